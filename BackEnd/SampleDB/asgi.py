@@ -1,11 +1,18 @@
-# 
-
-
-
-# asgi.py (no Channels / WebSockets)
+# asgi.py - HTTP via Django, WebSockets via Channels
 import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'SampleDB.settings')
 
-application = get_asgi_application()
+# Initialise Django before importing consumers so the app registry is ready
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter
+from channels.sessions import SessionMiddlewareStack
+from core.WebSocketConnection.routing import websocket_urlpatterns
+
+application = ProtocolTypeRouter({
+    'http': django_asgi_app,
+    # Sockets authenticate with the same session cookie as the REST API
+    'websocket': SessionMiddlewareStack(URLRouter(websocket_urlpatterns)),
+})
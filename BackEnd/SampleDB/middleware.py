@@ -1,33 +1,229 @@
-# from django.db import connections, transaction
-# import logging
-# import time
-
-# logger = logging.getLogger('django.db')
-
-# class DatabaseConnectionMiddleware:
-#     def __init__(self, get_response):
-#         self.get_response = get_response
-    
-#     def __call__(self, request):
-#         start_time = time.time()
-        
-#         try:
-#             response = self.get_response(request)
-#             return response
-#         except Exception as e:
-#             logger.error(f"Database error in request {request.path}: {e}")
-#             raise
-#         finally:
-#             # Close connections only for heavy operations
-#             if any(endpoint in request.path for endpoint in ['/sync-optimized/', '/live-enhanced/']):
-#                 connections.close_all()
-            
-#             # Log only slow requests
-#             end_time = time.time()
-#             request_time = end_time - start_time
-#             if request_time > 3.0:
-#                 logger.warning(f"Slow request {request.path}: {request_time:.2f}s")
-    
-#     def process_exception(self, request, exception):
-#         connections.close_all()
-#         return None
\ No newline at end of file
+# middleware.py - Query-level instrumentation for the raw-SQL endpoints
+# QueryMetricsMiddleware wraps every cursor of the request's connection
+# (connection.execute_wrapper) and records, per endpoint, the query count, the DB time
+# and statements repeated with the same shape in one request (N+1). Totals are exported
+# as Prometheus metrics at /metrics/; slow SELECTs are sampled through EXPLAIN into the
+# query_profiler log.
+import os
+import re
+import json
+import time
+import random
+import logging
+import threading
+from collections import Counter
+from django.db import connection
+from django.http import HttpResponse, JsonResponse
+
+try:
+    from prometheus_client import (
+        Counter as PrometheusCounter, Histogram, CollectorRegistry, REGISTRY,
+        generate_latest, CONTENT_TYPE_LATEST, multiprocess
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError as e:
+    PROMETHEUS_AVAILABLE = False
+    logging.warning(f"⚠️ prometheus_client not available, query metrics are only logged: {e}")
+
+logger = logging.getLogger('query_profiler')
+
+QUERY_METRICS_CONFIG = {
+    'ENABLED': os.getenv("QUERY_METRICS_ENABLED", "True") == "True",
+    # Requests slower than this are logged with their query totals
+    'SLOW_REQUEST_SECONDS': float(os.getenv("QUERY_METRICS_SLOW_REQUEST_SECONDS", 3.0)),
+    # Statements slower than this are logged and may be EXPLAINed
+    'SLOW_QUERY_MS': float(os.getenv("QUERY_METRICS_SLOW_QUERY_MS", 200)),
+    # One statement shape run this often in a request is reported as N+1
+    'DUPLICATE_THRESHOLD': int(os.getenv("QUERY_METRICS_DUPLICATE_THRESHOLD", 5)),
+    'EXPLAIN_SAMPLE_RATE': float(os.getenv("QUERY_METRICS_EXPLAIN_SAMPLE_RATE", 0.1)),
+    # A statement shape is EXPLAINed at most once per interval in each process
+    'EXPLAIN_INTERVAL_SECONDS': int(os.getenv("QUERY_METRICS_EXPLAIN_INTERVAL", 600)),
+    'MAX_EXPLAINS_PER_REQUEST': int(os.getenv("QUERY_METRICS_MAX_EXPLAINS", 2)),
+    # Bearer token /metrics/ requires when set
+    'METRICS_TOKEN': os.getenv("QUERY_METRICS_TOKEN", ""),
+}
+
+METRICS_PATH = '/metrics/'
+
+if PROMETHEUS_AVAILABLE:
+    REQUEST_DB_QUERIES = Histogram(
+        'http_request_db_queries', 'Database queries run by one request',
+        ['method', 'endpoint'], buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+    )
+    REQUEST_DB_SECONDS = Histogram(
+        'http_request_db_seconds', 'Database time spent by one request',
+        ['method', 'endpoint'], buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    )
+    REQUEST_REPEATED_QUERIES = PrometheusCounter(
+        'http_request_db_repeated_queries_total', 'Queries repeating a statement shape already run by the same request',
+        ['method', 'endpoint']
+    )
+    REQUEST_N_PLUS_ONE = PrometheusCounter(
+        'http_request_db_n_plus_one_total', 'Requests running one statement shape at least DUPLICATE_THRESHOLD times',
+        ['method', 'endpoint']
+    )
+    SLOW_QUERIES = PrometheusCounter(
+        'db_slow_queries_total', 'Statements slower than SLOW_QUERY_MS',
+        ['method', 'endpoint']
+    )
+
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint_sql(sql):
+    """Statement shape: literals and placeholders become ?, IN lists collapse, whitespace folds"""
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql.replace('%s', '?'))
+    sql = _IN_LIST_RE.sub('(?+)', sql)
+    return _SPACE_RE.sub(' ', sql).strip()
+
+
+class RequestQueryStats:
+    """execute_wrapper collecting one request's statements"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+        self.slow = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.seconds += elapsed
+            # Shapes are computed once per distinct text when the request ends
+            self.statements[sql] += 1
+            if elapsed * 1000 >= QUERY_METRICS_CONFIG['SLOW_QUERY_MS']:
+                self.slow.append((elapsed, sql, None if many else params, many))
+
+
+def endpoint_label(request):
+    """URL pattern of the resolved view, so metric labels stay bounded"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.route or match.view_name or 'unknown'
+
+
+_explained_until = {}
+_explained_lock = threading.Lock()
+
+
+def _claim_explain(shape):
+    """True if this shape has not been EXPLAINed within EXPLAIN_INTERVAL_SECONDS"""
+    now = time.monotonic()
+    with _explained_lock:
+        if _explained_until.get(shape, 0) > now:
+            return False
+        _explained_until[shape] = now + QUERY_METRICS_CONFIG['EXPLAIN_INTERVAL_SECONDS']
+        for stale in [key for key, until in _explained_until.items() if until <= now]:
+            del _explained_until[stale]
+    return True
+
+
+def explain_slow_queries(label, slow):
+    """Log the slow statements of a request and EXPLAIN a sample of the SELECTs"""
+    explained = 0
+    for elapsed, sql, params, many in sorted(slow, key=lambda query: query[0], reverse=True):
+        shape = fingerprint_sql(sql)
+        logger.warning(f"🐢 [SLOW QUERY] {label}: {elapsed * 1000:.0f} ms - {shape[:500]}")
+
+        if (many or explained >= QUERY_METRICS_CONFIG['MAX_EXPLAINS_PER_REQUEST']
+                or not sql.lstrip().upper().startswith(('SELECT', 'WITH'))
+                or random.random() >= QUERY_METRICS_CONFIG['EXPLAIN_SAMPLE_RATE']
+                or not _claim_explain(shape)):
+            continue
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN {sql}", params)
+                columns = [column[0] for column in cursor.description]
+                plan = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            explained += 1
+            logger.warning(f"🔎 [EXPLAIN] {label}: {shape[:500]}\n{json.dumps(plan, default=str, indent=2)}")
+        except Exception as e:
+            logger.debug(f"EXPLAIN failed for {shape[:200]}: {e}")
+
+
+def record_request_stats(request, stats, elapsed):
+    """Export one request's query totals and log slow requests, N+1 shapes and slow statements"""
+    endpoint = endpoint_label(request)
+    label = f"{request.method} {endpoint}"
+
+    shapes = Counter()
+    for sql, count in stats.statements.items():
+        shapes[fingerprint_sql(sql)] += count
+    repeated = sum(count - 1 for count in shapes.values() if count > 1)
+    hot_shape, hot_count = shapes.most_common(1)[0] if shapes else (None, 0)
+    n_plus_one = hot_count >= QUERY_METRICS_CONFIG['DUPLICATE_THRESHOLD']
+
+    if PROMETHEUS_AVAILABLE:
+        REQUEST_DB_QUERIES.labels(request.method, endpoint).observe(stats.count)
+        REQUEST_DB_SECONDS.labels(request.method, endpoint).observe(stats.seconds)
+        if repeated:
+            REQUEST_REPEATED_QUERIES.labels(request.method, endpoint).inc(repeated)
+        if n_plus_one:
+            REQUEST_N_PLUS_ONE.labels(request.method, endpoint).inc()
+        if stats.slow:
+            SLOW_QUERIES.labels(request.method, endpoint).inc(len(stats.slow))
+
+    if n_plus_one:
+        logger.warning(f"🔁 [N+1] {label}: {hot_count}x {hot_shape[:500]}")
+
+    if elapsed >= QUERY_METRICS_CONFIG['SLOW_REQUEST_SECONDS']:
+        logger.warning(
+            f"🐢 Slow request {request.path}: {elapsed:.2f}s, "
+            f"{stats.count} queries, {stats.seconds * 1000:.0f} ms in DB, {repeated} repeated"
+        )
+
+    if stats.slow:
+        explain_slow_queries(label, stats.slow)
+
+
+class QueryMetricsMiddleware:
+    """
+    Per-endpoint query count, DB time and N+1 detection for every request.
+    Queries a StreamingHttpResponse runs while streaming are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not QUERY_METRICS_CONFIG['ENABLED'] or request.path == METRICS_PATH:
+            return self.get_response(request)
+
+        stats = RequestQueryStats()
+        start = time.perf_counter()
+        with connection.execute_wrapper(stats):
+            response = self.get_response(request)
+
+        try:
+            record_request_stats(request, stats, time.perf_counter() - start)
+        except Exception as e:
+            logger.error(f"❌ Failed to record query metrics for {request.path}: {e}")
+        return response
+
+
+def query_metrics_view(request):
+    """Prometheus exposition of the query metrics"""
+    token = QUERY_METRICS_CONFIG['METRICS_TOKEN']
+    if token and request.headers.get('Authorization') != f"Bearer {token}":
+        return JsonResponse({"Error": "Unauthorized"}, status=401)
+    if not PROMETHEUS_AVAILABLE:
+        return JsonResponse({"Error": "prometheus_client is not installed"}, status=503)
+
+    # Worker processes share their metrics through PROMETHEUS_MULTIPROC_DIR
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -57,6 +57,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'corsheaders',
     'rest_framework',
+    'channels',
     'core',
     'core.scheduler',
     'core.UserDashBoard',
@@ -66,6 +67,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'SampleDB.middleware.QueryMetricsMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -200,9 +202,15 @@ REST_FRAMEWORK = {
 }
 
 # Channels configuration
+# Redis-backed so events published by any worker reach sockets held by any other
 CHANNEL_LAYERS = {
     "default": {
-        "BACKEND": "channels.layers.InMemoryChannelLayer"
+        "BACKEND": "channels_redis.core.RedisChannelLayer",
+        "CONFIG": {
+            "hosts": [os.getenv("CHANNEL_LAYER_REDIS_URL", f"redis://{REDIS_HOST_OVERRIDE}:6379/2")],
+            "capacity": int(os.getenv("CHANNEL_LAYER_CAPACITY", 1500)),
+            "expiry": 10,
+        },
     }
 }
 
@@ -234,6 +242,30 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'core.scheduler.tasks.send_meeting_reminders_task',
         'schedule': 60.0,
     },
+    'rebuild-reminder-queue': {
+        'task': 'core.scheduler.tasks.rebuild_reminder_queue_task',
+        'schedule': 60.0 * 60,
+    },
+    'sweep-expired-notifications': {
+        'task': 'core.scheduler.tasks.sweep_expired_notifications_task',
+        'schedule': 60.0,
+    },
+    'sweep-chat-files': {
+        'task': 'core.scheduler.tasks.sweep_chat_files_task',
+        'schedule': 60.0 * 60,
+    },
+    'reconcile-notification-counters': {
+        'task': 'core.scheduler.tasks.reconcile_notification_counters_task',
+        'schedule': 60.0 * 5,
+    },
+    'reconcile-user-meeting-history': {
+        'task': 'core.scheduler.tasks.reconcile_user_meeting_history_task',
+        'schedule': 60.0 * 15,
+    },
+    'reconcile-analytics-rollups': {
+        'task': 'core.scheduler.tasks.reconcile_analytics_rollups_task',
+        'schedule': 60.0 * 15,
+    },
     'cleanup-old-meetings': {
         'task': 'core.scheduler.tasks.cleanup_old_meetings_task',
         'schedule': 60.0 * 60 * 24,
@@ -308,6 +340,11 @@ LOGGING = {
             'filename': os.path.join(LOGS_DIR, 'celery.log'),
             'formatter': 'verbose',
         },
+        'query_profiler_file': {
+            'class': 'logging.FileHandler',
+            'filename': os.path.join(LOGS_DIR, 'query_profiler.log'),
+            'formatter': 'verbose',
+        },
     },
     'root': {
         'handlers': ['console'],
@@ -339,6 +376,11 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'query_profiler': {
+            'handlers': ['query_profiler_file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
@@ -16,9 +16,11 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from SampleDB.middleware import query_metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics/', query_metrics_view),
     path('', include('core.WebSocketConnection.meetings')),
     path('', include('core.UserDashBoard.users')),
     path('', include('core.UserDashBoard.Analytics')),
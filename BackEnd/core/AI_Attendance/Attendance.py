@@ -13,7 +13,6 @@ import uuid
 from functools import wraps
 from typing import Optional, Dict, List, Tuple, Any
 import traceback
-import asyncio
 
 from django.db import models, connection, transaction
 from django.utils import timezone
@@ -1137,7 +1136,7 @@ attendance_sessions = {}
 def release_face_model_gpu():
     """Release face model GPU memory after detection"""
     try:
-        from face_embeddings import face_model
+        from core.UserDashBoard.face_embeddings import face_model
         if face_model is not None:
             import torch
             if torch.cuda.is_available():
@@ -1317,40 +1316,53 @@ def generate_camera_verification_token(meeting_id: str, user_id: str, timestamp:
     data = f"{meeting_id}_{user_id}_{timestamp}_{uuid.uuid4()}"
     return hashlib.sha256(data.encode()).hexdigest()[:32]
 
-# ==================== HELPER: Run async code in sync context ====================
-
 # ==================== IDENTITY VERIFICATION HELPER FUNCTIONS ====================
 
-def run_async_verification(frame, user_id):
+def preload_identity_embeddings(meeting_id, user_id):
     """
-    ✅ NEW FUNCTION - Helper function to run identity verification in sync context
+    Load the user's stored embeddings into the meeting's embedding matrix so identity
+    checks during the meeting never read MongoDB. Refreshed on every (re)join.
     """
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        from core.FaceAuth.unified_face_service import get_unified_face_service
+        get_unified_face_service().preload_meeting_embeddings(meeting_id, [user_id], refresh=True)
+    except Exception as e:
+        # Verification falls back to the per-user embedding cache
+        logger.warning(f"⚠️ Could not preload embeddings for {user_id} in {meeting_id}: {e}")
+
+
+def release_identity_embeddings(meeting_id):
+    """Drop the meeting's embedding matrix once nobody in it is tracked any more"""
+    try:
+        from core.FaceAuth.unified_face_service import get_unified_face_service
+        get_unified_face_service().release_meeting_embeddings(meeting_id)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not release embeddings for meeting {meeting_id}: {e}")
+
+
+def run_identity_verification(frame, user_id, meeting_id=None):
+    """
+    Run identity verification in sync context.
+    Calls the synchronous core directly - no per-check event loop.
+    """
+    try:
+        from core.FaceAuth.unified_face_service import get_unified_face_service
+        face_service = get_unified_face_service()
+        
+        result = face_service.verify_face_sync(
+            frame=frame,
+            user_id=user_id,
+            threshold=AttendanceConfig.IDENTITY_FACE_THRESHOLD,
+            method='cosine',
+            meeting_id=meeting_id
+        )
         
-        try:
-            from core.FaceAuth.unified_face_service import get_unified_face_service
-            face_service = get_unified_face_service()
-            
-            result = loop.run_until_complete(
-                face_service.verify_face(
-                    frame=frame,
-                    user_id=user_id,
-                    threshold=AttendanceConfig.IDENTITY_FACE_THRESHOLD,
-                    method='cosine'
-                )
-            )
-            
-            logger.debug(
-                f"Identity verification result for {user_id}: "
-                f"verified={result[0]}, similarity={result[1]:.3f}"
-            )
-            
-            return result
-            
-        finally:
-            loop.close()
+        logger.debug(
+            f"Identity verification result for {user_id}: "
+            f"verified={result[0]}, similarity={result[1]:.3f}"
+        )
+        
+        return result
             
     except ImportError as e:
         logger.error(f"Failed to import unified_face_service: {e}")
@@ -1399,7 +1411,7 @@ def check_identity_verification(session, db_session, frame, user_id, current_tim
     # ============================================================
     # STEP 2: Run face verification
     # ============================================================
-    is_verified, similarity = run_async_verification(frame, user_id)
+    is_verified, similarity = run_identity_verification(frame, user_id, db_session.meeting_id)
     
     logger.debug(
         f"Identity check for {user_id}: "
@@ -2324,6 +2336,15 @@ def stop_attendance_tracking(meeting_id: str, user_id) -> bool:
 
 
 
+def refresh_attendance_rollups(meeting_id):
+    """Queue a refresh of the meeting's dashboard rollups after attendance was stored"""
+    try:
+        from core.WebSocketConnection.analytics_rollups import schedule_meeting_rollup_refresh
+        schedule_meeting_rollup_refresh(meeting_id)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not schedule analytics rollup refresh for {meeting_id}: {e}")
+
+
 def store_attendance_to_db(meeting_id: str, user_id: str) -> bool:
     """
     ✅ ENHANCED: Store attendance session data to database with identity verification
@@ -2595,6 +2616,7 @@ def store_attendance_to_db(meeting_id: str, user_id: str) -> bool:
                 f"  - Total Session Time: {int(time.time() - state.get('session_started_at', time.time()))}s\n"
             )
             
+            transaction.on_commit(lambda: refresh_attendance_rollups(meeting_id))
             return True
             
     except Exception as e:
@@ -5519,6 +5541,7 @@ def start_attendance_tracking_api(request):
         success = start_attendance_tracking(meeting_id, user_id_str, user_name)
         
         if success:
+            preload_identity_embeddings(meeting_id, user_id_str)
             final_concurrent_sessions = [k for k in attendance_sessions.keys() if k.startswith(f"{meeting_id}_")]
             
             return JsonResponse({
@@ -5577,6 +5600,9 @@ def stop_attendance_tracking_api(request):
         is_last_participant = len(concurrent_sessions_after) == 0
         gpu_released = False
         
+        if is_last_participant:
+            release_identity_embeddings(meeting_id)
+        
         if success and is_last_participant:
             # ✅ CRITICAL: Wait for all CUDA operations to complete
             logger.info(f"⏳ Last participant left. Waiting for face detection to fully stop...")
@@ -5601,17 +5627,9 @@ def stop_attendance_tracking_api(request):
             try:
                 logger.info(f"🔄 Attempting to release face model GPU memory...")
                 
-                import sys
-                import os
-                
-                current_dir = os.path.dirname(os.path.abspath(__file__))
-                faceauth_dir = os.path.join(current_dir, '..', 'FaceAuth')
-                faceauth_dir = os.path.abspath(faceauth_dir)
-                
-                if faceauth_dir not in sys.path:
-                    sys.path.insert(0, faceauth_dir)
-                
-                from face_model_shared import unload_face_model
+                # With the inference server this only drops the client connection;
+                # the server keeps its model warm for the next meeting
+                from core.FaceAuth.face_model_shared import unload_face_model
                 unload_face_model()
                 gpu_released = True
                 logger.info(f"✅ Face model GPU memory released safely for meeting {meeting_id}")
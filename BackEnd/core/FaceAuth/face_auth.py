@@ -39,7 +39,8 @@ from channels.routing import ProtocolTypeRouter
 from pymongo import MongoClient
 from bson import ObjectId
 from PIL import Image
-from insightface.app import FaceAnalysis
+from core.FaceAuth.face_model_shared import get_face_model
+from core.FaceAuth.verification_log_writer import BufferedVerificationWriter
 import logging
 from datetime import datetime, timedelta
 import base64
@@ -151,6 +152,9 @@ FACE_EMBEDDINGS_COLLECTION = os.getenv("FACE_EMBEDDINGS_COLLECTION", "face_embed
 VERIFICATION_LOGS_COLLECTION = os.getenv("VERIFICATION_LOGS_COLLECTION", "face_verification_logs")
 VERIFICATION_SESSIONS_COLLECTION = os.getenv("VERIFICATION_SESSIONS_COLLECTION", "face_verification_sessions")
 
+# Verification logs and routine session updates are written in the background
+verification_writer = BufferedVerificationWriter(db, VERIFICATION_LOGS_COLLECTION, VERIFICATION_SESSIONS_COLLECTION)
+
 # Face Recognition Configuration
 FACE_DISTANCE_THRESHOLD = float(os.getenv("FACE_DISTANCE_THRESHOLD", "0.6"))
 FACE_MODEL_NAME = os.getenv("FACE_MODEL_NAME", "buffalo_l")
@@ -192,30 +196,17 @@ logger.info(f"⚙️ Max Allowed Faces: {MAX_ALLOWED_FACES}")
 # Face Model - Singleton Pattern
 # ---------------------------------------------------------------------
 class FaceModel:
-    """Singleton class for InsightFace model management"""
+    """
+    Singleton facade over the shared face model (face_model_shared.get_face_model),
+    so verification no longer loads a second InsightFace copy per process.
+    """
     _instance = None
-    _initialized = False
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(FaceModel, cls).__new__(cls)
         return cls._instance
 
-    def __init__(self):
-        if not self._initialized:
-            logger.info(f"🔹 Initializing InsightFace model: {FACE_MODEL_NAME}...")
-            try:
-                self.app = FaceAnalysis(
-                    name=FACE_MODEL_NAME,
-                    providers=['CPUExecutionProvider']
-                )
-                self.app.prepare(ctx_id=-1, det_size=FACE_DETECTION_SIZE)
-                self._initialized = True
-                logger.info("✅ InsightFace model loaded successfully")
-            except Exception as e:
-                logger.error(f"❌ Failed to initialize InsightFace model: {e}")
-                raise
-
     def extract_embedding(self, image_data, return_all_faces=False):
         """
         Extract face embedding from image data
@@ -258,7 +249,7 @@ class FaceModel:
                 raise ValueError("Invalid image data type")
             
             # Detect all faces in image
-            faces = self.app.get(np_img)
+            faces = get_face_model().get_faces(np_img)
             
             if not faces:
                 raise ValueError("No face detected in the image. Please ensure your face is clearly visible and well-lit.")
@@ -273,16 +264,15 @@ class FaceModel:
                 
                 for idx, face in enumerate(faces):
                     bbox = face.bbox.tolist()
-                    bbox_area = (bbox[2] - bbox[0]) * (bbox[3] - bbox[1])
                     
                     face_info = {
                         'index': idx,
                         'embedding': face.embedding.tolist(),
                         'bbox': bbox,
-                        'bbox_area': bbox_area,
+                        'bbox_area': face.area,
                         'det_score': float(face.det_score),
-                        'age': int(face.age) if hasattr(face, 'age') else None,
-                        'gender': 'male' if hasattr(face, 'gender') and face.gender == 1 else 'female' if hasattr(face, 'gender') and face.gender == 0 else None
+                        'age': face.age,
+                        'gender': face.gender_label
                     }
                     face_list.append(face_info)
                 
@@ -305,7 +295,7 @@ class FaceModel:
                 logger.warning(f"⚠️ Multiple faces detected ({face_count}). Using the largest face.")
             
             # Use largest face (by bounding box area)
-            largest_face = max(faces, key=lambda f: (f.bbox[2] - f.bbox[0]) * (f.bbox[3] - f.bbox[1]))
+            largest_face = max(faces, key=lambda f: f.area)
             embedding = largest_face.embedding.tolist()
             
             logger.debug(f"✅ Embedding extracted (dimension: {len(embedding)})")
@@ -399,8 +389,8 @@ def log_verification_attempt(user_id, distance, allowed, confidence, error=None,
                 "port": SERVER_PORT,
             }
         }
-        db[VERIFICATION_LOGS_COLLECTION].insert_one(log_entry)
-        logger.debug(f"📝 Logged verification attempt for user_id: {user_id}")
+        verification_writer.add_log(log_entry)
+        logger.debug(f"📝 Queued verification attempt log for user_id: {user_id}")
     except Exception as e:
         logger.error(f"❌ Failed to log verification attempt: {e}")
 
@@ -500,26 +490,22 @@ def update_camera_state_in_session(session_id, state_info, frame_data):
     elif state_info["new_state"] == "disabled":
         update_data["last_camera_disabled_time"] = now
     
-    # Add to state history
-    db[VERIFICATION_SESSIONS_COLLECTION].update_one(
-        {"_id": ObjectId(session_id)},
-        {
-            "$set": update_data,
-            "$push": {
-                "camera_state_history": {
-                    "$each": [{
-                        "state": state_info["new_state"],
-                        "timestamp": now,
-                        "frame_received": frame_data is not None,
-                        "time_since_last_frame": state_info.get("time_since_last_frame")
-                    }],
-                    "$slice": -50  # Keep last 50 state changes
-                }
-            }
-        }
+    # Add to state history (coalesced with other pending updates of this session)
+    verification_writer.update_session(
+        session_id,
+        set_fields=update_data,
+        push={
+            "camera_state_history": [{
+                "state": state_info["new_state"],
+                "timestamp": now,
+                "frame_received": frame_data is not None,
+                "time_since_last_frame": state_info.get("time_since_last_frame")
+            }]
+        },
+        push_slice={"camera_state_history": -50}  # Keep last 50 state changes
     )
     
-    logger.debug(f"Updated camera state to '{state_info['new_state']}' for session {session_id}")
+    logger.debug(f"Queued camera state '{state_info['new_state']}' for session {session_id}")
 
 
 # ---------------------------------------------------------------------
@@ -566,17 +552,17 @@ def create_verification_session(user_id, room_name, initial_verification=True):
 def update_verification_session(session_id, verification_result, violation=None):
     """Update verification session with new verification attempt"""
     try:
-        update_data = {
-            "last_verification": datetime.utcnow(),
-        }
-        
-        # Increment verification count
-        db[VERIFICATION_SESSIONS_COLLECTION].update_one(
-            {"_id": ObjectId(session_id)},
-            {"$inc": {"verification_count": 1}}
+        # Count and timestamp are coalesced; violations are written immediately
+        # because the violation count is read back right away
+        verification_writer.update_session(
+            session_id,
+            set_fields={"last_verification": datetime.utcnow()},
+            inc={"verification_count": 1}
         )
         
         if violation:
+            verification_writer.flush_session(session_id)
+            
             violation_entry = {
                 "timestamp": datetime.utcnow(),
                 "reason": violation.get("reason"),
@@ -595,12 +581,10 @@ def update_verification_session(session_id, verification_result, violation=None)
             # Check violation count
             session = db[VERIFICATION_SESSIONS_COLLECTION].find_one({"_id": ObjectId(session_id)})
             if len(session.get("violations", [])) >= 3:
-                update_data["status"] = "suspended"
-        
-        db[VERIFICATION_SESSIONS_COLLECTION].update_one(
-            {"_id": ObjectId(session_id)},
-            {"$set": update_data}
-        )
+                db[VERIFICATION_SESSIONS_COLLECTION].update_one(
+                    {"_id": ObjectId(session_id)},
+                    {"$set": {"status": "suspended"}}
+                )
         
         logger.info(f"✅ Updated verification session {session_id}")
         
@@ -610,6 +594,7 @@ def update_verification_session(session_id, verification_result, violation=None)
 def end_verification_session(session_id):
     """End verification session"""
     try:
+        verification_writer.flush_session(session_id)
         db[VERIFICATION_SESSIONS_COLLECTION].update_one(
             {"_id": ObjectId(session_id)},
             {
@@ -629,7 +614,9 @@ def end_verification_session(session_id):
 def get_session_status(session_id):
     """Get session status"""
     try:
-        session = db[VERIFICATION_SESSIONS_COLLECTION].find_one({"_id": ObjectId(session_id)})
+        session = verification_writer.overlay(
+            db[VERIFICATION_SESSIONS_COLLECTION].find_one({"_id": ObjectId(session_id)})
+        )
         
         if not session:
             return None
@@ -1197,12 +1184,12 @@ class EnhancedAttendanceDetection(APIView):
                     "error": "user_id and meeting_id required"
                 }, status=400)
             
-            # Get or create session
-            session = db[VERIFICATION_SESSIONS_COLLECTION].find_one({
+            # Get or create session (with this process's not yet written camera state)
+            session = verification_writer.overlay(db[VERIFICATION_SESSIONS_COLLECTION].find_one({
                 "user_id": str(user_id),
                 "room_name": meeting_id,
                 "status": "active"
-            })
+            }))
             
             if not session:
                 # Create new session
@@ -1279,9 +1266,9 @@ class EnhancedAttendanceDetection(APIView):
                         logger.info("✅ Automatic continuous verification PASSED")
                         
                         # Clear pending reverification
-                        db[VERIFICATION_SESSIONS_COLLECTION].update_one(
-                            {"_id": session["_id"]},
-                            {"$set": {"pending_reverification": False}}
+                        verification_writer.update_session(
+                            session["_id"],
+                            set_fields={"pending_reverification": False}
                         )
                         
                         # Log successful verification
@@ -1326,6 +1313,7 @@ class EnhancedAttendanceDetection(APIView):
                         }
                         
                         # Update violations
+                        verification_writer.flush_session(session["_id"])
                         db[VERIFICATION_SESSIONS_COLLECTION].update_one(
                             {"_id": session["_id"]},
                             {
@@ -1411,6 +1399,7 @@ class EnhancedAttendanceDetection(APIView):
                         "type": "verification_error"
                     }
                     
+                    verification_writer.flush_session(session["_id"])
                     db[VERIFICATION_SESSIONS_COLLECTION].update_one(
                         {"_id": session["_id"]},
                         {"$push": {"violations": violation_entry}}
@@ -1749,6 +1738,7 @@ def get_stats(request):
                 "failed": recent_verifications - recent_successful,
                 "success_rate": round((recent_successful / recent_verifications * 100), 2) if recent_verifications > 0 else 0,
             },
+            "log_writer": verification_writer.get_stats(),
             "timestamp": datetime.utcnow().isoformat(),
             "protocol": SERVER_PROTOCOL,
             "port": int(SERVER_PORT),
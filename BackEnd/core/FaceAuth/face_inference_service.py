@@ -0,0 +1,266 @@
+# face_inference_service.py
+
+"""
+Face Inference Service
+======================
+One warm InsightFace model per host instead of one per gunicorn/celery process.
+
+Server (run once per host; on Kubernetes it is the face-inference sidecar of
+the gpu-worker pods, kubernetes/apps/gpu-workers/deployment.yaml):
+    FACE_INFERENCE_AUTHKEY=<secret> python -m core.FaceAuth.face_inference_service
+
+Clients get a RemoteFaceModel from face_model_shared.get_face_model() when
+FACE_INFERENCE_MODE=remote (the default is local, an in-process model). Images
+are decoded in the client and sent as numpy arrays over a Unix socket, so each
+caller keeps its own color handling. The connection pickles its messages: it
+only listens on a Unix socket, and both ends require FACE_INFERENCE_AUTHKEY. Requests arriving together are run as one batch: detection per
+image, then a single recognition pass over every aligned face.
+"""
+
+import os
+import queue
+import socket
+import logging
+import threading
+import time
+from multiprocessing.connection import Listener, Client
+
+from core.FaceAuth.face_model_shared import FaceModelBase, SharedFaceModel
+
+logger = logging.getLogger("face_inference_service")
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+FACE_INFERENCE_CONFIG = {
+    # 'remote': use the inference server, 'local': load the model in this process
+    'MODE': os.getenv("FACE_INFERENCE_MODE", "local").lower(),
+    # Unix socket path; TCP is refused since messages are pickled
+    'ADDRESS': os.getenv("FACE_INFERENCE_ADDRESS", "/tmp/imeetpro_face_inference.sock"),
+    # Shared secret for the connection handshake; required in remote mode
+    'AUTHKEY': os.getenv("FACE_INFERENCE_AUTHKEY", "").encode(),
+    'REQUEST_TIMEOUT': float(os.getenv("FACE_INFERENCE_REQUEST_TIMEOUT", "10")),
+    # Load the model in-process when the server is unreachable
+    'FALLBACK_LOCAL': os.getenv("FACE_INFERENCE_FALLBACK_LOCAL", "True") == "True",
+    'RETRY_INTERVAL': float(os.getenv("FACE_INFERENCE_RETRY_INTERVAL", "30")),
+    'BATCH_MAX': int(os.getenv("FACE_INFERENCE_BATCH_MAX", "16")),
+    # How long the batcher waits for more requests after the first one (seconds)
+    'BATCH_WINDOW': float(os.getenv("FACE_INFERENCE_BATCH_WINDOW_MS", "5")) / 1000.0,
+}
+
+
+def _parse_address(address):
+    """'/path/to.sock' -> (path, 'AF_UNIX'); anything else is refused"""
+    if not address.startswith('/'):
+        raise ValueError(f"FACE_INFERENCE_ADDRESS must be an absolute Unix socket path, got {address!r}")
+    return address, 'AF_UNIX'
+
+
+def _require_authkey():
+    authkey = FACE_INFERENCE_CONFIG['AUTHKEY']
+    if not authkey:
+        raise RuntimeError("FACE_INFERENCE_AUTHKEY must be set to use the face inference server")
+    return authkey
+
+
+class FaceInferenceUnavailable(RuntimeError):
+    """The inference server could not be reached or did not answer in time"""
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+class _PendingRequest:
+    __slots__ = ('image', 'result', 'error', 'done')
+
+    def __init__(self, image):
+        self.image = image
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class FaceInferenceServer:
+    """Holds one SharedFaceModel and serves get_faces requests from many processes"""
+
+    def __init__(self, address=None):
+        self.address, self.family = _parse_address(address or FACE_INFERENCE_CONFIG['ADDRESS'])
+        self.authkey = _require_authkey()
+        self.model = SharedFaceModel()
+        self._queue = queue.Queue()
+        self.stats = {'requests': 0, 'batches': 0, 'errors': 0}
+
+    def _batch_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + FACE_INFERENCE_CONFIG['BATCH_WINDOW']
+            while len(batch) < FACE_INFERENCE_CONFIG['BATCH_MAX']:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                results = self.model.get_faces_batch([pending.image for pending in batch])
+                for pending, faces in zip(batch, results):
+                    pending.result = faces
+            except Exception as e:
+                # One bad image must not fail its batch neighbours: retry individually
+                logger.warning(f"⚠️ Batch of {len(batch)} failed ({e}), retrying one by one")
+                for pending in batch:
+                    try:
+                        pending.result = self.model.get_faces(pending.image)
+                    except Exception as single_error:
+                        pending.error = str(single_error)
+                        self.stats['errors'] += 1
+
+            self.stats['batches'] += 1
+            self.stats['requests'] += len(batch)
+            for pending in batch:
+                pending.done.set()
+
+    def _handle(self, request):
+        op = request.get('op')
+        if op == 'ping':
+            return {'ok': True, 'ready': self.model.is_ready(), 'stats': dict(self.stats)}
+        if op == 'get_faces':
+            pending = _PendingRequest(request['image'])
+            self._queue.put(pending)
+            pending.done.wait()
+            if pending.error:
+                return {'ok': False, 'error': pending.error}
+            return {'ok': True, 'faces': pending.result}
+        return {'ok': False, 'error': f"Unknown op: {op}"}
+
+    def _serve_connection(self, conn):
+        try:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    break
+                try:
+                    response = self._handle(request)
+                except Exception as e:
+                    logger.error(f"❌ Inference request failed: {e}", exc_info=True)
+                    response = {'ok': False, 'error': str(e)}
+                conn.send(response)
+        finally:
+            conn.close()
+
+    def serve_forever(self):
+        if os.path.exists(self.address):
+            # Stale socket from a previous run
+            os.unlink(self.address)
+
+        threading.Thread(target=self._batch_loop, name="face-inference-batcher", daemon=True).start()
+        listener = Listener(self.address, family=self.family, authkey=self.authkey)
+        os.chmod(self.address, 0o660)
+        logger.info(f"✅ Face inference server listening on {self.address}")
+
+        try:
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    # Failed authentication or a client that hung up mid-handshake
+                    logger.warning(f"⚠️ Rejected inference client: {e}")
+                    continue
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+        finally:
+            listener.close()
+
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+class RemoteFaceModel(FaceModelBase):
+    """
+    FaceModelBase backed by the inference server. One connection per thread;
+    falls back to the in-process model when the server is down (if enabled).
+    """
+
+    def __init__(self, address=None):
+        self.address, self.family = _parse_address(address or FACE_INFERENCE_CONFIG['ADDRESS'])
+        self.authkey = _require_authkey()
+        self._local = threading.local()
+        self._unavailable_until = 0.0
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            try:
+                conn = Client(self.address, family=self.family, authkey=self.authkey)
+            except (OSError, socket.error) as e:
+                raise FaceInferenceUnavailable(f"Face inference server unreachable at {self.address}: {e}")
+            self._local.conn = conn
+        return conn
+
+    def _close_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def _request(self, payload):
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.send(payload)
+                if not conn.poll(FACE_INFERENCE_CONFIG['REQUEST_TIMEOUT']):
+                    # A late answer would be read by the next request: drop the connection
+                    self._close_connection()
+                    raise FaceInferenceUnavailable("Face inference request timed out")
+                return conn.recv()
+            except (EOFError, OSError):
+                # Server restarted: reconnect once
+                self._close_connection()
+                if attempt == 1:
+                    raise FaceInferenceUnavailable("Face inference server closed the connection")
+
+    def get_faces_batch(self, images):
+        if time.monotonic() >= self._unavailable_until:
+            try:
+                results = []
+                for image in images:
+                    response = self._request({'op': 'get_faces', 'image': image})
+                    if not response.get('ok'):
+                        raise ValueError(response.get('error') or "Face inference failed")
+                    results.append(response['faces'])
+                return results
+            except FaceInferenceUnavailable as e:
+                if not FACE_INFERENCE_CONFIG['FALLBACK_LOCAL']:
+                    raise
+                self._unavailable_until = time.monotonic() + FACE_INFERENCE_CONFIG['RETRY_INTERVAL']
+                logger.warning(f"⚠️ {e} - using in-process model for {FACE_INFERENCE_CONFIG['RETRY_INTERVAL']:.0f}s")
+        elif not FACE_INFERENCE_CONFIG['FALLBACK_LOCAL']:
+            raise FaceInferenceUnavailable("Face inference server unavailable")
+
+        return SharedFaceModel().get_faces_batch(images)
+
+    def is_ready(self):
+        try:
+            return bool(self._request({'op': 'ping'}).get('ready'))
+        except FaceInferenceUnavailable:
+            return FACE_INFERENCE_CONFIG['FALLBACK_LOCAL']
+
+    def get_app(self):
+        raise RuntimeError("FaceAnalysis app lives in the face inference server (FACE_INFERENCE_MODE=remote)")
+
+    def unload_model(self):
+        """The server keeps its model warm; only this thread's connection is dropped"""
+        self._close_connection()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    FaceInferenceServer().serve_forever()
@@ -31,7 +31,6 @@ import numpy as np
 from io import BytesIO
 from PIL import Image
 import cv2
-from insightface.app import FaceAnalysis
 import logging
 
 # ============================================================================
@@ -46,94 +45,64 @@ FACE_MODEL_NAME = os.getenv("FACE_MODEL_NAME", "buffalo_l")
 FACE_DETECTION_SIZE = tuple(map(int, os.getenv("FACE_DETECTION_SIZE", "640,640").split(",")))
 
 # ============================================================================
-# SHARED INSIGHTFACE MODEL - SINGLETON
+# FACE RESULT
 # ============================================================================
-class SharedFaceModel:
+class DetectedFace:
     """
-    Singleton class for InsightFace model management.
-    Can be imported and used by multiple services.
-    
-    Usage:
-        from face_model_shared import get_face_model
-        
-        face_model = get_face_model()
-        embedding = face_model.extract_embedding(image_data)
+    Plain, picklable copy of the insightface Face attributes the services use,
+    so results can cross the inference-server socket.
     """
-    _instance = None
-    _initialized = False
-    _app = None
+    __slots__ = ('bbox', 'kps', 'det_score', 'embedding', 'age', 'gender')
+
+    def __init__(self, bbox, kps=None, det_score=0.0, embedding=None, age=None, gender=None):
+        self.bbox = bbox
+        self.kps = kps
+        self.det_score = det_score
+        self.embedding = embedding
+        self.age = age
+        self.gender = gender
+
+    @classmethod
+    def from_insightface(cls, face):
+        return cls(
+            bbox=np.asarray(face.bbox, dtype=np.float32),
+            kps=np.asarray(face.kps, dtype=np.float32) if face.kps is not None else None,
+            det_score=float(face.det_score),
+            embedding=np.asarray(face.embedding, dtype=np.float32) if face.embedding is not None else None,
+            age=int(face.age) if face.age is not None else None,
+            gender=int(face.gender) if face.gender is not None else None,
+        )
+
+    @property
+    def area(self):
+        return float((self.bbox[2] - self.bbox[0]) * (self.bbox[3] - self.bbox[1]))
+
+    @property
+    def gender_label(self):
+        if self.gender == 1:
+            return 'male'
+        if self.gender == 0:
+            return 'female'
+        return None
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(SharedFaceModel, cls).__new__(cls)
-        return cls._instance
 
-    def __init__(self):
-        if not self._initialized:
-            self._initialize_model()
-            self._initialized = True
+# ============================================================================
+# COMMON FACE MODEL API
+# ============================================================================
+class FaceModelBase:
+    """
+    extract_embedding / detect_face / compare_embeddings on top of get_faces_batch().
+    Implemented in-process by SharedFaceModel and over a socket by
+    face_inference_service.RemoteFaceModel.
+    """
 
-    def _initialize_model(self):
-        """Initialize InsightFace model once"""
-        try:
-            logger.info(f"🔹 Initializing Shared InsightFace Model: {FACE_MODEL_NAME}")
-            logger.info(f"   Detection Size: {FACE_DETECTION_SIZE}")
-            
-            self._app = FaceAnalysis(
-                name=FACE_MODEL_NAME,
-                providers=['CUDAExecutionProvider', 'CPUExecutionProvider']
-            )
-            
-            # Prepare with detection size
-            self._app.prepare(ctx_id=-1, det_size=FACE_DETECTION_SIZE)
-            
-            logger.info("✅ Shared InsightFace Model initialized successfully")
-            logger.info(f"   Model: {FACE_MODEL_NAME}")
-            logger.info(f"   Providers: {self._app.det_model.session.get_providers()}")
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to initialize InsightFace model: {e}")
-            raise
+    def get_faces_batch(self, images):
+        """list of BGR images -> list of [DetectedFace] per image"""
+        raise NotImplementedError
 
-    def unload_model(self):
-        """Unload the model and free GPU memory"""
-        try:
-            if self._app is not None:
-                logger.info("🔹 Unloading InsightFace model and releasing GPU memory...")
-                
-                # Delete the model
-                del self._app
-                self._app = None
-                
-                # Force GPU cache cleanup
-                try:
-                    import torch
-                    if torch.cuda.is_available():
-                        torch.cuda.empty_cache()
-                        torch.cuda.synchronize()
-                        logger.info("✅ CUDA cache cleared")
-                except ImportError:
-                    pass
-                
-                # Force garbage collection
-                import gc
-                gc.collect()
-                
-                logger.info("✅ InsightFace model unloaded, GPU memory released")
-                self._initialized = False
-                
-        except Exception as e:
-            logger.error(f"❌ Error unloading model: {e}")
-            
-    def get_app(self):
-        """Get the FaceAnalysis app instance"""
-        if self._app is None:
-            raise RuntimeError("FaceAnalysis model not initialized")
-        return self._app
-
-    def is_ready(self):
-        """Check if model is ready"""
-        return self._app is not None
+    def get_faces(self, np_img):
+        """All faces detected in one image -> [DetectedFace]"""
+        return self.get_faces_batch([np_img])[0]
 
     def extract_embedding(self, image_data, return_face_info=False):
         """
@@ -169,7 +138,7 @@ class SharedFaceModel:
             np_img = self._convert_to_numpy(image_data)
             
             # Detect faces
-            faces = self._app.get(np_img)
+            faces = self.get_faces(np_img)
             
             if not faces:
                 raise ValueError("No face detected. Ensure face is clearly visible and well-lit.")
@@ -178,7 +147,7 @@ class SharedFaceModel:
                 logger.warning(f"⚠️  Multiple faces detected ({len(faces)}). Using largest face.")
             
             # Use largest face (by bounding box area)
-            face = max(faces, key=lambda f: (f.bbox[2] - f.bbox[0]) * (f.bbox[3] - f.bbox[1]))
+            face = max(faces, key=lambda f: f.area)
             
             # Extract embedding
             embedding = face.embedding.tolist()
@@ -193,10 +162,10 @@ class SharedFaceModel:
             face_info = {
                 'embedding': embedding,
                 'bbox': face.bbox.tolist(),
-                'landmarks': face.kps.tolist() if hasattr(face, 'kps') else None,
+                'landmarks': face.kps.tolist() if face.kps is not None else None,
                 'det_score': float(face.det_score),
-                'age': int(face.age) if hasattr(face, 'age') else None,
-                'gender': 'male' if hasattr(face, 'gender') and face.gender == 1 else 'female' if hasattr(face, 'gender') and face.gender == 0 else None,
+                'age': face.age,
+                'gender': face.gender_label,
                 'face_count': len(faces)
             }
             
@@ -269,7 +238,7 @@ class SharedFaceModel:
         """
         try:
             np_img = self._convert_to_numpy(image_data)
-            faces = self._app.get(np_img)
+            faces = self.get_faces(np_img)
             
             if not faces:
                 return {
@@ -280,7 +249,7 @@ class SharedFaceModel:
                 }
             
             # Get largest face
-            face = max(faces, key=lambda f: (f.bbox[2] - f.bbox[0]) * (f.bbox[3] - f.bbox[1]))
+            face = max(faces, key=lambda f: f.area)
             
             return {
                 'detected': True,
@@ -343,6 +312,134 @@ class SharedFaceModel:
             raise
 
 
+# ============================================================================
+# SHARED INSIGHTFACE MODEL - SINGLETON
+# ============================================================================
+class SharedFaceModel(FaceModelBase):
+    """
+    Singleton class for InsightFace model management.
+    Can be imported and used by multiple services.
+    
+    Usage:
+        from core.FaceAuth.face_model_shared import get_face_model
+        
+        face_model = get_face_model()
+        embedding = face_model.extract_embedding(image_data)
+    """
+    _instance = None
+    _initialized = False
+    _app = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(SharedFaceModel, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self._initialize_model()
+            self._initialized = True
+
+    def _initialize_model(self):
+        """Initialize InsightFace model once"""
+        try:
+            # Imported here so processes that only talk to the inference server skip onnxruntime
+            from insightface.app import FaceAnalysis
+
+            logger.info(f"🔹 Initializing Shared InsightFace Model: {FACE_MODEL_NAME}")
+            logger.info(f"   Detection Size: {FACE_DETECTION_SIZE}")
+            
+            self._app = FaceAnalysis(
+                name=FACE_MODEL_NAME,
+                providers=['CUDAExecutionProvider', 'CPUExecutionProvider']
+            )
+            
+            # Prepare with detection size
+            self._app.prepare(ctx_id=-1, det_size=FACE_DETECTION_SIZE)
+            
+            logger.info("✅ Shared InsightFace Model initialized successfully")
+            logger.info(f"   Model: {FACE_MODEL_NAME}")
+            logger.info(f"   Providers: {self._app.det_model.session.get_providers()}")
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize InsightFace model: {e}")
+            raise
+
+    def unload_model(self):
+        """Unload the model and free GPU memory"""
+        try:
+            if self._app is not None:
+                logger.info("🔹 Unloading InsightFace model and releasing GPU memory...")
+                
+                # Delete the model
+                del self._app
+                self._app = None
+                
+                # Force GPU cache cleanup
+                try:
+                    import torch
+                    if torch.cuda.is_available():
+                        torch.cuda.empty_cache()
+                        torch.cuda.synchronize()
+                        logger.info("✅ CUDA cache cleared")
+                except ImportError:
+                    pass
+                
+                # Force garbage collection
+                import gc
+                gc.collect()
+                
+                logger.info("✅ InsightFace model unloaded, GPU memory released")
+                self._initialized = False
+                
+        except Exception as e:
+            logger.error(f"❌ Error unloading model: {e}")
+            
+    def get_app(self):
+        """Get the FaceAnalysis app instance"""
+        if self._app is None:
+            raise RuntimeError("FaceAnalysis model not initialized")
+        return self._app
+
+    def is_ready(self):
+        """Check if model is ready"""
+        return self._app is not None
+
+    def get_faces_batch(self, images):
+        """
+        Same results as FaceAnalysis.get() per image, but the recognition model
+        runs once over the aligned crops of every face in the batch.
+        """
+        from insightface.app.common import Face
+        from insightface.utils import face_align
+
+        app = self.get_app()
+        recognition = app.models.get('recognition')
+        results, crops, crop_faces = [], [], []
+
+        for np_img in images:
+            bboxes, kpss = app.det_model.detect(np_img, max_num=0, metric='default')
+            faces = []
+            for i in range(bboxes.shape[0]):
+                face = Face(bbox=bboxes[i, 0:4], kps=kpss[i] if kpss is not None else None, det_score=bboxes[i, 4])
+                for taskname, model in app.models.items():
+                    if taskname in ('detection', 'recognition'):
+                        continue
+                    model.get(np_img, face)
+                if recognition is not None and face.kps is not None:
+                    crops.append(face_align.norm_crop(np_img, landmark=face.kps, image_size=recognition.input_size[0]))
+                    crop_faces.append(face)
+                faces.append(face)
+            results.append(faces)
+
+        if crops:
+            embeddings = recognition.get_feat(crops)
+            for face, embedding in zip(crop_faces, embeddings):
+                face.embedding = embedding.flatten()
+
+        return [[DetectedFace.from_insightface(face) for face in faces] for faces in results]
+
+
 # ============================================================================
 # GLOBAL INSTANCE AND HELPER FUNCTION
 # ============================================================================
@@ -355,18 +452,23 @@ def get_face_model():
     Get the global shared face model instance.
     
     Usage:
-        from face_model_shared import get_face_model
+        from core.FaceAuth.face_model_shared import get_face_model
         
         model = get_face_model()
         embedding = model.extract_embedding(image)
     
     Returns:
-        SharedFaceModel: The singleton instance
+        RemoteFaceModel when FACE_INFERENCE_MODE=remote (one model per host,
+        served by face_inference_service), otherwise the in-process SharedFaceModel
     """
     global _global_face_model
     
     if _global_face_model is None:
-        _global_face_model = SharedFaceModel()
+        from core.FaceAuth.face_inference_service import FACE_INFERENCE_CONFIG, RemoteFaceModel
+        if FACE_INFERENCE_CONFIG['MODE'] == 'remote':
+            _global_face_model = RemoteFaceModel()
+        else:
+            _global_face_model = SharedFaceModel()
     
     return _global_face_model
 
@@ -375,7 +477,7 @@ def unload_face_model():
     Unload the global face model and free GPU memory.
     
     Usage:
-        from face_model_shared import unload_face_model
+        from core.FaceAuth.face_model_shared import unload_face_model
         
         # After face detection/verification is done
         unload_face_model()
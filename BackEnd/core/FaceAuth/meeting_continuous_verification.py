@@ -47,7 +47,8 @@ from bson import ObjectId
 # YOUR PROJECT IMPORTS (Already in your project)
 # ============================================================================
 from core.FaceAuth.face_model_shared import get_face_model
-from core.UserDashBoard.face_embeddings import get_user_embeddings, base64_to_numpy
+from core.UserDashBoard.face_embeddings import base64_to_numpy
+from core.FaceAuth.unified_face_service import get_unified_face_service
 
 # ============================================================================
 # OPTIONAL: DATABASE IMPORTS (Add if available)
@@ -553,7 +554,11 @@ class MeetingContinuousVerifier:
         self.total_checks = 0
         self.successful_checks = 0
         self.failed_checks = 0
+        # Checks answered by the scene-change gate without running the model
+        self.skipped_checks = 0
         self.warning_history: List[Dict] = []
+        # Own gate entry: this verifier uses its own distance threshold
+        self.gate_key = f"{meeting_id}_{user_id}_continuous"
         
         # Timing
         self.last_check_time = None
@@ -587,26 +592,19 @@ class MeetingContinuousVerifier:
             f"{'='*80}\n"
         )
     
-    def _load_user_embeddings(self) -> Optional[List[Dict]]:
-        """Load user's stored embeddings from MongoDB"""
+    def _load_user_embeddings(self) -> Optional[Dict]:
+        """Load user's stored embeddings into the meeting's embedding matrix"""
         try:
-            user_embeddings = get_user_embeddings(self.user_id)
+            service = get_unified_face_service()
+            service.preload_meeting_embeddings(self.meeting_id, [self.user_id], refresh=True)
+            stacked = service.get_stacked_embeddings(self.user_id, self.meeting_id)
             
-            if not user_embeddings:
+            if not stacked or not stacked['embedding_ids']:
                 logger.warning(f"⚠️  No embeddings found for user {self.user_id}")
                 return None
             
-            embeddings_list = []
-            for emb_doc in user_embeddings:
-                if emb_doc.get('embedding'):
-                    embeddings_list.append({
-                        'embedding': np.array(emb_doc['embedding'], dtype=np.float32),
-                        'embedding_id': str(emb_doc['_id']),
-                        'det_score': emb_doc.get('det_score', 0.0)
-                    })
-            
-            logger.info(f"✅ Loaded {len(embeddings_list)} embeddings for user {self.user_id}")
-            return embeddings_list
+            logger.info(f"✅ Loaded {len(stacked['embedding_ids'])} embeddings for user {self.user_id}")
+            return stacked
             
         except Exception as e:
             logger.error(f"❌ Error loading embeddings: {e}")
@@ -737,15 +735,24 @@ class MeetingContinuousVerifier:
                 logger.warning(f"⚠️  Empty frame for user {self.user_id}")
                 return True, 1.0
             
+            # Reuse the last successful result while the scene is unchanged
+            scene_gate = get_unified_face_service().scene_gate
+            reused, scene = scene_gate.lookup(self.gate_key, frame)
+            if reused is not None:
+                self.skipped_checks += 1
+                return reused
+            
             # Extract embedding from live frame
             try:
-                live_embedding = self.face_model.extract_embedding(
+                face_info = self.face_model.extract_embedding(
                     frame,
-                    return_face_info=False
+                    return_face_info=True
                 )
+                live_embedding = face_info['embedding']
             except ValueError as e:
                 # No face detected
                 logger.warning(f"⚠️  No face detected for user {self.user_id}: {e}")
+                scene_gate.forget(self.gate_key)
                 return True, 1.0  # Skip frames without faces (don't penalize)
             except Exception as e:
                 logger.error(f"❌ Error extracting embedding: {e}")
@@ -759,29 +766,21 @@ class MeetingContinuousVerifier:
                 logger.warning(f"⚠️  Empty embedding for user {self.user_id}")
                 return True, 1.0
             
-            # Compare with all stored embeddings
+            # Compare with all stored embeddings (preloaded meeting matrix, no Mongo read)
             max_similarity = 0.0
             best_match_id = None
             
-            for stored_emb_data in self.stored_embeddings:
-                try:
-                    # Calculate cosine distance
-                    distance = self.face_model.compare_embeddings(
-                        live_embedding,
-                        stored_emb_data['embedding'],
-                        method='cosine'
-                    )
-                    
-                    # Convert distance to similarity
-                    similarity = 1 - distance
-                    
-                    if similarity > max_similarity:
-                        max_similarity = similarity
-                        best_match_id = stored_emb_data['embedding_id']
-                        
-                except Exception as e:
-                    logger.error(f"❌ Error comparing embeddings: {e}")
-                    continue
+            try:
+                match = get_unified_face_service().best_match(
+                    live_embedding,
+                    self.user_id,
+                    meeting_id=self.meeting_id,
+                    method='cosine'
+                )
+                if match:
+                    max_similarity, best_match_id, _ = match
+            except Exception as e:
+                logger.error(f"❌ Error comparing embeddings: {e}")
             
             # Determine if verified
             threshold = MeetingVerificationConfig.FACE_DISTANCE_THRESHOLD
@@ -851,6 +850,8 @@ class MeetingContinuousVerifier:
                             f"Similarity {max_similarity:.3f} below threshold {similarity_threshold:.3f}"
                         )
             
+            scene_gate.record(self.gate_key, frame, scene, face_info.get('bbox'), (is_verified, max_similarity))
+            
             return is_verified, max_similarity
             
         except Exception as e:
@@ -1000,6 +1001,8 @@ class MeetingContinuousVerifier:
                 await self.verification_task
             except asyncio.CancelledError:
                 pass
+        
+        get_unified_face_service().scene_gate.forget(self.gate_key)
     
     def get_stats(self) -> Dict:
         """Get detailed statistics"""
@@ -1036,6 +1039,7 @@ class MeetingContinuousVerifier:
             'total_checks': self.total_checks,
             'successful_checks': self.successful_checks,
             'failed_checks': self.failed_checks,
+            'skipped_checks': self.skipped_checks,
             'success_rate': (
                 f"{(self.successful_checks/self.total_checks*100):.1f}%"
                 if self.total_checks > 0 else "N/A"
@@ -1216,6 +1220,7 @@ def host_allow_blocked_user(meeting_id: str, user_id: int) -> bool:
 def end_meeting_session(meeting_id: str):
     """End a meeting session and clear all blocks"""
     clear_session_blocks(meeting_id)
+    get_unified_face_service().release_meeting_embeddings(meeting_id)
     logger.info(f"✅ Meeting session ended for {meeting_id}")
 
 def get_meeting_verification_summary(meeting_id: str) -> Dict:
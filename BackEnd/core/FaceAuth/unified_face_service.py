@@ -25,7 +25,8 @@ USAGE:
     from core.FaceAuth.unified_face_service import get_unified_face_service
     
     service = get_unified_face_service()
-    is_verified, similarity = await service.verify_face(frame, user_id)
+    is_verified, similarity = service.verify_face_sync(frame, user_id)   # sync code
+    is_verified, similarity = await service.verify_face(frame, user_id)  # async code
 """
 
 # ============================================================================
@@ -34,6 +35,8 @@ USAGE:
 import logging
 import asyncio
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Dict, Optional, List, Tuple, Any
 from threading import Lock
 from datetime import datetime, timedelta
@@ -55,7 +58,7 @@ except ImportError:
     logging.warning("face_model_shared not available")
 
 try:
-    from core.UserDashBoard.face_embeddings import get_user_embeddings, base64_to_numpy
+    from core.UserDashBoard.face_embeddings import get_user_embeddings, get_users_embeddings, base64_to_numpy
     USER_EMBEDDINGS_AVAILABLE = True
 except ImportError:
     USER_EMBEDDINGS_AVAILABLE = False
@@ -91,12 +94,26 @@ class UnifiedFaceServiceConfig:
     EMBEDDING_CACHE_MAX_AGE = 300  # Seconds - 5 minutes
     MAX_CACHED_FRAMES = 100        # Maximum frames in cache
     MAX_CACHED_EMBEDDINGS = 50     # Maximum user embeddings in cache
+    # Meeting embedding matrices are released when the meeting ends; this only
+    # reclaims meetings that never reported their end
+    MEETING_INDEX_MAX_IDLE = 6 * 3600  # Seconds
     
     # Performance
+    VERIFICATION_WORKERS = 4       # Shared executor threads behind the async verify_face()
     ENABLE_FRAME_CACHE = True
     ENABLE_EMBEDDING_CACHE = True
     AUTO_CLEANUP_INTERVAL = 60     # Seconds - cleanup old cache entries
     
+    # Scene-change gate: reuse the last successful verification while the frame
+    # (and the face box inside it) has not changed
+    ENABLE_SCENE_GATE = True
+    SCENE_THUMB_SIZE = 32          # Frames are compared as NxN grayscale block means
+    SCENE_DIFF_THRESHOLD = 4.0     # Mean abs gray difference (0-255) of the whole frame
+    FACE_DIFF_THRESHOLD = 6.0      # Mean abs gray difference (0-255) inside the face box
+    SCENE_MAX_CONSECUTIVE_SKIPS = 10  # Forced recheck after this many reused results
+    SCENE_MAX_REUSE_AGE = 30.0     # Seconds - forced recheck after this long
+    SCENE_GATE_MAX_ENTRIES = 1000  # Tracked (meeting, user) pairs
+    
     # Comparison methods
     COMPARISON_METHOD = 'cosine'   # 'cosine' or 'euclidean'
     
@@ -346,6 +363,246 @@ class EmbeddingCache:
                 'oldest_cache_age': max(ages) if ages else 0,
             }
 
+# ============================================================================
+# MEETING EMBEDDING INDEX
+# ============================================================================
+
+def stack_embeddings(embeddings: List[Dict]) -> Dict[str, Any]:
+    """
+    Stack embedding dicts into an L2-normalized float32 matrix.
+    Returns {'matrix', 'norms', 'embedding_ids'}; zero vectors are dropped.
+    """
+    vectors = [np.asarray(item['embedding'], dtype=np.float32).ravel() for item in embeddings]
+    embedding_ids = [item['embedding_id'] for item in embeddings]
+    if not vectors:
+        return {'matrix': np.zeros((0, 0), dtype=np.float32), 'norms': np.zeros(0, dtype=np.float32), 'embedding_ids': []}
+
+    matrix = np.vstack(vectors)
+    norms = np.linalg.norm(matrix, axis=1)
+    keep = norms > 0
+    matrix = matrix[keep] / norms[keep, None]
+    return {
+        'matrix': np.ascontiguousarray(matrix, dtype=np.float32),
+        'norms': norms[keep].astype(np.float32),
+        'embedding_ids': [embedding_id for embedding_id, kept in zip(embedding_ids, keep) if kept],
+    }
+
+
+class MeetingEmbeddingIndex:
+    """
+    Every participant's stored embeddings for a meeting in one contiguous,
+    normalized matrix, with a row slice per user. Entries live until the
+    meeting is released (not for a TTL), so verifications never hit Mongo.
+    Rebuilt copy-on-write under the lock; readers use the current snapshot.
+    """
+    
+    def __init__(self, max_idle: float = 6 * 3600):
+        self.meetings: Dict[str, Dict[str, Any]] = {}
+        self.max_idle = max_idle
+        self._lock = Lock()
+    
+    def has_user(self, meeting_id: str, user_id: int) -> bool:
+        entry = self.meetings.get(str(meeting_id))
+        return entry is not None and int(user_id) in entry['slices']
+    
+    def add_users(self, meeting_id: str, embeddings_by_user: Dict[int, Dict[str, Any]]):
+        """Add/replace users' stacked embeddings and rebuild the meeting matrix"""
+        meeting_id = str(meeting_id)
+        with self._lock:
+            self._evict_idle()
+            previous = self.meetings.get(meeting_id)
+            users = dict(previous['users']) if previous else {}
+            users.update({int(user_id): stacked for user_id, stacked in embeddings_by_user.items()})
+            self.meetings[meeting_id] = self._build(users)
+    
+    def _build(self, users: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+        slices, blocks, norms, embedding_ids = {}, [], [], []
+        row = 0
+        for user_id, stacked in users.items():
+            count = len(stacked['embedding_ids'])
+            slices[user_id] = (row, row + count)
+            row += count
+            if count:
+                blocks.append(stacked['matrix'])
+                norms.append(stacked['norms'])
+                embedding_ids.extend(stacked['embedding_ids'])
+        return {
+            'users': users,
+            'matrix': np.ascontiguousarray(np.vstack(blocks)) if blocks else np.zeros((0, 0), dtype=np.float32),
+            'norms': np.concatenate(norms) if norms else np.zeros(0, dtype=np.float32),
+            'embedding_ids': embedding_ids,
+            'slices': slices,
+            'last_access': time.time(),
+        }
+    
+    def get(self, meeting_id: str, user_id: int) -> Optional[Dict[str, Any]]:
+        """A user's rows as {'matrix', 'norms', 'embedding_ids'} views, or None if not loaded"""
+        entry = self.meetings.get(str(meeting_id))
+        if entry is None or int(user_id) not in entry['slices']:
+            return None
+        entry['last_access'] = time.time()
+        start, end = entry['slices'][int(user_id)]
+        return {
+            'matrix': entry['matrix'][start:end],
+            'norms': entry['norms'][start:end],
+            'embedding_ids': entry['embedding_ids'][start:end],
+        }
+    
+    def drop_user(self, user_id: int):
+        """Forget a user in every meeting (e.g. after re-registration)"""
+        with self._lock:
+            for meeting_id, entry in list(self.meetings.items()):
+                if int(user_id) in entry['users']:
+                    users = {uid: stacked for uid, stacked in entry['users'].items() if uid != int(user_id)}
+                    self.meetings[meeting_id] = self._build(users)
+    
+    def release(self, meeting_id: str) -> bool:
+        with self._lock:
+            return self.meetings.pop(str(meeting_id), None) is not None
+    
+    def clear_all(self):
+        with self._lock:
+            self.meetings.clear()
+    
+    def _evict_idle(self):
+        cutoff = time.time() - self.max_idle
+        for meeting_id in [m for m, entry in self.meetings.items() if entry['last_access'] < cutoff]:
+            del self.meetings[meeting_id]
+            logger.info(f"🧹 Released idle embedding index for meeting {meeting_id}")
+    
+    def get_stats(self) -> Dict:
+        meetings = list(self.meetings.values())
+        return {
+            'meetings': len(meetings),
+            'users': sum(len(entry['slices']) for entry in meetings),
+            'embeddings': sum(len(entry['embedding_ids']) for entry in meetings),
+            'memory_bytes': sum(entry['matrix'].nbytes for entry in meetings),
+        }
+
+# ============================================================================
+# SCENE-CHANGE GATE
+# ============================================================================
+
+def frame_thumbnail(frame: np.ndarray, size: int) -> Optional[np.ndarray]:
+    """Grayscale size x size block-mean thumbnail (float32), or None if the frame is too small"""
+    # Sample every step-th pixel first, keeping about 4x4 samples per block
+    step = max(1, min(frame.shape[0], frame.shape[1]) // (size * 4))
+    frame = frame[::step, ::step]
+    if frame.ndim == 3:
+        gray = frame[..., :3].mean(axis=2, dtype=np.float32)
+    else:
+        gray = frame.astype(np.float32)
+    height, width = gray.shape[:2]
+    block_h, block_w = height // size, width // size
+    if block_h == 0 or block_w == 0:
+        return None
+    gray = gray[:block_h * size, :block_w * size]
+    return gray.reshape(size, block_h, size, block_w).mean(axis=(1, 3))
+
+
+class SceneChangeGate:
+    """
+    Skips face verification while the camera image is stable.
+    After a successful verification the frame's thumbnail and face-box
+    thumbnail are kept; later frames whose scene and face region differ by
+    less than the thresholds reuse that result, up to a skip/age ceiling.
+    Failed checks are never reused, so warnings always come from the model.
+    """
+    
+    def __init__(self, thumb_size: int = 32, scene_threshold: float = 4.0,
+                 face_threshold: float = 6.0, max_skips: int = 10,
+                 max_age: float = 30.0, max_size: int = 1000):
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.thumb_size = thumb_size
+        self.scene_threshold = scene_threshold
+        self.face_threshold = face_threshold
+        self.max_skips = max_skips
+        self.max_age = max_age
+        self.max_size = max_size
+        self._lock = Lock()
+        self._stats = {'checks': 0, 'skipped': 0, 'scene_changes': 0, 'forced_rechecks': 0}
+    
+    def _face_thumbnail(self, frame: np.ndarray, bbox) -> Optional[np.ndarray]:
+        height, width = frame.shape[:2]
+        x1, y1, x2, y2 = [int(round(v)) for v in bbox]
+        x1, y1 = max(0, x1), max(0, y1)
+        x2, y2 = min(width, x2), min(height, y2)
+        if x2 <= x1 or y2 <= y1:
+            return None
+        return frame_thumbnail(frame[y1:y2, x1:x2], self.thumb_size // 2)
+    
+    def lookup(self, key: str, frame: np.ndarray) -> Tuple[Optional[Tuple[bool, float]], Optional[np.ndarray]]:
+        """
+        (reused_result, scene_thumbnail). reused_result is None when the model must run;
+        pass the thumbnail back to record() to avoid computing it twice.
+        """
+        scene = frame_thumbnail(frame, self.thumb_size)
+        with self._lock:
+            self._stats['checks'] += 1
+            entry = self.entries.get(key)
+            if entry is None or scene is None or entry['scene'].shape != scene.shape:
+                return None, scene
+            
+            if entry['skips'] >= self.max_skips or time.time() - entry['verified_at'] > self.max_age:
+                self._stats['forced_rechecks'] += 1
+                return None, scene
+            
+            if float(np.abs(scene - entry['scene']).mean()) > self.scene_threshold:
+                self._stats['scene_changes'] += 1
+                return None, scene
+            
+            face = self._face_thumbnail(frame, entry['bbox'])
+            if face is None or face.shape != entry['face'].shape or \
+                    float(np.abs(face - entry['face']).mean()) > self.face_threshold:
+                self._stats['scene_changes'] += 1
+                return None, scene
+            
+            entry['skips'] += 1
+            self._stats['skipped'] += 1
+            return entry['result'], scene
+    
+    def record(self, key: str, frame: np.ndarray, scene: Optional[np.ndarray], bbox, result: Tuple[bool, float]):
+        """Remember a model result; only verified results with a face box can be reused"""
+        with self._lock:
+            face = self._face_thumbnail(frame, bbox) if bbox is not None else None
+            if not result[0] or scene is None or face is None:
+                self.entries.pop(key, None)
+                return
+            if key not in self.entries and len(self.entries) >= self.max_size:
+                oldest = min(self.entries, key=lambda k: self.entries[k]['verified_at'])
+                del self.entries[oldest]
+            self.entries[key] = {
+                'scene': scene,
+                'face': face,
+                'bbox': list(bbox),
+                'result': result,
+                'verified_at': time.time(),
+                'skips': 0,
+            }
+    
+    def forget(self, key: str):
+        with self._lock:
+            self.entries.pop(key, None)
+    
+    def release_meeting(self, meeting_id: str):
+        prefix = f"{meeting_id}_"
+        with self._lock:
+            for key in [k for k in self.entries if k.startswith(prefix)]:
+                del self.entries[key]
+    
+    def clear_all(self):
+        with self._lock:
+            self.entries.clear()
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            checks = self._stats['checks']
+            return {
+                **self._stats,
+                'tracked': len(self.entries),
+                'skip_rate': f"{(self._stats['skipped'] / checks * 100) if checks else 0:.1f}%",
+            }
+
 # ============================================================================
 # MAIN UNIFIED FACE SERVICE
 # ============================================================================
@@ -378,6 +635,17 @@ class UnifiedFaceService:
             max_age=UnifiedFaceServiceConfig.EMBEDDING_CACHE_MAX_AGE,
             max_size=UnifiedFaceServiceConfig.MAX_CACHED_EMBEDDINGS
         )
+        self.meeting_index = MeetingEmbeddingIndex(
+            max_idle=UnifiedFaceServiceConfig.MEETING_INDEX_MAX_IDLE
+        )
+        self.scene_gate = SceneChangeGate(
+            thumb_size=UnifiedFaceServiceConfig.SCENE_THUMB_SIZE,
+            scene_threshold=UnifiedFaceServiceConfig.SCENE_DIFF_THRESHOLD,
+            face_threshold=UnifiedFaceServiceConfig.FACE_DIFF_THRESHOLD,
+            max_skips=UnifiedFaceServiceConfig.SCENE_MAX_CONSECUTIVE_SKIPS,
+            max_age=UnifiedFaceServiceConfig.SCENE_MAX_REUSE_AGE,
+            max_size=UnifiedFaceServiceConfig.SCENE_GATE_MAX_ENTRIES
+        )
         self._model_lock = Lock()
         self._stats = {
             'total_verifications': 0,
@@ -492,14 +760,7 @@ class UnifiedFaceService:
                 return None
             
             # Convert to standard format
-            embeddings_list = []
-            for emb_doc in user_embeddings:
-                if emb_doc.get('embedding'):
-                    embeddings_list.append({
-                        'embedding': np.array(emb_doc['embedding'], dtype=np.float32),
-                        'embedding_id': str(emb_doc['_id']),
-                        'det_score': emb_doc.get('det_score', 0.0)
-                    })
+            embeddings_list = self._to_embedding_list(user_embeddings)
             
             # Store in cache
             if UnifiedFaceServiceConfig.ENABLE_EMBEDDING_CACHE and embeddings_list:
@@ -512,33 +773,175 @@ class UnifiedFaceService:
             logger.error(f"❌ Error loading embeddings for user {user_id}: {e}")
             return None
     
+    @staticmethod
+    def _to_embedding_list(embedding_docs: List[Dict]) -> List[Dict]:
+        """Mongo embedding documents -> [{'embedding', 'embedding_id', 'det_score'}]"""
+        embeddings_list = []
+        for emb_doc in embedding_docs:
+            if emb_doc.get('embedding'):
+                embeddings_list.append({
+                    'embedding': np.array(emb_doc['embedding'], dtype=np.float32),
+                    'embedding_id': str(emb_doc['_id']),
+                    'det_score': emb_doc.get('det_score', 0.0)
+                })
+        return embeddings_list
+    
     def clear_user_embeddings(self, user_id: int):
         """Clear cached embeddings for a user"""
         self.embedding_cache.clear(user_id)
+        self.meeting_index.drop_user(user_id)
+    
+    def preload_meeting_embeddings(self, meeting_id: str, user_ids: List[int], refresh: bool = False) -> int:
+        """
+        Load participants' embeddings into the meeting's matrix with one Mongo query.
+        Users already loaded are skipped unless refresh=True (e.g. on rejoin).
+        Returns the number of users loaded.
+        """
+        if not USER_EMBEDDINGS_AVAILABLE or not meeting_id:
+            return 0
+        
+        wanted = []
+        for user_id in user_ids:
+            try:
+                wanted.append(int(user_id))
+            except (TypeError, ValueError):
+                logger.warning(f"⚠️  Skipping non-numeric user id {user_id!r} for meeting {meeting_id}")
+        if not refresh:
+            wanted = [user_id for user_id in wanted if not self.meeting_index.has_user(meeting_id, user_id)]
+        if not wanted:
+            return 0
+        
+        try:
+            docs_by_user = get_users_embeddings(wanted)
+        except Exception as e:
+            logger.error(f"❌ Error preloading embeddings for meeting {meeting_id}: {e}")
+            return 0
+        
+        self.meeting_index.add_users(meeting_id, {
+            user_id: stack_embeddings(self._to_embedding_list(docs_by_user.get(user_id, [])))
+            for user_id in wanted
+        })
+        logger.info(f"✅ Preloaded embeddings of {len(wanted)} user(s) for meeting {meeting_id}")
+        return len(wanted)
+    
+    def release_meeting_embeddings(self, meeting_id: str):
+        """Drop a meeting's embedding matrix (call when the meeting ends)"""
+        self.scene_gate.release_meeting(meeting_id)
+        if self.meeting_index.release(meeting_id):
+            logger.info(f"🧹 Released embedding index for meeting {meeting_id}")
+    
+    def get_stacked_embeddings(self, user_id: int, meeting_id: str = None) -> Optional[Dict[str, Any]]:
+        """
+        A user's stored embeddings as a normalized matrix: from the meeting index
+        when the user is loaded there, otherwise from the per-user cache / Mongo.
+        """
+        if meeting_id:
+            stacked = self.meeting_index.get(meeting_id, user_id)
+            # An empty block may only mean Mongo was unreachable at preload time
+            if stacked is not None and stacked['embedding_ids']:
+                self._stats['embedding_cache_hits'] += 1
+                return stacked
+        
+        embeddings = self.get_user_embeddings(user_id)
+        if not embeddings:
+            return None
+        return stack_embeddings(embeddings)
+    
+    @staticmethod
+    def similarities(live_embedding: np.ndarray, stacked: Dict[str, Any], method: str = 'cosine') -> np.ndarray:
+        """Similarity (1 - distance) of a live embedding to every stored row, in one pass"""
+        live = np.asarray(live_embedding, dtype=np.float32).ravel()
+        matrix = stacked['matrix']
+        if matrix.shape[0] == 0:
+            return np.zeros(0, dtype=np.float32)
+        if live.shape[0] != matrix.shape[1]:
+            raise ValueError(f"Embedding dimension mismatch: {live.shape[0]} vs {matrix.shape[1]}")
+        
+        if method == 'euclidean':
+            raw = matrix * stacked['norms'][:, None]
+            return 1 - np.linalg.norm(raw - live[None, :], axis=1)
+        
+        live_norm = np.linalg.norm(live)
+        if live_norm == 0:
+            return np.zeros(matrix.shape[0], dtype=np.float32)
+        return matrix @ (live / live_norm)
+    
+    def best_match(self, live_embedding, user_id: int, meeting_id: str = None, method: str = 'cosine'):
+        """
+        Best stored match for a live embedding -> (max_similarity, best_match_id, similarities),
+        or None when the user has no stored embeddings. Similarities below 0 count as 0.
+        """
+        stacked = self.get_stacked_embeddings(user_id, meeting_id)
+        if not stacked or not stacked['embedding_ids']:
+            return None
+        
+        similarities = self.similarities(live_embedding, stacked, method)
+        best = int(np.argmax(similarities))
+        if similarities[best] > 0:
+            return float(similarities[best]), stacked['embedding_ids'][best], similarities
+        return 0.0, None, similarities
     
     async def verify_face(
         self,
         frame,
         user_id: int,
         threshold: float = None,
-        method: str = None
+        method: str = None,
+        meeting_id: str = None
+    ) -> Tuple[bool, float]:
+        """
+        Async wrapper around verify_face_sync() for event-loop callers.
+        The CPU-bound work runs on the shared verification executor.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_verification_executor(),
+            partial(self.verify_face_sync, frame, user_id, threshold, method, meeting_id)
+        )
+    
+    def verify_face_sync(
+        self,
+        frame,
+        user_id: int,
+        threshold: float = None,
+        method: str = None,
+        meeting_id: str = None
     ) -> Tuple[bool, float]:
         """
         Verify face in frame against stored embeddings
         
         This is the MAIN verification function used by both:
-        - AI Attendance system
-        - Meeting Continuous Verification
+        - AI Attendance system (called directly, no event loop)
+        - Meeting Continuous Verification (through verify_face)
         
         Args:
             frame: Frame data (numpy array or base64 string)
             user_id: User to verify against
             threshold: Distance threshold (default: from config)
             method: Comparison method ('cosine' or 'euclidean')
+            meeting_id: Compare against the meeting's preloaded matrix when given;
+                also enables the scene-change gate for this (meeting, user)
         
         Returns:
             Tuple[bool, float]: (is_verified, similarity_score)
         """
+        if isinstance(frame, str):
+            try:
+                frame = base64_to_numpy(frame)
+            except Exception as e:
+                logger.warning(f"⚠️  Could not decode frame: {e}")
+                frame = None
+        
+        gate_key, scene = None, None
+        if meeting_id and UnifiedFaceServiceConfig.ENABLE_SCENE_GATE \
+                and isinstance(frame, np.ndarray) and frame.size > 0:
+            gate_key = f"{meeting_id}_{user_id}"
+            reused, scene = self.scene_gate.lookup(gate_key, frame)
+            if reused is not None:
+                if UnifiedFaceServiceConfig.LOG_CACHE_HITS:
+                    logger.debug(f"Scene unchanged for {gate_key}, reusing verification result")
+                return reused
+        
         self._stats['total_verifications'] += 1
         
         if threshold is None:
@@ -548,10 +951,6 @@ class UnifiedFaceService:
             method = UnifiedFaceServiceConfig.COMPARISON_METHOD
         
         try:
-            # Convert frame if needed
-            if isinstance(frame, str):
-                frame = base64_to_numpy(frame)
-            
             if frame is None or not isinstance(frame, np.ndarray):
                 logger.warning("⚠️  Invalid frame format")
                 return True, 1.0  # Skip invalid frames
@@ -569,13 +968,16 @@ class UnifiedFaceService:
             # Extract embedding from live frame
             try:
                 with self._model_lock:
-                    live_embedding = self.face_model.extract_embedding(
+                    face_info = self.face_model.extract_embedding(
                         frame,
-                        return_face_info=False
+                        return_face_info=True
                     )
+                live_embedding = face_info['embedding']
             except ValueError as e:
                 # No face detected - not an error, just skip
                 logger.debug(f"No face detected: {e}")
+                if gate_key:
+                    self.scene_gate.forget(gate_key)
                 return True, 1.0
             except Exception as e:
                 logger.error(f"Error extracting embedding: {e}")
@@ -589,38 +991,20 @@ class UnifiedFaceService:
                 logger.warning("⚠️  Empty embedding extracted")
                 return True, 1.0
             
-            # Get stored embeddings
-            stored_embeddings = self.get_user_embeddings(user_id)
-            if not stored_embeddings:
+            # Compare with all stored embeddings (one matrix-vector product)
+            try:
+                match = self.best_match(live_embedding, user_id, meeting_id, method)
+            except ValueError as e:
+                logger.error(f"Error comparing embeddings: {e}")
+                match = (0.0, None, np.zeros(0, dtype=np.float32))
+            if match is None:
                 logger.warning(f"⚠️  No stored embeddings for user {user_id}")
                 self._stats['errors'] += 1
                 return False, 0.0
             
-            # Compare with all stored embeddings
-            max_similarity = 0.0
-            best_match_id = None
-            all_similarities = []
-            
-            for stored_emb_data in stored_embeddings:
-                try:
-                    with self._model_lock:
-                        distance = self.face_model.compare_embeddings(
-                            live_embedding,
-                            stored_emb_data['embedding'],
-                            method=method
-                        )
-                    
-                    # Convert distance to similarity
-                    similarity = 1 - distance
-                    all_similarities.append(similarity)
-                    
-                    if similarity > max_similarity:
-                        max_similarity = similarity
-                        best_match_id = stored_emb_data['embedding_id']
-                        
-                except Exception as e:
-                    logger.error(f"Error comparing embeddings: {e}")
-                    continue
+            max_similarity, best_match_id, similarities = match
+            all_similarities = similarities.tolist()
+            stored_count = len(all_similarities)
             
             # Determine if verified
             similarity_threshold = 1 - threshold
@@ -649,7 +1033,7 @@ class UnifiedFaceService:
                         f"Threshold: {similarity_threshold:.3f}\n"
                         f"Best Match Embedding ID: {best_match_id}\n"
                         f"Comparison Method: {method}\n"
-                        f"Total Stored Embeddings: {len(stored_embeddings)}\n"
+                        f"Total Stored Embeddings: {stored_count}\n"
                         f"Result: AUTHORIZED PERSON VERIFIED\n"
                         f"Status: Face matches registered user\n"
                         f"Cache Stats:\n"
@@ -677,7 +1061,7 @@ class UnifiedFaceService:
                         f"Difference: {(similarity_threshold - max_similarity):.3f}\n"
                         f"Best Match Embedding ID: {best_match_id}\n"
                         f"Comparison Method: {method}\n"
-                        f"Total Stored Embeddings Checked: {len(stored_embeddings)}\n"
+                        f"Total Stored Embeddings Checked: {stored_count}\n"
                         f"Result: UNAUTHORIZED PERSON\n"
                         f"Status: Face does NOT match any stored embedding\n"
                         f"Verdict: Someone else is using this account\n"
@@ -701,7 +1085,7 @@ class UnifiedFaceService:
                             f"DETAILED ANALYSIS:\n"
                             f"{'='*75}\n"
                             f"  ❌ The person's face embedding does not match user {user_id}\n"
-                            f"  ❌ All {len(stored_embeddings)} stored embeddings were checked\n"
+                            f"  ❌ All {stored_count} stored embeddings were checked\n"
                             f"  ❌ Best similarity: {max_similarity:.3f}\n"
                             f"  ❌ Average similarity: {avg_similarity:.3f}\n"
                             f"  ❌ Minimum similarity: {min_similarity:.3f}\n"
@@ -733,6 +1117,9 @@ class UnifiedFaceService:
                         f"Detection #{self._stats['unknown_person_detections']}"
                     )
             
+            if gate_key:
+                self.scene_gate.record(gate_key, frame, scene, face_info.get('bbox'), (is_verified, max_similarity))
+            
             return is_verified, max_similarity
             
         except Exception as e:
@@ -751,6 +1138,7 @@ class UnifiedFaceService:
             user_id: User identifier
         """
         self.clear_frame(meeting_id, user_id)
+        self.scene_gate.forget(f"{meeting_id}_{user_id}")
         # Don't clear embeddings - they can be reused
         logger.info(f"🧹 Cleaned up session for user {user_id}")
     
@@ -758,6 +1146,8 @@ class UnifiedFaceService:
         """Cleanup all cached data"""
         self.frame_cache.clear_all()
         self.embedding_cache.clear_all()
+        self.meeting_index.clear_all()
+        self.scene_gate.clear_all()
         logger.info("🧹 Cleaned up all cached data")
     
     def get_stats(self) -> Dict:
@@ -810,7 +1200,9 @@ class UnifiedFaceService:
                 'cache_hit_rate': f"{embedding_cache_rate:.1f}%",
                 'total_hits': self._stats['embedding_cache_hits'],
                 'total_misses': self._stats['embedding_cache_misses'],
-            }
+            },
+            'meeting_index': self.meeting_index.get_stats(),
+            'scene_gate': self.scene_gate.get_stats()
         }
     
     def reset_stats(self):
@@ -859,6 +1251,21 @@ class UnifiedFaceService:
 
 _unified_service_instance = None
 _instance_lock = Lock()
+_verification_executor = None
+
+def get_verification_executor() -> ThreadPoolExecutor:
+    """Process-wide executor for async verifications (created on first use)"""
+    global _verification_executor
+    
+    if _verification_executor is None:
+        with _instance_lock:
+            if _verification_executor is None:
+                _verification_executor = ThreadPoolExecutor(
+                    max_workers=UnifiedFaceServiceConfig.VERIFICATION_WORKERS,
+                    thread_name_prefix="face-verify"
+                )
+    
+    return _verification_executor
 
 def get_unified_face_service() -> UnifiedFaceService:
     """
@@ -0,0 +1,230 @@
+# verification_log_writer.py
+
+"""
+Buffered MongoDB writer for face verification logs and session updates
+======================================================================
+Verification requests hand their log documents and session-document updates to
+a background thread instead of waiting on Mongo:
+
+- logs are written with insert_many in batches (bounded queue; when it is full
+  the caller writes inline, so nothing is dropped)
+- session updates are coalesced per session: $set fields merge (last write
+  wins), $inc amounts add up and $push entries are concatenated, giving one
+  update per session per flush
+- everything pending is flushed at interpreter exit
+
+A session's pending updates are flushed before any synchronous write to the
+same document (flush_session) so write order is preserved, and readers in this
+process see pending $set fields through overlay().
+"""
+
+import os
+import queue
+import atexit
+import logging
+import threading
+import time
+
+from pymongo import UpdateOne
+from bson import ObjectId
+
+logger = logging.getLogger("verification_log_writer")
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+VERIFICATION_LOG_WRITER_CONFIG = {
+    # False: every write goes straight to Mongo (previous behaviour)
+    'ENABLED': os.getenv("VERIFICATION_LOG_WRITER_ENABLED", "True") == "True",
+    'BATCH_SIZE': int(os.getenv("VERIFICATION_LOG_BATCH_SIZE", "200")),
+    'MAX_QUEUE_SIZE': int(os.getenv("VERIFICATION_LOG_MAX_QUEUE_SIZE", "10000")),
+    # Seconds between flushes; also bounds how stale session documents can be
+    'FLUSH_INTERVAL': float(os.getenv("VERIFICATION_LOG_FLUSH_INTERVAL", "0.5")),
+}
+
+
+class BufferedVerificationWriter:
+    """Background insert_many / coalesced update_one writer for one Mongo database"""
+
+    def __init__(self, db, logs_collection, sessions_collection):
+        self.db = db
+        self.logs_collection = logs_collection
+        self.sessions_collection = sessions_collection
+        self.enabled = VERIFICATION_LOG_WRITER_CONFIG['ENABLED']
+        self._logs = queue.Queue(maxsize=VERIFICATION_LOG_WRITER_CONFIG['MAX_QUEUE_SIZE'])
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+        # Held from taking session updates until they are written, so a background
+        # batch can never land after a later flush_session() write
+        self._session_write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self.stats = {
+            'logs_queued': 0, 'logs_written': 0, 'logs_written_inline': 0,
+            'session_updates_queued': 0, 'session_writes': 0, 'flushes': 0, 'errors': 0,
+        }
+        atexit.register(self.flush)
+
+    # ------------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------------
+    def add_log(self, log_entry):
+        """Queue a verification log document"""
+        if not self.enabled:
+            self.db[self.logs_collection].insert_one(log_entry)
+            return
+        self._ensure_thread()
+        try:
+            self._logs.put_nowait(log_entry)
+            self.stats['logs_queued'] += 1
+        except queue.Full:
+            # Back-pressure: write inline rather than dropping the log
+            self.db[self.logs_collection].insert_one(log_entry)
+            self.stats['logs_written_inline'] += 1
+        if self._logs.qsize() >= VERIFICATION_LOG_WRITER_CONFIG['BATCH_SIZE']:
+            self._wakeup.set()
+
+    def update_session(self, session_id, set_fields=None, inc=None, push=None, push_slice=None):
+        """
+        Queue an update of a session document.
+        push maps field -> list of entries; push_slice maps field -> $slice for that field.
+        """
+        if not self.enabled:
+            update = self._build_update(self._new_pending(set_fields, inc, push, push_slice))
+            self.db[self.sessions_collection].update_one({"_id": ObjectId(session_id)}, update)
+            return
+        self._ensure_thread()
+        with self._sessions_lock:
+            pending = self._sessions.get(str(session_id))
+            if pending is None:
+                self._sessions[str(session_id)] = self._new_pending(set_fields, inc, push, push_slice)
+            else:
+                pending['$set'].update(set_fields or {})
+                for field, amount in (inc or {}).items():
+                    pending['$inc'][field] = pending['$inc'].get(field, 0) + amount
+                for field, entries in (push or {}).items():
+                    pending['$push'].setdefault(field, []).extend(entries)
+                pending['slice'].update(push_slice or {})
+            self.stats['session_updates_queued'] += 1
+
+    @staticmethod
+    def _new_pending(set_fields, inc, push, push_slice):
+        return {
+            '$set': dict(set_fields or {}),
+            '$inc': dict(inc or {}),
+            '$push': {field: list(entries) for field, entries in (push or {}).items()},
+            'slice': dict(push_slice or {}),
+        }
+
+    @staticmethod
+    def _build_update(pending):
+        update = {}
+        if pending['$set']:
+            update['$set'] = pending['$set']
+        if pending['$inc']:
+            update['$inc'] = pending['$inc']
+        if pending['$push']:
+            update['$push'] = {}
+            for field, entries in pending['$push'].items():
+                spec = {'$each': entries}
+                if field in pending['slice']:
+                    spec['$slice'] = pending['slice'][field]
+                update['$push'][field] = spec
+        return update
+
+    # ------------------------------------------------------------------
+    # Readers
+    # ------------------------------------------------------------------
+    def overlay(self, session_doc):
+        """Apply this process's pending $set fields to a session document just read"""
+        if session_doc is None:
+            return None
+        with self._sessions_lock:
+            pending = self._sessions.get(str(session_doc.get('_id')))
+            if pending:
+                session_doc.update(pending['$set'])
+        return session_doc
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+    def flush_session(self, session_id):
+        """Write one session's pending update now (call before a direct write to it)"""
+        with self._session_write_lock:
+            with self._sessions_lock:
+                pending = self._sessions.pop(str(session_id), None)
+            if pending:
+                self._write_sessions({str(session_id): pending})
+
+    def flush(self):
+        """Write everything pending; safe to call from any thread"""
+        while True:
+            batch = []
+            try:
+                while len(batch) < VERIFICATION_LOG_WRITER_CONFIG['BATCH_SIZE']:
+                    batch.append(self._logs.get_nowait())
+            except queue.Empty:
+                pass
+            if batch:
+                self._write_logs(batch)
+            if len(batch) < VERIFICATION_LOG_WRITER_CONFIG['BATCH_SIZE']:
+                break
+
+        with self._session_write_lock:
+            with self._sessions_lock:
+                sessions, self._sessions = self._sessions, {}
+            if sessions:
+                self._write_sessions(sessions)
+        self.stats['flushes'] += 1
+
+    def _write_logs(self, batch):
+        try:
+            self.db[self.logs_collection].insert_many(batch, ordered=False)
+            self.stats['logs_written'] += len(batch)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"❌ Failed to write {len(batch)} verification logs: {e}")
+
+    def _write_sessions(self, sessions):
+        operations = [
+            UpdateOne({"_id": ObjectId(session_id)}, self._build_update(pending))
+            for session_id, pending in sessions.items()
+        ]
+        try:
+            self.db[self.sessions_collection].bulk_write(operations, ordered=False)
+            self.stats['session_writes'] += len(operations)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"❌ Failed to write {len(operations)} session updates: {e}")
+
+    def _ensure_thread(self):
+        # Restart after fork: the parent's thread does not exist in the child
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="verification-log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(VERIFICATION_LOG_WRITER_CONFIG['FLUSH_INTERVAL'])
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"❌ Verification writer flush failed: {e}")
+                time.sleep(VERIFICATION_LOG_WRITER_CONFIG['FLUSH_INTERVAL'])
+
+    def get_stats(self):
+        with self._sessions_lock:
+            pending_sessions = len(self._sessions)
+        return {
+            **self.stats,
+            'enabled': self.enabled,
+            'pending_logs': self._logs.qsize(),
+            'pending_sessions': pending_sessions,
+        }
@@ -3,10 +3,13 @@ from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.urls import path
 import json
+import csv
+import base64
 import logging
+from urllib.parse import urlencode
 from reportlab.platypus import Preformatted
 from reportlab.platypus import KeepTogether, Paragraph
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from datetime import datetime, timedelta
 import pytz
 from django.utils import timezone
@@ -18,13 +21,15 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.platypus.frames import Frame
 from reportlab.platypus.doctemplate import PageTemplate, BaseDocTemplate
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
-from io import BytesIO
+from io import BytesIO, StringIO
 import os
 import traceback
 from textwrap import fill
 from reportlab.platypus import Paragraph
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.platypus import HRFlowable
+from pymysql.cursors import SSCursor
+from core.WebSocketConnection.analytics_rollups import ROLLUP_ROLE_HOST, ROLLUP_ROLE_PARTICIPANT
 
 # Configure logging
 logging.basicConfig(filename='analytics_debug.log', level=logging.DEBUG, format='%(asctime)s %(levelname)s %(message)s')
@@ -32,6 +37,7 @@ logger = logging.getLogger(__name__)
 
 # Global status codes
 SUCCESS_STATUS = 200
+ACCEPTED_STATUS = 202
 BAD_REQUEST_STATUS = 400
 UNAUTHORIZED_STATUS = 401
 FORBIDDEN_STATUS = 403
@@ -96,6 +102,16 @@ class ReportGenerator:
             spaceAfter=4
         )
         
+        # Participant report styles
+        styles['MainSectionHeader'] = ParagraphStyle(name='MainSectionHeader', fontName='Helvetica-Bold', fontSize=14,
+            textColor=colors.HexColor('#2C3E50'), spaceBefore=15, spaceAfter=10)
+        styles['CellStyle'] = ParagraphStyle(name='CellStyle', fontName='Helvetica', fontSize=7, leading=9, wordWrap='CJK')
+        styles['HeaderCellStyle'] = ParagraphStyle(name='HeaderCellStyle', fontName='Helvetica-Bold', fontSize=7, leading=9, textColor=colors.white, wordWrap='CJK')
+        styles['SectionTitle'] = ParagraphStyle(name="SectionTitle", fontName="Helvetica-Bold", fontSize=11, textColor=colors.HexColor('#2C3E50'), spaceBefore=15, spaceAfter=8)
+        styles['TableSubSection'] = ParagraphStyle(name="TableSubSection", fontName="Helvetica-Bold", fontSize=9, textColor=colors.HexColor('#7F8C8D'), spaceBefore=10, spaceAfter=5)
+        styles['MeetingInfo'] = ParagraphStyle('MeetingInfo', fontSize=10, spaceAfter=5)
+        styles['ParticipantInfo'] = ParagraphStyle('ParticipantInfo', fontSize=10, spaceAfter=15)
+        
         return styles
 
     def create_header_footer(self, canvas, doc, title):
@@ -120,6 +136,17 @@ class ReportGenerator:
         canvas.restoreState()
 
 
+# Stylesheets are read-only once built, so one generator serves every report in a process
+_report_generator = None
+
+
+def get_report_generator():
+    global _report_generator
+    if _report_generator is None:
+        _report_generator = ReportGenerator()
+    return _report_generator
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -256,11 +283,15 @@ def Get_Host_Meetings(request, user_id):
                         WHEN m.Meeting_Type = 'CalendarMeeting' THEN COALESCE(cm.title, m.Meeting_Name)
                         ELSE m.Meeting_Name
                     END AS meeting_name,
-                    (SELECT COUNT(*) FROM tbl_Participants p2 
-                     WHERE p2.Meeting_ID = m.ID 
-                     AND p2.Role = 'participant'
-                     AND (m.Meeting_Type != 'ScheduleMeeting' OR p2.occurrence_number = p.occurrence_number)
-                    ) AS total_participants,
+                    CASE
+                        WHEN mr.ID IS NULL OR p.Is_Currently_Active = 1 THEN
+                            (SELECT COUNT(*) FROM tbl_Participants p2 
+                             WHERE p2.Meeting_ID = m.ID 
+                             AND p2.Role = 'participant'
+                             AND (m.Meeting_Type != 'ScheduleMeeting' OR p2.occurrence_number = p.occurrence_number))
+                        WHEN m.Meeting_Type = 'ScheduleMeeting' THEN mr.Participant_Count
+                        ELSE (SELECT SUM(mr2.Participant_Count) FROM tbl_MeetingRollups mr2 WHERE mr2.Meeting_ID = m.ID)
+                    END AS total_participants,
                     p.Total_Duration_Minutes AS total_duration,
                     p.Is_Currently_Active,
                     p.Join_Times,
@@ -277,11 +308,14 @@ def Get_Host_Meetings(request, user_id):
                     END AS scheduled_duration,
                     p.session_start_time,
                     p.End_Meeting_Time,
-                    p.Leave_Times
+                    p.Leave_Times,
+                    mr.Started_At AS rollup_started_at,
+                    mr.Ended_At AS rollup_ended_at
                 FROM tbl_Meetings m
                 LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
                 LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
                 INNER JOIN tbl_Participants p ON m.ID = p.Meeting_ID AND p.Role = 'host'
+                LEFT JOIN tbl_MeetingRollups mr ON mr.Meeting_ID = p.Meeting_ID AND mr.occurrence_number = p.occurrence_number
                 WHERE p.User_ID = %s
             """
             params = [user_id]
@@ -319,6 +353,8 @@ def Get_Host_Meetings(request, user_id):
                 session_start_date = row[11]
                 end_meeting_time = row[12]
                 leave_times_raw = row[13]
+                rollup_started_at = row[14]
+                rollup_ended_at = row[15]
                 
                 # Calculate duration for active meetings
                 if is_currently_active and stored_duration == 0 and join_times_raw:
@@ -326,9 +362,9 @@ def Get_Host_Meetings(request, user_id):
                 else:
                     total_duration = stored_duration
                 
-                # FIXED: Extract actual start time from Join_Times
-                start_datetime = None
-                if join_times_raw:
+                # Rolled-up occurrences carry their start/end; otherwise parse Join_Times
+                start_datetime = rollup_started_at if not is_currently_active else None
+                if not start_datetime and join_times_raw:
                     join_times = safe_json_parse(join_times_raw)
                     if join_times and isinstance(join_times, list) and len(join_times) > 0:
                         first_join = join_times[0]
@@ -344,10 +380,12 @@ def Get_Host_Meetings(request, user_id):
                 if not start_datetime:
                     continue
                 
-                # Get end time from End_Meeting_Time or Leave_Times
+                # Get end time from End_Meeting_Time, the rollup or Leave_Times
                 end_datetime = None
                 if end_meeting_time:
                     end_datetime = end_meeting_time
+                elif rollup_ended_at and not is_currently_active:
+                    end_datetime = rollup_ended_at
                 elif leave_times_raw:
                     leave_times = safe_json_parse(leave_times_raw)
                     if leave_times and isinstance(leave_times, list) and len(leave_times) > 0:
@@ -1027,606 +1065,665 @@ def get_available_meeting_times(request):
             "success": False
         }, status=500)
 
-@require_http_methods(["GET"])
-@csrf_exempt
-def Generate_Participant_Report_PDF_For_Meeting(request, meeting_id, user_id):
+def load_participant_report_data(cursor, meeting_id, user_id, occurrence_number=None):
     """
-    Generate PDF report for a specific participant in a specific meeting
-    
-    GET /api/meetings/<meeting_id>/participants/<user_id>/report/pdf/?occurrence_number=1
-    
-    FIXED: 
+    Everything a participant PDF report is rendered from, as a picklable dict.
+    Returns (report, None), or (None, (error_message, status)) when the meeting
+    or participant does not exist.
+
     - Handles ScheduleMeeting with occurrence_number
     - Uses Join_Times for actual meeting time (not session_start_time which is DATE only)
-    - Shows Overall Attendance for recurring ScheduleMeeting
-    - Removed occurrence display from header
     - FIXED: SQL parameter order bug
     """
-    try:
-        if not meeting_id or not user_id:
-            return JsonResponse({"success": False, "error": "meeting_id and user_id are required"}, status=BAD_REQUEST_STATUS)
-        
-        # Get occurrence_number from query params (for ScheduleMeeting)
-        occurrence_number_param = request.GET.get('occurrence_number')
-        
-        # ✅ DEBUG LOG
-        logger.info(f"📊 PDF Report requested - meeting_id: {meeting_id}, user_id: {user_id}, occurrence_number_param: {occurrence_number_param}")
-        
-        with connection.cursor() as cursor:
-            # Get meeting details with proper joins for all meeting types
+    # Get meeting details with proper joins for all meeting types
+    cursor.execute("""
+        SELECT 
+            m.ID, 
+            CASE 
+                WHEN m.Meeting_Type = 'ScheduleMeeting' THEN COALESCE(sm.title, m.Meeting_Name)
+                WHEN m.Meeting_Type = 'CalendarMeeting' THEN COALESCE(cm.title, m.Meeting_Name)
+                ELSE m.Meeting_Name
+            END AS meeting_name,
+            m.Meeting_Type, 
+            m.Started_At, 
+            m.Created_At,
+            sm.recurrence_type,
+            sm.is_recurring,
+            sm.start_time AS scheduled_start_time,
+            sm.recurrence_end_date,
+            sm.recurrence_occurrences,
+            cm.startTime AS calendar_start_time
+        FROM tbl_Meetings m
+        LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
+        LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
+        WHERE m.ID = %s
+    """, [meeting_id])
+    meeting = cursor.fetchone()
+    
+    if not meeting:
+        return None, ("Meeting not found", NOT_FOUND_STATUS)
+    
+    meeting_name = meeting[1]
+    meeting_type = meeting[2]
+    meeting_started_at = meeting[3]
+    meeting_created_at = meeting[4]
+    recurrence_type = meeting[5]
+    is_recurring = bool(meeting[6]) and recurrence_type and recurrence_type != 'none'
+    scheduled_start_time = meeting[7]
+    recurrence_end_date = meeting[8]
+    recurrence_occurrences = meeting[9]
+    calendar_start_time = meeting[10]
+    
+    # For ScheduleMeeting, determine which occurrence to use
+    selected_occurrence = None
+    
+    if meeting_type == 'ScheduleMeeting':
+        # Use occurrence_number from query param if provided
+        if occurrence_number:
+            selected_occurrence = int(occurrence_number)
+            logger.info(f"📊 Using occurrence_number from param: {selected_occurrence}")
+        else:
+            # Default to occurrence 1 if not specified
             cursor.execute("""
-                SELECT 
-                    m.ID, 
-                    CASE 
-                        WHEN m.Meeting_Type = 'ScheduleMeeting' THEN COALESCE(sm.title, m.Meeting_Name)
-                        WHEN m.Meeting_Type = 'CalendarMeeting' THEN COALESCE(cm.title, m.Meeting_Name)
-                        ELSE m.Meeting_Name
-                    END AS meeting_name,
-                    m.Meeting_Type, 
-                    m.Started_At, 
-                    m.Created_At,
-                    sm.recurrence_type,
-                    sm.is_recurring,
-                    sm.start_time AS scheduled_start_time,
-                    sm.recurrence_end_date,
-                    sm.recurrence_occurrences,
-                    cm.startTime AS calendar_start_time
-                FROM tbl_Meetings m
-                LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
-                LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
-                WHERE m.ID = %s
-            """, [meeting_id])
-            meeting = cursor.fetchone()
-            
-            if not meeting:
-                return JsonResponse({"error": "Meeting not found"}, status=NOT_FOUND_STATUS)
-            
-            meeting_name = meeting[1]
-            meeting_type = meeting[2]
-            meeting_started_at = meeting[3]
-            meeting_created_at = meeting[4]
-            recurrence_type = meeting[5]
-            is_recurring = bool(meeting[6]) and recurrence_type and recurrence_type != 'none'
-            scheduled_start_time = meeting[7]
-            recurrence_end_date = meeting[8]
-            recurrence_occurrences = meeting[9]
-            calendar_start_time = meeting[10]
-            
-            # For ScheduleMeeting, determine which occurrence to use
-            selected_occurrence = None
-            
-            if meeting_type == 'ScheduleMeeting':
-                # Use occurrence_number from query param if provided
-                if occurrence_number_param:
-                    selected_occurrence = int(occurrence_number_param)
-                    logger.info(f"📊 Using occurrence_number from param: {selected_occurrence}")
-                else:
-                    # Default to occurrence 1 if not specified
-                    cursor.execute("""
-                        SELECT MIN(occurrence_number)
-                        FROM tbl_Participants 
-                        WHERE Meeting_ID = %s AND User_ID = %s AND Role = 'participant' AND occurrence_number IS NOT NULL
-                    """, [meeting_id, user_id])
-                    min_occ = cursor.fetchone()
-                    selected_occurrence = int(min_occ[0]) if min_occ and min_occ[0] else 1
-                    logger.info(f"📊 Using default occurrence_number: {selected_occurrence}")
-            
-            # ✅ FIXED: Build participant query based on meeting type
-            if meeting_type == 'ScheduleMeeting' and selected_occurrence:
-                logger.info(f"📊 Querying ScheduleMeeting with occurrence_number: {selected_occurrence}")
-                
-                cursor.execute("""
-                    SELECT p.User_ID, p.Full_Name, p.Participant_Attendance, p.Join_Times, p.Leave_Times,
-                        p.Total_Duration_Minutes, p.Total_Sessions, p.Overall_Attendance, p.Attendance_Percentagebasedon_host,
-                        ats.detection_counts, ats.popup_count, ats.attendance_penalty, ats.break_used, ats.violations,
-                        ats.engagement_score, ats.attendance_percentage, ats.break_count, ats.break_sessions,
-                        ats.total_break_time_used, ats.identity_warning_count, ats.identity_warnings,
-                        ats.identity_removal_count, ats.identity_total_warnings_issued, ats.behavior_removal_count,
-                        ats.continuous_violation_removal_count,
-                        p.occurrence_number,
-                        p.session_start_time
-                    FROM tbl_Participants p
-                    LEFT JOIN tbl_Attendance_Sessions ats 
-                        ON p.Meeting_ID = ats.Meeting_ID 
-                        AND p.User_ID = ats.User_ID
-                    WHERE p.Meeting_ID = %s 
-                        AND p.User_ID = %s 
-                        AND p.Role = 'participant'
-                        AND p.occurrence_number = %s
-                """, [meeting_id, user_id, selected_occurrence])
-            else:
-                # Standard query for InstantMeeting and CalendarMeeting
-                logger.info(f"📊 Querying {meeting_type} (no occurrence filter)")
-                
-                cursor.execute("""
-                    SELECT p.User_ID, p.Full_Name, p.Participant_Attendance, p.Join_Times, p.Leave_Times,
-                        p.Total_Duration_Minutes, p.Total_Sessions, p.Overall_Attendance, p.Attendance_Percentagebasedon_host,
-                        ats.detection_counts, ats.popup_count, ats.attendance_penalty, ats.break_used, ats.violations,
-                        ats.engagement_score, ats.attendance_percentage, ats.break_count, ats.break_sessions,
-                        ats.total_break_time_used, ats.identity_warning_count, ats.identity_warnings,
-                        ats.identity_removal_count, ats.identity_total_warnings_issued, ats.behavior_removal_count,
-                        ats.continuous_violation_removal_count,
-                        p.occurrence_number,
-                        p.session_start_time
-                    FROM tbl_Participants p
-                    LEFT JOIN tbl_Attendance_Sessions ats 
-                        ON p.Meeting_ID = ats.Meeting_ID 
-                        AND p.User_ID = ats.User_ID
-                    WHERE p.Meeting_ID = %s 
-                        AND p.User_ID = %s 
-                        AND p.Role = 'participant'
-                """, [meeting_id, user_id])
-            
-            row = cursor.fetchone()
-            
-            if not row:
-                logger.warning(f"📊 Participant not found - meeting_id: {meeting_id}, user_id: {user_id}, occurrence: {selected_occurrence}")
-                return JsonResponse({"error": "Participant not found in this meeting"}, status=NOT_FOUND_STATUS)
-            
-            # ✅ DEBUG: Log what we got from DB
-            logger.info(f"📊 Found participant data - Duration: {row[5]}, Attendance: {row[2]}, occurrence_from_db: {row[25] if len(row) > 25 else 'N/A'}")
-            
-            full_name = row[1]
-            participant_attendance = float(row[2]) if row[2] is not None else 0.0
-            join_times_raw = row[3]
-            overall_attendance = float(row[7]) if row[7] is not None else 0.0
-            occurrence_number_from_db = row[25] if len(row) > 25 else None
-            session_start_date = row[26] if len(row) > 26 else None
-            
-            # Determine meeting date - extract from Join_Times for actual datetime
-            meeting_date = None
-            
-            # First try to get from Join_Times (has actual time)
-            if join_times_raw:
-                join_times_parsed = safe_json_parse(join_times_raw)
-                if join_times_parsed and isinstance(join_times_parsed, list) and len(join_times_parsed) > 0:
-                    first_join = join_times_parsed[0]
-                    if isinstance(first_join, str):
-                        for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S.%f']:
-                            try:
-                                meeting_date = datetime.strptime(first_join, fmt)
-                                break
-                            except ValueError:
-                                continue
-            
-            # Fallback to other sources if Join_Times didn't work
-            if not meeting_date:
-                if meeting_type == 'CalendarMeeting' and calendar_start_time:
-                    meeting_date = calendar_start_time
-                elif meeting_type == 'ScheduleMeeting' and scheduled_start_time:
-                    meeting_date = scheduled_start_time
-                elif meeting_started_at:
-                    meeting_date = meeting_started_at
-                elif meeting_created_at:
-                    meeting_date = meeting_created_at
-        
-        # =====================================================================
-        # PDF GENERATION STARTS HERE
-        # =====================================================================
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, leftMargin=40, rightMargin=40, topMargin=70, bottomMargin=70)
-        
-        report_gen = ReportGenerator()
-        story = []
-        
-        main_section_style = ParagraphStyle(name='MainSectionHeader', fontName='Helvetica-Bold', fontSize=14,
-            textColor=colors.HexColor('#2C3E50'), spaceBefore=15, spaceAfter=10)
-        
-        cell_style = ParagraphStyle(name='CellStyle', fontName='Helvetica', fontSize=7, leading=9, wordWrap='CJK')
-        header_cell_style = ParagraphStyle(name='HeaderCellStyle', fontName='Helvetica-Bold', fontSize=7, leading=9, textColor=colors.white, wordWrap='CJK')
-        section_title_style = ParagraphStyle(name="SectionTitle", fontName="Helvetica-Bold", fontSize=11, textColor=colors.HexColor('#2C3E50'), spaceBefore=15, spaceAfter=8)
-        table_sub_section_style = ParagraphStyle(name="TableSubSection", fontName="Helvetica-Bold", fontSize=9, textColor=colors.HexColor('#7F8C8D'), spaceBefore=10, spaceAfter=5)
-        
-        def P(text, style=cell_style):
-            return Paragraph(str(text) if text else '', style)
-        
-        def PH(text):
-            return Paragraph(str(text) if text else '', header_cell_style)
-        
-        # Title
-        title = Paragraph("Participant Attendance Report", report_gen.custom_styles['ReportTitle'])
-        story.append(title)
-        story.append(Spacer(1, 10))
-        
-        # Meeting Info Header - NO occurrence display
-        meeting_type_display = {
-            'InstantMeeting': 'Instant Meeting',
-            'ScheduleMeeting': 'Scheduled Meeting',
-            'CalendarMeeting': 'Calendar Meeting'
-        }.get(meeting_type, meeting_type)
-        
-        meeting_info_text = f"<b>Meeting:</b> {meeting_name} | <b>Type:</b> {meeting_type_display}"
-        
-        if meeting_date:
-            meeting_info_text += f" | <b>Date:</b> {meeting_date.strftime('%Y-%m-%d %H:%M') if hasattr(meeting_date, 'strftime') else str(meeting_date)}"
-        
-        # Add recurrence type for recurring meetings (but NOT occurrence number)
-        if is_recurring and recurrence_type:
-            recurrence_display = recurrence_type.replace('_', ' ').title()
-            meeting_info_text += f" | <b>Recurrence:</b> {recurrence_display}"
-        
-        story.append(Paragraph(meeting_info_text, ParagraphStyle('MeetingInfo', fontSize=10, spaceAfter=5)))
-        story.append(Paragraph(f"<b>Participant:</b> {full_name}", ParagraphStyle('ParticipantInfo', fontSize=10, spaceAfter=15)))
-        story.append(HRFlowable(width="100%", thickness=2, color=colors.HexColor('#2C3E50'), spaceBefore=0, spaceAfter=15))
-        
-        # =====================================================================
-        # PARTICIPATION DETAILS
-        # =====================================================================
-        part_elements = []
-        part_elements.append(Paragraph("Participation Details", main_section_style))
-        part_elements.append(HRFlowable(width="100%", thickness=2, color=colors.HexColor('#3498DB'), spaceBefore=0, spaceAfter=10))
-        
-        participation_data = [['Metric', 'Value']]
-        
-        duration = float(row[5]) if row[5] is not None else 0.0
-        if is_valid_value(duration):
-            participation_data.append(['Duration', f"{round(duration, 2)} minutes"])
-        
-        join_times = safe_json_parse(row[3])
-        if is_valid_value(join_times):
-            if isinstance(join_times, list):
-                join_times_str = '<br/>'.join([format_timestamp(t) or str(t) for t in join_times])
-            else:
-                join_times_str = str(join_times)
-            participation_data.append(['Join Times', Paragraph(join_times_str, cell_style)])
+                SELECT MIN(occurrence_number)
+                FROM tbl_Participants 
+                WHERE Meeting_ID = %s AND User_ID = %s AND Role = 'participant' AND occurrence_number IS NOT NULL
+            """, [meeting_id, user_id])
+            min_occ = cursor.fetchone()
+            selected_occurrence = int(min_occ[0]) if min_occ and min_occ[0] else 1
+            logger.info(f"📊 Using default occurrence_number: {selected_occurrence}")
+    
+    # ✅ FIXED: Build participant query based on meeting type
+    if meeting_type == 'ScheduleMeeting' and selected_occurrence:
+        logger.info(f"📊 Querying ScheduleMeeting with occurrence_number: {selected_occurrence}")
+        
+        cursor.execute("""
+            SELECT p.User_ID, p.Full_Name, p.Participant_Attendance, p.Join_Times, p.Leave_Times,
+                p.Total_Duration_Minutes, p.Total_Sessions, p.Overall_Attendance, p.Attendance_Percentagebasedon_host,
+                ats.detection_counts, ats.popup_count, ats.attendance_penalty, ats.break_used, ats.violations,
+                ats.engagement_score, ats.attendance_percentage, ats.break_count, ats.break_sessions,
+                ats.total_break_time_used, ats.identity_warning_count, ats.identity_warnings,
+                ats.identity_removal_count, ats.identity_total_warnings_issued, ats.behavior_removal_count,
+                ats.continuous_violation_removal_count,
+                p.occurrence_number,
+                p.session_start_time
+            FROM tbl_Participants p
+            LEFT JOIN tbl_Attendance_Sessions ats 
+                ON p.Meeting_ID = ats.Meeting_ID 
+                AND p.User_ID = ats.User_ID
+            WHERE p.Meeting_ID = %s 
+                AND p.User_ID = %s 
+                AND p.Role = 'participant'
+                AND p.occurrence_number = %s
+        """, [meeting_id, user_id, selected_occurrence])
+    else:
+        # Standard query for InstantMeeting and CalendarMeeting
+        logger.info(f"📊 Querying {meeting_type} (no occurrence filter)")
+        
+        cursor.execute("""
+            SELECT p.User_ID, p.Full_Name, p.Participant_Attendance, p.Join_Times, p.Leave_Times,
+                p.Total_Duration_Minutes, p.Total_Sessions, p.Overall_Attendance, p.Attendance_Percentagebasedon_host,
+                ats.detection_counts, ats.popup_count, ats.attendance_penalty, ats.break_used, ats.violations,
+                ats.engagement_score, ats.attendance_percentage, ats.break_count, ats.break_sessions,
+                ats.total_break_time_used, ats.identity_warning_count, ats.identity_warnings,
+                ats.identity_removal_count, ats.identity_total_warnings_issued, ats.behavior_removal_count,
+                ats.continuous_violation_removal_count,
+                p.occurrence_number,
+                p.session_start_time
+            FROM tbl_Participants p
+            LEFT JOIN tbl_Attendance_Sessions ats 
+                ON p.Meeting_ID = ats.Meeting_ID 
+                AND p.User_ID = ats.User_ID
+            WHERE p.Meeting_ID = %s 
+                AND p.User_ID = %s 
+                AND p.Role = 'participant'
+        """, [meeting_id, user_id])
+    
+    row = cursor.fetchone()
+    
+    if not row:
+        logger.warning(f"📊 Participant not found - meeting_id: {meeting_id}, user_id: {user_id}, occurrence: {selected_occurrence}")
+        return None, ("Participant not found in this meeting", NOT_FOUND_STATUS)
+    
+    # ✅ DEBUG: Log what we got from DB
+    logger.info(f"📊 Found participant data - Duration: {row[5]}, Attendance: {row[2]}, occurrence_from_db: {row[25] if len(row) > 25 else 'N/A'}")
+    
+    full_name = row[1]
+    join_times_raw = row[3]
+    occurrence_number_from_db = row[25] if len(row) > 25 else None
+    session_start_date = row[26] if len(row) > 26 else None
+    
+    # Determine meeting date - extract from Join_Times for actual datetime
+    meeting_date = None
+    
+    # First try to get from Join_Times (has actual time)
+    if join_times_raw:
+        join_times_parsed = safe_json_parse(join_times_raw)
+        if join_times_parsed and isinstance(join_times_parsed, list) and len(join_times_parsed) > 0:
+            first_join = join_times_parsed[0]
+            if isinstance(first_join, str):
+                for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S.%f']:
+                    try:
+                        meeting_date = datetime.strptime(first_join, fmt)
+                        break
+                    except ValueError:
+                        continue
+    
+    # Fallback to other sources if Join_Times didn't work
+    if not meeting_date:
+        if meeting_type == 'CalendarMeeting' and calendar_start_time:
+            meeting_date = calendar_start_time
+        elif meeting_type == 'ScheduleMeeting' and scheduled_start_time:
+            meeting_date = scheduled_start_time
+        elif meeting_started_at:
+            meeting_date = meeting_started_at
+        elif meeting_created_at:
+            meeting_date = meeting_created_at
+
+    return {
+        'meeting_id': meeting_id,
+        'user_id': user_id,
+        'meeting_name': meeting_name,
+        'meeting_type': meeting_type,
+        'is_recurring': bool(is_recurring),
+        'recurrence_type': recurrence_type,
+        'selected_occurrence': selected_occurrence,
+        'meeting_date': meeting_date,
+        'full_name': full_name,
+        'row': tuple(row),
+    }, None
+
+
+def render_participant_report_pdf(report):
+    """
+    Render a report from load_participant_report_data() to PDF bytes.
+    Pure CPU work with no database access, so it can run in a worker process.
 
-        leave_times = safe_json_parse(row[4])
-        if is_valid_value(leave_times):
-            if isinstance(leave_times, list):
-                leave_times_str = '<br/>'.join([format_timestamp(t) or str(t) for t in leave_times])
-            else:
-                leave_times_str = str(leave_times)
-            participation_data.append(['Leave Times', Paragraph(leave_times_str, cell_style)])
+    - Shows Overall Attendance for recurring ScheduleMeeting
+    - Removed occurrence display from header
+    """
+    meeting_name = report['meeting_name']
+    meeting_type = report['meeting_type']
+    meeting_date = report['meeting_date']
+    is_recurring = report['is_recurring']
+    recurrence_type = report['recurrence_type']
+    full_name = report['full_name']
+    row = report['row']
+    participant_attendance = float(row[2]) if row[2] is not None else 0.0
+    overall_attendance = float(row[7]) if row[7] is not None else 0.0
+    
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, leftMargin=40, rightMargin=40, topMargin=70, bottomMargin=70)
+    
+    report_gen = get_report_generator()
+    story = []
+    
+    main_section_style = report_gen.custom_styles['MainSectionHeader']
+    cell_style = report_gen.custom_styles['CellStyle']
+    header_cell_style = report_gen.custom_styles['HeaderCellStyle']
+    section_title_style = report_gen.custom_styles['SectionTitle']
+    table_sub_section_style = report_gen.custom_styles['TableSubSection']
+    
+    def P(text, style=cell_style):
+        return Paragraph(str(text) if text else '', style)
+    
+    def PH(text):
+        return Paragraph(str(text) if text else '', header_cell_style)
+    
+    # Title
+    title = Paragraph("Participant Attendance Report", report_gen.custom_styles['ReportTitle'])
+    story.append(title)
+    story.append(Spacer(1, 10))
+    
+    # Meeting Info Header - NO occurrence display
+    meeting_type_display = {
+        'InstantMeeting': 'Instant Meeting',
+        'ScheduleMeeting': 'Scheduled Meeting',
+        'CalendarMeeting': 'Calendar Meeting'
+    }.get(meeting_type, meeting_type)
+    
+    meeting_info_text = f"<b>Meeting:</b> {meeting_name} | <b>Type:</b> {meeting_type_display}"
+    
+    if meeting_date:
+        meeting_info_text += f" | <b>Date:</b> {meeting_date.strftime('%Y-%m-%d %H:%M') if hasattr(meeting_date, 'strftime') else str(meeting_date)}"
+    
+    # Add recurrence type for recurring meetings (but NOT occurrence number)
+    if is_recurring and recurrence_type:
+        recurrence_display = recurrence_type.replace('_', ' ').title()
+        meeting_info_text += f" | <b>Recurrence:</b> {recurrence_display}"
+    
+    story.append(Paragraph(meeting_info_text, report_gen.custom_styles['MeetingInfo']))
+    story.append(Paragraph(f"<b>Participant:</b> {full_name}", report_gen.custom_styles['ParticipantInfo']))
+    story.append(HRFlowable(width="100%", thickness=2, color=colors.HexColor('#2C3E50'), spaceBefore=0, spaceAfter=15))
+    
+    # =====================================================================
+    # PARTICIPATION DETAILS
+    # =====================================================================
+    part_elements = []
+    part_elements.append(Paragraph("Participation Details", main_section_style))
+    part_elements.append(HRFlowable(width="100%", thickness=2, color=colors.HexColor('#3498DB'), spaceBefore=0, spaceAfter=10))
+    
+    participation_data = [['Metric', 'Value']]
+    
+    duration = float(row[5]) if row[5] is not None else 0.0
+    if is_valid_value(duration):
+        participation_data.append(['Duration', f"{round(duration, 2)} minutes"])
+    
+    join_times = safe_json_parse(row[3])
+    if is_valid_value(join_times):
+        if isinstance(join_times, list):
+            join_times_str = '<br/>'.join([format_timestamp(t) or str(t) for t in join_times])
+        else:
+            join_times_str = str(join_times)
+        participation_data.append(['Join Times', Paragraph(join_times_str, cell_style)])
 
-        if is_valid_value(participant_attendance):
-            participation_data.append(['Participant Attendance', f"{round(participant_attendance, 2)}%"])
-        
-        # Add Overall Attendance for recurring ScheduleMeeting only
-        if is_recurring and meeting_type == 'ScheduleMeeting' and is_valid_value(overall_attendance):
-            participation_data.append(['Overall Attendance (All Occurrences)', f"{round(overall_attendance, 2)}%"])
-        
-        if len(participation_data) > 1:
-            participation_table = Table(participation_data, colWidths=[3*inch, 3.5*inch])
-            participation_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498DB')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#EBF5FB')]),
-                ('LEFTPADDING', (0, 0), (-1, -1), 8),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ]))
-            part_elements.append(participation_table)
+    leave_times = safe_json_parse(row[4])
+    if is_valid_value(leave_times):
+        if isinstance(leave_times, list):
+            leave_times_str = '<br/>'.join([format_timestamp(t) or str(t) for t in leave_times])
         else:
-            part_elements.append(Paragraph("No participation data available.", report_gen.styles['Normal']))
-        
-        part_elements.append(Spacer(1, 15))
-        story.append(KeepTogether(part_elements))
-        
-        # =====================================================================
-        # ATTENDANCE MONITORING & BEHAVIOR
-        # =====================================================================
-        monitoring_data = [['Metric', 'Value']]
-        
-        popup_count = int(row[10]) if row[10] is not None else 0
-        if is_valid_value(popup_count): monitoring_data.append(['Popup Count', str(popup_count)])
-        
-        attendance_penalty = float(row[11]) if row[11] is not None else 0.0
-        if is_valid_value(attendance_penalty): monitoring_data.append(['Attendance Penalty', f"{round(attendance_penalty, 2)}%"])
-        
-        break_used = bool(row[12]) if row[12] is not None else False
-        if break_used: monitoring_data.append(['Break Used', 'Yes'])
-        
-        engagement_score = int(row[14]) if row[14] is not None else 0
-        if is_valid_value(engagement_score): monitoring_data.append(['Engagement Score', f"{engagement_score} / 100"])
-        
-        attendance_percentage = float(row[15]) if row[15] is not None else 0.0
-        if is_valid_value(attendance_percentage): monitoring_data.append(['Attendance Percentage', f"{round(attendance_percentage, 2)}%"])
-        
-        break_count = int(row[16]) if row[16] is not None else 0
-        if is_valid_value(break_count): monitoring_data.append(['Break Count', str(break_count)])
-        
-        total_break_time = int(row[18]) if row[18] is not None else 0
-        if is_valid_value(total_break_time): monitoring_data.append(['Total Break Time Used', f"{total_break_time} seconds"])
-        
-        identity_warning_count = int(row[19]) if row[19] is not None else 0
-        if is_valid_value(identity_warning_count): monitoring_data.append(['Identity Warning Count', str(identity_warning_count)])
-        
-        identity_removal_count = int(row[21]) if row[21] is not None else 0
-        if is_valid_value(identity_removal_count): monitoring_data.append(['Identity Removal Count', str(identity_removal_count)])
-        
-        identity_total_warnings = int(row[22]) if row[22] is not None else 0
-        if is_valid_value(identity_total_warnings): monitoring_data.append(['Identity Total Warnings Issued', str(identity_total_warnings)])
-        
-        behavior_removal_count = int(row[23]) if row[23] is not None else 0
-        if is_valid_value(behavior_removal_count): monitoring_data.append(['Behavior Removal Count', str(behavior_removal_count)])
-        
-        continuous_violation_removal = int(row[24]) if row[24] is not None else 0
-        if is_valid_value(continuous_violation_removal): monitoring_data.append(['Continuous Violation Removal Count', str(continuous_violation_removal)])
-        
-        if len(monitoring_data) > 1:
-            monitoring_elements = []
-            monitoring_elements.append(Paragraph("Attendance Monitoring & Behavior", main_section_style))
-            monitoring_elements.append(HRFlowable(width="100%", thickness=2, color=colors.HexColor('#E74C3C'), spaceBefore=0, spaceAfter=10))
-            
-            monitoring_table = Table(monitoring_data, colWidths=[3*inch, 3.5*inch])
-            monitoring_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#E74C3C')),
+            leave_times_str = str(leave_times)
+        participation_data.append(['Leave Times', Paragraph(leave_times_str, cell_style)])
+
+    if is_valid_value(participant_attendance):
+        participation_data.append(['Participant Attendance', f"{round(participant_attendance, 2)}%"])
+    
+    # Add Overall Attendance for recurring ScheduleMeeting only
+    if is_recurring and meeting_type == 'ScheduleMeeting' and is_valid_value(overall_attendance):
+        participation_data.append(['Overall Attendance (All Occurrences)', f"{round(overall_attendance, 2)}%"])
+    
+    if len(participation_data) > 1:
+        participation_table = Table(participation_data, colWidths=[3*inch, 3.5*inch])
+        participation_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498DB')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#EBF5FB')]),
+            ('LEFTPADDING', (0, 0), (-1, -1), 8),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ]))
+        part_elements.append(participation_table)
+    else:
+        part_elements.append(Paragraph("No participation data available.", report_gen.styles['Normal']))
+    
+    part_elements.append(Spacer(1, 15))
+    story.append(KeepTogether(part_elements))
+    
+    # =====================================================================
+    # ATTENDANCE MONITORING & BEHAVIOR
+    # =====================================================================
+    monitoring_data = [['Metric', 'Value']]
+    
+    popup_count = int(row[10]) if row[10] is not None else 0
+    if is_valid_value(popup_count): monitoring_data.append(['Popup Count', str(popup_count)])
+    
+    attendance_penalty = float(row[11]) if row[11] is not None else 0.0
+    if is_valid_value(attendance_penalty): monitoring_data.append(['Attendance Penalty', f"{round(attendance_penalty, 2)}%"])
+    
+    break_used = bool(row[12]) if row[12] is not None else False
+    if break_used: monitoring_data.append(['Break Used', 'Yes'])
+    
+    engagement_score = int(row[14]) if row[14] is not None else 0
+    if is_valid_value(engagement_score): monitoring_data.append(['Engagement Score', f"{engagement_score} / 100"])
+    
+    attendance_percentage = float(row[15]) if row[15] is not None else 0.0
+    if is_valid_value(attendance_percentage): monitoring_data.append(['Attendance Percentage', f"{round(attendance_percentage, 2)}%"])
+    
+    break_count = int(row[16]) if row[16] is not None else 0
+    if is_valid_value(break_count): monitoring_data.append(['Break Count', str(break_count)])
+    
+    total_break_time = int(row[18]) if row[18] is not None else 0
+    if is_valid_value(total_break_time): monitoring_data.append(['Total Break Time Used', f"{total_break_time} seconds"])
+    
+    identity_warning_count = int(row[19]) if row[19] is not None else 0
+    if is_valid_value(identity_warning_count): monitoring_data.append(['Identity Warning Count', str(identity_warning_count)])
+    
+    identity_removal_count = int(row[21]) if row[21] is not None else 0
+    if is_valid_value(identity_removal_count): monitoring_data.append(['Identity Removal Count', str(identity_removal_count)])
+    
+    identity_total_warnings = int(row[22]) if row[22] is not None else 0
+    if is_valid_value(identity_total_warnings): monitoring_data.append(['Identity Total Warnings Issued', str(identity_total_warnings)])
+    
+    behavior_removal_count = int(row[23]) if row[23] is not None else 0
+    if is_valid_value(behavior_removal_count): monitoring_data.append(['Behavior Removal Count', str(behavior_removal_count)])
+    
+    continuous_violation_removal = int(row[24]) if row[24] is not None else 0
+    if is_valid_value(continuous_violation_removal): monitoring_data.append(['Continuous Violation Removal Count', str(continuous_violation_removal)])
+    
+    if len(monitoring_data) > 1:
+        monitoring_elements = []
+        monitoring_elements.append(Paragraph("Attendance Monitoring & Behavior", main_section_style))
+        monitoring_elements.append(HRFlowable(width="100%", thickness=2, color=colors.HexColor('#E74C3C'), spaceBefore=0, spaceAfter=10))
+        
+        monitoring_table = Table(monitoring_data, colWidths=[3*inch, 3.5*inch])
+        monitoring_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#E74C3C')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#FADBD8')]),
+            ('LEFTPADDING', (0, 0), (-1, -1), 8),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ]))
+        monitoring_elements.append(monitoring_table)
+        monitoring_elements.append(Spacer(1, 15))
+        story.append(KeepTogether(monitoring_elements))
+    
+    # =====================================================================
+    # DETECTION COUNTS
+    # =====================================================================
+    detection_counts_data = safe_json_parse(row[9])
+    if detection_counts_data and isinstance(detection_counts_data, dict):
+        filtered_detection = {}
+        for key, value in detection_counts_data.items():
+            if key in ['last_detection_time', 'camera_verified_at'] and value:
+                formatted_time = format_timestamp(value)
+                if formatted_time: filtered_detection[key] = formatted_time
+            elif is_valid_value(value):
+                filtered_detection[key] = value
+        
+        if filtered_detection:
+            dc_elements = []
+            dc_elements.append(Paragraph("Detection Counts", section_title_style))
+            
+            dc_rows = [[PH('Field'), PH('Value')]]
+            for key, value in filtered_detection.items():
+                dc_rows.append([P(str(key)), P(str(value))])
+            
+            dc_table = Table(dc_rows, colWidths=[3*inch, 3.5*inch], repeatRows=1)
+            dc_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495E')),
                 ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
                 ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ('FONTSIZE', (0, 0), (-1, -1), 8),
                 ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#FADBD8')]),
-                ('LEFTPADDING', (0, 0), (-1, -1), 8),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#EAECEE')]),
+                ('LEFTPADDING', (0, 0), (-1, -1), 6),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+                ('TOPPADDING', (0, 0), (-1, -1), 5),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
             ]))
-            monitoring_elements.append(monitoring_table)
-            monitoring_elements.append(Spacer(1, 15))
-            story.append(KeepTogether(monitoring_elements))
-        
-        # =====================================================================
-        # DETECTION COUNTS
-        # =====================================================================
-        detection_counts_data = safe_json_parse(row[9])
-        if detection_counts_data and isinstance(detection_counts_data, dict):
-            filtered_detection = {}
-            for key, value in detection_counts_data.items():
-                if key in ['last_detection_time', 'camera_verified_at'] and value:
-                    formatted_time = format_timestamp(value)
-                    if formatted_time: filtered_detection[key] = formatted_time
-                elif is_valid_value(value):
-                    filtered_detection[key] = value
-            
-            if filtered_detection:
-                dc_elements = []
-                dc_elements.append(Paragraph("Detection Counts", section_title_style))
-                
-                dc_rows = [[PH('Field'), PH('Value')]]
-                for key, value in filtered_detection.items():
-                    dc_rows.append([P(str(key)), P(str(value))])
-                
-                dc_table = Table(dc_rows, colWidths=[3*inch, 3.5*inch], repeatRows=1)
-                dc_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495E')),
+            dc_elements.append(dc_table)
+            dc_elements.append(Spacer(1, 15))
+            story.append(KeepTogether(dc_elements))
+    
+    # =====================================================================
+    # VIOLATIONS DATA
+    # =====================================================================
+    violations_data = safe_json_parse(row[13])
+    if violations_data and isinstance(violations_data, dict):
+        warnings = violations_data.get('warnings', [])
+        detections = violations_data.get('detections', []) or violations_data.get('detection_events', [])
+        removals = violations_data.get('continuous_removals', []) or violations_data.get('removals', [])
+        
+        has_warnings = warnings and len(warnings) > 0
+        has_detections = detections and len(detections) > 0
+        has_removals = removals and len(removals) > 0
+        
+        if has_warnings or has_detections or has_removals:
+            if has_warnings:
+                warn_elements = []
+                warn_elements.append(Paragraph("Violations Data", section_title_style))
+                warn_elements.append(Spacer(1, 8))
+                warn_elements.append(Paragraph("Warnings Table", table_sub_section_style))
+                
+                warn_rows = [[PH('#'), PH('Timestamp'), PH('Violation Type'), PH('Duration'), PH('Time Range'), PH('Message')]]
+                for i, w in enumerate(warnings, 1):
+                    if isinstance(w, dict):
+                        warn_rows.append([
+                            P(str(i)),
+                            P(format_timestamp(w.get('timestamp', '')) or 'N/A'),
+                            P(str(w.get('violation_type', 'N/A'))),
+                            P(f"{round(float(w.get('duration', 0)), 2)}s"),
+                            P(str(w.get('time_range', 'N/A'))),
+                            P(str(w.get('message', 'N/A'))[:40])
+                        ])
+                
+                warn_table = Table(warn_rows, colWidths=[0.4*inch, 1.2*inch, 1.1*inch, 0.7*inch, 0.7*inch, 2.4*inch], repeatRows=1)
+                warn_table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#F39C12')),
                     ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
                     ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
                     ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 8),
                     ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#EAECEE')]),
-                    ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#FEF9E7')]),
+                    ('LEFTPADDING', (0, 0), (-1, -1), 4),
+                    ('RIGHTPADDING', (0, 0), (-1, -1), 4),
                     ('TOPPADDING', (0, 0), (-1, -1), 5),
                     ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
                 ]))
-                dc_elements.append(dc_table)
-                dc_elements.append(Spacer(1, 15))
-                story.append(KeepTogether(dc_elements))
-        
-        # =====================================================================
-        # VIOLATIONS DATA
-        # =====================================================================
-        violations_data = safe_json_parse(row[13])
-        if violations_data and isinstance(violations_data, dict):
-            warnings = violations_data.get('warnings', [])
-            detections = violations_data.get('detections', []) or violations_data.get('detection_events', [])
-            removals = violations_data.get('continuous_removals', []) or violations_data.get('removals', [])
-            
-            has_warnings = warnings and len(warnings) > 0
-            has_detections = detections and len(detections) > 0
-            has_removals = removals and len(removals) > 0
-            
-            if has_warnings or has_detections or has_removals:
-                if has_warnings:
-                    warn_elements = []
-                    warn_elements.append(Paragraph("Violations Data", section_title_style))
-                    warn_elements.append(Spacer(1, 8))
-                    warn_elements.append(Paragraph("Warnings Table", table_sub_section_style))
-                    
-                    warn_rows = [[PH('#'), PH('Timestamp'), PH('Violation Type'), PH('Duration'), PH('Time Range'), PH('Message')]]
-                    for i, w in enumerate(warnings, 1):
-                        if isinstance(w, dict):
-                            warn_rows.append([
-                                P(str(i)),
-                                P(format_timestamp(w.get('timestamp', '')) or 'N/A'),
-                                P(str(w.get('violation_type', 'N/A'))),
-                                P(f"{round(float(w.get('duration', 0)), 2)}s"),
-                                P(str(w.get('time_range', 'N/A'))),
-                                P(str(w.get('message', 'N/A'))[:40])
-                            ])
-                    
-                    warn_table = Table(warn_rows, colWidths=[0.4*inch, 1.2*inch, 1.1*inch, 0.7*inch, 0.7*inch, 2.4*inch], repeatRows=1)
-                    warn_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#F39C12')),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#FEF9E7')]),
-                        ('LEFTPADDING', (0, 0), (-1, -1), 4),
-                        ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-                        ('TOPPADDING', (0, 0), (-1, -1), 5),
-                        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-                    ]))
-                    warn_elements.append(warn_table)
-                    warn_elements.append(Spacer(1, 12))
-                    story.append(KeepTogether(warn_elements))
-                elif has_detections or has_removals:
-                    story.append(Paragraph("Violations Data", section_title_style))
-                    story.append(Spacer(1, 8))
-                
-                if has_detections:
-                    det_elements = []
-                    det_elements.append(Paragraph("Detection Events Table", table_sub_section_style))
-                    
-                    det_rows = [[PH('#'), PH('Timestamp'), PH('Violation Type'), PH('Duration'), PH('Penalty'), PH('Message')]]
-                    for i, d in enumerate(detections, 1):
-                        if isinstance(d, dict):
-                            det_rows.append([
-                                P(str(i)),
-                                P(format_timestamp(d.get('timestamp', '')) or 'N/A'),
-                                P(str(d.get('violation_type', 'N/A'))),
-                                P(f"{round(float(d.get('duration', 0)), 2)}s"),
-                                P(f"{round(float(d.get('penalty_applied', 0)), 2)}%"),
-                                P(str(d.get('message', 'N/A'))[:40])
-                            ])
-                    
-                    det_table = Table(det_rows, colWidths=[0.4*inch, 1.2*inch, 1.1*inch, 0.7*inch, 0.7*inch, 2.4*inch], repeatRows=1)
-                    det_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498DB')),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#EBF5FB')]),
-                        ('LEFTPADDING', (0, 0), (-1, -1), 4),
-                        ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-                        ('TOPPADDING', (0, 0), (-1, -1), 5),
-                        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-                    ]))
-                    det_elements.append(det_table)
-                    det_elements.append(Spacer(1, 12))
-                    story.append(KeepTogether(det_elements))
-                
-                if has_removals:
-                    rem_elements = []
-                    rem_elements.append(Paragraph("Continuous Removals Table", table_sub_section_style))
-                    
-                    rem_rows = [[PH('#'), PH('Timestamp'), PH('Violation Type'), PH('Duration'), PH('Penalty'), PH('Message')]]
-                    for i, r in enumerate(removals, 1):
-                        if isinstance(r, dict):
-                            rem_rows.append([
-                                P(str(i)),
-                                P(format_timestamp(r.get('timestamp', '')) or 'N/A'),
-                                P(str(r.get('violation_type', 'N/A'))),
-                                P(f"{round(float(r.get('duration', 0)), 2)}s"),
-                                P(str(round(float(r.get('penalty', 0)), 2))),
-                                P(str(r.get('message', 'N/A'))[:40])
-                            ])
-                    
-                    rem_table = Table(rem_rows, colWidths=[0.4*inch, 1.2*inch, 1.1*inch, 0.7*inch, 0.7*inch, 2.4*inch], repeatRows=1)
-                    rem_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#E74C3C')),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#FADBD8')]),
-                        ('LEFTPADDING', (0, 0), (-1, -1), 4),
-                        ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-                        ('TOPPADDING', (0, 0), (-1, -1), 5),
-                        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-                    ]))
-                    rem_elements.append(rem_table)
-                    rem_elements.append(Spacer(1, 12))
-                    story.append(KeepTogether(rem_elements))
+                warn_elements.append(warn_table)
+                warn_elements.append(Spacer(1, 12))
+                story.append(KeepTogether(warn_elements))
+            elif has_detections or has_removals:
+                story.append(Paragraph("Violations Data", section_title_style))
+                story.append(Spacer(1, 8))
+            
+            if has_detections:
+                det_elements = []
+                det_elements.append(Paragraph("Detection Events Table", table_sub_section_style))
+                
+                det_rows = [[PH('#'), PH('Timestamp'), PH('Violation Type'), PH('Duration'), PH('Penalty'), PH('Message')]]
+                for i, d in enumerate(detections, 1):
+                    if isinstance(d, dict):
+                        det_rows.append([
+                            P(str(i)),
+                            P(format_timestamp(d.get('timestamp', '')) or 'N/A'),
+                            P(str(d.get('violation_type', 'N/A'))),
+                            P(f"{round(float(d.get('duration', 0)), 2)}s"),
+                            P(f"{round(float(d.get('penalty_applied', 0)), 2)}%"),
+                            P(str(d.get('message', 'N/A'))[:40])
+                        ])
+                
+                det_table = Table(det_rows, colWidths=[0.4*inch, 1.2*inch, 1.1*inch, 0.7*inch, 0.7*inch, 2.4*inch], repeatRows=1)
+                det_table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498DB')),
+                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#EBF5FB')]),
+                    ('LEFTPADDING', (0, 0), (-1, -1), 4),
+                    ('RIGHTPADDING', (0, 0), (-1, -1), 4),
+                    ('TOPPADDING', (0, 0), (-1, -1), 5),
+                    ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+                ]))
+                det_elements.append(det_table)
+                det_elements.append(Spacer(1, 12))
+                story.append(KeepTogether(det_elements))
+            
+            if has_removals:
+                rem_elements = []
+                rem_elements.append(Paragraph("Continuous Removals Table", table_sub_section_style))
+                
+                rem_rows = [[PH('#'), PH('Timestamp'), PH('Violation Type'), PH('Duration'), PH('Penalty'), PH('Message')]]
+                for i, r in enumerate(removals, 1):
+                    if isinstance(r, dict):
+                        rem_rows.append([
+                            P(str(i)),
+                            P(format_timestamp(r.get('timestamp', '')) or 'N/A'),
+                            P(str(r.get('violation_type', 'N/A'))),
+                            P(f"{round(float(r.get('duration', 0)), 2)}s"),
+                            P(str(round(float(r.get('penalty', 0)), 2))),
+                            P(str(r.get('message', 'N/A'))[:40])
+                        ])
+                
+                rem_table = Table(rem_rows, colWidths=[0.4*inch, 1.2*inch, 1.1*inch, 0.7*inch, 0.7*inch, 2.4*inch], repeatRows=1)
+                rem_table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#E74C3C')),
+                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#FADBD8')]),
+                    ('LEFTPADDING', (0, 0), (-1, -1), 4),
+                    ('RIGHTPADDING', (0, 0), (-1, -1), 4),
+                    ('TOPPADDING', (0, 0), (-1, -1), 5),
+                    ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+                ]))
+                rem_elements.append(rem_table)
+                rem_elements.append(Spacer(1, 12))
+                story.append(KeepTogether(rem_elements))
+    
+    # =====================================================================
+    # BREAK SESSIONS
+    # =====================================================================
+    break_sessions_data = safe_json_parse(row[17])
+    if break_sessions_data and isinstance(break_sessions_data, list) and len(break_sessions_data) > 0:
+        bs_elements = []
+        bs_elements.append(Paragraph("Break Sessions", section_title_style))
+        
+        bs_rows = [[PH('Break #'), PH('Start Time'), PH('End Time'), PH('Duration (sec)')]]
+        for i, bs in enumerate(break_sessions_data, 1):
+            if isinstance(bs, dict):
+                start_time = bs.get('start_time', bs.get('start', ''))
+                end_time = bs.get('end_time', bs.get('end', ''))
+                duration_val = bs.get('duration', 0)
+                
+                bs_rows.append([
+                    P(str(i)),
+                    P(format_timestamp(start_time) if start_time else str(start_time)),
+                    P(format_timestamp(end_time) if end_time else str(end_time)),
+                    P(str(round(float(duration_val), 2)) if duration_val else '0')
+                ])
+        
+        bs_table = Table(bs_rows, colWidths=[0.8*inch, 2.2*inch, 2.2*inch, 1.3*inch], repeatRows=1)
+        bs_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#27AE60')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#E8F8F5')]),
+            ('LEFTPADDING', (0, 0), (-1, -1), 6),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ]))
+        bs_elements.append(bs_table)
+        bs_elements.append(Spacer(1, 15))
+        story.append(KeepTogether(bs_elements))
+    
+    # =====================================================================
+    # IDENTITY WARNINGS
+    # =====================================================================
+    identity_warnings_data = safe_json_parse(row[20])
+    if identity_warnings_data and isinstance(identity_warnings_data, list) and len(identity_warnings_data) > 0:
+        iw_elements = []
+        iw_elements.append(Paragraph("Identity Warnings", section_title_style))
+        
+        iw_rows = [[PH('#'), PH('Timestamp'), PH('Cycle #'), PH('Total #'), PH('Consec. Sec'), PH('Similarity'), PH('Unknown Sec'), PH('Cycle'), PH('ID Rem'), PH('Beh Rem')]]
+        for i, iw in enumerate(identity_warnings_data, 1):
+            if isinstance(iw, dict):
+                iw_rows.append([
+                    P(str(i)),
+                    P(format_timestamp(iw.get('timestamp', '')) or 'N/A'),
+                    P(str(iw.get('cycle_warning', iw.get('cycle_warning_number', 'N/A')))),
+                    P(str(iw.get('total_warning', iw.get('total_warning_number', 'N/A')))),
+                    P(str(iw.get('consecutive_seconds', 'N/A'))),
+                    P(str(round(float(iw.get('similarity_score', 0)), 2)) if iw.get('similarity_score') else 'N/A'),
+                    P(str(iw.get('total_unknown_seconds', 'N/A'))),
+                    P(str(iw.get('removal_cycle', 'N/A'))),
+                    P(str(iw.get('identity_removals', 'N/A'))),
+                    P(str(iw.get('behavior_removals', 'N/A')))
+                ])
+        
+        iw_table = Table(iw_rows, colWidths=[0.35*inch, 1.1*inch, 0.5*inch, 0.5*inch, 0.65*inch, 0.65*inch, 0.7*inch, 0.5*inch, 0.5*inch, 0.55*inch], repeatRows=1)
+        iw_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#9B59B6')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5EEF8')]),
+            ('LEFTPADDING', (0, 0), (-1, -1), 3),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 3),
+            ('TOPPADDING', (0, 0), (-1, -1), 5),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+        ]))
+        iw_elements.append(iw_table)
+        iw_elements.append(Spacer(1, 15))
+        story.append(KeepTogether(iw_elements))
+    
+    # =====================================================================
+    # BUILD PDF
+    # =====================================================================
+    def add_page_number(canvas, doc):
+        report_gen.create_header_footer(canvas, doc, "Participant Attendance Report")
+    
+    doc.build(story, onFirstPage=add_page_number, onLaterPages=add_page_number)
+    
+    return buffer.getvalue()
+
+
+@require_http_methods(["GET"])
+@csrf_exempt
+def Generate_Participant_Report_PDF_For_Meeting(request, meeting_id, user_id):
+    """
+    Generate PDF report for a specific participant in a specific meeting
+    
+    GET /api/meetings/<meeting_id>/participants/<user_id>/report/pdf/?occurrence_number=1
+    
+    Reports are rendered by a Celery task and cached per (meeting, user, occurrence,
+    data version), so repeat downloads are served from the cache and a report is
+    only rendered again once the participant's data changes. A cache miss answers
+    202 with the task_id and a poll_url; polling with task_id reports task errors.
+    """
+    try:
+        if not meeting_id or not user_id:
+            return JsonResponse({"success": False, "error": "meeting_id and user_id are required"}, status=BAD_REQUEST_STATUS)
         
-        # =====================================================================
-        # BREAK SESSIONS
-        # =====================================================================
-        break_sessions_data = safe_json_parse(row[17])
-        if break_sessions_data and isinstance(break_sessions_data, list) and len(break_sessions_data) > 0:
-            bs_elements = []
-            bs_elements.append(Paragraph("Break Sessions", section_title_style))
-            
-            bs_rows = [[PH('Break #'), PH('Start Time'), PH('End Time'), PH('Duration (sec)')]]
-            for i, bs in enumerate(break_sessions_data, 1):
-                if isinstance(bs, dict):
-                    start_time = bs.get('start_time', bs.get('start', ''))
-                    end_time = bs.get('end_time', bs.get('end', ''))
-                    duration_val = bs.get('duration', 0)
-                    
-                    bs_rows.append([
-                        P(str(i)),
-                        P(format_timestamp(start_time) if start_time else str(start_time)),
-                        P(format_timestamp(end_time) if end_time else str(end_time)),
-                        P(str(round(float(duration_val), 2)) if duration_val else '0')
-                    ])
-            
-            bs_table = Table(bs_rows, colWidths=[0.8*inch, 2.2*inch, 2.2*inch, 1.3*inch], repeatRows=1)
-            bs_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#27AE60')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#E8F8F5')]),
-                ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ]))
-            bs_elements.append(bs_table)
-            bs_elements.append(Spacer(1, 15))
-            story.append(KeepTogether(bs_elements))
+        # Get occurrence_number from query params (for ScheduleMeeting)
+        occurrence_number_param = request.GET.get('occurrence_number')
         
-        # =====================================================================
-        # IDENTITY WARNINGS
-        # =====================================================================
-        identity_warnings_data = safe_json_parse(row[20])
-        if identity_warnings_data and isinstance(identity_warnings_data, list) and len(identity_warnings_data) > 0:
-            iw_elements = []
-            iw_elements.append(Paragraph("Identity Warnings", section_title_style))
-            
-            iw_rows = [[PH('#'), PH('Timestamp'), PH('Cycle #'), PH('Total #'), PH('Consec. Sec'), PH('Similarity'), PH('Unknown Sec'), PH('Cycle'), PH('ID Rem'), PH('Beh Rem')]]
-            for i, iw in enumerate(identity_warnings_data, 1):
-                if isinstance(iw, dict):
-                    iw_rows.append([
-                        P(str(i)),
-                        P(format_timestamp(iw.get('timestamp', '')) or 'N/A'),
-                        P(str(iw.get('cycle_warning', iw.get('cycle_warning_number', 'N/A')))),
-                        P(str(iw.get('total_warning', iw.get('total_warning_number', 'N/A')))),
-                        P(str(iw.get('consecutive_seconds', 'N/A'))),
-                        P(str(round(float(iw.get('similarity_score', 0)), 2)) if iw.get('similarity_score') else 'N/A'),
-                        P(str(iw.get('total_unknown_seconds', 'N/A'))),
-                        P(str(iw.get('removal_cycle', 'N/A'))),
-                        P(str(iw.get('identity_removals', 'N/A'))),
-                        P(str(iw.get('behavior_removals', 'N/A')))
-                    ])
-            
-            iw_table = Table(iw_rows, colWidths=[0.35*inch, 1.1*inch, 0.5*inch, 0.5*inch, 0.65*inch, 0.65*inch, 0.7*inch, 0.5*inch, 0.5*inch, 0.55*inch], repeatRows=1)
-            iw_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#9B59B6')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5EEF8')]),
-                ('LEFTPADDING', (0, 0), (-1, -1), 3),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-                ('TOPPADDING', (0, 0), (-1, -1), 5),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-            ]))
-            iw_elements.append(iw_table)
-            iw_elements.append(Spacer(1, 15))
-            story.append(KeepTogether(iw_elements))
+        # ✅ DEBUG LOG
+        logger.info(f"📊 PDF Report requested - meeting_id: {meeting_id}, user_id: {user_id}, occurrence_number_param: {occurrence_number_param}")
         
-        # =====================================================================
-        # BUILD PDF
-        # =====================================================================
-        def add_page_number(canvas, doc):
-            report_gen.create_header_footer(canvas, doc, "Participant Attendance Report")
+        with connection.cursor() as cursor:
+            report, error = load_participant_report_data(cursor, meeting_id, user_id, occurrence_number_param)
         
-        doc.build(story, onFirstPage=add_page_number, onLaterPages=add_page_number)
+        if error:
+            return JsonResponse({"error": error[0]}, status=error[1])
         
-        buffer.seek(0)
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+        from core.UserDashBoard.participant_reports import get_or_queue_participant_report
+        status, value = get_or_queue_participant_report(report, request.GET.get('task_id'))
+        if status == 'failed':
+            return JsonResponse({"status": "failed", "error": value}, status=SERVER_ERROR_STATUS)
+        if status == 'pending':
+            poll_params = {'task_id': value}
+            if occurrence_number_param:
+                poll_params['occurrence_number'] = occurrence_number_param
+            response = JsonResponse({
+                "status": "generating",
+                "task_id": value,
+                "poll_url": f"{request.path}?{urlencode(poll_params)}",
+                "message": "Report is being generated, please retry shortly"
+            }, status=ACCEPTED_STATUS)
+            response['Retry-After'] = '5'
+            return response
+        pdf_bytes = value
+        
+        response = HttpResponse(pdf_bytes, content_type='application/pdf')
         
         # Filename without occurrence number
+        full_name = report['full_name'] or ''
         filename = f"participant_report_{full_name.replace(' ', '_')}_{meeting_id[:8]}_{datetime.now().strftime('%Y%m%d')}.pdf"
         
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
         
-        logger.info(f"✅ PDF Report generated successfully for {full_name} - occurrence: {selected_occurrence}")
+        logger.info(f"✅ PDF Report served for {full_name} - occurrence: {report['selected_occurrence']}")
         
         return response
         
@@ -1635,6 +1732,42 @@ def Generate_Participant_Report_PDF_For_Meeting(request, meeting_id, user_id):
         logger.error(traceback.format_exc())
         return JsonResponse({"error": f"Failed to generate report: {str(e)}"}, status=SERVER_ERROR_STATUS)
 
+
+@require_http_methods(["POST"])
+@csrf_exempt
+def Generate_Meeting_Reports_PDF(request, meeting_id):
+    """
+    Queue PDF report generation for every participant of a meeting
+    
+    POST /api/meetings/<meeting_id>/reports/pdf/generate/?occurrence_number=1
+    """
+    try:
+        occurrence_number = request.GET.get('occurrence_number')
+        occurrence_number = int(occurrence_number) if occurrence_number else None
+        
+        from core.UserDashBoard.participant_reports import report_tasks_enabled
+        if not report_tasks_enabled():
+            return JsonResponse({
+                "error": "Bulk report generation needs PARTICIPANT_REPORT_STORAGE=s3 or a CACHE_DIR shared with the Celery workers"
+            }, status=SERVER_ERROR_STATUS)
+
+        from core.scheduler.tasks import generate_meeting_reports_task
+        task = generate_meeting_reports_task.delay(meeting_id, occurrence_number)
+        
+        logger.info(f"📄 Bulk report generation queued for meeting {meeting_id} - task: {task.id}")
+        return JsonResponse({
+            "success": True,
+            "task_id": task.id,
+            "meeting_id": meeting_id,
+            "occurrence_number": occurrence_number
+        }, status=ACCEPTED_STATUS)
+        
+    except ValueError:
+        return JsonResponse({"error": "occurrence_number must be an integer"}, status=BAD_REQUEST_STATUS)
+    except Exception as e:
+        logger.error(f"Error queueing meeting reports: {e}")
+        return JsonResponse({"error": f"Failed to queue reports: {str(e)}"}, status=SERVER_ERROR_STATUS)
+
 @require_http_methods(["GET"])
 @csrf_exempt
 def Get_Participant_Report_For_Meeting(request, meeting_id, user_id):
@@ -2065,38 +2198,52 @@ def get_host_dashboard_overview(request):
         else: return JsonResponse({"error": "Invalid timeframe"}, status=BAD_REQUEST_STATUS)
 
         with connection.cursor() as cursor:
+            # One pre-aggregated row per hosted day and meeting type (see analytics_rollups)
             query = """
                 SELECT 
-                    COUNT(DISTINCT m.ID) as total_meetings,
-                    COUNT(DISTINCT p.User_ID) as total_participants,
-                    AVG(p.Total_Duration_Minutes) as avg_duration_minutes,
-                    AVG(p.Participant_Attendance) as avg_participant_attendance,
-                    AVG(p.Overall_Attendance) as avg_overall_attendance,
-                    AVG(ats.popup_count) as avg_popup_count,
-                    AVG(ats.total_detections) as avg_detections,
-                    AVG(ats.attendance_penalty) as avg_penalty,
-                    AVG(ats.total_break_time_used) as avg_break_time,
-                    AVG(ats.engagement_score) as avg_engagement_score,
-                    SUM(CASE WHEN ats.break_used = 1 THEN 1 ELSE 0 END) as total_breaks_used,
-                    COUNT(CASE WHEN m.Status = 'active' THEN 1 END) as active_meetings,
-                    COUNT(CASE WHEN m.Status = 'ended' THEN 1 END) as ended_meetings,
-                    COUNT(CASE WHEN m.Status = 'scheduled' THEN 1 END) as scheduled_meetings
-                FROM tbl_Meetings m
-                LEFT JOIN tbl_Participants p ON m.ID = p.Meeting_ID
-                LEFT JOIN tbl_Attendance_Sessions ats ON m.ID = ats.Meeting_ID
-                WHERE m.Host_ID = %s AND m.Created_At BETWEEN %s AND %s
+                    SUM(r.Meeting_Count) as total_meetings,
+                    SUM(r.Participant_Count) as total_participants,
+                    SUM(r.Duration_Sum) / NULLIF(SUM(r.Duration_Samples), 0) as avg_duration_minutes,
+                    SUM(r.Attendance_Sum) / NULLIF(SUM(r.Attendance_Samples), 0) as avg_participant_attendance,
+                    SUM(r.Overall_Sum) / NULLIF(SUM(r.Overall_Samples), 0) as avg_overall_attendance,
+                    SUM(r.Popup_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_popup_count,
+                    SUM(r.Detection_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_detections,
+                    SUM(r.Penalty_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_penalty,
+                    SUM(r.Break_Time_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_break_time,
+                    SUM(r.Engagement_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_engagement_score,
+                    SUM(r.Breaks_Used) as total_breaks_used
+                FROM tbl_UserDailyRollups r
+                WHERE r.User_ID = %s AND r.Role = %s AND r.Rollup_Date BETWEEN %s AND %s
             """
             
-            params = [user_id, start_date, end_date]
+            params = [user_id, ROLLUP_ROLE_HOST, start_date.date(), end_date.date()]
             if meeting_type != 'all':
-                query += " AND m.Meeting_Type = %s"
+                query += " AND r.Meeting_Type = %s"
                 params.append(meeting_type)
 
             cursor.execute(query, params)
             result = cursor.fetchone()
 
+            # Meeting counts are read live: rollups only catch up with status changes on reconcile
+            status_query = """
+                SELECT 
+                    COUNT(*) as total_meetings,
+                    COUNT(CASE WHEN m.Status = 'active' THEN 1 END) as active_meetings,
+                    COUNT(CASE WHEN m.Status = 'ended' THEN 1 END) as ended_meetings,
+                    COUNT(CASE WHEN m.Status = 'scheduled' THEN 1 END) as scheduled_meetings
+                FROM tbl_Meetings m
+                WHERE m.Host_ID = %s AND DATE(COALESCE(m.Started_At, m.Created_At)) BETWEEN %s AND %s
+            """
+            status_params = [user_id, start_date.date(), end_date.date()]
+            if meeting_type != 'all':
+                status_query += " AND m.Meeting_Type = %s"
+                status_params.append(meeting_type)
+
+            cursor.execute(status_query, status_params)
+            counts = cursor.fetchone()
+
         data = {
-            "total_meetings": int(result[0] or 0),
+            "total_meetings": int(counts[0] or 0),
             "total_participants": int(result[1] or 0),
             "average_duration_minutes": round(float(result[2] or 0), 2),
             "avg_participant_attendance": round(float(result[3] or 0), 2),
@@ -2110,9 +2257,9 @@ def get_host_dashboard_overview(request):
                 "total_breaks_used": int(result[10] or 0)
             },
             "meeting_status_breakdown": {
-                "active_meetings": int(result[11] or 0),
-                "ended_meetings": int(result[12] or 0),
-                "scheduled_meetings": int(result[13] or 0)
+                "active_meetings": int(counts[1] or 0),
+                "ended_meetings": int(counts[2] or 0),
+                "scheduled_meetings": int(counts[3] or 0)
             }
         }
         
@@ -2121,6 +2268,624 @@ def get_host_dashboard_overview(request):
         logging.error(f"Error fetching enhanced host overview: {e}")
         return JsonResponse({"error": f"Database error: {str(e)}"}, status=SERVER_ERROR_STATUS)
 
+# ==================== COMPREHENSIVE ANALYTICS: SECTION QUERIES ====================
+# Each section is a (query, params) builder plus a row formatter, shared by the
+# paginated JSON response and the streaming NDJSON/CSV export.
+
+COMPREHENSIVE_DEFAULT_LIMIT = 100
+COMPREHENSIVE_MAX_LIMIT = 1000
+COMPREHENSIVE_STREAM_FORMATS = ('ndjson', 'csv')
+# Rows pulled from the server-side cursor per round trip while streaming
+COMPREHENSIVE_STREAM_CHUNK_SIZE = 500
+
+
+def encode_analytics_cursor(session_date, meeting_id, participant_id):
+    """Opaque keyset cursor pointing after a participant_details row"""
+    payload = json.dumps([session_date.isoformat(), meeting_id, participant_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_analytics_cursor(token):
+    """(session_date, meeting_id, participant_id) from encode_analytics_cursor()"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        session_date, meeting_id, participant_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.strptime(session_date, '%Y-%m-%d').date(), str(meeting_id), int(participant_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def parse_comprehensive_filters(request):
+    """Query parameters of the comprehensive analytics endpoint; ValueError on bad input"""
+    # Accept multiple parameter names for flexibility
+    timeframe = request.GET.get('timeframe', '30days')
+    date_range_start = (request.GET.get('dateRange[start]') or
+                       request.GET.get('start_date') or
+                       request.GET.get('startDate'))
+    date_range_end = (request.GET.get('dateRange[end]') or
+                     request.GET.get('end_date') or
+                     request.GET.get('endDate'))
+
+    # Calculate date range with FIXED inclusive boundaries
+    ist_timezone = pytz.timezone('Asia/Kolkata')
+
+    if not date_range_end:
+        end_date = timezone.now().astimezone(ist_timezone)
+    else:
+        end_date = datetime.strptime(date_range_end, '%Y-%m-%d').replace(tzinfo=ist_timezone)
+        end_date = end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
+
+    if not date_range_start:
+        if timeframe == '7days':
+            start_date = end_date - timedelta(days=7)
+        elif timeframe == '30days':
+            start_date = end_date - timedelta(days=30)
+        elif timeframe == '90days':
+            start_date = end_date - timedelta(days=90)
+        elif timeframe == '1year':
+            start_date = end_date - timedelta(days=365)
+        else:
+            start_date = end_date - timedelta(days=30)
+    else:
+        start_date = datetime.strptime(date_range_start, '%Y-%m-%d').replace(tzinfo=ist_timezone)
+        start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    limit = int(request.GET.get('limit', COMPREHENSIVE_DEFAULT_LIMIT))
+    if limit < 1:
+        raise ValueError("limit must be positive")
+
+    export_format = request.GET.get('format', 'json').lower()
+    if export_format not in ('json',) + COMPREHENSIVE_STREAM_FORMATS:
+        raise ValueError(f"Unsupported format: {export_format}")
+
+    # page/OFFSET was replaced by the keyset cursor; only the first page is still addressable by number
+    if int(request.GET.get('page', 1)) > 1:
+        raise ValueError("page is no longer supported, pass pagination.next_cursor as cursor")
+
+    cursor_token = request.GET.get('cursor')
+
+    return {
+        'user_id': request.GET.get('user_id') or request.GET.get('userId'),
+        'meeting_id': request.GET.get('meeting_id') or request.GET.get('meetingId'),
+        'timeframe': timeframe,
+        'meeting_type': request.GET.get('meetingType') or request.GET.get('meeting_type', 'all'),
+        'analytics_type': request.GET.get('analytics_type', 'all'),
+        'start_date': start_date,
+        'end_date': end_date,
+        'limit': min(limit, COMPREHENSIVE_MAX_LIMIT),
+        'after': decode_analytics_cursor(cursor_token) if cursor_token else None,
+        'format': export_format,
+    }
+
+
+def participant_details_query(filters, after=None, limit=None):
+    """
+    Participant rows of the range, newest first, in keyset order
+    (session date, meeting, participant row) so pages never use OFFSET.
+    """
+    query = """
+        SELECT
+            p.ID as participant_id,
+            p.Meeting_ID,
+            p.User_ID,
+            p.Full_Name,
+            p.Role,
+            p.Meeting_Type,
+            p.Join_Times,
+            p.Leave_Times,
+            p.Total_Duration_Minutes,
+            p.Total_Sessions,
+            p.End_Meeting_Time,
+            p.Is_Currently_Active,
+            p.Attendance_Percentagebasedon_host,
+            p.Participant_Attendance,
+            p.Overall_Attendance,
+            ats.popup_count,
+            ats.detection_counts,
+            ats.violation_start_times as violation_start_time,
+            ats.total_detections,
+            ats.attendance_penalty,
+            ats.break_used,
+            ats.total_break_time_used,
+            ats.engagement_score,
+            ats.attendance_percentage as session_attendance_percentage,
+            ats.session_active,
+            ats.break_count,
+            ats.focus_score,
+            ats.violation_severity_score,
+            ats.active_participation_time,
+            ats.total_session_time,
+            m.Meeting_Name,
+            m.Status as meeting_status,
+            m.Created_At as meeting_created_at,
+            m.Started_At,
+            m.Ended_At,
+            m.Host_ID,
+            m.Meeting_Link,
+            m.Is_Recording_Enabled,
+            m.Waiting_Room_Enabled,
+            p.session_start_time
+        FROM tbl_Participants p
+        LEFT JOIN tbl_Attendance_Sessions ats ON p.Meeting_ID = ats.Meeting_ID AND p.User_ID = ats.User_ID
+        LEFT JOIN tbl_Meetings m ON p.Meeting_ID = m.ID
+        WHERE p.Role = 'participant' AND p.session_start_time BETWEEN %s AND %s
+    """
+
+    params = [filters['start_date'].date(), filters['end_date'].date()]
+    if filters['user_id']:
+        query += " AND p.User_ID = %s"
+        params.append(filters['user_id'])
+    if filters['meeting_id']:
+        query += " AND p.Meeting_ID = %s"
+        params.append(filters['meeting_id'])
+    if filters['meeting_type'] != 'all':
+        query += " AND p.Meeting_Type = %s"
+        params.append(filters['meeting_type'])
+    if after:
+        after_date, after_meeting_id, after_participant_id = after
+        query += """ AND (p.session_start_time < %s
+            OR (p.session_start_time = %s AND (p.Meeting_ID < %s
+                OR (p.Meeting_ID = %s AND p.ID < %s))))"""
+        params.extend([after_date, after_date, after_meeting_id, after_meeting_id, after_participant_id])
+
+    query += " ORDER BY p.session_start_time DESC, p.Meeting_ID DESC, p.ID DESC"
+    if limit:
+        query += " LIMIT %s"
+        params.append(limit)
+    return query, params
+
+
+def participant_details_cursor(row):
+    """Keyset cursor for the page that starts after this participant_details row"""
+    return encode_analytics_cursor(row[39], row[1], row[0])
+
+
+def participant_detail_record(row):
+    return {
+        "participant_id": row[0],
+        "meeting_id": row[1],
+        "user_id": row[2],
+        "full_name": row[3],
+        "role": row[4],
+        "meeting_type": row[5],
+        "duration_analysis": {
+            "join_times": json.loads(row[6]) if row[6] else [],
+            "leave_times": json.loads(row[7]) if row[7] else [],
+            "total_duration_minutes": float(row[8] or 0),
+            "total_sessions": int(row[9] or 0),
+            "end_meeting_time": row[10].isoformat() if row[10] else None,
+            "is_currently_active": bool(row[11])
+        },
+        "participant_attendance_data": {
+            "attendance_percentage_based_on_host": float(row[12] or 0),
+            "participant_attendance": float(row[13] or 0),
+            "overall_attendance": float(row[14] or 0)
+        },
+        "attendance_session": {
+            "popup_count": int(row[15] or 0),
+            "detection_counts": row[16],
+            "violation_start_time": row[17],
+            "total_detections": int(row[18] or 0),
+            "attendance_penalty": float(row[19] or 0),
+            "break_used": bool(row[20]),
+            "total_break_time_used": int(row[21] or 0),
+            "engagement_score": int(row[22] or 0),
+            "attendance_percentage": float(row[23] or 0),
+            "session_active": bool(row[24]),
+            "break_count": int(row[25] or 0),
+            "focus_score": float(row[26] or 0),
+            "violation_severity_score": float(row[27] or 0),
+            "active_participation_time": int(row[28] or 0),
+            "total_session_time": int(row[29] or 0)
+        },
+        "meeting_info": {
+            "meeting_name": row[30],
+            "status": row[31],
+            "created_at": row[32].isoformat() if row[32] else None,
+            "started_at": row[33].isoformat() if row[33] else None,
+            "ended_at": row[34].isoformat() if row[34] else None,
+            "host_id": row[35],
+            "meeting_link": row[36],
+            "is_recording_enabled": bool(row[37]),
+            "waiting_room_enabled": bool(row[38])
+        }
+    }
+
+
+def host_analytics_query(filters):
+    query = """
+        SELECT
+            r.User_ID as host_id,
+            r.Meeting_Type,
+            SUM(r.Meeting_Count) as total_meetings_hosted,
+            SUM(r.Active_Count) as active_meetings,
+            SUM(r.Ended_Count) as ended_meetings,
+            SUM(r.Scheduled_Count) as scheduled_meetings,
+            SUM(r.Participant_Count) as total_unique_participants,
+            SUM(r.Duration_Sum) / NULLIF(SUM(r.Duration_Samples), 0) as avg_meeting_duration_minutes,
+            SUM(r.Attendance_Sum) / NULLIF(SUM(r.Attendance_Samples), 0) as avg_participant_attendance,
+            SUM(r.Overall_Sum) / NULLIF(SUM(r.Overall_Samples), 0) as avg_overall_attendance,
+            SUM(r.Duration_Sum) as total_hosting_time_minutes,
+            MIN(r.First_Meeting_At) as first_meeting_created,
+            MAX(r.Last_Meeting_At) as last_meeting_created,
+            SUM(r.Popup_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_popup_count,
+            SUM(r.Detection_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_total_detections,
+            SUM(r.Penalty_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_attendance_penalty,
+            SUM(r.Engagement_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_engagement_score,
+            SUM(r.Breaks_Used) as total_breaks_used
+        FROM tbl_UserDailyRollups r
+        WHERE r.Role = %s AND r.Rollup_Date BETWEEN %s AND %s
+    """
+
+    params = [ROLLUP_ROLE_HOST, filters['start_date'].date(), filters['end_date'].date()]
+    if filters['user_id']:
+        query += " AND r.User_ID = %s"
+        params.append(filters['user_id'])
+    if filters['meeting_type'] != 'all':
+        query += " AND r.Meeting_Type = %s"
+        params.append(filters['meeting_type'])
+
+    query += " GROUP BY r.User_ID, r.Meeting_Type ORDER BY total_meetings_hosted DESC"
+    return query, params
+
+
+def host_analytics_record(row):
+    return {
+        "host_id": row[0],
+        "meeting_type": row[1],
+        "meeting_counts": {
+            "total_meetings_hosted": int(row[2] or 0),
+            "active_meetings": int(row[3] or 0),
+            "ended_meetings": int(row[4] or 0),
+            "scheduled_meetings": int(row[5] or 0),
+            "completion_rate": round((int(row[4] or 0) / int(row[2] or 1) * 100), 2)
+        },
+        "participant_analytics": {
+            "total_unique_participants": int(row[6] or 0),
+            "avg_meeting_duration_minutes": round(float(row[7] or 0), 2),
+            "avg_participant_attendance": round(float(row[8] or 0), 2),
+            "avg_overall_attendance": round(float(row[9] or 0), 2),
+            "total_hosting_time_minutes": round(float(row[10] or 0), 2)
+        },
+        "activity_period": {
+            "first_meeting_created": row[11].isoformat() if row[11] else None,
+            "last_meeting_created": row[12].isoformat() if row[12] else None
+        },
+        "attendance_monitoring": {
+            "avg_popup_count": round(float(row[13] or 0), 2),
+            "avg_total_detections": round(float(row[14] or 0), 2),
+            "avg_attendance_penalty": round(float(row[15] or 0), 2),
+            "avg_engagement_score": round(float(row[16] or 0), 2),
+            "total_breaks_used": int(row[17] or 0)
+        }
+    }
+
+
+def participant_summary_query(filters):
+    query = """
+        SELECT
+            r.User_ID,
+            MAX(u.full_name) as full_name,
+            SUM(r.Meeting_Count) as total_meetings_attended,
+            SUM(r.Duration_Sum) as total_participation_time_minutes,
+            SUM(r.Duration_Sum) / NULLIF(SUM(r.Duration_Samples), 0) as avg_meeting_duration_minutes,
+            SUM(r.Attendance_Sum) / NULLIF(SUM(r.Attendance_Samples), 0) as avg_participant_attendance,
+            SUM(r.Overall_Sum) / NULLIF(SUM(r.Overall_Samples), 0) as avg_overall_attendance,
+            SUM(r.Active_Count) as active_meetings,
+            SUM(r.Sessions_Sum) / NULLIF(SUM(r.Duration_Samples), 0) as avg_sessions_per_meeting,
+            r.Meeting_Type,
+            MIN(r.First_Meeting_At) as first_meeting_joined,
+            MAX(r.Last_Meeting_At) as last_meeting_joined,
+            SUM(r.Popup_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_popup_count,
+            SUM(r.Detection_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_total_detections,
+            SUM(r.Penalty_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_attendance_penalty,
+            SUM(r.Break_Time_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_break_time_used,
+            SUM(r.Engagement_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_engagement_score,
+            SUM(r.Focus_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_focus_score,
+            SUM(r.Breaks_Used) as total_breaks_taken
+        FROM tbl_UserDailyRollups r
+        LEFT JOIN tbl_Users u ON u.ID = r.User_ID
+        WHERE r.Role = %s AND r.Rollup_Date BETWEEN %s AND %s
+    """
+
+    params = [ROLLUP_ROLE_PARTICIPANT, filters['start_date'].date(), filters['end_date'].date()]
+    # CRITICAL FIX: Always filter by user_id when provided
+    if filters['user_id']:
+        query += " AND r.User_ID = %s"
+        params.append(filters['user_id'])
+    if filters['meeting_type'] != 'all':
+        query += " AND r.Meeting_Type = %s"
+        params.append(filters['meeting_type'])
+
+    query += " GROUP BY r.User_ID, r.Meeting_Type ORDER BY total_meetings_attended DESC"
+    return query, params
+
+
+def participant_summary_record(row):
+    return {
+        "user_id": row[0],
+        "full_name": row[1],
+        "meeting_participation": {
+            "total_meetings_attended": int(row[2] or 0),
+            "total_participation_time_minutes": round(float(row[3] or 0), 2),
+            "avg_meeting_duration_minutes": round(float(row[4] or 0), 2),
+            "avg_participant_attendance": round(float(row[5] or 0), 2),
+            "avg_overall_attendance": round(float(row[6] or 0), 2),
+            "active_meetings": int(row[7] or 0),
+            "avg_sessions_per_meeting": round(float(row[8] or 0), 2)
+        },
+        "meeting_type": row[9],
+        "activity_period": {
+            "first_meeting_joined": row[10].isoformat() if row[10] else None,
+            "last_meeting_joined": row[11].isoformat() if row[11] else None
+        },
+        "attendance_analytics": {
+            "avg_popup_count": round(float(row[12] or 0), 2),
+            "avg_total_detections": round(float(row[13] or 0), 2),
+            "avg_attendance_penalty": round(float(row[14] or 0), 2),
+            "avg_break_time_used": round(float(row[15] or 0), 2),
+            "avg_engagement_score": round(float(row[16] or 0), 2),
+            "avg_focus_score": round(float(row[17] or 0), 2),
+            "total_breaks_taken": int(row[18] or 0)
+        }
+    }
+
+
+def meeting_analytics_query(filters):
+    meeting_filters = ""
+    params = [filters['start_date'].date(), filters['end_date'].date()]
+    if filters['meeting_id']:
+        meeting_filters += " AND mr.Meeting_ID = %s"
+        params.append(filters['meeting_id'])
+    if filters['user_id']:
+        meeting_filters += " AND mr.Host_ID = %s"
+        params.append(filters['user_id'])
+    if filters['meeting_type'] != 'all':
+        meeting_filters += " AND mr.Meeting_Type = %s"
+        params.append(filters['meeting_type'])
+
+    # Occurrence rollups of the range, combined per meeting
+    query = f"""
+        SELECT
+            m.ID as meeting_id,
+            m.Meeting_Name,
+            m.Meeting_Type,
+            m.Host_ID,
+            m.Status,
+            m.Created_At,
+            m.Started_At,
+            m.Ended_At,
+            m.Meeting_Link,
+            m.Is_Recording_Enabled,
+            m.Waiting_Room_Enabled,
+            r.total_participants,
+            r.currently_active_participants,
+            r.avg_participant_duration_minutes,
+            r.avg_participant_attendance,
+            r.total_meeting_duration_minutes,
+            r.longest_participant_duration,
+            r.shortest_participant_duration,
+            r.avg_popup_count,
+            r.avg_total_detections,
+            r.avg_attendance_penalty,
+            r.avg_engagement_score,
+            r.total_breaks_in_meeting
+        FROM (
+            SELECT
+                mr.Meeting_ID,
+                SUM(mr.Participant_Count) as total_participants,
+                SUM(mr.Active_Participant_Count) as currently_active_participants,
+                SUM(mr.Duration_Sum) / NULLIF(SUM(mr.Duration_Samples), 0) as avg_participant_duration_minutes,
+                SUM(mr.Attendance_Sum) / NULLIF(SUM(mr.Attendance_Samples), 0) as avg_participant_attendance,
+                SUM(mr.Duration_Sum) as total_meeting_duration_minutes,
+                MAX(mr.Duration_Max) as longest_participant_duration,
+                MIN(mr.Duration_Min) as shortest_participant_duration,
+                SUM(mr.Popup_Sum) / NULLIF(SUM(mr.Monitored_Count), 0) as avg_popup_count,
+                SUM(mr.Detection_Sum) / NULLIF(SUM(mr.Monitored_Count), 0) as avg_total_detections,
+                SUM(mr.Penalty_Sum) / NULLIF(SUM(mr.Monitored_Count), 0) as avg_attendance_penalty,
+                SUM(mr.Engagement_Sum) / NULLIF(SUM(mr.Monitored_Count), 0) as avg_engagement_score,
+                SUM(mr.Breaks_Used) as total_breaks_in_meeting
+            FROM tbl_MeetingRollups mr
+            WHERE mr.Meeting_Date BETWEEN %s AND %s{meeting_filters}
+            GROUP BY mr.Meeting_ID
+        ) r
+        JOIN tbl_Meetings m ON m.ID = r.Meeting_ID
+        ORDER BY m.Created_At DESC
+    """
+    return query, params
+
+
+def meeting_analytics_record(row):
+    return {
+        "meeting_id": row[0],
+        "meeting_name": row[1],
+        "meeting_type": row[2],
+        "host_id": row[3],
+        "status": row[4],
+        "created_at": row[5].isoformat() if row[5] else None,
+        "started_at": row[6].isoformat() if row[6] else None,
+        "ended_at": row[7].isoformat() if row[7] else None,
+        "meeting_link": row[8],
+        "is_recording_enabled": bool(row[9]),
+        "waiting_room_enabled": bool(row[10]),
+        "participant_analytics": {
+            "total_participants": int(row[11] or 0),
+            "currently_active_participants": int(row[12] or 0),
+            "avg_participant_duration_minutes": round(float(row[13] or 0), 2),
+            "avg_participant_attendance": round(float(row[14] or 0), 2),
+            "total_meeting_duration_minutes": round(float(row[15] or 0), 2),
+            "longest_participant_duration_minutes": round(float(row[16] or 0), 2),
+            "shortest_participant_duration_minutes": round(float(row[17] or 0), 2)
+        },
+        "attendance_analytics": {
+            "avg_popup_count": round(float(row[18] or 0), 2),
+            "avg_total_detections": round(float(row[19] or 0), 2),
+            "avg_attendance_penalty": round(float(row[20] or 0), 2),
+            "avg_engagement_score": round(float(row[21] or 0), 2),
+            "total_breaks_in_meeting": int(row[22] or 0)
+        }
+    }
+
+
+def build_overall_summary(cursor, filters):
+    """User-specific summary when user_id is given, global (admin) summary otherwise"""
+    user_id = filters['user_id']
+    start_date, end_date = filters['start_date'], filters['end_date']
+
+    # FIXED: This now calculates stats ONLY for the specified user
+    if user_id:
+        # Get user-specific participant stats
+        cursor.execute("""
+            SELECT
+                SUM(r.Meeting_Count) as total_meetings_attended,
+                SUM(r.Duration_Sum) as total_duration_minutes,
+                SUM(r.Attendance_Sum) / NULLIF(SUM(r.Attendance_Samples), 0) as avg_participant_attendance,
+                SUM(r.Overall_Sum) / NULLIF(SUM(r.Overall_Samples), 0) as avg_overall_attendance,
+                SUM(r.Engagement_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_engagement_score,
+                SUM(r.Penalty_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_penalty
+            FROM tbl_UserDailyRollups r
+            WHERE r.User_ID = %s AND r.Role = %s AND r.Rollup_Date BETWEEN %s AND %s
+        """, [user_id, ROLLUP_ROLE_PARTICIPANT, start_date.date(), end_date.date()])
+
+        participant_summary_row = cursor.fetchone()
+
+        # Get user-specific host stats
+        cursor.execute("""
+            SELECT
+                SUM(r.Meeting_Count) as total_meetings_hosted,
+                SUM(r.Participant_Count) as total_participants_in_hosted
+            FROM tbl_UserDailyRollups r
+            WHERE r.User_ID = %s AND r.Role = %s AND r.Rollup_Date BETWEEN %s AND %s
+        """, [user_id, ROLLUP_ROLE_HOST, start_date.date(), end_date.date()])
+
+        host_summary_row = cursor.fetchone()
+
+        return {
+            "total_meetings": int(participant_summary_row[0] or 0),
+            "total_hosted_meetings": int(host_summary_row[0] or 0),
+            "total_participants": int(host_summary_row[1] or 0),
+            "total_duration_minutes": round(float(participant_summary_row[1] or 0), 2),
+            "total_duration_hours": round(float(participant_summary_row[1] or 0) / 60, 2),
+            "avg_participant_attendance": round(float(participant_summary_row[2] or 0), 2),
+            "avg_overall_attendance": round(float(participant_summary_row[3] or 0), 2),
+            "avg_engagement_score": round(float(participant_summary_row[4] or 0), 2),
+            "avg_penalty": round(float(participant_summary_row[5] or 0), 2),
+            "date_range": {
+                "start": start_date.isoformat(),
+                "end": end_date.isoformat()
+            }
+        }
+
+    # Global stats (admin view)
+    cursor.execute("""
+        SELECT
+            COUNT(DISTINCT r.Meeting_ID) as total_meetings,
+            COUNT(DISTINCT r.Host_ID) as total_hosts,
+            SUM(r.Participant_Count) as total_participants,
+            SUM(r.Duration_Sum) / NULLIF(SUM(r.Duration_Samples), 0) as avg_duration_minutes,
+            SUM(r.Attendance_Sum) / NULLIF(SUM(r.Attendance_Samples), 0) as avg_participant_attendance,
+            SUM(r.Overall_Sum) / NULLIF(SUM(r.Overall_Samples), 0) as avg_overall_attendance,
+            SUM(r.Duration_Sum) as total_duration_minutes
+        FROM tbl_MeetingRollups r
+        WHERE r.Meeting_Date BETWEEN %s AND %s
+    """, [start_date.date(), end_date.date()])
+
+    summary_row = cursor.fetchone()
+    return {
+        "total_meetings": int(summary_row[0] or 0),
+        "total_hosts": int(summary_row[1] or 0),
+        "total_participants": int(summary_row[2] or 0),
+        "avg_duration_minutes": round(float(summary_row[3] or 0), 2),
+        "avg_participant_attendance": round(float(summary_row[4] or 0), 2),
+        "avg_overall_attendance": round(float(summary_row[5] or 0), 2),
+        "total_duration_hours": round(float(summary_row[6] or 0) / 60, 2),
+        "date_range": {
+            "start": start_date.isoformat(),
+            "end": end_date.isoformat()
+        }
+    }
+
+
+def flatten_record(record, prefix=''):
+    """Nested section record -> flat {"a.b": value} row for CSV"""
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_record(value, prefix=f"{name}."))
+        elif isinstance(value, list):
+            flat[name] = ';'.join(str(item) for item in value)
+        else:
+            flat[name] = value
+    return flat
+
+
+def stream_comprehensive_analytics(filters):
+    """
+    Yield the export straight off a server-side cursor, one fetchmany() chunk at a
+    time, so memory stays flat however large the range is.
+    ndjson: overall_summary, then every requested section, one {"section", "data"} per line.
+    csv: participant_details only, one flattened row per participant record.
+    Must be served by the WSGI deployment: under ASGI, StreamingHttpResponse collects a
+    sync iterator into a list before sending it.
+    """
+    analytics_type = filters['analytics_type']
+    export_format = filters['format']
+
+    sections = []
+    if analytics_type in ['all', 'participant']:
+        sections.append(('participant_details', participant_details_query(filters), participant_detail_record))
+    if export_format == 'ndjson':
+        if analytics_type in ['all', 'participant']:
+            sections.append(('participant_summary', participant_summary_query(filters), participant_summary_record))
+        if analytics_type in ['all', 'host']:
+            sections.append(('host_analytics', host_analytics_query(filters), host_analytics_record))
+        if analytics_type in ['all', 'meeting']:
+            sections.append(('meeting_analytics', meeting_analytics_query(filters), meeting_analytics_record))
+
+        with connection.cursor() as cursor:
+            summary = build_overall_summary(cursor, filters)
+        yield json.dumps({"section": "overall_summary", "data": summary}, default=str) + "\n"
+
+    csv_buffer = StringIO()
+    csv_writer = None
+    total_rows = 0
+
+    connection.ensure_connection()
+    for section, (query, params), to_record in sections:
+        # Unbuffered cursor: rows stay on the server until fetched. No other query may
+        # run on this connection until it is closed, so sections run one after another.
+        raw_cursor = connection.connection.cursor(SSCursor)
+        try:
+            raw_cursor.execute(query, params)
+            while True:
+                rows = raw_cursor.fetchmany(COMPREHENSIVE_STREAM_CHUNK_SIZE)
+                if not rows:
+                    break
+                total_rows += len(rows)
+
+                if export_format == 'ndjson':
+                    yield ''.join(
+                        json.dumps({"section": section, "data": to_record(row)}, default=str) + "\n"
+                        for row in rows
+                    )
+                    continue
+
+                for row in rows:
+                    flat = flatten_record(to_record(row))
+                    if csv_writer is None:
+                        csv_writer = csv.DictWriter(csv_buffer, fieldnames=list(flat.keys()))
+                        csv_writer.writeheader()
+                    csv_writer.writerow(flat)
+                yield csv_buffer.getvalue()
+                csv_buffer.seek(0)
+                csv_buffer.truncate(0)
+        finally:
+            raw_cursor.close()
+
+    logging.info(f"📤 Streamed comprehensive analytics ({export_format}): {total_rows} rows")
+
+
 @require_http_methods(["GET"])
 @csrf_exempt
 def get_comprehensive_meeting_analytics(request):
@@ -2128,52 +2893,38 @@ def get_comprehensive_meeting_analytics(request):
     FIXED: Comprehensive analytics that properly filters by user_id
     - Returns ONLY meetings where the specific user participated (not ALL meetings)
     - Properly calculates user-specific stats
+    - participant_details is keyset-paginated: send pagination.next_cursor back as ?cursor=
+    - ?format=ndjson or ?format=csv streams the whole range instead of one page
     """
     try:
-        # Accept multiple parameter names for flexibility
-        user_id = request.GET.get('user_id') or request.GET.get('userId')
-        meeting_id = request.GET.get('meeting_id') or request.GET.get('meetingId')
-        timeframe = request.GET.get('timeframe', '30days')
-        meeting_type = request.GET.get('meetingType') or request.GET.get('meeting_type', 'all')
-        analytics_type = request.GET.get('analytics_type', 'all')
-        page = int(request.GET.get('page', 1))
-        limit = int(request.GET.get('limit', 100))
-        
-        # Handle date range parameters
-        date_range_start = (request.GET.get('dateRange[start]') or 
-                           request.GET.get('start_date') or
-                           request.GET.get('startDate'))
-        date_range_end = (request.GET.get('dateRange[end]') or 
-                         request.GET.get('end_date') or
-                         request.GET.get('endDate'))
-
-        logging.debug(f"Comprehensive analytics request - user_id: {user_id}, meeting_id: {meeting_id}, analytics_type: {analytics_type}")
-
-        # Calculate date range with FIXED inclusive boundaries
-        ist_timezone = pytz.timezone('Asia/Kolkata')
-        
-        if not date_range_end:
-            end_date = timezone.now().astimezone(ist_timezone)
-        else:
-            end_date = datetime.strptime(date_range_end, '%Y-%m-%d').replace(tzinfo=ist_timezone)
-            end_date = end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
-            
-        if not date_range_start:
-            if timeframe == '7days':
-                start_date = end_date - timedelta(days=7)
-            elif timeframe == '30days':
-                start_date = end_date - timedelta(days=30)
-            elif timeframe == '90days':
-                start_date = end_date - timedelta(days=90)
-            elif timeframe == '1year':
-                start_date = end_date - timedelta(days=365)
+        try:
+            filters = parse_comprehensive_filters(request)
+        except ValueError as e:
+            return JsonResponse({"error": f"Invalid parameters: {str(e)}"}, status=BAD_REQUEST_STATUS)
+
+        user_id = filters['user_id']
+        meeting_id = filters['meeting_id']
+        timeframe = filters['timeframe']
+        meeting_type = filters['meeting_type']
+        analytics_type = filters['analytics_type']
+        start_date = filters['start_date']
+        end_date = filters['end_date']
+        limit = filters['limit']
+
+        logging.debug(f"Comprehensive analytics request - user_id: {user_id}, meeting_id: {meeting_id}, analytics_type: {analytics_type}, format: {filters['format']}")
+
+        # ==================== STREAMING EXPORT ====================
+        if filters['format'] in COMPREHENSIVE_STREAM_FORMATS:
+            if filters['format'] == 'csv':
+                response = StreamingHttpResponse(stream_comprehensive_analytics(filters), content_type='text/csv')
+                response['Content-Disposition'] = (
+                    f'attachment; filename="comprehensive_analytics_{start_date:%Y%m%d}_{end_date:%Y%m%d}.csv"'
+                )
             else:
-                start_date = end_date - timedelta(days=30)
-        else:
-            start_date = datetime.strptime(date_range_start, '%Y-%m-%d').replace(tzinfo=ist_timezone)
-            start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+                response = StreamingHttpResponse(stream_comprehensive_analytics(filters), content_type='application/x-ndjson')
+            return response
 
-        offset = (page - 1) * limit
+        next_cursor = None
 
         with connection.cursor() as cursor:
             
@@ -2309,479 +3060,31 @@ def get_comprehensive_meeting_analytics(request):
             
             # ==================== 1. PARTICIPANT DURATION AND ATTENDANCE ANALYTICS ====================
             if analytics_type in ['all', 'participant']:
-                participant_analytics_query = """
-                    SELECT 
-                        p.ID as participant_id,
-                        p.Meeting_ID,
-                        p.User_ID,
-                        p.Full_Name,
-                        p.Role,
-                        p.Meeting_Type,
-                        p.Join_Times,
-                        p.Leave_Times,
-                        p.Total_Duration_Minutes,
-                        p.Total_Sessions,
-                        p.End_Meeting_Time,
-                        p.Is_Currently_Active,
-                        p.Attendance_Percentagebasedon_host,
-                        p.Participant_Attendance,
-                        p.Overall_Attendance,
-                        ats.popup_count,
-                        ats.detection_counts,
-                        ats.violation_start_times as violation_start_time,
-                        ats.total_detections,
-                        ats.attendance_penalty,
-                        ats.break_used,
-                        ats.total_break_time_used,
-                        ats.engagement_score,
-                        ats.attendance_percentage as session_attendance_percentage,
-                        ats.session_active,
-                        ats.break_count,
-                        ats.focus_score,
-                        ats.violation_severity_score,
-                        ats.active_participation_time,
-                        ats.total_session_time,
-                        m.Meeting_Name,
-                        m.Status as meeting_status,
-                        m.Created_At as meeting_created_at,
-                        m.Started_At,
-                        m.Ended_At,
-                        m.Host_ID,
-                        m.Meeting_Link,
-                        m.Is_Recording_Enabled,
-                        m.Waiting_Room_Enabled
-                    FROM tbl_Participants p
-                    LEFT JOIN tbl_Attendance_Sessions ats ON p.Meeting_ID = ats.Meeting_ID AND p.User_ID = ats.User_ID
-                    LEFT JOIN tbl_Meetings m ON p.Meeting_ID = m.ID
-                    LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
-                    LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
-                    WHERE p.Role = 'participant'
-                """
-                
-                params = []
-                if user_id:
-                    participant_analytics_query += " AND p.User_ID = %s"
-                    params.append(user_id)
-                if meeting_id:
-                    participant_analytics_query += " AND p.Meeting_ID = %s"
-                    params.append(meeting_id)
-                if meeting_type != 'all':
-                    participant_analytics_query += " AND p.Meeting_Type = %s"
-                    params.append(meeting_type)
-                
-                participant_analytics_query += """ AND COALESCE(
-                    m.Started_At,
-                    sm.start_time,
-                    cm.startTime,
-                    m.Created_At
-                ) BETWEEN %s AND %s"""
-                params.extend([start_date, end_date])
-                
-                participant_analytics_query += " ORDER BY m.Created_At DESC LIMIT %s OFFSET %s"
-                params.extend([limit, offset])
-                
-                cursor.execute(participant_analytics_query, params)
-                for row in cursor.fetchall():
-                    participant_data.append({
-                        "participant_id": row[0],
-                        "meeting_id": row[1],
-                        "user_id": row[2],
-                        "full_name": row[3],
-                        "role": row[4],
-                        "meeting_type": row[5],
-                        "duration_analysis": {
-                            "join_times": json.loads(row[6]) if row[6] else [],
-                            "leave_times": json.loads(row[7]) if row[7] else [],
-                            "total_duration_minutes": float(row[8] or 0),
-                            "total_sessions": int(row[9] or 0),
-                            "end_meeting_time": row[10].isoformat() if row[10] else None,
-                            "is_currently_active": bool(row[11])
-                        },
-                        "participant_attendance_data": {
-                            "attendance_percentage_based_on_host": float(row[12] or 0),
-                            "participant_attendance": float(row[13] or 0),
-                            "overall_attendance": float(row[14] or 0)
-                        },
-                        "attendance_session": {
-                            "popup_count": int(row[15] or 0),
-                            "detection_counts": row[16],
-                            "violation_start_time": row[17],
-                            "total_detections": int(row[18] or 0),
-                            "attendance_penalty": float(row[19] or 0),
-                            "break_used": bool(row[20]),
-                            "total_break_time_used": int(row[21] or 0),
-                            "engagement_score": int(row[22] or 0),
-                            "attendance_percentage": float(row[23] or 0),
-                            "session_active": bool(row[24]),
-                            "break_count": int(row[25] or 0),
-                            "focus_score": float(row[26] or 0),
-                            "violation_severity_score": float(row[27] or 0),
-                            "active_participation_time": int(row[28] or 0),
-                            "total_session_time": int(row[29] or 0)
-                        },
-                        "meeting_info": {
-                            "meeting_name": row[30],
-                            "status": row[31],
-                            "created_at": row[32].isoformat() if row[32] else None,
-                            "started_at": row[33].isoformat() if row[33] else None,
-                            "ended_at": row[34].isoformat() if row[34] else None,
-                            "host_id": row[35],
-                            "meeting_link": row[36],
-                            "is_recording_enabled": bool(row[37]),
-                            "waiting_room_enabled": bool(row[38])
-                        }
-                    })
+                # Fetch one extra row to know whether another page follows
+                cursor.execute(*participant_details_query(filters, after=filters['after'], limit=limit + 1))
+                rows = cursor.fetchall()
+                participant_data = [participant_detail_record(row) for row in rows[:limit]]
+                if len(rows) > limit:
+                    next_cursor = participant_details_cursor(rows[limit - 1])
 
             # ==================== 2. HOST ANALYTICS ====================
             if analytics_type in ['all', 'host']:
-                host_analytics_query = """
-                    SELECT 
-                        m.Host_ID,
-                        m.Meeting_Type,
-                        COUNT(DISTINCT m.ID) as total_meetings_hosted,
-                        COUNT(DISTINCT CASE WHEN m.Status = 'active' THEN m.ID END) as active_meetings,
-                        COUNT(DISTINCT CASE WHEN m.Status = 'ended' THEN m.ID END) as ended_meetings,
-                        COUNT(DISTINCT CASE WHEN m.Status = 'scheduled' THEN m.ID END) as scheduled_meetings,
-                        COUNT(DISTINCT p.User_ID) as total_unique_participants,
-                        AVG(p.Total_Duration_Minutes) as avg_meeting_duration_minutes,
-                        AVG(p.Participant_Attendance) as avg_participant_attendance,
-                        AVG(p.Overall_Attendance) as avg_overall_attendance,
-                        SUM(p.Total_Duration_Minutes) as total_hosting_time_minutes,
-                        MIN(m.Created_At) as first_meeting_created,
-                        MAX(m.Created_At) as last_meeting_created,
-                        AVG(ats.popup_count) as avg_popup_count,
-                        AVG(ats.total_detections) as avg_total_detections,
-                        AVG(ats.attendance_penalty) as avg_attendance_penalty,
-                        AVG(ats.engagement_score) as avg_engagement_score,
-                        COUNT(CASE WHEN ats.break_used = 1 THEN 1 END) as total_breaks_used
-                    FROM tbl_Meetings m
-                    LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
-                    LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
-                    LEFT JOIN tbl_Participants p ON m.ID = p.Meeting_ID
-                    LEFT JOIN tbl_Attendance_Sessions ats ON m.ID = ats.Meeting_ID
-                    WHERE 1=1
-                """
-                
-                params = []
-                if user_id:
-                    host_analytics_query += " AND m.Host_ID = %s"
-                    params.append(user_id)
-                if meeting_type != 'all':
-                    host_analytics_query += " AND m.Meeting_Type = %s"
-                    params.append(meeting_type)
-                
-                host_analytics_query += """ AND COALESCE(
-                    m.Started_At,
-                    sm.start_time,
-                    cm.startTime,
-                    m.Created_At
-                ) BETWEEN %s AND %s"""
-                params.extend([start_date, end_date])
-                
-                host_analytics_query += " GROUP BY m.Host_ID, m.Meeting_Type ORDER BY total_meetings_hosted DESC"
-                
-                cursor.execute(host_analytics_query, params)
-                for row in cursor.fetchall():
-                    host_data.append({
-                        "host_id": row[0],
-                        "meeting_type": row[1],
-                        "meeting_counts": {
-                            "total_meetings_hosted": int(row[2] or 0),
-                            "active_meetings": int(row[3] or 0),
-                            "ended_meetings": int(row[4] or 0),
-                            "scheduled_meetings": int(row[5] or 0),
-                            "completion_rate": round((int(row[4] or 0) / int(row[2] or 1) * 100), 2)
-                        },
-                        "participant_analytics": {
-                            "total_unique_participants": int(row[6] or 0),
-                            "avg_meeting_duration_minutes": round(float(row[7] or 0), 2),
-                            "avg_participant_attendance": round(float(row[8] or 0), 2),
-                            "avg_overall_attendance": round(float(row[9] or 0), 2),
-                            "total_hosting_time_minutes": round(float(row[10] or 0), 2)
-                        },
-                        "activity_period": {
-                            "first_meeting_created": row[11].isoformat() if row[11] else None,
-                            "last_meeting_created": row[12].isoformat() if row[12] else None
-                        },
-                        "attendance_monitoring": {
-                            "avg_popup_count": round(float(row[13] or 0), 2),
-                            "avg_total_detections": round(float(row[14] or 0), 2),
-                            "avg_attendance_penalty": round(float(row[15] or 0), 2),
-                            "avg_engagement_score": round(float(row[16] or 0), 2),
-                            "total_breaks_used": int(row[17] or 0)
-                        }
-                    })
+                cursor.execute(*host_analytics_query(filters))
+                host_data = [host_analytics_record(row) for row in cursor.fetchall()]
 
             # ==================== 3. PARTICIPANT SUMMARY ANALYTICS ====================
             # FIXED: This query now ONLY counts meetings where the user participated as 'participant'
             if analytics_type in ['all', 'participant']:
-                participant_summary_query = """
-                    SELECT 
-                        p.User_ID,
-                        p.Full_Name,
-                        COUNT(DISTINCT p.Meeting_ID) as total_meetings_attended,
-                        SUM(p.Total_Duration_Minutes) as total_participation_time_minutes,
-                        AVG(p.Total_Duration_Minutes) as avg_meeting_duration_minutes,
-                        AVG(p.Participant_Attendance) as avg_participant_attendance,
-                        AVG(p.Overall_Attendance) as avg_overall_attendance,
-                        COUNT(DISTINCT CASE WHEN p.Is_Currently_Active = 1 THEN p.Meeting_ID END) as active_meetings,
-                        AVG(p.Total_Sessions) as avg_sessions_per_meeting,
-                        p.Meeting_Type,
-                        MIN(m.Created_At) as first_meeting_joined,
-                        MAX(m.Created_At) as last_meeting_joined,
-                        AVG(ats.popup_count) as avg_popup_count,
-                        AVG(ats.total_detections) as avg_total_detections,
-                        AVG(ats.attendance_penalty) as avg_attendance_penalty,
-                        AVG(ats.total_break_time_used) as avg_break_time_used,
-                        AVG(ats.engagement_score) as avg_engagement_score,
-                        AVG(ats.focus_score) as avg_focus_score,
-                        COUNT(CASE WHEN ats.break_used = 1 THEN 1 END) as total_breaks_taken
-                    FROM tbl_Participants p
-                    LEFT JOIN tbl_Attendance_Sessions ats ON p.Meeting_ID = ats.Meeting_ID AND p.User_ID = ats.User_ID
-                    LEFT JOIN tbl_Meetings m ON p.Meeting_ID = m.ID
-                    LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
-                    LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
-                    WHERE p.Role = 'participant'
-                """
-                
-                params = []
-                # CRITICAL FIX: Always filter by user_id when provided
-                if user_id:
-                    participant_summary_query += " AND p.User_ID = %s"
-                    params.append(user_id)
-                if meeting_type != 'all':
-                    participant_summary_query += " AND p.Meeting_Type = %s"
-                    params.append(meeting_type)
-                
-                participant_summary_query += """ AND COALESCE(
-                    m.Started_At,
-                    sm.start_time,
-                    cm.startTime,
-                    m.Created_At
-                ) BETWEEN %s AND %s"""
-                params.extend([start_date, end_date])
-                
-                participant_summary_query += " GROUP BY p.User_ID, p.Full_Name, p.Meeting_Type ORDER BY total_meetings_attended DESC"
-                
-                cursor.execute(participant_summary_query, params)
-                for row in cursor.fetchall():
-                    participant_summary_data.append({
-                        "user_id": row[0],
-                        "full_name": row[1],
-                        "meeting_participation": {
-                            "total_meetings_attended": int(row[2] or 0),
-                            "total_participation_time_minutes": round(float(row[3] or 0), 2),
-                            "avg_meeting_duration_minutes": round(float(row[4] or 0), 2),
-                            "avg_participant_attendance": round(float(row[5] or 0), 2),
-                            "avg_overall_attendance": round(float(row[6] or 0), 2),
-                            "active_meetings": int(row[7] or 0),
-                            "avg_sessions_per_meeting": round(float(row[8] or 0), 2)
-                        },
-                        "meeting_type": row[9],
-                        "activity_period": {
-                            "first_meeting_joined": row[10].isoformat() if row[10] else None,
-                            "last_meeting_joined": row[11].isoformat() if row[11] else None
-                        },
-                        "attendance_analytics": {
-                            "avg_popup_count": round(float(row[12] or 0), 2),
-                            "avg_total_detections": round(float(row[13] or 0), 2),
-                            "avg_attendance_penalty": round(float(row[14] or 0), 2),
-                            "avg_break_time_used": round(float(row[15] or 0), 2),
-                            "avg_engagement_score": round(float(row[16] or 0), 2),
-                            "avg_focus_score": round(float(row[17] or 0), 2),
-                            "total_breaks_taken": int(row[18] or 0)
-                        }
-                    })
+                cursor.execute(*participant_summary_query(filters))
+                participant_summary_data = [participant_summary_record(row) for row in cursor.fetchall()]
 
             # ==================== 4. MEETING ANALYTICS ====================
             if analytics_type in ['all', 'meeting']:
-                meeting_analytics_query = """
-                    SELECT 
-                        m.ID as meeting_id,
-                        m.Meeting_Name,
-                        m.Meeting_Type,
-                        m.Host_ID,
-                        m.Status,
-                        m.Created_At,
-                        m.Started_At,
-                        m.Ended_At,
-                        m.Meeting_Link,
-                        m.Is_Recording_Enabled,
-                        m.Waiting_Room_Enabled,
-                        COUNT(DISTINCT p.User_ID) as total_participants,
-                        COUNT(DISTINCT CASE WHEN p.Is_Currently_Active = 1 THEN p.User_ID END) as currently_active_participants,
-                        AVG(p.Total_Duration_Minutes) as avg_participant_duration_minutes,
-                        AVG(p.Participant_Attendance) as avg_participant_attendance,
-                        SUM(p.Total_Duration_Minutes) as total_meeting_duration_minutes,
-                        MAX(p.Total_Duration_Minutes) as longest_participant_duration,
-                        MIN(p.Total_Duration_Minutes) as shortest_participant_duration,
-                        AVG(ats.popup_count) as avg_popup_count,
-                        AVG(ats.total_detections) as avg_total_detections,
-                        AVG(ats.attendance_penalty) as avg_attendance_penalty,
-                        AVG(ats.engagement_score) as avg_engagement_score,
-                        COUNT(CASE WHEN ats.break_used = 1 THEN 1 END) as total_breaks_in_meeting
-                    FROM tbl_Meetings m
-                    LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
-                    LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
-                    LEFT JOIN tbl_Participants p ON m.ID = p.Meeting_ID
-                    LEFT JOIN tbl_Attendance_Sessions ats ON m.ID = ats.Meeting_ID
-                    WHERE 1=1
-                """
-                
-                params = []
-                if meeting_id:
-                    meeting_analytics_query += " AND m.ID = %s"
-                    params.append(meeting_id)
-                if user_id:
-                    meeting_analytics_query += " AND m.Host_ID = %s"
-                    params.append(user_id)
-                if meeting_type != 'all':
-                    meeting_analytics_query += " AND m.Meeting_Type = %s"
-                    params.append(meeting_type)
-                
-                meeting_analytics_query += """ AND COALESCE(
-                    m.Started_At,
-                    sm.start_time,
-                    cm.startTime,
-                    m.Created_At
-                ) BETWEEN %s AND %s"""
-                params.extend([start_date, end_date])
-                
-                meeting_analytics_query += " GROUP BY m.ID ORDER BY m.Created_At DESC"
-                
-                cursor.execute(meeting_analytics_query, params)
-                for row in cursor.fetchall():
-                    meeting_data.append({
-                        "meeting_id": row[0],
-                        "meeting_name": row[1],
-                        "meeting_type": row[2],
-                        "host_id": row[3],
-                        "status": row[4],
-                        "created_at": row[5].isoformat() if row[5] else None,
-                        "started_at": row[6].isoformat() if row[6] else None,
-                        "ended_at": row[7].isoformat() if row[7] else None,
-                        "meeting_link": row[8],
-                        "is_recording_enabled": bool(row[9]),
-                        "waiting_room_enabled": bool(row[10]),
-                        "participant_analytics": {
-                            "total_participants": int(row[11] or 0),
-                            "currently_active_participants": int(row[12] or 0),
-                            "avg_participant_duration_minutes": round(float(row[13] or 0), 2),
-                            "avg_participant_attendance": round(float(row[14] or 0), 2),
-                            "total_meeting_duration_minutes": round(float(row[15] or 0), 2),
-                            "longest_participant_duration_minutes": round(float(row[16] or 0), 2),
-                            "shortest_participant_duration_minutes": round(float(row[17] or 0), 2)
-                        },
-                        "attendance_analytics": {
-                            "avg_popup_count": round(float(row[18] or 0), 2),
-                            "avg_total_detections": round(float(row[19] or 0), 2),
-                            "avg_attendance_penalty": round(float(row[20] or 0), 2),
-                            "avg_engagement_score": round(float(row[21] or 0), 2),
-                            "total_breaks_in_meeting": int(row[22] or 0)
-                        }
-                    })
+                cursor.execute(*meeting_analytics_query(filters))
+                meeting_data = [meeting_analytics_record(row) for row in cursor.fetchall()]
 
-            # ==================== 5. USER-SPECIFIC OVERALL SUMMARY STATISTICS ====================
-            # FIXED: This now calculates stats ONLY for the specified user
-            if user_id:
-                # Get user-specific participant stats
-                cursor.execute("""
-                    SELECT 
-                        COUNT(DISTINCT p.Meeting_ID) as total_meetings_attended,
-                        SUM(p.Total_Duration_Minutes) as total_duration_minutes,
-                        AVG(p.Participant_Attendance) as avg_participant_attendance,
-                        AVG(p.Overall_Attendance) as avg_overall_attendance,
-                        AVG(ats.engagement_score) as avg_engagement_score,
-                        AVG(ats.attendance_penalty) as avg_penalty
-                    FROM tbl_Participants p
-                    LEFT JOIN tbl_Attendance_Sessions ats ON p.Meeting_ID = ats.Meeting_ID AND p.User_ID = ats.User_ID
-                    JOIN tbl_Meetings m ON p.Meeting_ID = m.ID
-                    LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
-                    LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
-                    WHERE p.User_ID = %s
-                    AND p.Role = 'participant'
-                    AND COALESCE(
-                        m.Started_At,
-                        sm.start_time,
-                        cm.startTime,
-                        m.Created_At
-                    ) BETWEEN %s AND %s
-                """, [user_id, start_date, end_date])
-                
-                participant_summary_row = cursor.fetchone()
-                
-                # Get user-specific host stats
-                cursor.execute("""
-                    SELECT 
-                        COUNT(DISTINCT m.ID) as total_meetings_hosted,
-                        COUNT(DISTINCT p.User_ID) as total_participants_in_hosted
-                    FROM tbl_Meetings m
-                    LEFT JOIN tbl_Participants p ON m.ID = p.Meeting_ID
-                    LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
-                    LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
-                    WHERE m.Host_ID = %s
-                    AND COALESCE(
-                        m.Started_At,
-                        sm.start_time,
-                        cm.startTime,
-                        m.Created_At
-                    ) BETWEEN %s AND %s
-                """, [user_id, start_date, end_date])
-                
-                host_summary_row = cursor.fetchone()
-                
-                overall_summary = {
-                    "total_meetings": int(participant_summary_row[0] or 0),
-                    "total_hosted_meetings": int(host_summary_row[0] or 0),
-                    "total_participants": int(host_summary_row[1] or 0),
-                    "total_duration_minutes": round(float(participant_summary_row[1] or 0), 2),
-                    "total_duration_hours": round(float(participant_summary_row[1] or 0) / 60, 2),
-                    "avg_participant_attendance": round(float(participant_summary_row[2] or 0), 2),
-                    "avg_overall_attendance": round(float(participant_summary_row[3] or 0), 2),
-                    "avg_engagement_score": round(float(participant_summary_row[4] or 0), 2),
-                    "avg_penalty": round(float(participant_summary_row[5] or 0), 2),
-                    "date_range": {
-                        "start": start_date.isoformat(),
-                        "end": end_date.isoformat()
-                    }
-                }
-            else:
-                # Global stats (admin view)
-                cursor.execute("""
-                    SELECT 
-                        COUNT(DISTINCT m.ID) as total_meetings,
-                        COUNT(DISTINCT m.Host_ID) as total_hosts,
-                        COUNT(DISTINCT p.User_ID) as total_participants,
-                        AVG(p.Total_Duration_Minutes) as avg_duration_minutes,
-                        AVG(p.Participant_Attendance) as avg_participant_attendance,
-                        AVG(p.Overall_Attendance) as avg_overall_attendance,
-                        SUM(p.Total_Duration_Minutes) as total_duration_minutes
-                    FROM tbl_Meetings m
-                    LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
-                    LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
-                    LEFT JOIN tbl_Participants p ON m.ID = p.Meeting_ID
-                    WHERE COALESCE(
-                        m.Started_At,
-                        sm.start_time,
-                        cm.startTime,
-                        m.Created_At
-                    ) BETWEEN %s AND %s
-                """, [start_date, end_date])
-                
-                summary_row = cursor.fetchone()
-                overall_summary = {
-                    "total_meetings": int(summary_row[0] or 0),
-                    "total_hosts": int(summary_row[1] or 0),
-                    "total_participants": int(summary_row[2] or 0),
-                    "avg_duration_minutes": round(float(summary_row[3] or 0), 2),
-                    "avg_participant_attendance": round(float(summary_row[4] or 0), 2),
-                    "avg_overall_attendance": round(float(summary_row[5] or 0), 2),
-                    "total_duration_hours": round(float(summary_row[6] or 0) / 60, 2),
-                    "date_range": {
-                        "start": start_date.isoformat(),
-                        "end": end_date.isoformat()
-                    }
-                }
+            # ==================== 5. OVERALL SUMMARY STATISTICS ====================
+            overall_summary = build_overall_summary(cursor, filters)
 
         # ==================== PREPARE RESPONSE DATA ====================
         response_data = {
@@ -2803,6 +3106,11 @@ def get_comprehensive_meeting_analytics(request):
         if analytics_type in ['all', 'participant']:
             response_data["participant_details"] = participant_data
             response_data["participant_summary"] = participant_summary_data
+            response_data["pagination"] = {
+                "limit": limit,
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None
+            }
 
         if analytics_type in ['all', 'host']:
             response_data["host_analytics"] = host_data
@@ -2840,25 +3148,24 @@ def get_participant_dashboard_overview(request):
         else: return JsonResponse({"error": "Invalid timeframe"}, status=BAD_REQUEST_STATUS)
 
         with connection.cursor() as cursor:
+            # One pre-aggregated row per attended day and meeting type (see analytics_rollups)
             query = """
                 SELECT 
-                    COUNT(DISTINCT p.Meeting_ID) as total_meetings_attended,
-                    AVG(p.Participant_Attendance) as avg_participant_attendance,
-                    AVG(p.Overall_Attendance) as avg_overall_attendance,
-                    SUM(p.Total_Duration_Minutes) as total_duration,
-                    AVG(ats.engagement_score) as avg_engagement_score,
-                    AVG(ats.attendance_penalty) as avg_penalty,
-                    SUM(ats.popup_count) as total_popups,
-                    SUM(CASE WHEN ats.break_used = 1 THEN 1 ELSE 0 END) as total_breaks_used
-                FROM tbl_Participants p
-                LEFT JOIN tbl_Meetings m ON p.Meeting_ID = m.ID
-                LEFT JOIN tbl_Attendance_Sessions ats ON p.Meeting_ID = ats.Meeting_ID AND p.User_ID = ats.User_ID
-                WHERE p.User_ID = %s AND p.Role = 'participant' AND m.Created_At BETWEEN %s AND %s
+                    SUM(r.Meeting_Count) as total_meetings_attended,
+                    SUM(r.Attendance_Sum) / NULLIF(SUM(r.Attendance_Samples), 0) as avg_participant_attendance,
+                    SUM(r.Overall_Sum) / NULLIF(SUM(r.Overall_Samples), 0) as avg_overall_attendance,
+                    SUM(r.Duration_Sum) as total_duration,
+                    SUM(r.Engagement_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_engagement_score,
+                    SUM(r.Penalty_Sum) / NULLIF(SUM(r.Monitored_Count), 0) as avg_penalty,
+                    SUM(r.Popup_Sum) as total_popups,
+                    SUM(r.Breaks_Used) as total_breaks_used
+                FROM tbl_UserDailyRollups r
+                WHERE r.User_ID = %s AND r.Role = %s AND r.Rollup_Date BETWEEN %s AND %s
             """
             
-            params = [user_id, start_date, end_date]
+            params = [user_id, ROLLUP_ROLE_PARTICIPANT, start_date.date(), end_date.date()]
             if meeting_type != 'all':
-                query += " AND m.Meeting_Type = %s"
+                query += " AND r.Meeting_Type = %s"
                 params.append(meeting_type)
 
             cursor.execute(query, params)
@@ -2891,6 +3198,7 @@ urlpatterns = [
     # path('api/meetings/<str:meeting_id>/participants/<int:user_id>/report/', Get_Participant_Report_For_Meeting, name='get_participant_report_for_meeting'),
     path('api/meetings/<str:meeting_id>/participants/<int:user_id>/report/pdf/', Generate_Participant_Report_PDF_For_Meeting, name='generate_participant_report_pdf_for_meeting'),
     path('api/meetings/<str:meeting_id>/participants/<int:user_id>/report/', Get_Participant_Report_For_Meeting, name='get_participant_report_for_meeting'),
+    path('api/meetings/<str:meeting_id>/reports/pdf/generate/', Generate_Meeting_Reports_PDF, name='generate_meeting_reports_pdf'),
 
     # Existing Analytics Endpoints
     path('api/analytics/host/overview', get_host_dashboard_overview, name='get_host_dashboard_overview'),
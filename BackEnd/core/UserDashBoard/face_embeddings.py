@@ -21,7 +21,6 @@ os.environ.update({
 })
 
 import os
-import sys
 import logging
 import numpy as np
 import base64
@@ -40,22 +39,16 @@ from botocore.exceptions import ClientError
 # ============================================================================
 # IMPORT SHARED FACE MODEL FROM FACEAUTH FOLDER
 # ============================================================================
-# Add FaceAuth folder to Python path
-current_dir = os.path.dirname(os.path.abspath(__file__))
-faceauth_dir = os.path.join(current_dir, '..', 'FaceAuth')
-faceauth_dir = os.path.abspath(faceauth_dir)
-
-if faceauth_dir not in sys.path:
-    sys.path.insert(0, faceauth_dir)
-
+# Imported through the package so every service shares one module (and one model);
+# a sys.path import would create a second face_model_shared with its own singleton.
 try:
-    from face_model_shared import get_face_model, compare_embeddings
+    from core.FaceAuth.face_model_shared import get_face_model, compare_embeddings
     FACE_RECOGNITION_ENABLED = True
     face_model = None
 except ImportError as e:
     FACE_RECOGNITION_ENABLED = False
     face_model = None
-    print(f"⚠️  Warning: Could not import face_model_shared from {faceauth_dir}")
+    print("⚠️  Warning: Could not import core.FaceAuth.face_model_shared")
     print(f"   Error: {e}")
     print("   Face recognition features will be disabled")
 
@@ -412,6 +405,39 @@ def get_user_embeddings(user_id: int) -> List[Dict]:
         return []
 
 
+def get_users_embeddings(user_ids: List[int]) -> Dict[int, List[Dict]]:
+    """
+    Get all active embeddings for many users with one query
+
+    Args:
+        user_ids: User IDs from MySQL
+
+    Returns:
+        Dict mapping user_id to its embedding documents (newest first)
+    """
+    result = {int(user_id): [] for user_id in user_ids}
+    try:
+        if face_embeddings_collection is None or not result:
+            return result
+
+        embeddings = face_embeddings_collection.find(
+            {'user_id': {'$in': list(result)}, 'status': 'active'},
+            sort=[('created_at', -1)]
+        )
+
+        for doc in embeddings:
+            doc['_id'] = str(doc['_id'])
+            doc['photo_id'] = str(doc['photo_id'])
+            result.setdefault(int(doc['user_id']), []).append(doc)
+
+        logger.debug(f"Found embeddings for {sum(1 for docs in result.values() if docs)}/{len(result)} users")
+        return result
+
+    except Exception as e:
+        logger.error(f"✗ Error getting embeddings for users {list(result)}: {e}")
+        return result
+
+
 def delete_face_embedding(embedding_id: str, permanent: bool = False) -> bool:
     """
     Delete face embedding
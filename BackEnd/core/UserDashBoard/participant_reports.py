@@ -0,0 +1,242 @@
+# participant_reports.py - Cached participant PDF reports
+# Reports are rendered off the web tier by Celery and stored under a key built from
+# (meeting, user, occurrence, data version). The data version is a hash of the rows
+# the report is rendered from, so a download is served from the cache until the
+# participant's data changes. Bulk generation for a meeting renders in a process pool.
+# Downloads never wait on the task: a miss is queued and polled by task id.
+import os
+import json
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from django.db import connection, connections
+from core.UserDashBoard.Analytics import load_participant_report_data, render_participant_report_pdf
+
+logger = logging.getLogger(__name__)
+
+PARTICIPANT_REPORT_CONFIG = {
+    # 's3' keeps reports under S3_PREFIX in AWS_S3_BUCKET, 'local' under CACHE_DIR
+    'STORAGE': os.getenv("PARTICIPANT_REPORT_STORAGE", "s3"),
+    'CACHE_DIR': os.getenv("PARTICIPANT_REPORT_CACHE_DIR", os.path.join(settings.MEDIA_ROOT, "participant_reports")),
+    # Set when CACHE_DIR is a volume the Celery workers mount too; otherwise local
+    # reports are rendered in the web process, since a worker's file would never be found
+    'LOCAL_SHARED': os.getenv("PARTICIPANT_REPORT_LOCAL_SHARED", "False") == "True",
+    'S3_PREFIX': os.getenv("PARTICIPANT_REPORT_S3_PREFIX", "participant_reports"),
+    'BULK_WORKERS': int(os.getenv("PARTICIPANT_REPORT_BULK_WORKERS", os.cpu_count() or 2)),
+}
+
+AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
+AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
+AWS_REGION = os.getenv("AWS_REGION", "ap-south-1")
+AWS_S3_BUCKET = os.getenv("AWS_S3_BUCKET", "imeetpro-prod-recordings")
+
+_s3_client = None
+
+
+def _get_s3_client():
+    global _s3_client
+    if _s3_client is None:
+        import boto3
+        _s3_client = boto3.client(
+            "s3",
+            aws_access_key_id=AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+            region_name=AWS_REGION
+        )
+    return _s3_client
+
+
+# ============================================================================
+# CACHE KEYS AND STORAGE
+# ============================================================================
+
+def report_data_version(report):
+    """Short hash of the data a report is rendered from"""
+    payload = json.dumps(report, default=str, sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def report_cache_key(report):
+    """<meeting>/<user>/occ<occurrence>/<data version>.pdf"""
+    return (f"{report['meeting_id']}/{report['user_id']}/"
+            f"occ{report['selected_occurrence'] or 0}/{report_data_version(report)}.pdf")
+
+
+def read_cached_report(key):
+    """PDF bytes stored under key, or None"""
+    if PARTICIPANT_REPORT_CONFIG['STORAGE'] == 's3':
+        try:
+            response = _get_s3_client().get_object(
+                Bucket=AWS_S3_BUCKET, Key=f"{PARTICIPANT_REPORT_CONFIG['S3_PREFIX']}/{key}"
+            )
+            return response['Body'].read()
+        except Exception:
+            return None
+
+    path = os.path.join(PARTICIPANT_REPORT_CONFIG['CACHE_DIR'], key)
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def store_cached_report(key, pdf_bytes):
+    """Store a rendered report; older versions of the same report are removed (local storage)"""
+    if PARTICIPANT_REPORT_CONFIG['STORAGE'] == 's3':
+        # Superseded versions are left to the bucket's lifecycle rules
+        _get_s3_client().put_object(
+            Bucket=AWS_S3_BUCKET,
+            Key=f"{PARTICIPANT_REPORT_CONFIG['S3_PREFIX']}/{key}",
+            Body=pdf_bytes,
+            ContentType='application/pdf'
+        )
+        return
+
+    path = os.path.join(PARTICIPANT_REPORT_CONFIG['CACHE_DIR'], key)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Write then rename, so readers never see a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(pdf_bytes)
+    os.replace(tmp_path, path)
+
+    for name in os.listdir(directory):
+        if name.endswith('.pdf') and name != os.path.basename(path):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+
+# ============================================================================
+# GENERATION
+# ============================================================================
+
+def generate_participant_report(meeting_id, user_id, occurrence_number=None):
+    """Render and cache one participant's report unless the current version is cached"""
+    with connection.cursor() as cursor:
+        report, error = load_participant_report_data(cursor, meeting_id, user_id, occurrence_number)
+    if error:
+        return {'key': None, 'generated': False, 'error': error[0]}
+
+    key = report_cache_key(report)
+    if read_cached_report(key) is not None:
+        return {'key': key, 'generated': False}
+
+    store_cached_report(key, render_participant_report_pdf(report))
+    logger.info(f"📄 Participant report cached: {key}")
+    return {'key': key, 'generated': True}
+
+
+def report_tasks_enabled():
+    """True if a report cached by a Celery worker is readable by the web processes"""
+    return PARTICIPANT_REPORT_CONFIG['STORAGE'] == 's3' or PARTICIPANT_REPORT_CONFIG['LOCAL_SHARED']
+
+
+if not report_tasks_enabled():
+    logger.warning("📄 Participant reports use unshared local storage: reports are rendered in the web process")
+
+
+def _render_and_store(report, key):
+    pdf_bytes = render_participant_report_pdf(report)
+    try:
+        store_cached_report(key, pdf_bytes)
+    except Exception as e:
+        logger.error(f"❌ Failed to cache participant report {key}: {e}")
+    return pdf_bytes
+
+
+def get_or_queue_participant_report(report, task_id=None):
+    """
+    Report loaded by the download view, without waiting on Celery:
+    ('ready', pdf_bytes), ('pending', task_id) or ('failed', error).
+    task_id is the id returned by an earlier 'pending' answer.
+    """
+    key = report_cache_key(report)
+    pdf_bytes = read_cached_report(key)
+    if pdf_bytes is not None:
+        logger.debug(f"📄 Participant report cache hit: {key}")
+        return 'ready', pdf_bytes
+
+    if not report_tasks_enabled():
+        return 'ready', _render_and_store(report, key)
+
+    from core.scheduler.tasks import generate_participant_report_task
+    if task_id:
+        task = generate_participant_report_task.AsyncResult(task_id)
+        if not task.ready():
+            return 'pending', task_id
+        result = task.result if task.successful() else {'error': str(task.result)}
+        if (result or {}).get('error'):
+            logger.warning(f"📄 Participant report {key} failed: {result['error']}")
+            return 'failed', result['error']
+        # The task reloads the data, so it may have cached a newer version
+        pdf_bytes = read_cached_report((result or {}).get('key') or key)
+        if pdf_bytes is not None:
+            return 'ready', pdf_bytes
+        # Data changed again after the task ran: queue the current version
+
+    try:
+        task = generate_participant_report_task.apply_async(
+            args=[report['meeting_id'], report['user_id'], report['selected_occurrence']]
+        )
+    except Exception as e:
+        logger.warning(f"📄 Task queue unavailable, rendering report {key} inline: {e}")
+        return 'ready', _render_and_store(report, key)
+    return 'pending', task.id
+
+
+def _render_report_job(report):
+    """Process pool job: (key, PDF bytes) for one report"""
+    return report_cache_key(report), render_participant_report_pdf(report)
+
+
+def generate_meeting_participant_reports(meeting_id, occurrence_number=None, workers=None):
+    """Render and cache every participant's report of a meeting, in a process pool"""
+    query = """
+        SELECT DISTINCT User_ID FROM tbl_Participants
+        WHERE Meeting_ID = %s AND Role = 'participant'
+    """
+    params = [meeting_id]
+    if occurrence_number:
+        query += " AND occurrence_number = %s"
+        params.append(occurrence_number)
+
+    pending = []
+    cached = 0
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        user_ids = [row[0] for row in cursor.fetchall()]
+        for user_id in user_ids:
+            report, error = load_participant_report_data(cursor, meeting_id, user_id, occurrence_number)
+            if error:
+                continue
+            if read_cached_report(report_cache_key(report)) is not None:
+                cached += 1
+            else:
+                pending.append(report)
+
+    generated = 0
+    if pending:
+        workers = min(workers or PARTICIPANT_REPORT_CONFIG['BULK_WORKERS'], len(pending))
+        # Forked workers must not share this process's database sockets
+        connections.close_all()
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                rendered = pool.map(_render_report_job, pending)
+                for key, pdf_bytes in rendered:
+                    store_cached_report(key, pdf_bytes)
+                    generated += 1
+        except (OSError, AssertionError) as e:
+            # e.g. a daemonic worker that may not fork; render the rest in this process
+            logger.warning(f"📄 Report process pool unavailable, rendering serially: {e}")
+            for report in pending[generated:]:
+                key, pdf_bytes = _render_report_job(report)
+                store_cached_report(key, pdf_bytes)
+                generated += 1
+
+    logger.info(f"📄 Meeting {meeting_id} reports: {generated} generated, {cached} already cached")
+    return {'participants': len(user_ids), 'generated': generated, 'cached': cached}
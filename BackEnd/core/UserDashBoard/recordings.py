@@ -57,6 +57,7 @@ from botocore.exceptions import NoCredentialsError
 from pydub import AudioSegment
 from deep_translator import GoogleTranslator
 from django.utils import timezone
+from core.WebSocketConnection.notification_counters import increment_unread_count
 from core.WebSocketConnection.meetings import BAD_REQUEST_STATUS, NOT_FOUND_STATUS, SERVER_ERROR_STATUS, SUCCESS_STATUS, TBL_MEETINGS, create_meetings_table
 from openai import OpenAI
 from groq import Groq
@@ -1110,6 +1111,7 @@ def send_recording_completion_notifications(meeting_id, video_url, transcript_ur
 
                 if cursor.rowcount > 0:
                     sent_count += 1
+                    increment_unread_count(participant_email)
                     logging.info(f"Recording notification sent to {participant_email} ({'host' if is_host else 'participant'})")
                 else:
                     logging.error(f"INSERT returned 0 rows for {participant_email}")
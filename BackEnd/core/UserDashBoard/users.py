@@ -13,9 +13,8 @@ import logging
 import re
 import os
 import random
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from django.core.mail import EmailMessage
+from core.scheduler.mail_queue import send_messages_pooled, record_mail_metric
 from datetime import timedelta
 from pymongo import MongoClient
 from bson import ObjectId
@@ -171,19 +170,18 @@ def generate_OTP():
 def send_OTP_email(email, OTP):
     """Send OTP to the provided email address"""
     try:
-        msg = MIMEMultipart()
-        msg['From'] = FROM_EMAIL
-        msg['To'] = email
-        msg['Subject'] = 'Your Password Reset OTP'
-        
         body = f"Your OTP for password reset is: {OTP}\nThis OTP is valid for 10 minutes."
-        msg.attach(MIMEText(body, 'plain'))
+        msg = EmailMessage(subject='Your Password Reset OTP', body=body, from_email=FROM_EMAIL, to=[email])
 
-        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
-        server.starttls()
-        server.login(SMTP_USERNAME, SMTP_PASSWORD)
-        server.sendmail(FROM_EMAIL, email, msg.as_string())
-        server.quit()
+        # Reuses this worker's logged-in SMTP session instead of connecting per OTP
+        failed = send_messages_pooled(
+            [msg], host=SMTP_SERVER, port=SMTP_PORT,
+            username=SMTP_USERNAME, password=SMTP_PASSWORD, use_tls=True
+        )
+        if failed:
+            record_mail_metric('failed', 1, 'otp')
+            return False
+        record_mail_metric('sent', 1, 'otp')
         logging.debug(f"OTP {OTP} sent to {email}")
         return True
     except Exception as e:
@@ -0,0 +1,472 @@
+# analytics_rollups.py - Pre-aggregated dashboard analytics
+# tbl_MeetingRollups keeps one row per meeting occurrence and tbl_UserDailyRollups one
+# row per (user, day, role, meeting type). Rows are recomputed for the affected meeting
+# and user-days when attendance is stored or a meeting ends, and by the periodic
+# reconcile when a meeting's status moved on (created, started), so dashboard ranges sum a
+# handful of rows per day instead of joining tbl_Meetings x tbl_Participants x
+# tbl_Attendance_Sessions. Averages are stored as sum + sample count so they combine
+# exactly across days.
+import os
+import time
+import logging
+import threading
+from datetime import timedelta
+from django.db import connection, models, transaction
+from core.utils.date_utils import get_current_ist_datetime
+
+ANALYTICS_ROLLUP_CONFIG = {
+    # Seconds to wait before refreshing a meeting, so the per-participant attendance
+    # stores of one meeting end are folded into a single refresh
+    'REFRESH_DELAY': int(os.getenv("ANALYTICS_ROLLUP_REFRESH_DELAY", 30)),
+    # Meetings created, started or ended within this window are re-checked by reconcile_analytics_rollups()
+    'RECONCILE_HOURS': int(os.getenv("ANALYTICS_ROLLUP_RECONCILE_HOURS", 48)),
+    'RECONCILE_BATCH_SIZE': int(os.getenv("ANALYTICS_ROLLUP_RECONCILE_BATCH_SIZE", 200)),
+}
+
+ROLLUP_ROLE_HOST = 'host'
+ROLLUP_ROLE_PARTICIPANT = 'participant'
+
+# meeting_id -> monotonic time until which a queued refresh already covers it
+_scheduled_refreshes = {}
+_scheduled_lock = threading.Lock()
+
+
+class MeetingRollups(models.Model):
+    id = models.AutoField(primary_key=True, db_column='ID')
+    meeting_id = models.CharField(max_length=20, db_column='Meeting_ID')
+    occurrence_number = models.IntegerField(default=1, db_column='occurrence_number')
+    host_id = models.IntegerField(blank=True, null=True, db_column='Host_ID')
+    meeting_type = models.CharField(max_length=50, default='', db_column='Meeting_Type')
+    meeting_name = models.CharField(max_length=200, blank=True, null=True, db_column='Meeting_Name')
+    status = models.CharField(max_length=50, blank=True, null=True, db_column='Status')
+    meeting_date = models.DateField(db_column='Meeting_Date')
+    created_at = models.DateTimeField(blank=True, null=True, db_column='Created_At')
+    started_at = models.DateTimeField(blank=True, null=True, db_column='Started_At')
+    ended_at = models.DateTimeField(blank=True, null=True, db_column='Ended_At')
+    participant_count = models.IntegerField(default=0, db_column='Participant_Count')
+    active_participant_count = models.IntegerField(default=0, db_column='Active_Participant_Count')
+    duration_sum = models.FloatField(default=0, db_column='Duration_Sum')
+    duration_samples = models.IntegerField(default=0, db_column='Duration_Samples')
+    duration_max = models.FloatField(blank=True, null=True, db_column='Duration_Max')
+    duration_min = models.FloatField(blank=True, null=True, db_column='Duration_Min')
+    attendance_sum = models.FloatField(default=0, db_column='Attendance_Sum')
+    attendance_samples = models.IntegerField(default=0, db_column='Attendance_Samples')
+    overall_sum = models.FloatField(default=0, db_column='Overall_Sum')
+    overall_samples = models.IntegerField(default=0, db_column='Overall_Samples')
+    sessions_sum = models.IntegerField(default=0, db_column='Sessions_Sum')
+    monitored_count = models.IntegerField(default=0, db_column='Monitored_Count')
+    popup_sum = models.IntegerField(default=0, db_column='Popup_Sum')
+    detection_sum = models.IntegerField(default=0, db_column='Detection_Sum')
+    penalty_sum = models.FloatField(default=0, db_column='Penalty_Sum')
+    engagement_sum = models.FloatField(default=0, db_column='Engagement_Sum')
+    focus_sum = models.FloatField(default=0, db_column='Focus_Sum')
+    break_time_sum = models.IntegerField(default=0, db_column='Break_Time_Sum')
+    breaks_used = models.IntegerField(default=0, db_column='Breaks_Used')
+    identity_warnings = models.IntegerField(default=0, db_column='Identity_Warnings')
+    removals = models.IntegerField(default=0, db_column='Removals')
+    updated_at = models.DateTimeField(db_column='Updated_At')
+
+    class Meta:
+        db_table = 'tbl_MeetingRollups'
+        unique_together = ('meeting_id', 'occurrence_number')
+        indexes = [
+            models.Index(fields=['host_id', 'meeting_date'], name='idx_mroll_host_date'),
+            models.Index(fields=['meeting_date'], name='idx_mroll_date'),
+        ]
+
+
+class UserDailyRollups(models.Model):
+    ROLE_CHOICES = [
+        (ROLLUP_ROLE_HOST, 'Host'),
+        (ROLLUP_ROLE_PARTICIPANT, 'Participant'),
+    ]
+
+    id = models.AutoField(primary_key=True, db_column='ID')
+    user_id = models.IntegerField(db_column='User_ID')
+    rollup_date = models.DateField(db_column='Rollup_Date')
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES, db_column='Role')
+    meeting_type = models.CharField(max_length=50, default='', db_column='Meeting_Type')
+    meeting_count = models.IntegerField(default=0, db_column='Meeting_Count')
+    active_count = models.IntegerField(default=0, db_column='Active_Count')
+    ended_count = models.IntegerField(default=0, db_column='Ended_Count')
+    scheduled_count = models.IntegerField(default=0, db_column='Scheduled_Count')
+    participant_count = models.IntegerField(default=0, db_column='Participant_Count')
+    duration_sum = models.FloatField(default=0, db_column='Duration_Sum')
+    duration_samples = models.IntegerField(default=0, db_column='Duration_Samples')
+    attendance_sum = models.FloatField(default=0, db_column='Attendance_Sum')
+    attendance_samples = models.IntegerField(default=0, db_column='Attendance_Samples')
+    overall_sum = models.FloatField(default=0, db_column='Overall_Sum')
+    overall_samples = models.IntegerField(default=0, db_column='Overall_Samples')
+    sessions_sum = models.IntegerField(default=0, db_column='Sessions_Sum')
+    monitored_count = models.IntegerField(default=0, db_column='Monitored_Count')
+    popup_sum = models.IntegerField(default=0, db_column='Popup_Sum')
+    detection_sum = models.IntegerField(default=0, db_column='Detection_Sum')
+    penalty_sum = models.FloatField(default=0, db_column='Penalty_Sum')
+    engagement_sum = models.FloatField(default=0, db_column='Engagement_Sum')
+    focus_sum = models.FloatField(default=0, db_column='Focus_Sum')
+    break_time_sum = models.IntegerField(default=0, db_column='Break_Time_Sum')
+    breaks_used = models.IntegerField(default=0, db_column='Breaks_Used')
+    identity_warnings = models.IntegerField(default=0, db_column='Identity_Warnings')
+    removals = models.IntegerField(default=0, db_column='Removals')
+    first_meeting_at = models.DateTimeField(blank=True, null=True, db_column='First_Meeting_At')
+    last_meeting_at = models.DateTimeField(blank=True, null=True, db_column='Last_Meeting_At')
+    updated_at = models.DateTimeField(db_column='Updated_At')
+
+    class Meta:
+        db_table = 'tbl_UserDailyRollups'
+        unique_together = ('user_id', 'rollup_date', 'role', 'meeting_type')
+        indexes = [
+            models.Index(fields=['rollup_date', 'role'], name='idx_droll_date_role'),
+        ]
+
+
+def create_analytics_rollup_tables():
+    """Create tbl_MeetingRollups and tbl_UserDailyRollups tables if they don't exist - MYSQL VERSION"""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tbl_MeetingRollups (
+                ID INT AUTO_INCREMENT PRIMARY KEY,
+                Meeting_ID VARCHAR(20) NOT NULL,
+                occurrence_number INT NOT NULL DEFAULT 1,
+                Host_ID INT DEFAULT NULL,
+                Meeting_Type VARCHAR(50) NOT NULL DEFAULT '',
+                Meeting_Name VARCHAR(200) DEFAULT NULL,
+                Status VARCHAR(50) DEFAULT NULL,
+                Meeting_Date DATE NOT NULL,
+                Created_At DATETIME DEFAULT NULL,
+                Started_At DATETIME DEFAULT NULL,
+                Ended_At DATETIME DEFAULT NULL,
+                Participant_Count INT NOT NULL DEFAULT 0,
+                Active_Participant_Count INT NOT NULL DEFAULT 0,
+                Duration_Sum DOUBLE NOT NULL DEFAULT 0,
+                Duration_Samples INT NOT NULL DEFAULT 0,
+                Duration_Max DOUBLE DEFAULT NULL,
+                Duration_Min DOUBLE DEFAULT NULL,
+                Attendance_Sum DOUBLE NOT NULL DEFAULT 0,
+                Attendance_Samples INT NOT NULL DEFAULT 0,
+                Overall_Sum DOUBLE NOT NULL DEFAULT 0,
+                Overall_Samples INT NOT NULL DEFAULT 0,
+                Sessions_Sum INT NOT NULL DEFAULT 0,
+                Monitored_Count INT NOT NULL DEFAULT 0,
+                Popup_Sum INT NOT NULL DEFAULT 0,
+                Detection_Sum INT NOT NULL DEFAULT 0,
+                Penalty_Sum DOUBLE NOT NULL DEFAULT 0,
+                Engagement_Sum DOUBLE NOT NULL DEFAULT 0,
+                Focus_Sum DOUBLE NOT NULL DEFAULT 0,
+                Break_Time_Sum INT NOT NULL DEFAULT 0,
+                Breaks_Used INT NOT NULL DEFAULT 0,
+                Identity_Warnings INT NOT NULL DEFAULT 0,
+                Removals INT NOT NULL DEFAULT 0,
+                Updated_At DATETIME NOT NULL,
+                UNIQUE KEY uq_mroll_meeting_occ (Meeting_ID, occurrence_number),
+                KEY idx_mroll_host_date (Host_ID, Meeting_Date),
+                KEY idx_mroll_date (Meeting_Date)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+            """)
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tbl_UserDailyRollups (
+                ID INT AUTO_INCREMENT PRIMARY KEY,
+                User_ID INT NOT NULL,
+                Rollup_Date DATE NOT NULL,
+                Role VARCHAR(20) NOT NULL,
+                Meeting_Type VARCHAR(50) NOT NULL DEFAULT '',
+                Meeting_Count INT NOT NULL DEFAULT 0,
+                Active_Count INT NOT NULL DEFAULT 0,
+                Ended_Count INT NOT NULL DEFAULT 0,
+                Scheduled_Count INT NOT NULL DEFAULT 0,
+                Participant_Count INT NOT NULL DEFAULT 0,
+                Duration_Sum DOUBLE NOT NULL DEFAULT 0,
+                Duration_Samples INT NOT NULL DEFAULT 0,
+                Attendance_Sum DOUBLE NOT NULL DEFAULT 0,
+                Attendance_Samples INT NOT NULL DEFAULT 0,
+                Overall_Sum DOUBLE NOT NULL DEFAULT 0,
+                Overall_Samples INT NOT NULL DEFAULT 0,
+                Sessions_Sum INT NOT NULL DEFAULT 0,
+                Monitored_Count INT NOT NULL DEFAULT 0,
+                Popup_Sum INT NOT NULL DEFAULT 0,
+                Detection_Sum INT NOT NULL DEFAULT 0,
+                Penalty_Sum DOUBLE NOT NULL DEFAULT 0,
+                Engagement_Sum DOUBLE NOT NULL DEFAULT 0,
+                Focus_Sum DOUBLE NOT NULL DEFAULT 0,
+                Break_Time_Sum INT NOT NULL DEFAULT 0,
+                Breaks_Used INT NOT NULL DEFAULT 0,
+                Identity_Warnings INT NOT NULL DEFAULT 0,
+                Removals INT NOT NULL DEFAULT 0,
+                First_Meeting_At DATETIME DEFAULT NULL,
+                Last_Meeting_At DATETIME DEFAULT NULL,
+                Updated_At DATETIME NOT NULL,
+                UNIQUE KEY uq_droll_user_date (User_ID, Rollup_Date, Role, Meeting_Type),
+                KEY idx_droll_date_role (Rollup_Date, Role)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+            """)
+    except Exception as e:
+        logging.error(f"Failed to create analytics rollup tables: {e}")
+
+
+_MEETING_ROLLUP_COLUMNS = [
+    'Meeting_ID', 'occurrence_number', 'Host_ID', 'Meeting_Type', 'Meeting_Name', 'Status',
+    'Meeting_Date', 'Created_At', 'Started_At', 'Ended_At', 'Participant_Count',
+    'Active_Participant_Count', 'Duration_Sum', 'Duration_Samples', 'Duration_Max', 'Duration_Min',
+    'Attendance_Sum', 'Attendance_Samples', 'Overall_Sum', 'Overall_Samples', 'Sessions_Sum',
+    'Monitored_Count', 'Popup_Sum', 'Detection_Sum', 'Penalty_Sum', 'Engagement_Sum', 'Focus_Sum',
+    'Break_Time_Sum', 'Breaks_Used', 'Identity_Warnings', 'Removals', 'Updated_At',
+]
+
+# Driven from tbl_Meetings so meetings nobody joined yet (scheduled, just created) still
+# get an occurrence-1 row dated by their start or creation.
+# Participant-side figures only count Role='participant' rows, like the dashboards.
+# Start/end come from tbl_ParticipantSessions (host's first join, else the first join).
+_MEETING_ROLLUP_SQL = f"""
+INSERT INTO tbl_MeetingRollups ({', '.join(_MEETING_ROLLUP_COLUMNS)})
+SELECT m.ID,
+       COALESCE(p.occurrence_number, 1),
+       MAX(m.Host_ID),
+       COALESCE(MAX(m.Meeting_Type), MAX(p.Meeting_Type), ''),
+       MAX(CASE
+           WHEN m.Meeting_Type = 'ScheduleMeeting' THEN COALESCE(sm.title, m.Meeting_Name)
+           WHEN m.Meeting_Type = 'CalendarMeeting' THEN COALESCE(cm.title, m.Meeting_Name)
+           ELSE m.Meeting_Name
+       END),
+       MAX(m.Status),
+       COALESCE(
+           MIN(CASE WHEN p.Role = 'host' THEN p.session_start_time END),
+           MIN(p.session_start_time),
+           DATE(COALESCE(MAX(m.Started_At), MAX(m.Created_At)))
+       ),
+       MAX(m.Created_At),
+       COALESCE(MAX(s.host_started_at), MAX(s.first_joined_at)),
+       COALESCE(MAX(CASE WHEN p.Role = 'host' THEN p.End_Meeting_Time END), MAX(s.last_left_at)),
+       COUNT(DISTINCT CASE WHEN p.Role = 'participant' THEN p.User_ID END),
+       COUNT(DISTINCT CASE WHEN p.Role = 'participant' AND p.Is_Currently_Active = 1 THEN p.User_ID END),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN p.Total_Duration_Minutes END), 0),
+       COUNT(CASE WHEN p.Role = 'participant' THEN p.Total_Duration_Minutes END),
+       MAX(CASE WHEN p.Role = 'participant' THEN p.Total_Duration_Minutes END),
+       MIN(CASE WHEN p.Role = 'participant' THEN p.Total_Duration_Minutes END),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN p.Participant_Attendance END), 0),
+       COUNT(CASE WHEN p.Role = 'participant' THEN p.Participant_Attendance END),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN p.Overall_Attendance END), 0),
+       COUNT(CASE WHEN p.Role = 'participant' THEN p.Overall_Attendance END),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN p.Total_Sessions END), 0),
+       COUNT(CASE WHEN p.Role = 'participant' THEN ats.engagement_score END),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN ats.popup_count END), 0),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN ats.total_detections END), 0),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN ats.attendance_penalty END), 0),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN ats.engagement_score END), 0),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN ats.focus_score END), 0),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN ats.total_break_time_used END), 0),
+       COUNT(CASE WHEN p.Role = 'participant' AND ats.break_used = 1 THEN 1 END),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN ats.identity_total_warnings_issued END), 0),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant'
+                         THEN COALESCE(ats.identity_removal_count, 0) + COALESCE(ats.behavior_removal_count, 0) END), 0),
+       %s
+FROM tbl_Meetings m
+LEFT JOIN tbl_Participants p ON p.Meeting_ID = m.ID
+LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
+LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
+LEFT JOIN tbl_Attendance_Sessions ats ON p.Meeting_ID = ats.Meeting_ID AND p.User_ID = ats.User_ID
+LEFT JOIN (
+    SELECT ps.Meeting_ID,
+           ps.occurrence_number,
+           MIN(CASE WHEN ps.User_ID = pm.Host_ID THEN ps.Joined_At END) AS host_started_at,
+           MIN(ps.Joined_At) AS first_joined_at,
+           MAX(ps.Left_At) AS last_left_at
+    FROM tbl_ParticipantSessions ps
+    JOIN tbl_Meetings pm ON pm.ID = ps.Meeting_ID
+    WHERE ps.Meeting_ID = %s
+    GROUP BY ps.Meeting_ID, ps.occurrence_number
+) s ON s.Meeting_ID = m.ID AND s.occurrence_number = p.occurrence_number
+WHERE m.ID = %s
+GROUP BY m.ID, COALESCE(p.occurrence_number, 1)
+ON DUPLICATE KEY UPDATE {', '.join(f'{column} = VALUES({column})' for column in _MEETING_ROLLUP_COLUMNS[2:])}
+"""
+
+_DAILY_ROLLUP_COLUMNS = [
+    'User_ID', 'Rollup_Date', 'Role', 'Meeting_Type', 'Meeting_Count', 'Active_Count', 'Ended_Count',
+    'Scheduled_Count', 'Participant_Count', 'Duration_Sum', 'Duration_Samples', 'Attendance_Sum',
+    'Attendance_Samples', 'Overall_Sum', 'Overall_Samples', 'Sessions_Sum', 'Monitored_Count',
+    'Popup_Sum', 'Detection_Sum', 'Penalty_Sum', 'Engagement_Sum', 'Focus_Sum', 'Break_Time_Sum',
+    'Breaks_Used', 'Identity_Warnings', 'Removals', 'First_Meeting_At', 'Last_Meeting_At', 'Updated_At',
+]
+
+# Host days are sums of the host's meeting rollups for that day
+_HOST_DAILY_ROLLUP_SQL = f"""
+INSERT INTO tbl_UserDailyRollups ({', '.join(_DAILY_ROLLUP_COLUMNS)})
+SELECT r.Host_ID, r.Meeting_Date, 'host', r.Meeting_Type,
+       COUNT(DISTINCT r.Meeting_ID),
+       COUNT(DISTINCT CASE WHEN r.Status = 'active' THEN r.Meeting_ID END),
+       COUNT(DISTINCT CASE WHEN r.Status = 'ended' THEN r.Meeting_ID END),
+       COUNT(DISTINCT CASE WHEN r.Status = 'scheduled' THEN r.Meeting_ID END),
+       SUM(r.Participant_Count),
+       SUM(r.Duration_Sum), SUM(r.Duration_Samples),
+       SUM(r.Attendance_Sum), SUM(r.Attendance_Samples),
+       SUM(r.Overall_Sum), SUM(r.Overall_Samples),
+       SUM(r.Sessions_Sum), SUM(r.Monitored_Count),
+       SUM(r.Popup_Sum), SUM(r.Detection_Sum), SUM(r.Penalty_Sum),
+       SUM(r.Engagement_Sum), SUM(r.Focus_Sum), SUM(r.Break_Time_Sum),
+       SUM(r.Breaks_Used), SUM(r.Identity_Warnings), SUM(r.Removals),
+       MIN(r.Created_At), MAX(r.Created_At),
+       %s
+FROM tbl_MeetingRollups r
+WHERE r.Host_ID IS NOT NULL AND (r.Host_ID, r.Meeting_Date) IN ({{pairs}})
+GROUP BY r.Host_ID, r.Meeting_Date, r.Meeting_Type
+"""
+
+# Participant days come straight from the user's participant rows for that day
+_PARTICIPANT_DAILY_ROLLUP_SQL = f"""
+INSERT INTO tbl_UserDailyRollups ({', '.join(_DAILY_ROLLUP_COLUMNS)})
+SELECT p.User_ID, p.session_start_time, 'participant', COALESCE(p.Meeting_Type, ''),
+       COUNT(DISTINCT p.Meeting_ID),
+       COUNT(DISTINCT CASE WHEN p.Is_Currently_Active = 1 THEN p.Meeting_ID END),
+       COUNT(DISTINCT CASE WHEN m.Status = 'ended' THEN p.Meeting_ID END),
+       COUNT(DISTINCT CASE WHEN m.Status = 'scheduled' THEN p.Meeting_ID END),
+       0,
+       COALESCE(SUM(p.Total_Duration_Minutes), 0), COUNT(p.Total_Duration_Minutes),
+       COALESCE(SUM(p.Participant_Attendance), 0), COUNT(p.Participant_Attendance),
+       COALESCE(SUM(p.Overall_Attendance), 0), COUNT(p.Overall_Attendance),
+       COALESCE(SUM(p.Total_Sessions), 0), COUNT(ats.engagement_score),
+       COALESCE(SUM(ats.popup_count), 0), COALESCE(SUM(ats.total_detections), 0),
+       COALESCE(SUM(ats.attendance_penalty), 0), COALESCE(SUM(ats.engagement_score), 0),
+       COALESCE(SUM(ats.focus_score), 0), COALESCE(SUM(ats.total_break_time_used), 0),
+       COUNT(CASE WHEN ats.break_used = 1 THEN 1 END),
+       COALESCE(SUM(ats.identity_total_warnings_issued), 0),
+       COALESCE(SUM(COALESCE(ats.identity_removal_count, 0) + COALESCE(ats.behavior_removal_count, 0)), 0),
+       MIN(m.Created_At), MAX(m.Created_At),
+       %s
+FROM tbl_Participants p
+LEFT JOIN tbl_Meetings m ON p.Meeting_ID = m.ID
+LEFT JOIN tbl_Attendance_Sessions ats ON p.Meeting_ID = ats.Meeting_ID AND p.User_ID = ats.User_ID
+WHERE p.Role = 'participant' AND (p.User_ID, p.session_start_time) IN ({{pairs}})
+GROUP BY p.User_ID, p.session_start_time, COALESCE(p.Meeting_Type, '')
+"""
+
+
+def _now_for_db():
+    """Naive IST datetime, matching how the meeting tables store times"""
+    return get_current_ist_datetime().replace(tzinfo=None)
+
+
+def _host_days_for_meeting(cursor, meeting_id):
+    cursor.execute("""
+        SELECT DISTINCT Host_ID, Meeting_Date FROM tbl_MeetingRollups
+        WHERE Meeting_ID = %s AND Host_ID IS NOT NULL
+    """, [meeting_id])
+    return {(row[0], row[1]) for row in cursor.fetchall()}
+
+
+def _participant_days_for_meeting(cursor, meeting_id):
+    cursor.execute("""
+        SELECT DISTINCT User_ID, session_start_time FROM tbl_Participants
+        WHERE Meeting_ID = %s AND Role = 'participant' AND session_start_time IS NOT NULL
+    """, [meeting_id])
+    return {(row[0], row[1]) for row in cursor.fetchall()}
+
+
+def refresh_user_daily_rollups(cursor, role, user_days):
+    """Recompute tbl_UserDailyRollups rows of one role for the given (user_id, date) pairs"""
+    user_days = sorted(user_days)
+    if not user_days:
+        return 0
+
+    pairs = ','.join(['(%s, %s)'] * len(user_days))
+    pair_params = [value for pair in user_days for value in pair]
+    insert_sql = _HOST_DAILY_ROLLUP_SQL if role == ROLLUP_ROLE_HOST else _PARTICIPANT_DAILY_ROLLUP_SQL
+
+    # A day can lose a meeting type (or every meeting), so replace rather than upsert
+    cursor.execute(f"""
+        DELETE FROM tbl_UserDailyRollups
+        WHERE Role = %s AND (User_ID, Rollup_Date) IN ({pairs})
+    """, [role] + pair_params)
+    cursor.execute(insert_sql.format(pairs=pairs), [_now_for_db()] + pair_params)
+    return len(user_days)
+
+
+def refresh_meeting_rollups(meeting_id):
+    """
+    Recompute the meeting's occurrence rollups, then every host/participant day they feed.
+    Idempotent; safe to run concurrently with itself.
+    """
+    started = time.monotonic()
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            # Days the meeting counted towards before, in case its date or host changed
+            host_days = _host_days_for_meeting(cursor, meeting_id)
+
+            # The placeholder occurrence-1 row goes away once real occurrences exist
+            cursor.execute("DELETE FROM tbl_MeetingRollups WHERE Meeting_ID = %s", [meeting_id])
+            cursor.execute(_MEETING_ROLLUP_SQL, [_now_for_db(), meeting_id, meeting_id])
+            host_days |= _host_days_for_meeting(cursor, meeting_id)
+            participant_days = _participant_days_for_meeting(cursor, meeting_id)
+
+            refresh_user_daily_rollups(cursor, ROLLUP_ROLE_HOST, host_days)
+            refresh_user_daily_rollups(cursor, ROLLUP_ROLE_PARTICIPANT, participant_days)
+
+    logging.info(
+        f"📊 [ROLLUPS] Refreshed meeting {meeting_id}: {len(host_days)} host days, "
+        f"{len(participant_days)} participant days in {(time.monotonic() - started) * 1000:.0f}ms"
+    )
+    return {'host_days': len(host_days), 'participant_days': len(participant_days)}
+
+
+def schedule_meeting_rollup_refresh(meeting_id, immediate=False):
+    """
+    Queue refresh_meeting_rollups() on Celery. Calls for the same meeting within
+    REFRESH_DELAY are folded into the refresh already queued; immediate=True always
+    queues one without delay (meeting end). Runs inline if the broker is down.
+    """
+    delay = 0 if immediate else ANALYTICS_ROLLUP_CONFIG['REFRESH_DELAY']
+    now = time.monotonic()
+    with _scheduled_lock:
+        if not immediate and _scheduled_refreshes.get(meeting_id, 0) > now:
+            return False
+        _scheduled_refreshes[meeting_id] = now + delay
+        for stale in [key for key, until in _scheduled_refreshes.items() if until <= now]:
+            del _scheduled_refreshes[stale]
+
+    try:
+        from core.scheduler.tasks import refresh_meeting_rollups_task
+        refresh_meeting_rollups_task.apply_async(args=[meeting_id], countdown=delay)
+    except Exception as e:
+        logging.warning(f"📊 [ROLLUPS] Task queue unavailable, refreshing {meeting_id} inline: {e}")
+        try:
+            refresh_meeting_rollups(meeting_id)
+        except Exception as refresh_error:
+            logging.error(f"❌ [ROLLUPS] Refresh failed for meeting {meeting_id}: {refresh_error}")
+    return True
+
+
+def reconcile_analytics_rollups(hours=None, batch_size=None):
+    """
+    Refresh recently created, started or ended meetings whose rollups are missing, carry
+    an outdated status or predate the meeting's end. Active meetings are always checked.
+    """
+    hours = hours or ANALYTICS_ROLLUP_CONFIG['RECONCILE_HOURS']
+    batch_size = batch_size or ANALYTICS_ROLLUP_CONFIG['RECONCILE_BATCH_SIZE']
+    since = _now_for_db() - timedelta(hours=hours)
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT m.ID FROM tbl_Meetings m
+            WHERE (m.Created_At >= %s OR m.Started_At >= %s OR m.Ended_At >= %s OR m.Status = 'active')
+              AND NOT EXISTS (
+                  SELECT 1 FROM tbl_MeetingRollups r
+                  WHERE r.Meeting_ID = m.ID
+                    AND r.Status <=> m.Status
+                    AND (m.Ended_At IS NULL OR r.Updated_At >= m.Ended_At)
+              )
+            ORDER BY COALESCE(m.Ended_At, m.Started_At, m.Created_At)
+            LIMIT %s
+        """, [since, since, since, batch_size])
+        meeting_ids = [row[0] for row in cursor.fetchall()]
+
+    refreshed = 0
+    for meeting_id in meeting_ids:
+        try:
+            refresh_meeting_rollups(meeting_id)
+            refreshed += 1
+        except Exception as e:
+            logging.error(f"❌ [ROLLUPS] Reconcile failed for meeting {meeting_id}: {e}")
+
+    if meeting_ids:
+        logging.info(f"📊 [ROLLUPS] Reconciled {refreshed}/{len(meeting_ids)} meetings")
+    return {'checked': len(meeting_ids), 'refreshed': refreshed}
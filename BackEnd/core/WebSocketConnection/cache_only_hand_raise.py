@@ -12,6 +12,7 @@ from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.urls import path
 from django.db import connection
+from core.WebSocketConnection.meeting_events import publish_meeting_event
 
 # Configure logging
 logger = logging.getLogger('cache_hand_raise')
@@ -53,12 +54,90 @@ HAND_STATUS = {
     'LOWERED': 'lowered'
 }
 
+# Lua scripts keep each hand-raise mutation atomic (no double raises between
+# HEXISTS and HSET) and turn several round trips into one.
+
+# KEYS: [hands, queue, status]  ARGV: [user_id, hand_json, raised_at, max_hands, now_iso]
+# Returns -1 when the meeting is not active, 0 when already raised, 1 when raised
+RAISE_HAND_SCRIPT = """
+if redis.call('EXISTS', KEYS[3]) == 0 then
+    return -1
+end
+if redis.call('HSETNX', KEYS[1], ARGV[1], ARGV[2]) == 0 then
+    return 0
+end
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[1])
+local overflow = redis.call('ZCARD', KEYS[2]) - tonumber(ARGV[4])
+if overflow > 0 then
+    local dropped = redis.call('ZRANGE', KEYS[2], 0, overflow - 1)
+    redis.call('ZREMRANGEBYRANK', KEYS[2], 0, overflow - 1)
+    redis.call('HDEL', KEYS[1], unpack(dropped))
+end
+redis.call('HINCRBY', KEYS[3], 'total_hands_raised', 1)
+redis.call('HSET', KEYS[3], 'last_hand_at', ARGV[5])
+return 1
+"""
+
+# KEYS: [hands, queue]  ARGV: [user_id]
+LOWER_HAND_SCRIPT = """
+if redis.call('HDEL', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('ZREM', KEYS[2], ARGV[1])
+return 1
+"""
+
+# KEYS: [hands, queue, acknowledged, status]
+# ARGV: [participant_user_id, host_user_id, action, now_iso, new_status, ack_ttl]
+# Returns the updated hand JSON, or false when no hand is raised
+ACKNOWLEDGE_HAND_SCRIPT = """
+local raw = redis.call('HGET', KEYS[1], ARGV[1])
+if not raw then
+    return false
+end
+local hand = cjson.decode(raw)
+hand['status'] = ARGV[5]
+hand['acknowledged_by'] = ARGV[2]
+hand['acknowledged_at'] = ARGV[4]
+hand['action'] = ARGV[3]
+local encoded = cjson.encode(hand)
+
+redis.call('HDEL', KEYS[1], ARGV[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+if ARGV[3] == 'acknowledge' then
+    redis.call('HSET', KEYS[3], ARGV[1], encoded)
+    redis.call('EXPIRE', KEYS[3], ARGV[6])
+    redis.call('HINCRBY', KEYS[4], 'total_acknowledged', 1)
+else
+    redis.call('HINCRBY', KEYS[4], 'total_denied', 1)
+end
+redis.call('HSET', KEYS[4], 'last_action_at', ARGV[4])
+return encoded
+"""
+
+# KEYS: [status]  ARGV: [meeting_id, started_at]
+# HSETNX per field: a second start (reconnect, concurrent auto-start) keeps the counters
+START_HAND_RAISE_SCRIPT = """
+local started = redis.call('HSETNX', KEYS[1], 'meeting_id', ARGV[1])
+redis.call('HSETNX', KEYS[1], 'started_at', ARGV[2])
+redis.call('HSETNX', KEYS[1], 'status', 'active')
+redis.call('HSETNX', KEYS[1], 'total_hands_raised', 0)
+redis.call('HSETNX', KEYS[1], 'total_acknowledged', 0)
+redis.call('HSETNX', KEYS[1], 'total_denied', 0)
+return started
+"""
+
 class CacheOnlyHandRaiseManager:
     """Manages hand raises ONLY in cache - NO database storage"""
     
     def __init__(self):
         self.redis_client = cache_hand_raise_redis
         self.enabled = cache_hand_raise_redis is not None
+        if self.enabled:
+            self._raise_hand_script = cache_hand_raise_redis.register_script(RAISE_HAND_SCRIPT)
+            self._lower_hand_script = cache_hand_raise_redis.register_script(LOWER_HAND_SCRIPT)
+            self._acknowledge_hand_script = cache_hand_raise_redis.register_script(ACKNOWLEDGE_HAND_SCRIPT)
+            self._start_hand_raise_script = cache_hand_raise_redis.register_script(START_HAND_RAISE_SCRIPT)
         logger.info(f"✋ Cache-only hand raise manager initialized: {'Enabled' if self.enabled else 'Disabled'}")
     
     def _get_hands_key(self, meeting_id):
@@ -66,12 +145,12 @@ class CacheOnlyHandRaiseManager:
         return f"cache_hands:{meeting_id}"
     
     def _get_queue_key(self, meeting_id):
-        """Generate Redis key for hand raise queue (order)"""
-        return f"cache_hand_queue:{meeting_id}"
+        """Generate Redis key for hand raise queue (ZSET scored by raise time)"""
+        return f"cache_hand_order:{meeting_id}"
     
     def _get_meeting_status_key(self, meeting_id):
-        """Generate Redis key for meeting status"""
-        return f"cache_hand_meeting:{meeting_id}"
+        """Generate Redis key for meeting status (hash)"""
+        return f"cache_hand_status:{meeting_id}"
     
     def _get_acknowledged_key(self, meeting_id):
         """Generate Redis key for acknowledged hands (temporary)"""
@@ -85,17 +164,15 @@ class CacheOnlyHandRaiseManager:
         
         try:
             status_key = self._get_meeting_status_key(meeting_id)
-            meeting_data = {
-                'meeting_id': meeting_id,
-                'started_at': timezone.now().isoformat(),
-                'status': 'active',
-                'total_hands_raised': 0,
-                'total_acknowledged': 0,
-                'total_denied': 0
-            }
             
-            # Set meeting as active (no expiration until meeting ends)
-            self.redis_client.set(status_key, json.dumps(meeting_data))
+            # Set meeting as active (no expiration until meeting ends); existing counters are kept
+            started = self._start_hand_raise_script(
+                keys=[status_key],
+                args=[meeting_id, timezone.now().isoformat()]
+            )
+            if not started:
+                logger.info(f"✋ Hand raise already initialized for meeting: {meeting_id}")
+                return True
             
             logger.info(f"✋ Started cache-only hand raise for meeting: {meeting_id}")
             return True
@@ -110,45 +187,37 @@ class CacheOnlyHandRaiseManager:
             return False
         
         try:
-            hands_key = self._get_hands_key(meeting_id)
-            queue_key = self._get_queue_key(meeting_id)
-            status_key = self._get_meeting_status_key(meeting_id)
-            
-            # Check if meeting is active
-            meeting_status = self.redis_client.get(status_key)
-            if not meeting_status:
-                logger.warning(f"Meeting {meeting_id} not active, cannot raise hand")
-                return False
-            
-            # Check if user already has hand raised
-            if self.redis_client.hexists(hands_key, user_id):
-                logger.warning(f"User {user_id} already has hand raised in meeting {meeting_id}")
-                return False
-            
-            # Prepare hand raise data
+            raised_at = time.time()
             hand_data = {
                 'user_id': str(user_id),
                 'user_name': user_name[:CACHE_SETTINGS['MAX_USER_NAME_LENGTH']],
                 'participant_identity': participant_identity,
                 'timestamp': timezone.now().isoformat(),
                 'status': HAND_STATUS['WAITING'],
-                'raised_at': time.time()
+                'raised_at': raised_at
             }
             
-            # Add to hands hash
-            self.redis_client.hset(hands_key, user_id, json.dumps(hand_data))
-            
-            # Add to queue (for ordering)
-            self.redis_client.rpush(queue_key, user_id)
-            
-            # Limit queue size
-            self.redis_client.ltrim(queue_key, -CACHE_SETTINGS['MAX_HANDS_PER_ROOM'], -1)
+            result = self._raise_hand_script(
+                keys=[
+                    self._get_hands_key(meeting_id),
+                    self._get_queue_key(meeting_id),
+                    self._get_meeting_status_key(meeting_id),
+                ],
+                args=[
+                    str(user_id),
+                    json.dumps(hand_data),
+                    raised_at,
+                    CACHE_SETTINGS['MAX_HANDS_PER_ROOM'],
+                    hand_data['timestamp'],
+                ]
+            )
             
-            # Update statistics
-            status_data = json.loads(meeting_status)
-            status_data['total_hands_raised'] = status_data.get('total_hands_raised', 0) + 1
-            status_data['last_hand_at'] = timezone.now().isoformat()
-            self.redis_client.set(status_key, json.dumps(status_data))
+            if result == -1:
+                logger.warning(f"Meeting {meeting_id} not active, cannot raise hand")
+                return False
+            if result == 0:
+                logger.warning(f"User {user_id} already has hand raised in meeting {meeting_id}")
+                return False
             
             logger.info(f"✋ User {user_id} ({user_name}) raised hand in meeting {meeting_id}")
             return True
@@ -163,20 +232,15 @@ class CacheOnlyHandRaiseManager:
             return False
         
         try:
-            hands_key = self._get_hands_key(meeting_id)
-            queue_key = self._get_queue_key(meeting_id)
+            lowered = self._lower_hand_script(
+                keys=[self._get_hands_key(meeting_id), self._get_queue_key(meeting_id)],
+                args=[str(user_id)]
+            )
             
-            # Check if hand is raised
-            if not self.redis_client.hexists(hands_key, user_id):
+            if not lowered:
                 logger.warning(f"User {user_id} does not have hand raised in meeting {meeting_id}")
                 return False
             
-            # Remove from hands hash
-            self.redis_client.hdel(hands_key, user_id)
-            
-            # Remove from queue
-            self.redis_client.lrem(queue_key, 0, user_id)
-            
             logger.info(f"✋ User {user_id} lowered hand in meeting {meeting_id}")
             return True
             
@@ -190,43 +254,29 @@ class CacheOnlyHandRaiseManager:
             return False
         
         try:
-            hands_key = self._get_hands_key(meeting_id)
-            queue_key = self._get_queue_key(meeting_id)
-            ack_key = self._get_acknowledged_key(meeting_id)
-            status_key = self._get_meeting_status_key(meeting_id)
+            new_status = HAND_STATUS['ACKNOWLEDGED'] if action == 'acknowledge' else HAND_STATUS['DENIED']
+            
+            hand_data = self._acknowledge_hand_script(
+                keys=[
+                    self._get_hands_key(meeting_id),
+                    self._get_queue_key(meeting_id),
+                    self._get_acknowledged_key(meeting_id),
+                    self._get_meeting_status_key(meeting_id),
+                ],
+                args=[
+                    str(participant_user_id),
+                    str(host_user_id),
+                    action,
+                    timezone.now().isoformat(),
+                    new_status,
+                    CACHE_SETTINGS['ACKNOWLEDGMENT_TTL'],
+                ]
+            )
             
-            # Get hand data
-            hand_data_str = self.redis_client.hget(hands_key, participant_user_id)
-            if not hand_data_str:
+            if not hand_data:
                 logger.warning(f"No raised hand found for user {participant_user_id}")
                 return False
             
-            hand_data = json.loads(hand_data_str)
-            hand_data['status'] = HAND_STATUS['ACKNOWLEDGED'] if action == 'acknowledge' else HAND_STATUS['DENIED']
-            hand_data['acknowledged_by'] = host_user_id
-            hand_data['acknowledged_at'] = timezone.now().isoformat()
-            hand_data['action'] = action
-            
-            if action == 'acknowledge':
-                # Move to acknowledged (temporary storage)
-                self.redis_client.hset(ack_key, participant_user_id, json.dumps(hand_data))
-                self.redis_client.expire(ack_key, CACHE_SETTINGS['ACKNOWLEDGMENT_TTL'])
-            
-            # Remove from active hands
-            self.redis_client.hdel(hands_key, participant_user_id)
-            self.redis_client.lrem(queue_key, 0, participant_user_id)
-            
-            # Update statistics
-            meeting_status = self.redis_client.get(status_key)
-            if meeting_status:
-                status_data = json.loads(meeting_status)
-                if action == 'acknowledge':
-                    status_data['total_acknowledged'] = status_data.get('total_acknowledged', 0) + 1
-                else:
-                    status_data['total_denied'] = status_data.get('total_denied', 0) + 1
-                status_data['last_action_at'] = timezone.now().isoformat()
-                self.redis_client.set(status_key, json.dumps(status_data))
-            
             logger.info(f"✅ Host {host_user_id} {action}d hand from {participant_user_id}")
             return True
             
@@ -243,11 +293,11 @@ class CacheOnlyHandRaiseManager:
             hands_key = self._get_hands_key(meeting_id)
             queue_key = self._get_queue_key(meeting_id)
             
-            # Get count before clearing
-            hands_count = self.redis_client.hlen(hands_key)
-            
-            # Clear all hands
-            self.redis_client.delete(hands_key, queue_key)
+            # Count and clear in one round trip
+            pipe = self.redis_client.pipeline()
+            pipe.hlen(hands_key)
+            pipe.delete(hands_key, queue_key)
+            hands_count = pipe.execute()[0]
             
             logger.info(f"🧹 Host {host_user_id} cleared {hands_count} hands in meeting {meeting_id}")
             return hands_count
@@ -257,44 +307,45 @@ class CacheOnlyHandRaiseManager:
             return 0
     
     def get_raised_hands(self, meeting_id):
-        """Get all currently raised hands in order"""
+        """Get all currently raised hands in order (single round trip)"""
         if not self.enabled:
             return []
         
         try:
-            hands_key = self._get_hands_key(meeting_id)
-            queue_key = self._get_queue_key(meeting_id)
-            status_key = self._get_meeting_status_key(meeting_id)
+            pipe = self.redis_client.pipeline()
+            pipe.exists(self._get_meeting_status_key(meeting_id))
+            pipe.zrange(self._get_queue_key(meeting_id), 0, -1)
+            pipe.hgetall(self._get_hands_key(meeting_id))
+            meeting_exists, ordered_user_ids, hands = pipe.execute()
             
             # Check if meeting is active
-            if not self.redis_client.exists(status_key):
+            if not meeting_exists:
                 logger.warning(f"Meeting {meeting_id} not found in cache")
                 return []
             
-            # Get ordered list of user IDs
-            ordered_user_ids = self.redis_client.lrange(queue_key, 0, -1)
-            
             raised_hands = []
             for user_id in ordered_user_ids:
-                hand_data_str = self.redis_client.hget(hands_key, user_id)
-                if hand_data_str:
-                    try:
-                        hand_data = json.loads(hand_data_str)
-                        raised_hands.append({
-                            'id': f"hand_{user_id}_{int(hand_data.get('raised_at', time.time()))}",
-                            'user_id': hand_data['user_id'],
-                            'user': {
-                                'user_id': hand_data['user_id'],
-                                'full_name': hand_data['user_name'],
-                                'profile_picture': None
-                            },
-                            'timestamp': hand_data['timestamp'],
-                            'status': hand_data['status'],
-                            'participant_identity': hand_data.get('participant_identity'),
-                            'raised_at': hand_data.get('raised_at')
-                        })
-                    except json.JSONDecodeError:
-                        continue
+                hand_data_str = hands.get(user_id)
+                if not hand_data_str:
+                    continue
+                try:
+                    hand_data = json.loads(hand_data_str)
+                except json.JSONDecodeError:
+                    continue
+                
+                raised_hands.append({
+                    'id': f"hand_{user_id}_{int(hand_data.get('raised_at', time.time()))}",
+                    'user_id': hand_data['user_id'],
+                    'user': {
+                        'user_id': hand_data['user_id'],
+                        'full_name': hand_data['user_name'],
+                        'profile_picture': None
+                    },
+                    'timestamp': hand_data['timestamp'],
+                    'status': hand_data['status'],
+                    'participant_identity': hand_data.get('participant_identity'),
+                    'raised_at': hand_data.get('raised_at')
+                })
             
             return raised_hands
             
@@ -376,19 +427,18 @@ class CacheOnlyHandRaiseManager:
             return None
         
         try:
-            status_key = self._get_meeting_status_key(meeting_id)
-            status_data = self.redis_client.get(status_key)
+            pipe = self.redis_client.pipeline()
+            pipe.hgetall(self._get_meeting_status_key(meeting_id))
+            pipe.hlen(self._get_hands_key(meeting_id))
+            data, current_hands_count = pipe.execute()
             
-            if status_data:
-                data = json.loads(status_data)
-                current_hands_count = self.get_hands_count(meeting_id)
-                
+            if data:
                 return {
                     'meeting_id': meeting_id,
                     'started_at': data.get('started_at'),
-                    'total_hands_raised': data.get('total_hands_raised', 0),
-                    'total_acknowledged': data.get('total_acknowledged', 0),
-                    'total_denied': data.get('total_denied', 0),
+                    'total_hands_raised': int(data.get('total_hands_raised', 0)),
+                    'total_acknowledged': int(data.get('total_acknowledged', 0)),
+                    'total_denied': int(data.get('total_denied', 0)),
                     'current_raised_hands': current_hands_count,
                     'last_hand_at': data.get('last_hand_at'),
                     'last_action_at': data.get('last_action_at'),
@@ -492,6 +542,7 @@ def raise_hand(request):
                 'timestamp': timezone.now().isoformat(),
                 'meeting_id': data['meeting_id']
             }
+            publish_meeting_event(data['meeting_id'], 'hand_raise', livekit_data)
             
             return JsonResponse({
                 'success': True,
@@ -563,6 +614,7 @@ def acknowledge_hand(request):
                 'timestamp': timezone.now().isoformat(),
                 'meeting_id': data['meeting_id']
             }
+            publish_meeting_event(data['meeting_id'], 'hand_acknowledgment', livekit_data)
             
             return JsonResponse({
                 'success': True,
@@ -626,6 +678,7 @@ def clear_all_hands(request):
             'timestamp': timezone.now().isoformat(),
             'meeting_id': data['meeting_id']
         }
+        publish_meeting_event(data['meeting_id'], 'clear_all_hands', livekit_data)
         
         return JsonResponse({
             'success': True,
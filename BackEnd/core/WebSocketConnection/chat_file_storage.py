@@ -0,0 +1,223 @@
+# core/WebSocketConnection/chat_file_storage.py - Blob storage for chat attachments
+# Attachment bytes live on local disk or S3; Redis only keeps their metadata.
+import os
+import re
+import time
+import shutil
+import logging
+from datetime import datetime, timedelta, timezone
+import boto3
+from botocore.exceptions import ClientError
+from django.conf import settings
+
+logger = logging.getLogger('cache_chat')
+
+CHAT_FILE_STORAGE = {
+    'BACKEND': os.getenv("CHAT_FILE_STORAGE", "s3"),  # 's3' or 'local'
+    'LOCAL_ROOT': os.getenv("CHAT_FILE_LOCAL_ROOT", os.path.join(settings.MEDIA_ROOT, "chat_files")),
+    # 'local' is only safe when LOCAL_ROOT is one volume shared by every web pod and the Celery worker
+    'LOCAL_SHARED': os.getenv("CHAT_FILE_LOCAL_SHARED", "False") == "True",
+    'S3_BUCKET': os.getenv("CHAT_FILE_S3_BUCKET", os.getenv("AWS_S3_BUCKET", "imeetpro-prod-recordings")),
+    'S3_PREFIX': os.getenv("CHAT_FILE_S3_PREFIX", "chat_files"),
+    # Point at MinIO/moto etc. to run against a local S3 stand-in
+    'S3_ENDPOINT_URL': os.getenv("CHAT_FILE_S3_ENDPOINT_URL") or None,
+    'S3_PRESIGNED_DOWNLOADS': os.getenv("CHAT_FILE_S3_PRESIGNED_DOWNLOADS", "True") == "True",
+    'PRESIGNED_URL_TTL': int(os.getenv("CHAT_FILE_PRESIGNED_URL_TTL", 300)),
+    'STREAM_CHUNK_SIZE': 64 * 1024,
+}
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_range_header(range_header, size):
+    """
+    Parse a single-range 'Range: bytes=a-b' header.
+    Returns (start, end) inclusive, None when absent/unsupported (serve the
+    whole file), or False when the range cannot be satisfied.
+    """
+    if not range_header:
+        return None
+    match = _RANGE_RE.match(range_header.strip())
+    if not match:
+        return None
+
+    start_str, end_str = match.groups()
+    if not start_str and not end_str:
+        return None
+    if not start_str:
+        # Suffix range: last N bytes
+        length = int(end_str)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+
+    start = int(start_str)
+    end = int(end_str) if end_str else size - 1
+    if start >= size or end < start:
+        return False
+    return start, min(end, size - 1)
+
+
+class LocalChatFileStore:
+    """Disk-backed store; files are written and read in fixed-size chunks"""
+
+    name = 'local'
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, storage_key):
+        return os.path.join(self.root, *storage_key.split('/'))
+
+    def save(self, storage_key, file_obj, content_type):
+        path = self._path(storage_key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as out:
+            shutil.copyfileobj(file_obj, out, CHAT_FILE_STORAGE['STREAM_CHUNK_SIZE'])
+
+    def exists(self, storage_key):
+        return os.path.exists(self._path(storage_key))
+
+    def iter_range(self, storage_key, start, end):
+        """Yield bytes [start, end] of the file without loading it whole"""
+        remaining = end - start + 1
+        with open(self._path(storage_key), 'rb') as f:
+            f.seek(start)
+            while remaining > 0:
+                chunk = f.read(min(CHAT_FILE_STORAGE['STREAM_CHUNK_SIZE'], remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    def presigned_url(self, storage_key, filename, content_type):
+        return None
+
+    def delete(self, storage_key):
+        try:
+            os.remove(self._path(storage_key))
+        except FileNotFoundError:
+            pass
+
+    def delete_prefix(self, prefix):
+        shutil.rmtree(self._path(prefix), ignore_errors=True)
+
+    def sweep_expired(self, max_age_seconds):
+        """Delete files older than max_age_seconds and the directories they leave empty"""
+        cutoff = time.time() - max_age_seconds
+        deleted = 0
+        for directory, _, filenames in os.walk(self.root, topdown=False):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        deleted += 1
+                except OSError:
+                    pass
+            if directory != self.root:
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    pass  # not empty
+        return deleted
+
+
+class S3ChatFileStore:
+    """S3 store; uploads use managed multipart transfers, downloads use ranged GETs or presigned URLs"""
+
+    name = 's3'
+
+    def __init__(self, bucket, prefix, endpoint_url=None):
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+        self.client = boto3.client(
+            "s3",
+            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+            region_name=os.getenv("AWS_REGION", "ap-south-1"),
+            endpoint_url=endpoint_url
+        )
+
+    def _key(self, storage_key):
+        return f"{self.prefix}/{storage_key}" if self.prefix else storage_key
+
+    def save(self, storage_key, file_obj, content_type):
+        self.client.upload_fileobj(
+            file_obj, self.bucket, self._key(storage_key),
+            ExtraArgs={'ContentType': content_type}
+        )
+
+    def exists(self, storage_key):
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(storage_key))
+            return True
+        except ClientError:
+            return False
+
+    def iter_range(self, storage_key, start, end):
+        response = self.client.get_object(
+            Bucket=self.bucket,
+            Key=self._key(storage_key),
+            Range=f"bytes={start}-{end}"
+        )
+        yield from response['Body'].iter_chunks(CHAT_FILE_STORAGE['STREAM_CHUNK_SIZE'])
+
+    def presigned_url(self, storage_key, filename, content_type):
+        if not CHAT_FILE_STORAGE['S3_PRESIGNED_DOWNLOADS']:
+            return None
+        return self.client.generate_presigned_url(
+            'get_object',
+            Params={
+                'Bucket': self.bucket,
+                'Key': self._key(storage_key),
+                'ResponseContentDisposition': f'attachment; filename="{filename}"',
+                'ResponseContentType': content_type,
+            },
+            ExpiresIn=CHAT_FILE_STORAGE['PRESIGNED_URL_TTL']
+        )
+
+    def delete(self, storage_key):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(storage_key))
+
+    def delete_prefix(self, prefix):
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self._key(prefix) + '/'):
+            objects = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
+            if objects:
+                self.client.delete_objects(Bucket=self.bucket, Delete={'Objects': objects})
+
+    def sweep_expired(self, max_age_seconds):
+        """Delete objects under the prefix older than max_age_seconds"""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds)
+        deleted = 0
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=f"{self.prefix}/" if self.prefix else ''):
+            objects = [{'Key': obj['Key']} for obj in page.get('Contents', []) if obj['LastModified'] < cutoff]
+            if objects:
+                self.client.delete_objects(Bucket=self.bucket, Delete={'Objects': objects})
+                deleted += len(objects)
+        return deleted
+
+
+def create_chat_file_store():
+    if CHAT_FILE_STORAGE['BACKEND'] == 's3':
+        store = S3ChatFileStore(
+            CHAT_FILE_STORAGE['S3_BUCKET'],
+            CHAT_FILE_STORAGE['S3_PREFIX'],
+            CHAT_FILE_STORAGE['S3_ENDPOINT_URL']
+        )
+    elif CHAT_FILE_STORAGE['LOCAL_SHARED']:
+        store = LocalChatFileStore(CHAT_FILE_STORAGE['LOCAL_ROOT'])
+    else:
+        raise RuntimeError(
+            "CHAT_FILE_STORAGE=local needs CHAT_FILE_LOCAL_ROOT on a volume shared by all "
+            "backend pods and the Celery worker; set CHAT_FILE_LOCAL_SHARED=True to confirm it, "
+            "or use CHAT_FILE_STORAGE=s3"
+        )
+    logger.info(f"📦 Chat file storage backend: {store.name}")
+    return store
+
+
+chat_file_store = create_chat_file_store()
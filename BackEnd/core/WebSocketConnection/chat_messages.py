@@ -6,11 +6,11 @@ import time
 import logging
 import os
 import hashlib
-import base64
+import io
 import mimetypes
 from datetime import datetime, timedelta
 from django.utils import timezone
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse, HttpResponseRedirect
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.urls import path
@@ -19,6 +19,8 @@ from django.core.files.base import ContentFile
 from django.conf import settings
 from redis import ConnectionPool
 from functools import wraps
+from core.WebSocketConnection.meeting_events import publish_meeting_event
+from core.WebSocketConnection.chat_file_storage import chat_file_store, parse_range_header
 
 # Configure logging
 logger = logging.getLogger('cache_chat')
@@ -114,6 +116,25 @@ CACHE_SETTINGS = {
     'SYNC_INTERVAL': 2,
 }
 
+# Appends a message to the meeting stream and fans it out, under the same
+# stream ID, to either the public stream or each participant's private index.
+# KEYS: [stream, public_stream, status, private_index_set, private_stream...]
+# ARGV: [maxlen, payload, is_private, last_activity]
+ADD_MESSAGE_SCRIPT = """
+local message_id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', 'data', ARGV[2])
+if ARGV[3] == '1' then
+    for i = 5, #KEYS do
+        redis.call('XADD', KEYS[i], 'MAXLEN', '~', ARGV[1], message_id, 'data', ARGV[2])
+        redis.call('SADD', KEYS[4], KEYS[i])
+    end
+else
+    redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[1], message_id, 'data', ARGV[2])
+end
+redis.call('HINCRBY', KEYS[3], 'message_count', 1)
+redis.call('HSET', KEYS[3], 'last_activity', ARGV[4])
+return message_id
+"""
+
 class RateLimiter:
     """Token bucket rate limiter using Redis"""
     
@@ -198,16 +219,69 @@ class EnhancedCacheOnlyChatManager:
     def __init__(self):
         self.redis_client = cache_chat_redis
         self.enabled = cache_chat_redis is not None
+        self._add_message_script = cache_chat_redis.register_script(ADD_MESSAGE_SCRIPT) if self.enabled else None
         logger.info(f"🗨 Enhanced cache-only chat manager initialized: {'Enabled' if self.enabled else 'Disabled'}")
     
     def _get_chat_key(self, meeting_id):
-        return f"cache_chat:{meeting_id}"
+        """Stream holding every message of the meeting (host view)"""
+        return f"cache_chat_stream:{meeting_id}"
+    
+    def _get_public_chat_key(self, meeting_id):
+        return f"cache_chat_public:{meeting_id}"
+    
+    def _get_private_chat_key(self, meeting_id, user_id):
+        """Per-participant stream of private messages they sent or received"""
+        return f"cache_chat_private:{meeting_id}:{user_id}"
+    
+    def _get_private_index_key(self, meeting_id):
+        return f"cache_chat_private_index:{meeting_id}"
+    
+    @staticmethod
+    def _parse_stream_id(stream_id):
+        """Turn a stream ID (or a legacy '<ms>_<hash>' message ID) into a sortable (ms, seq) tuple"""
+        stream_id = str(stream_id)
+        if '-' in stream_id:
+            ms, seq = stream_id.split('-', 1)
+            return int(ms), int(seq)
+        # Legacy list-based IDs only carry the millisecond timestamp
+        return int(stream_id.split('_', 1)[0]), -1
+    
+    def _next_stream_id(self, after):
+        """First stream ID strictly after 'after', for exclusive XRANGE starts"""
+        ms, seq = self._parse_stream_id(after)
+        return f"{ms}-{seq + 1}"
+    
+    @staticmethod
+    def _decode_stream_entries(entries):
+        messages = []
+        for entry_id, fields in entries:
+            # Keys, values and IDs are bytes when CACHE_CHAT_DECODE_RESPONSES=False
+            if isinstance(entry_id, bytes):
+                entry_id = entry_id.decode()
+            fields = {
+                (key.decode() if isinstance(key, bytes) else key): value
+                for key, value in fields.items()
+            }
+            try:
+                data = fields['data']
+                message = json.loads(data.decode() if isinstance(data, bytes) else data)
+            except (KeyError, TypeError, UnicodeDecodeError, json.JSONDecodeError):
+                continue
+            message['id'] = entry_id
+            messages.append(message)
+        return messages
     
     def _get_files_key(self, meeting_id):
         return f"cache_files:{meeting_id}"
     
-    def _get_file_data_key(self, file_id):
-        return f"cache_file_data:{file_id}"
+    def _get_file_meta_key(self, file_id):
+        """Per-file metadata, so downloads resolve a file without scanning meetings"""
+        return f"cache_file_meta:{file_id}"
+    
+    def _get_storage_key(self, meeting_id, file_id):
+        import re
+        safe_meeting_id = re.sub(r'[^\w-]', '_', str(meeting_id))
+        return f"{safe_meeting_id}/{file_id}"
     
     def _get_typing_key(self, meeting_id):
         return f"cache_typing:{meeting_id}"
@@ -218,8 +292,8 @@ class EnhancedCacheOnlyChatManager:
     def _get_meeting_status_key(self, meeting_id):
         return f"cache_meeting_status:{meeting_id}"
     
-    def _validate_file(self, file_data, filename, content_type):
-        if len(file_data) > CACHE_SETTINGS['MAX_FILE_SIZE']:
+    def _validate_file(self, file_size, filename, content_type):
+        if file_size > CACHE_SETTINGS['MAX_FILE_SIZE']:
             return False, f"File too large (max {CACHE_SETTINGS['MAX_FILE_SIZE'] / 1024 / 1024:.1f}MB)"
         
         if content_type not in CACHE_SETTINGS['ALLOWED_FILE_TYPES']:
@@ -289,13 +363,12 @@ class EnhancedCacheOnlyChatManager:
             return False
             
     def add_message(self, meeting_id, message_data):
-        """Add message with optimized Redis pipeline operations"""
+        """Append a message to the meeting stream in a single scripted round trip"""
         if not self.enabled:
             return False
         
         try:
             redis_client = get_redis_client()  # Use connection pool
-            chat_key = self._get_chat_key(meeting_id)
             status_key = self._get_meeting_status_key(meeting_id)
             
             # Check meeting is active
@@ -303,44 +376,64 @@ class EnhancedCacheOnlyChatManager:
                 logger.warning(f"Meeting {meeting_id} not active, cannot add message")
                 return False
             
-            message_id = f"{int(time.time() * 1000)}_{hash(str(message_data)) % 100000}"
-            
-            recipients = message_data.get('recipients', [])
-            is_private = message_data.get('is_private', False)
+            is_private = bool(message_data.get('is_private', False))
+            recipients = [str(r) for r in message_data.get('recipients', []) if r] if is_private else []
+            sender_id = str(message_data.get('user_id', ''))
             
+            # The message ID is the stream entry ID assigned by XADD
             message = {
-                'id': message_id,
-                'user_id': str(message_data.get('user_id', '')),
+                'user_id': sender_id,
                 'user_name': message_data.get('user_name', 'Anonymous'),
                 'message': message_data.get('message', '').strip()[:CACHE_SETTINGS['MAX_MESSAGE_LENGTH']],
                 'timestamp': message_data.get('timestamp', timezone.now().isoformat()),
                 'message_type': message_data.get('message_type', 'text'),
                 'is_private': is_private,
-                'recipients': recipients if is_private else [],
+                'recipients': recipients,
                 'sender_is_host': message_data.get('sender_is_host', False),
                 'file_id': message_data.get('file_id'),
                 'file_metadata': message_data.get('file_metadata'),
                 'file_data': message_data.get('file_data')
             }
             
-            # USE PIPELINE - This is the key optimization!
-            # Instead of 4 separate Redis calls, we do 1 round trip
-            pipe = redis_client.pipeline()
-            pipe.lpush(chat_key, json.dumps(message))
-            pipe.ltrim(chat_key, 0, CACHE_SETTINGS['MAX_MESSAGES_PER_ROOM'] - 1)
-            pipe.hincrby(status_key, 'message_count', 1)
-            pipe.hset(status_key, 'last_activity', timezone.now().isoformat())
-            pipe.execute()  # Single round-trip to Redis
+            keys = [
+                self._get_chat_key(meeting_id),
+                self._get_public_chat_key(meeting_id),
+                status_key,
+                self._get_private_index_key(meeting_id),
+            ]
+            if is_private:
+                # Sender and every recipient get the message in their own index
+                participants = dict.fromkeys([sender_id] + recipients)
+                keys.extend(self._get_private_chat_key(meeting_id, uid) for uid in participants if uid)
+            
+            message_id = self._add_message_script(
+                keys=keys,
+                args=[
+                    CACHE_SETTINGS['MAX_MESSAGES_PER_ROOM'],
+                    json.dumps(message),
+                    '1' if is_private else '0',
+                    timezone.now().isoformat(),
+                ],
+                client=redis_client
+            )
             
             logger.info(f"📝 Message added: {message_id} (private: {is_private})")
+            
+            message['id'] = message_id
+            if is_private:
+                publish_meeting_event(meeting_id, 'chat_message', message,
+                                      user_ids=[sender_id] + recipients, include_hosts=True)
+            else:
+                publish_meeting_event(meeting_id, 'chat_message', message)
+            
             return message_id
             
         except Exception as e:
             logger.error(f"❌ Failed to add message: {e}")
             return False
 
-    def upload_file(self, meeting_id, file_data, filename, content_type, user_id, user_name, is_private=False, recipients=None):
-        """Upload file with chunked storage for large files"""
+    def upload_file(self, meeting_id, file_obj, filename, content_type, user_id, user_name, is_private=False, recipients=None, file_size=None):
+        """Stream an attachment to the blob store; Redis keeps only its metadata"""
         if not self.enabled:
             return False, "Redis not available"
         
@@ -350,13 +443,16 @@ class EnhancedCacheOnlyChatManager:
         recipients = [str(r) for r in recipients if r] if recipients else []
         
         try:
-            if not isinstance(file_data, bytes):
-                logger.error(f"File data must be bytes, got {type(file_data)}")
+            if isinstance(file_obj, bytes):
+                file_size = len(file_obj)
+                file_obj = io.BytesIO(file_obj)
+            elif file_size is None:
+                logger.error("file_size is required when uploading a file object")
                 return False, "Invalid file data type"
             
             filename = self._sanitize_filename(filename)
             
-            is_valid, validation_msg = self._validate_file(file_data, filename, content_type)
+            is_valid, validation_msg = self._validate_file(file_size, filename, content_type)
             if not is_valid:
                 return False, validation_msg
             
@@ -367,29 +463,11 @@ class EnhancedCacheOnlyChatManager:
                 return False, "Meeting not active"
             
             file_id = self._generate_file_id(meeting_id, filename, user_id)
-            file_data_key = self._get_file_data_key(file_id)
+            storage_key = self._get_storage_key(meeting_id, file_id)
             
-            # CHUNKED STORAGE for large files (key optimization)
-            CHUNK_SIZE = 1024 * 1024  # 1MB chunks
-            
-            if len(file_data) > CHUNK_SIZE:
-                # Store in chunks using pipeline
-                chunks = [file_data[i:i+CHUNK_SIZE] for i in range(0, len(file_data), CHUNK_SIZE)]
-                
-                pipe = redis_client.pipeline()
-                for i, chunk in enumerate(chunks):
-                    chunk_key = f"{file_data_key}:chunk:{i}"
-                    encoded_chunk = base64.b64encode(chunk).decode('ascii')
-                    pipe.set(chunk_key, encoded_chunk, ex=CACHE_SETTINGS['FILE_CACHE_TTL'])
-                
-                pipe.set(f"{file_data_key}:chunks", len(chunks), ex=CACHE_SETTINGS['FILE_CACHE_TTL'])
-                pipe.execute()
-                
-                logger.info(f"📦 Stored file in {len(chunks)} chunks")
-            else:
-                # Store directly for small files
-                encoded_data = base64.b64encode(file_data).decode('ascii')
-                redis_client.set(file_data_key, encoded_data, ex=CACHE_SETTINGS['FILE_CACHE_TTL'])
+            # Bytes go to disk/S3 in chunks - never through Redis or fully into memory
+            chat_file_store.save(storage_key, file_obj, content_type)
+            logger.info(f"📦 Stored file in {chat_file_store.name} storage: {storage_key}")
             
             # Store metadata
             files_key = self._get_files_key(meeting_id)
@@ -397,26 +475,27 @@ class EnhancedCacheOnlyChatManager:
                 'file_id': file_id,
                 'filename': filename,
                 'content_type': content_type,
-                'size': len(file_data),
+                'size': file_size,
                 'uploaded_by': str(user_id),
                 'uploaded_by_name': user_name,
                 'uploaded_at': timezone.now().isoformat(),
                 'meeting_id': meeting_id,
                 'is_private': is_private,
                 'recipients': recipients,
-                'chunked': len(file_data) > CHUNK_SIZE
+                'storage_backend': chat_file_store.name,
+                'storage_key': storage_key
             }
+            metadata_json = json.dumps(file_metadata)
             
-            redis_client.hset(files_key, file_id, json.dumps(file_metadata))
-            
-            # Update status using pipeline
             pipe = redis_client.pipeline()
+            pipe.hset(files_key, file_id, metadata_json)
+            pipe.set(self._get_file_meta_key(file_id), metadata_json, ex=CACHE_SETTINGS['FILE_CACHE_TTL'])
             pipe.hincrby(status_key, 'file_count', 1)
             pipe.hset(status_key, 'last_activity', timezone.now().isoformat())
             pipe.execute()
             
             # Create file message
-            human_size = self._format_file_size(len(file_data))
+            human_size = self._format_file_size(file_size)
             is_image = content_type.startswith('image/')
             
             file_message_text = (
@@ -432,7 +511,7 @@ class EnhancedCacheOnlyChatManager:
                 'file_id': file_id,
                 'file_data': json.dumps({
                     'name': filename,
-                    'size': len(file_data),
+                    'size': file_size,
                     'type': content_type,
                     'file_id': file_id,
                     'url': f'/api/cache-chat/files/{file_id}/',
@@ -446,19 +525,20 @@ class EnhancedCacheOnlyChatManager:
             message_id = self.add_message(meeting_id, file_message_data)
             
             if message_id:
-                logger.info(f"📎 File uploaded: {filename} ({len(file_data)} bytes, private: {is_private})")
+                logger.info(f"📎 File uploaded: {filename} ({file_size} bytes, private: {is_private})")
                 return True, {
                     'file_id': file_id,
                     'message_id': message_id,
                     'download_url': f'/api/cache-chat/files/{file_id}/',
                     'filename': filename,
-                    'size': len(file_data),
+                    'size': file_size,
                     'content_type': content_type,
                     'is_private': is_private,
                     'recipients': recipients
                 }
             else:
-                redis_client.delete(file_data_key)
+                chat_file_store.delete(storage_key)
+                redis_client.delete(self._get_file_meta_key(file_id))
                 redis_client.hdel(files_key, file_id)
                 return False, "Failed to create file message"
             
@@ -468,117 +548,63 @@ class EnhancedCacheOnlyChatManager:
             logger.error(f"Traceback: {traceback.format_exc()}")
             return False, f"Upload failed: {str(e)}"
 
-    def get_file(self, file_id):
-        """Get file with chunked retrieval support"""
+    def get_file_metadata(self, file_id):
+        """Metadata for a stored attachment, or None if unknown/expired"""
         if not self.enabled:
-            return None, None
+            return None
         
         try:
-            redis_client = get_redis_client()  # Use connection pool
-            file_data_key = self._get_file_data_key(file_id)
-            
-            # Check if file is stored in chunks
-            chunk_count = redis_client.get(f"{file_data_key}:chunks")
-            
-            if chunk_count:
-                # Retrieve chunks using pipeline (single round-trip)
-                chunk_count = int(chunk_count)
-                
-                pipe = redis_client.pipeline()
-                for i in range(chunk_count):
-                    pipe.get(f"{file_data_key}:chunk:{i}")
-                
-                chunk_data = pipe.execute()
-                
-                chunks = []
-                for chunk in chunk_data:
-                    if chunk:
-                        chunks.append(base64.b64decode(chunk))
-                
-                file_data = b''.join(chunks)
-                logger.info(f"📥 Retrieved file from {chunk_count} chunks: {len(file_data)} bytes")
-            else:
-                # Direct retrieval for non-chunked files
-                encoded_data = redis_client.get(file_data_key)
-                
-                if not encoded_data:
-                    logger.warning(f"File data not found for ID: {file_id}")
-                    return None, None
-                
-                file_data = base64.b64decode(encoded_data)
-                logger.info(f"📥 Retrieved file directly: {len(file_data)} bytes")
-            
-            # Get metadata
-            metadata = None
-            for key in redis_client.scan_iter("cache_files:*"):
-                file_meta = redis_client.hget(key, file_id)
-                if file_meta:
-                    metadata = json.loads(file_meta)
-                    break
-            
-            if not metadata:
-                metadata = {
-                    'file_id': file_id,
-                    'filename': f'file_{file_id}',
-                    'content_type': 'application/octet-stream',
-                    'size': len(file_data)
-                }
-            
-            return file_data, metadata
-            
+            metadata = get_redis_client().get(self._get_file_meta_key(file_id))
+            return json.loads(metadata) if metadata else None
         except Exception as e:
-            logger.error(f"❌ Failed to get file {file_id}: {e}")
-            return None, None
+            logger.error(f"❌ Failed to get file metadata {file_id}: {e}")
+            return None
 
     def get_messages(self, meeting_id, limit=100, offset=0, user_id=None, is_host=False, after=None):
-        """Get messages with differential sync support via 'after' parameter"""
+        """Get messages with differential sync support via 'after' parameter
+        
+        Hosts read the full meeting stream; everyone else reads the public
+        stream merged with their own private index, so no per-message
+        visibility filtering is needed. With 'after', only entries newer than
+        that ID are read (oldest first); if 'after' has already been trimmed
+        the client receives everything still retained.
+        """
         if not self.enabled:
             return []
         
         try:
-            chat_key = self._get_chat_key(meeting_id)
             status_key = self._get_meeting_status_key(meeting_id)
             
             if not self.redis_client.exists(status_key):
                 logger.warning(f"Meeting {meeting_id} not found in cache")
                 return []
             
-            end_index = offset + limit - 1
-            raw_messages = self.redis_client.lrange(chat_key, offset, end_index)
+            if is_host:
+                stream_keys = [self._get_chat_key(meeting_id)]
+            else:
+                stream_keys = [self._get_public_chat_key(meeting_id)]
+                if user_id:
+                    stream_keys.append(self._get_private_chat_key(meeting_id, user_id))
+            
+            pipe = self.redis_client.pipeline(transaction=False)
+            if after:
+                start = self._next_stream_id(after)
+                for key in stream_keys:
+                    pipe.xrange(key, min=start, count=limit)
+            else:
+                for key in stream_keys:
+                    pipe.xrevrange(key, count=offset + limit)
             
             messages = []
-            found_after = after is None  # If no 'after' param, include all messages
+            for entries in pipe.execute():
+                messages.extend(self._decode_stream_entries(entries))
             
-            for raw_msg in raw_messages:
-                try:
-                    message = json.loads(raw_msg)
-                    
-                    # DIFFERENTIAL SYNC: Skip messages until we find the 'after' message
-                    if not found_after:
-                        if message.get('id') == after:
-                            found_after = True
-                        continue  # Skip this message and earlier ones
-                    
-                    # Private message filtering
-                    if message.get('is_private', False):
-                        recipients = message.get('recipients', [])
-                        sender_id = str(message.get('user_id', ''))
-                        current_user_id = str(user_id) if user_id else None
-                        
-                        can_see_message = (
-                            (current_user_id and current_user_id == sender_id) or
-                            is_host or
-                            (current_user_id and str(current_user_id) in [str(r) for r in recipients])
-                        )
-                        
-                        if not can_see_message:
-                            continue
-                    
-                    messages.append(message)
-                except json.JSONDecodeError:
-                    continue
+            if after:
+                messages.sort(key=lambda m: self._parse_stream_id(m['id']))
+                return messages[:limit]
             
-            return list(reversed(messages))
+            messages.sort(key=lambda m: self._parse_stream_id(m['id']), reverse=True)
+            return list(reversed(messages[offset:offset + limit]))
             
         except Exception as e:
             logger.error(f"❌ Failed to get messages from cache: {e}")
@@ -615,7 +641,6 @@ class EnhancedCacheOnlyChatManager:
         
         try:
             files_key = self._get_files_key(meeting_id)
-            file_data_key = self._get_file_data_key(file_id)
             
             file_metadata_str = self.redis_client.hget(files_key, file_id)
             if not file_metadata_str:
@@ -626,16 +651,15 @@ class EnhancedCacheOnlyChatManager:
             if file_metadata.get('uploaded_by') != str(user_id):
                 return False, "Not authorized to delete this file"
             
-            self.redis_client.delete(file_data_key)
-            self.redis_client.hdel(files_key, file_id)
+            chat_file_store.delete(file_metadata.get('storage_key') or self._get_storage_key(meeting_id, file_id))
             
             status_key = self._get_meeting_status_key(meeting_id)
-            meeting_status = self.redis_client.get(status_key)
-            if meeting_status:
-                status_data = json.loads(meeting_status)
-                status_data['file_count'] = max(0, status_data.get('file_count', 0) - 1)
-                status_data['last_activity'] = timezone.now().isoformat()
-                self.redis_client.set(status_key, json.dumps(status_data))
+            pipe = self.redis_client.pipeline()
+            pipe.delete(self._get_file_meta_key(file_id))
+            pipe.hdel(files_key, file_id)
+            pipe.hincrby(status_key, 'file_count', -1)
+            pipe.hset(status_key, 'last_activity', timezone.now().isoformat())
+            pipe.execute()
             
             logger.info(f"🗑 File deleted: {file_id} from meeting {meeting_id}")
             return True, "File deleted successfully"
@@ -666,6 +690,8 @@ class EnhancedCacheOnlyChatManager:
         
         try:
             chat_key = self._get_chat_key(meeting_id)
+            public_chat_key = self._get_public_chat_key(meeting_id)
+            private_index_key = self._get_private_index_key(meeting_id)
             files_key = self._get_files_key(meeting_id)
             typing_key = self._get_typing_key(meeting_id)
             participants_key = self._get_participants_key(meeting_id)
@@ -675,12 +701,18 @@ class EnhancedCacheOnlyChatManager:
             files = self.get_meeting_files(meeting_id)
             file_count = len(files)
             
-            for file_metadata in files:
-                file_data_key = self._get_file_data_key(file_metadata['file_id'])
-                self.redis_client.delete(file_data_key)
+            file_meta_keys = [self._get_file_meta_key(f['file_id']) for f in files]
+            if file_meta_keys:
+                self.redis_client.delete(*file_meta_keys)
+            chat_file_store.delete_prefix(self._get_storage_key(meeting_id, '').rstrip('/'))
+            
+            private_chat_keys = self.redis_client.smembers(private_index_key)
             
             deleted_keys = self.redis_client.delete(
                 chat_key, 
+                public_chat_key,
+                private_index_key,
+                *private_chat_keys,
                 files_key,
                 typing_key, 
                 participants_key, 
@@ -782,7 +814,7 @@ class EnhancedCacheOnlyChatManager:
             
             if status_data:
                 chat_key = self._get_chat_key(meeting_id)
-                current_message_count = redis_client.llen(chat_key)
+                current_message_count = redis_client.xlen(chat_key)
                 
                 return {
                     'meeting_id': meeting_id,
@@ -835,6 +867,13 @@ class EnhancedCacheOnlyChatManager:
 # Initialize the enhanced cache-only chat manager
 enhanced_cache_chat_manager = EnhancedCacheOnlyChatManager()
 
+
+def sweep_expired_chat_files():
+    """Delete attachment blobs whose Redis metadata (FILE_CACHE_TTL) has expired"""
+    deleted = chat_file_store.sweep_expired(CACHE_SETTINGS['FILE_CACHE_TTL'])
+    logger.info(f"🧹 Swept {deleted} expired chat attachments from {chat_file_store.name} storage")
+    return {'deleted': deleted}
+
 # ENHANCED API ENDPOINTS
 
 @require_http_methods(["POST"])
@@ -1004,34 +1043,22 @@ def upload_chat_file(request):
         logger.info(f"   - Is private: {is_private}")
         logger.info(f"   - Recipients: {recipients}")
         
-        # Read file data
-        try:
-            file_data = uploaded_file.read()
-            logger.info(f"   - Bytes read: {len(file_data)}")
-        except Exception as read_error:
-            logger.error(f"❌ Failed to read file: {read_error}")
-            return JsonResponse({'error': 'Failed to read uploaded file'}, status=500)
-        
         filename = uploaded_file.name
         content_type = uploaded_file.content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
         
-        # Validate file data is bytes
-        if not isinstance(file_data, bytes):
-            logger.error(f"❌ File data is not bytes: {type(file_data)}")
-            return JsonResponse({'error': 'Invalid file data format'}, status=500)
+        logger.info(f"📤 Starting upload: {filename} ({uploaded_file.size} bytes)")
         
-        logger.info(f"📤 Starting upload: {filename} ({len(file_data)} bytes)")
-        
-        # FIX: Pass is_private and recipients to backend manager
+        # The uploaded file is streamed to blob storage, never read into memory here
         success, result = enhanced_cache_chat_manager.upload_file(
             meeting_id, 
-            file_data, 
+            uploaded_file, 
             filename, 
             content_type, 
             user_id, 
             user_name,
             is_private=is_private,
-            recipients=recipients if is_private else []
+            recipients=recipients if is_private else [],
+            file_size=uploaded_file.size
         )
         
         if success:
@@ -1054,7 +1081,7 @@ def upload_chat_file(request):
                 'cache_ttl_days': CACHE_SETTINGS['FILE_CACHE_TTL'] // (24 * 3600),
                 'debug_info': {
                     'original_size': uploaded_file.size,
-                    'processed_size': len(file_data),
+                    'processed_size': result['size'],
                     'content_type_detected': content_type,
                     'is_private_received': is_private,
                     'recipients_received': recipients
@@ -1074,40 +1101,67 @@ def upload_chat_file(request):
 @require_http_methods(["GET"])
 @csrf_exempt
 def download_chat_file(request, file_id):
+    """Serve an attachment via presigned URL (S3) or a streamed, range-aware response"""
     try:
         logger.info(f"📥 File download request for: {file_id}")
         
-        file_data, metadata = enhanced_cache_chat_manager.get_file(file_id)
+        metadata = enhanced_cache_chat_manager.get_file_metadata(file_id)
         
-        if not file_data:
+        if not metadata or not metadata.get('storage_key'):
             logger.warning(f"❌ File not found: {file_id}")
             return JsonResponse({'error': 'File not found or expired'}, status=404)
         
-        if not metadata:
-            content_type = 'application/octet-stream'
-            filename = f'file_{file_id}'
-            logger.warning(f"⚠️ Using default metadata for {file_id}")
-        else:
-            content_type = metadata.get('content_type', 'application/octet-stream')
-            filename = metadata.get('filename', f'file_{file_id}')
-            logger.info(f"✅ Using stored metadata for {file_id}: {filename}")
+        content_type = metadata.get('content_type', 'application/octet-stream')
+        filename = metadata.get('filename', f'file_{file_id}')
+        storage_key = metadata['storage_key']
+        size = int(metadata.get('size', 0))
+        
+        if size == 0:
+            # No byte range of an empty file is satisfiable (S3 answers 416), so skip storage
+            response = HttpResponse(b'', content_type=content_type)
+            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+            response['Content-Length'] = 0
+            response['Access-Control-Allow-Origin'] = '*'
+            return response
+        
+        presigned_url = chat_file_store.presigned_url(storage_key, filename, content_type)
+        if presigned_url:
+            # S3 serves the bytes (and any Range requests) directly
+            logger.info(f"📥 Redirecting download to presigned URL: {filename}")
+            return HttpResponseRedirect(presigned_url)
+        
+        if not chat_file_store.exists(storage_key):
+            logger.warning(f"❌ File data missing from storage: {storage_key}")
+            return JsonResponse({'error': 'File not found or expired'}, status=404)
+        
+        byte_range = parse_range_header(request.META.get('HTTP_RANGE'), size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
         
-        response = HttpResponse(
-            file_data,
+        start, end = byte_range if byte_range else (0, size - 1)
+        response = StreamingHttpResponse(
+            chat_file_store.iter_range(storage_key, start, end),
+            status=206 if byte_range else 200,
             content_type=content_type
         )
+        if byte_range:
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
         
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        response['Content-Length'] = len(file_data)
+        response['Content-Length'] = end - start + 1
+        response['Accept-Ranges'] = 'bytes'
         response['Cache-Control'] = 'private, max-age=3600'
         response['Access-Control-Allow-Origin'] = '*'
         response['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
-        response['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
+        response['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, Range'
+        response['Access-Control-Expose-Headers'] = 'Content-Range, Content-Length, Accept-Ranges'
         
         if content_type.startswith('text/'):
             response['Content-Type'] = f'{content_type}; charset=utf-8'
         
-        logger.info(f"📥 File download served: {filename} ({len(file_data)} bytes)")
+        logger.info(f"📥 File download streaming: {filename} (bytes {start}-{end}/{size})")
         return response
         
     except Exception as e:
@@ -1442,10 +1496,13 @@ def health_check(request):
             'features': [
                 'connection_pooling',
                 'rate_limiting', 
-                'chunked_file_storage',
+                'blob_file_storage',
+                'range_downloads',
                 'private_messages', 
                 'private_files',
-                'differential_sync'  # NEW
+                'differential_sync',  # NEW
+                'stream_history',
+                'websocket_push'
             ],
             'rate_limits': {
                 'send_message': '30/minute',
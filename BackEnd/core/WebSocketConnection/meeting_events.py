@@ -0,0 +1,71 @@
+# core/WebSocketConnection/meeting_events.py - Per-meeting push events over the channel layer
+import re
+import logging
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.utils import timezone
+
+logger = logging.getLogger('meeting_events')
+
+# Channel layer group names only allow ASCII alphanumerics, hyphens, underscores and periods
+_GROUP_NAME_UNSAFE = re.compile(r'[^0-9A-Za-z_.-]')
+
+
+def _safe(value):
+    return _GROUP_NAME_UNSAFE.sub('_', str(value))[:80]
+
+
+def meeting_group_name(meeting_id):
+    """Group every socket of a meeting joins"""
+    return f"meeting_{_safe(meeting_id)}"
+
+
+def meeting_user_group_name(meeting_id, user_id):
+    """Group for events only one participant may see (private chat)"""
+    return f"meeting_{_safe(meeting_id)}_user_{_safe(user_id)}"
+
+
+def meeting_hosts_group_name(meeting_id):
+    """Group for host-only events (hosts see all private chat)"""
+    return f"meeting_{_safe(meeting_id)}_hosts"
+
+
+def _group_send(groups, event):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return False
+
+    send = async_to_sync(channel_layer.group_send)
+    for group in groups:
+        send(group, {'type': 'meeting.event', 'event': event})
+    return True
+
+
+def publish_meeting_event(meeting_id, event_type, data, user_ids=None, include_hosts=False):
+    """
+    Push an event to the sockets of a meeting.
+
+    Broadcasts to the whole meeting unless user_ids is given, in which case
+    only those participants (plus hosts when include_hosts is set) receive it.
+    Failures are logged and swallowed: clients keep polling as a fallback, so
+    a missed push never loses state.
+    """
+    event = {
+        'type': event_type,
+        'meeting_id': meeting_id,
+        'data': data,
+        'sent_at': timezone.now().isoformat()
+    }
+
+    if user_ids is None:
+        groups = [meeting_group_name(meeting_id)]
+    else:
+        groups = [meeting_user_group_name(meeting_id, uid) for uid in dict.fromkeys(str(u) for u in user_ids if u)]
+        if include_hosts:
+            groups.append(meeting_hosts_group_name(meeting_id))
+
+    try:
+        return _group_send(groups, event)
+    except Exception as e:
+        logger.warning(f"⚠ Failed to publish {event_type} for meeting {meeting_id}: {e}")
+        return False
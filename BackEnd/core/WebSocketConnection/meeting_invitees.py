@@ -0,0 +1,212 @@
+# meeting_invitees.py - Invitee index for scheduled and calendar meetings
+# One row per (meeting, invitee) with the meeting's next occurrence denormalized,
+# so "meetings for this user" is an indexed lookup instead of LIKE over guest lists.
+from django.db import connection, models
+import logging
+import re
+from core.utils.date_utils import get_current_ist_datetime, parse_datetime_safely, convert_to_ist
+from core.utils.recurring_calculator import calculate_next_occurrence
+from core.WebSocketConnection.schedule_cache import invalidate_user_schedules
+from core.WebSocketConnection.user_meeting_history import refresh_user_meeting_history
+
+INVITEE_ROLE_HOST = 'host'
+INVITEE_ROLE_GUEST = 'guest'
+
+_EMAIL_SPLIT_RE = re.compile(r'[,;]')
+
+
+class MeetingInvitees(models.Model):
+    ROLE_CHOICES = [
+        (INVITEE_ROLE_HOST, 'Host'),
+        (INVITEE_ROLE_GUEST, 'Guest'),
+    ]
+
+    id = models.AutoField(primary_key=True, db_column='ID')
+    meeting_id = models.CharField(max_length=20, db_column='Meeting_ID')
+    meeting_type = models.CharField(max_length=50, db_column='Meeting_Type')
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES, default=INVITEE_ROLE_GUEST, db_column='Role')
+    email = models.CharField(max_length=255, blank=True, null=True, db_column='Email')
+    user_id = models.IntegerField(blank=True, null=True, db_column='User_ID')
+    next_start_time = models.DateTimeField(blank=True, null=True, db_column='Next_Start_Time')
+    next_end_time = models.DateTimeField(blank=True, null=True, db_column='Next_End_Time')
+
+    class Meta:
+        db_table = 'tbl_MeetingInvitees'
+        indexes = [
+            models.Index(fields=['meeting_id'], name='idx_inv_meeting'),
+            models.Index(fields=['email', 'meeting_type', 'next_end_time'], name='idx_inv_email_next'),
+            models.Index(fields=['user_id', 'meeting_type', 'next_end_time'], name='idx_inv_user_next'),
+        ]
+
+
+def create_meeting_invitees_table():
+    """Create tbl_MeetingInvitees table if it doesn't exist - MYSQL VERSION"""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tbl_MeetingInvitees (
+                ID INT AUTO_INCREMENT PRIMARY KEY,
+                Meeting_ID VARCHAR(20) NOT NULL,
+                Meeting_Type VARCHAR(50) NOT NULL,
+                Role VARCHAR(10) NOT NULL DEFAULT 'guest',
+                Email VARCHAR(255) DEFAULT NULL,
+                User_ID INT DEFAULT NULL,
+                Next_Start_Time DATETIME DEFAULT NULL,
+                Next_End_Time DATETIME DEFAULT NULL,
+                KEY idx_inv_meeting (Meeting_ID),
+                KEY idx_inv_email_next (Email, Meeting_Type, Next_End_Time),
+                KEY idx_inv_user_next (User_ID, Meeting_Type, Next_End_Time)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+            """)
+    except Exception as e:
+        logging.error(f"Failed to create tbl_MeetingInvitees table: {e}")
+
+
+def normalize_invitee_emails(*sources):
+    """Collect lowercase, de-duplicated emails from comma/semicolon strings or lists"""
+    emails = []
+    for source in sources:
+        if not source:
+            continue
+        if isinstance(source, dict):
+            source = source.get('email')
+        if isinstance(source, str):
+            emails.extend(
+                candidate.strip().lower()
+                for candidate in _EMAIL_SPLIT_RE.split(source)
+                if '@' in candidate
+            )
+        elif isinstance(source, (list, tuple)):
+            emails.extend(normalize_invitee_emails(*source))
+    return list(dict.fromkeys(emails))
+
+
+def _to_db_datetime(value):
+    """Naive IST datetime for DATETIME columns"""
+    if not value:
+        return None
+    parsed = parse_datetime_safely(value) if isinstance(value, str) else value
+    if parsed is None:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = convert_to_ist(parsed).replace(tzinfo=None)
+    return parsed
+
+
+def compute_next_occurrence(meeting_data, current_time=None):
+    """
+    (next_start, next_end) for the invitee index.
+    Falls back to the stored start/end when no later occurrence can be computed.
+    """
+    current_time = current_time or get_current_ist_datetime()
+    start_time = meeting_data.get('start_time')
+    end_time = meeting_data.get('end_time')
+
+    if meeting_data.get('is_recurring'):
+        try:
+            next_occurrence = calculate_next_occurrence({
+                **meeting_data,
+                'start_time': start_time.isoformat() if hasattr(start_time, 'isoformat') else start_time,
+                'end_time': end_time.isoformat() if hasattr(end_time, 'isoformat') else end_time,
+            }, current_time)
+            if next_occurrence:
+                start_time = next_occurrence.get('next_start_time') or start_time
+                end_time = next_occurrence.get('next_end_time') or end_time
+        except Exception as e:
+            logging.error(f"[INVITEES] Next occurrence calculation failed for {meeting_data.get('id')}: {e}")
+
+    return _to_db_datetime(start_time), _to_db_datetime(end_time)
+
+
+def sync_meeting_invitees(cursor, meeting_id, meeting_type, host_id, emails, next_start, next_end):
+    """Replace a meeting's invitee rows (host row + one row per guest email)"""
+    emails = normalize_invitee_emails(emails)
+
+    user_ids = {}
+    if emails:
+        placeholders = ','.join(['%s'] * len(emails))
+        cursor.execute(f"""
+            SELECT LOWER(email), ID FROM tbl_Users WHERE email IN ({placeholders})
+        """, emails)
+        user_ids = {row[0]: row[1] for row in cursor.fetchall()}
+
+    rows = []
+    if host_id:
+        rows.append([meeting_id, meeting_type, INVITEE_ROLE_HOST, None, host_id, next_start, next_end])
+    for email in emails:
+        rows.append([meeting_id, meeting_type, INVITEE_ROLE_GUEST, email, user_ids.get(email), next_start, next_end])
+
+    # Previous invitees lose the meeting, new ones gain it - both caches go stale
+    invalidate_meeting_schedule_caches(cursor, meeting_id, extra_user_ids=[row[4] for row in rows], extra_emails=emails)
+
+    cursor.execute("DELETE FROM tbl_MeetingInvitees WHERE Meeting_ID = %s", [meeting_id])
+    if rows:
+        cursor.executemany("""
+            INSERT INTO tbl_MeetingInvitees
+            (Meeting_ID, Meeting_Type, Role, Email, User_ID, Next_Start_Time, Next_End_Time)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """, rows)
+    logging.info(f"[INVITEES] Indexed {len(rows)} invitee rows for meeting {meeting_id}")
+
+    # Name, schedule and host changes land in the host's meeting history row too
+    refresh_user_meeting_history(cursor, meeting_id)
+
+
+def invalidate_meeting_schedule_caches(cursor, meeting_id, extra_user_ids=(), extra_emails=()):
+    """Invalidate the per-user schedule caches of everyone indexed on a meeting"""
+    cursor.execute("SELECT User_ID, Email FROM tbl_MeetingInvitees WHERE Meeting_ID = %s", [meeting_id])
+    current = cursor.fetchall()
+    invalidate_user_schedules(
+        user_ids=[row[0] for row in current] + list(extra_user_ids),
+        emails=[row[1] for row in current] + list(extra_emails)
+    )
+
+
+def refresh_next_occurrence(cursor, meeting_id, next_start, next_end):
+    """Move every invitee row of a meeting to its new next occurrence"""
+    invalidate_meeting_schedule_caches(cursor, meeting_id)
+    cursor.execute("""
+        UPDATE tbl_MeetingInvitees
+        SET Next_Start_Time = %s, Next_End_Time = %s
+        WHERE Meeting_ID = %s
+    """, [_to_db_datetime(next_start), _to_db_datetime(next_end), meeting_id])
+    return cursor.rowcount
+
+
+def delete_meeting_invitees(cursor, meeting_id):
+    invalidate_meeting_schedule_caches(cursor, meeting_id)
+    cursor.execute("DELETE FROM tbl_MeetingInvitees WHERE Meeting_ID = %s", [meeting_id])
+
+
+def user_meetings_subquery(meeting_type, user_id, user_email, min_next_end=None, recurring_on=None):
+    """
+    SQL + params selecting (Meeting_ID, Next_Start_Time, Next_End_Time) for the
+    meetings a user hosts or is invited to; join it as a derived table.
+    Each branch is an index range on (User_ID|Email, Meeting_Type, Next_End_Time).
+    recurring_on (ScheduleMeeting only) also keeps recurring series running on that date
+    whose Next_End_Time is older than min_next_end: the scheduler does not advance
+    series it skips (e.g. an ended occurrence), so their stored next occurrence goes stale.
+    """
+    branches = []
+    params = []
+    for column, value in (('User_ID', user_id), ('Email', (user_email or '').strip().lower())):
+        if not value:
+            continue
+        branch = f"SELECT Meeting_ID, Next_Start_Time, Next_End_Time FROM tbl_MeetingInvitees WHERE {column} = %s AND Meeting_Type = %s"
+        params.extend([value, meeting_type])
+        if min_next_end is not None:
+            branch += " AND Next_End_Time >= %s"
+            params.append(_to_db_datetime(min_next_end))
+        branches.append(branch)
+
+        if min_next_end is not None and recurring_on is not None:
+            branches.append(f"""SELECT inv.Meeting_ID, inv.Next_Start_Time, inv.Next_End_Time
+                FROM tbl_MeetingInvitees inv
+                INNER JOIN tbl_ScheduledMeetings sm ON sm.id = inv.Meeting_ID
+                WHERE inv.{column} = %s AND inv.Meeting_Type = %s AND inv.Next_End_Time < %s
+                  AND sm.is_recurring = 1 AND DATE(sm.start_date) <= %s AND DATE(sm.end_date) >= %s""")
+            params.extend([value, meeting_type, _to_db_datetime(min_next_end), recurring_on, recurring_on])
+
+    if not branches:
+        return "SELECT NULL AS Meeting_ID, NULL AS Next_Start_Time, NULL AS Next_End_Time", []
+    return " UNION ".join(branches), params
@@ -33,17 +33,24 @@ import concurrent.futures
 import asyncio
 import aiohttp
 import concurrent.futures
-import threading
 import time
 import ssl
 import json
 import logging
-import threading
-from django.core.mail import EmailMessage
 from django.conf import settings
 from typing import Optional, Dict, List, Any
 import pytz
 from core.WebSocketConnection.participants import get_or_create_participant_for_occurrence
+from core.WebSocketConnection.participant_sessions import open_participant_session
+from core.WebSocketConnection.meeting_invitees import (
+    sync_meeting_invitees, delete_meeting_invitees,
+    compute_next_occurrence, user_meetings_subquery
+)
+from core.WebSocketConnection.schedule_cache import cache_user_schedule, invalidate_user_schedules
+from core.WebSocketConnection.user_meeting_history import refresh_user_meeting_history, delete_user_meeting_history
+from core.scheduler.reminder_queue import enqueue_meeting_reminders, remove_meeting_reminders
+from core.scheduler.mail_queue import enqueue_bulk_email, get_mail_metrics
+from functools import lru_cache
 import urllib3
 import random
 import string
@@ -914,6 +921,7 @@ class ProductionLiveKitService:
                                         SET Status = 'ended', Ended_At = %s
                                         WHERE ID = %s
                                     """, [current_time, meeting_id])
+                                    refresh_user_meeting_history(cursor, meeting_id)
                                     
                                     logging.info(f"✅ [CLEANUP] Cleaned up room: {room_name} (Meeting: {meeting_id})")
                                     cleanup_results['rooms_cleaned'] += 1
@@ -2030,79 +2038,57 @@ def create_calendar_meetings_table():
     except (ProgrammingError, OperationalError) as e:
         return JsonResponse({"Error": f"Failed to create tbl_CalendarMeetings table: {str(e)}"}, status=SERVER_ERROR_STATUS)
         
-def send_meeting_invitations(data):
+@lru_cache(maxsize=256)
+def render_meeting_invitation(meeting_type, meeting_title, start_time, duration, meeting_url, custom_subject,
+                              organizer_email, location, meeting_id, description, is_recurring, recurrence_info):
     """
-    Send meeting invitations - handles both Calendar and Schedule meetings
+    Render (subject, body) of a meeting invitation. The body is the same for every
+    guest, so it is rendered once per meeting version and reused across batches.
+    recurrence_info is a (type, end_date) tuple or None.
     """
-    meeting_title = data.get('meeting_title', 'Meeting')
-    guest_emails = data.get('guest_emails', [])
-    meeting_type = data.get('meeting_type', '')
-    start_time = data.get('start_time', '')
-    duration = data.get('duration')
-    meeting_url = data.get('meeting_url', '')
-    custom_subject = data.get('subject', '')
-    
-    # Calendar meeting specific data
-    organizer_email = data.get('organizer_email', '')
-    location = data.get('location', '')
-    meeting_id = data.get('meeting_id', '')
-    description = data.get('description', '')
-    is_recurring = data.get('is_recurring', False)
-    recurrence_info = data.get('recurrence_info', {})
+    recurrence_info = dict(zip(('type', 'end_date'), recurrence_info)) if recurrence_info else {}
     
-    if not guest_emails:
-        logging.warning("No guest emails provided")
-        return 0, ['No guest emails']
+    # Format start time
+    formatted_start_time = start_time
+    calendar_dates = ""
+    calendar_end_dates = ""
     
-    # Ensure guest_emails is a list
-    if isinstance(guest_emails, str):
-        guest_emails = [email.strip() for email in guest_emails.split(',') if email.strip()]
-    
-    def send_emails_core():
+    if isinstance(start_time, str) and start_time:
         try:
-            logging.info(f"Sending emails to {len(guest_emails)} recipients for {meeting_type}")
-            
-            # Format start time
-            formatted_start_time = start_time
-            calendar_dates = ""
-            calendar_end_dates = ""
+            dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
+            ist_timezone = pytz.timezone("Asia/Kolkata")
+            if dt.tzinfo:
+                dt = dt.astimezone(ist_timezone)
+            else:
+                dt = ist_timezone.localize(dt)
             
-            if isinstance(start_time, str) and start_time:
-                try:
-                    dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                    ist_timezone = pytz.timezone("Asia/Kolkata")
-                    if dt.tzinfo:
-                        dt = dt.astimezone(ist_timezone)
-                    else:
-                        dt = ist_timezone.localize(dt)
-                    
-                    formatted_start_time = dt.strftime('%A, %B %d, %Y at %I:%M %p')
-                    calendar_dates = dt.strftime('%Y%m%dT%H%M%S')
-                    end_dt = dt + timedelta(minutes=int(duration))
-                    calendar_end_dates = end_dt.strftime('%Y%m%dT%H%M%S')
-                except Exception as e:
-                    logging.error(f"Error formatting date: {e}")
-            
-            # Create calendar link
-            calendar_url = f"https://calendar.google.com/calendar/render?action=TEMPLATE&text={meeting_title.replace(' ', '+')}&dates={calendar_dates}Z/{calendar_end_dates}Z&details=Join+meeting:+{meeting_url}"
-            
-            # Create subject
-            subject = custom_subject if custom_subject else f"Meeting Invitation: {meeting_title}"
-            
-            # Create message body
-            location_section = f"📍 Location: {location}\n" if location else ""
-            description_section = f"📝 Description: {description}\n\n" if description else ""
-            recurring_section = ""
-            
-            if is_recurring and recurrence_info:
-                recurring_section = f"""🔁 This is a recurring meeting.
+            formatted_start_time = dt.strftime('%A, %B %d, %Y at %I:%M %p')
+            calendar_dates = dt.strftime('%Y%m%dT%H%M%S')
+            end_dt = dt + timedelta(minutes=int(duration))
+            calendar_end_dates = end_dt.strftime('%Y%m%dT%H%M%S')
+        except Exception as e:
+            logging.error(f"Error formatting date: {e}")
+    
+    # Create calendar link
+    calendar_url = f"https://calendar.google.com/calendar/render?action=TEMPLATE&text={meeting_title.replace(' ', '+')}&dates={calendar_dates}Z/{calendar_end_dates}Z&details=Join+meeting:+{meeting_url}"
+    
+    # Create subject
+    subject = custom_subject if custom_subject else f"Meeting Invitation: {meeting_title}"
+    
+    # Create message body
+    location_section = f"📍 Location: {location}\n" if location else ""
+    description_section = f"📝 Description: {description}\n\n" if description else ""
+    recurring_section = ""
+    
+    if is_recurring and recurrence_info:
+        recurring_section = f"""🔁 This is a recurring meeting.
 Pattern: {recurrence_info.get('type', 'Weekly')} recurring
 {f"Ends on: {recurrence_info.get('end_date')}" if recurrence_info.get('end_date') else "Continues indefinitely"}
 
 """
-            
-            if meeting_type == 'CalendarMeeting':
-                message = f"""Hello,
+    
+    if meeting_type == 'CalendarMeeting':
+        message = f"""Hello,
 
 You are invited to join a calendar meeting:
 
@@ -2125,8 +2111,8 @@ You are invited to join a calendar meeting:
 Best regards,  
 Meet Pro Team"""
 
-            elif meeting_type == 'ScheduleMeeting':
-                message = f"""Hello,
+    elif meeting_type == 'ScheduleMeeting':
+        message = f"""Hello,
 
 You are invited to join a 📅 scheduled meeting:
 
@@ -2149,8 +2135,8 @@ You are invited to join a 📅 scheduled meeting:
 Best regards,  
 Meet Pro Team"""
 
-            else:
-                message = f"""Hello,
+    else:
+        message = f"""Hello,
 
 You are invited to join a meeting:
 
@@ -2162,54 +2148,52 @@ You are invited to join a meeting:
 Best regards,  
 Meet Pro Team"""
 
-            # Send emails
-            successful_sends = 0
-            failed_emails = []
-            
-            batch_size = 10
-            for i in range(0, len(guest_emails), batch_size):
-                batch = guest_emails[i:i + batch_size]
-                
-                try:
-                    email_message = EmailMessage(
-                        subject=subject,
-                        body=message,
-                        from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@meetpro.com'),
-                        to=batch,
-                    )
-                    
-                    email_message.send(fail_silently=False)
-                    successful_sends += len(batch)
-                    logging.info(f"Successfully sent batch of {len(batch)} emails")
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    logging.error(f"Failed to send email batch: {e}")
-                    failed_emails.extend(batch)
-            
-            logging.info(f"Email sending completed: {successful_sends}/{len(guest_emails)} emails sent")
-            return successful_sends, failed_emails
-                
-        except Exception as e:
-            logging.error(f"Critical error in email sending: {e}")
-            return 0, guest_emails
+    return subject, message
+
+def send_meeting_invitations(data):
+    """
+    Send meeting invitations - handles both Calendar and Schedule meetings.
+    Guests are queued in batches on the mail queue, so this never blocks on SMTP.
+    """
+    meeting_title = data.get('meeting_title', 'Meeting')
+    guest_emails = data.get('guest_emails', [])
+    meeting_type = data.get('meeting_type', '')
+    start_time = data.get('start_time', '')
+    duration = data.get('duration')
+    meeting_url = data.get('meeting_url', '')
+    custom_subject = data.get('subject', '')
     
-    # Calendar meetings send synchronously, Schedule meetings send asynchronously
-    if meeting_type == 'CalendarMeeting':
-        logging.info(f"Sending emails synchronously for {meeting_type}")
-        sent_count, failed_list = send_emails_core()
-        return sent_count, failed_list
-    else:
-        # For Schedule meetings - send asynchronously
-        def send_emails_async():
-            send_emails_core()
-        
-        email_thread = threading.Thread(target=send_emails_async)
-        email_thread.daemon = True
-        email_thread.start()
-        
-        logging.info(f"Started async email sending for {len(guest_emails)} invitations")
+    # Calendar meeting specific data
+    organizer_email = data.get('organizer_email', '')
+    location = data.get('location', '')
+    meeting_id = data.get('meeting_id', '')
+    description = data.get('description', '')
+    is_recurring = data.get('is_recurring', False)
+    recurrence_info = data.get('recurrence_info', {})
+    
+    if not guest_emails:
+        logging.warning("No guest emails provided")
+        return 0, ['No guest emails']
+    
+    # Ensure guest_emails is a list
+    if isinstance(guest_emails, str):
+        guest_emails = [email.strip() for email in guest_emails.split(',') if email.strip()]
+    
+    try:
+        if start_time and not isinstance(start_time, str):
+            start_time = start_time.isoformat() if hasattr(start_time, 'isoformat') else str(start_time)
+        subject, message = render_meeting_invitation(
+            meeting_type, meeting_title, start_time, duration, meeting_url, custom_subject,
+            organizer_email, location, meeting_id, description, bool(is_recurring),
+            (recurrence_info.get('type', 'Weekly'), recurrence_info.get('end_date')) if recurrence_info else None
+        )
+        # Queue only once the meeting rows are committed, so workers never mail a rolled-back meeting
+        transaction.on_commit(lambda: enqueue_bulk_email(subject, message, guest_emails, tag='invitation'))
+        logging.info(f"Queued {len(guest_emails)} invitations for {meeting_type}")
         return len(guest_emails), []
+    except Exception as e:
+        logging.error(f"Critical error in email sending: {e}")
+        return 0, guest_emails
 
 @csrf_exempt
 def get_all_meetings(request):
@@ -2452,6 +2436,11 @@ def Create_Calendar_Meeting(request):
                     json.dumps(data.get('reminderTimes', [15, 30])),
                     1, 1, 1, 1, 1, 1, created_at
                 ])
+
+                sync_meeting_invitees(
+                    cursor, meeting_id, 'CalendarMeeting', host_id,
+                    guest_emails + [data.get('email')], start_dt, end_dt
+                )
         logging.info(f"✅ Calendar meeting created: {meeting_id}")
     except Exception as e:
         logging.error(f"DB insert failed: {e}")
@@ -2511,16 +2500,9 @@ def Create_Calendar_Meeting(request):
             'subject': f"Meeting Invitation: {title}"
         }
 
-        import threading
-        def async_email_send():
-            try:
-                send_meeting_invitations(email_data)
-                logging.info(f"Background email thread completed for {len(guest_emails)} participants")
-            except Exception as e:
-                logging.error(f"Async email send error: {e}")
-
-        threading.Thread(target=async_email_send, daemon=True).start()
-        logging.info(f"📧 Started background email sending for {len(guest_emails)} participants")
+        # Batches go to the mail queue; nothing here waits on SMTP
+        send_meeting_invitations(email_data)
+        logging.info(f"📧 Queued invitation emails for {len(guest_emails)} participants")
 
     # --- Final Response ---
     return JsonResponse({
@@ -2884,6 +2866,19 @@ def Create_Schedule_Meeting(request):
                     ]
                     
                     cursor.execute(scheduled_query, scheduled_params)
+
+                    next_start, next_end = compute_next_occurrence({
+                        **meeting_data,
+                        'start_time': meeting_data['started_at'],
+                        'end_time': meeting_data['ended_at'],
+                    })
+                    sync_meeting_invitees(
+                        cursor, meeting_data['id'], 'ScheduleMeeting', meeting_data['host_id'],
+                        meeting_data['email'], next_start, next_end
+                    )
+                    enqueue_meeting_reminders(
+                        meeting_data['id'], next_start, reminders_times, enabled=bool(reminders_email)
+                    )
                     logging.info("Database inserts completed successfully")
                     
         except Exception as e:
@@ -2958,16 +2953,10 @@ def Create_Schedule_Meeting(request):
                     } if is_recurring else None
                 }
                 
-                # Start email sending in background thread
-                import threading
-                email_thread = threading.Thread(
-                    target=send_meeting_invitations,
-                    args=(email_data,),
-                    daemon=True
-                )
-                email_thread.start()
+                # Batches go to the mail queue; nothing here waits on SMTP
+                send_meeting_invitations(email_data)
                 
-                logging.info(f"Started background email sending for {participant_count} participants")
+                logging.info(f"Queued invitation emails for {participant_count} participants")
             else:
                 logging.info("No valid participant emails found")
 
@@ -3186,6 +3175,8 @@ def Create_Instant_Meeting(request):
                     return JsonResponse({
                         "Error": "Failed to create meeting in database"
                     }, status=500)
+
+                invalidate_user_schedules(user_ids=[data['Host_ID']])
                     
         logging.info(f"✅ [CREATE] Meeting {meeting_id} inserted successfully")
         
@@ -3228,6 +3219,10 @@ def Create_Instant_Meeting(request):
         except Exception as e:
             logging.warning(f"[CREATE] LiveKit room creation failed (non-critical): {e}")
 
+    # After the LiveKit SID is stored, so the history row carries it
+    with connection.cursor() as cursor:
+        refresh_user_meeting_history(cursor, meeting_id)
+
     # ✓ LOG: Meeting successfully created
     logging.info(f"✅ [CREATE] MEETING CREATED: {meeting_id} | Host: {data['Host_ID']} | Status: {data['Status']}")
 
@@ -3744,6 +3739,21 @@ def Update_Meeting(request, id):
                         logging.error(f"UPDATE_MEETING: Failed to update ScheduleMeeting {id}")
                         return JsonResponse({"Error": f"Failed to update ScheduleMeeting {id}"}, status=500)
 
+                    next_start, next_end = compute_next_occurrence({
+                        'id': id,
+                        'start_time': data.get('start_time', started_at),
+                        'end_time': data.get('end_time', ended_at),
+                        'is_recurring': bool(recurring_data.get('enabled')),
+                        'recurrence_type': recurring_data.get('type') if recurring_data.get('enabled') else None,
+                        'recurrence_interval': recurring_data.get('interval', 1) if recurring_data.get('enabled') else 1,
+                        'recurrence_end_date': recurrence_end_date,
+                        'selected_days': selected_days,
+                        'selected_month_dates': selected_month_dates,
+                        'monthly_pattern': monthly_pattern,
+                    })
+                    sync_meeting_invitees(cursor, id, 'ScheduleMeeting', host_id, final_email, next_start, next_end)
+                    enqueue_meeting_reminders(id, next_start, reminders_times, enabled=bool(reminders_email))
+
                 elif meeting_type == 'CalendarMeeting':
                     logging.info(f"UPDATE_MEETING: Processing CalendarMeeting update for {id}")
                     
@@ -3999,6 +4009,11 @@ def Update_Meeting(request, id):
                             }, status=500)
                         else:
                             logging.info(f"UPDATE_MEETING: Successfully updated exactly 1 CalendarMeeting record with ID {id}")
+
+                        sync_meeting_invitees(
+                            cursor, id, 'CalendarMeeting', host_id,
+                            [guest_emails, attendees, calendar_email], started_at, ended_at
+                        )
                             
                     except Exception as calendar_error:
                         logging.error(f"UPDATE_MEETING: Error in CalendarMeeting update section for {id}: {calendar_error}")
@@ -4012,6 +4027,9 @@ def Update_Meeting(request, id):
                     # InstantMeeting only updates main table (already done above)
                     logging.info(f"UPDATE_MEETING: InstantMeeting {id} updated (main table only)")
 
+                # Name, times, status or host may have changed
+                refresh_user_meeting_history(cursor, id)
+
                 # Collect updated fields for response
                 updated_fields = [k for k in data.keys() if data[k] is not None]
                 
@@ -4172,6 +4190,9 @@ def Delete_Meeting(request, id):
                     cursor.execute(f"DELETE FROM {TBL_SCHEDULED_MEETINGS} WHERE id = %s", [id])
                 elif meeting_type == 'CalendarMeeting':
                     cursor.execute(f"DELETE FROM {TBL_CALENDAR_MEETING} WHERE ID = %s", [id])
+                delete_meeting_invitees(cursor, id)
+                delete_user_meeting_history(cursor, id)
+                remove_meeting_reminders(id)
 
                 # Then delete from tbl_Meetings
                 cursor.execute(f"DELETE FROM {TBL_MEETINGS} WHERE ID = %s", [id])
@@ -4847,6 +4868,7 @@ def format_meeting_for_frontend(row, user_id=None, user_email=None):
 
 @require_http_methods(["GET"])
 @csrf_exempt
+@cache_user_schedule('schedule')
 def Get_User_Schedule_Meetings(request):
     """FIXED: Get user scheduled meetings with real-time status - ALL FUNCTIONALITY PRESERVED"""
     try:
@@ -4879,12 +4901,13 @@ def Get_User_Schedule_Meetings(request):
                 sm.created_at, sm.email,
                 m.Status, m.Meeting_Link, m.Is_Recording_Enabled, m.Waiting_Room_Enabled,
                 m.Meeting_Name, m.Meeting_Type, m.LiveKit_Room_Name, m.LiveKit_Room_SID,
-                u.full_name as host_full_name, u.email as host_email
-            FROM tbl_ScheduledMeetings sm
+                u.full_name as host_full_name, u.email as host_email,
+                inv.Next_Start_Time, inv.Next_End_Time
+            FROM ({invitee_subquery}) inv
+            INNER JOIN tbl_ScheduledMeetings sm ON sm.id = inv.Meeting_ID
             INNER JOIN tbl_Meetings m ON sm.id = m.ID
             LEFT JOIN tbl_Users u ON sm.host_id = u.ID
-            WHERE (sm.host_id = %s OR (sm.email IS NOT NULL AND sm.email LIKE %s))
-              AND m.Status NOT IN ('deleted', 'cancelled', 'recurrence_ended')
+            WHERE m.Status NOT IN ('deleted', 'cancelled', 'recurrence_ended')
               AND (
                   (sm.is_recurring = 0 AND sm.end_time >= %s)
                   OR
@@ -4895,11 +4918,18 @@ def Get_User_Schedule_Meetings(request):
             ORDER BY sm.start_time ASC
             """
             
-            email_pattern = f'%{user_email}%' if user_email else ''
             one_week_ago = current_datetime - timedelta(days=7)
             
-            cursor.execute(query, [
-                user_id, email_pattern, current_datetime, current_date, current_date, one_week_ago, current_datetime
+            # Candidate meetings come from the invitee index (host/guest rows whose
+            # next occurrence ended within the last week, plus recurring series running
+            # today) instead of a LIKE scan
+            invitee_subquery, invitee_params = user_meetings_subquery(
+                'ScheduleMeeting', user_id, user_email, min_next_end=one_week_ago, recurring_on=current_date
+            )
+            query = query.replace('{invitee_subquery}', invitee_subquery)
+            
+            cursor.execute(query, invitee_params + [
+                current_datetime, current_date, current_date, one_week_ago, current_datetime
             ])
             rows = cursor.fetchall()
 
@@ -4914,7 +4944,7 @@ def Get_User_Schedule_Meetings(request):
                         participant_emails = [email.strip() for email in row[30].split(',') if email.strip()]
                     
                     is_host = str(row[1]) == str(user_id)
-                    is_participant = user_email in participant_emails if user_email else False
+                    is_participant = user_email.lower() in [email.lower() for email in participant_emails] if user_email else False
                     
                     if is_host or is_participant:
                         # UNCHANGED: Original recurring meeting logic
@@ -4923,7 +4953,13 @@ def Get_User_Schedule_Meetings(request):
                         is_today_meeting = False
                         duration_minutes = row[10] or 60
                         
-                        if row[11]:  # is_recurring - UNCHANGED logic
+                        next_start_at, next_end_at = row[41], row[42]
+                        if row[11] and next_start_at and next_end_at and next_end_at >= current_datetime.replace(tzinfo=None):
+                            # Precomputed by the recurring scheduler and still current
+                            display_start_time = next_start_at.isoformat()
+                            display_end_time = next_end_at.isoformat()
+                            is_today_meeting = next_start_at.date() == current_date
+                        elif row[11]:  # is_recurring - UNCHANGED logic
                             try:
                                 meeting_data = {
                                     'start_time': display_start_time,
@@ -5024,6 +5060,7 @@ def Get_User_Schedule_Meetings(request):
 
 @require_http_methods(["GET"])
 @csrf_exempt
+@cache_user_schedule('calendar')
 def Get_User_Calendar_Meetings(request):
     """FIXED: Get user's calendar meetings with real-time status - ALL FUNCTIONALITY PRESERVED"""
     try:
@@ -5046,26 +5083,17 @@ def Get_User_Calendar_Meetings(request):
                 cm.Settings_AddToHostCalendar, cm.Settings_AddToParticipantCalendars,
                 cm.CreatedAt, m.Status, m.Is_Recording_Enabled, m.Waiting_Room_Enabled,
                 m.LiveKit_Room_Name, m.LiveKit_Room_SID, m.Meeting_Name as meeting_name
-            FROM tbl_CalendarMeetings cm
+            FROM (
+                SELECT DISTINCT Meeting_ID FROM ({invitee_subquery}) user_invites
+            ) inv
+            INNER JOIN tbl_CalendarMeetings cm ON cm.ID = inv.Meeting_ID
             INNER JOIN tbl_Meetings m ON cm.ID = m.ID
-            WHERE (
-                cm.Host_ID = %s 
-                OR (cm.guestEmails IS NOT NULL AND cm.guestEmails LIKE %s)
-                OR (cm.attendees IS NOT NULL AND cm.attendees LIKE %s)
-                OR (cm.email = %s)
-            )
-            AND (m.Status IS NULL OR m.Status NOT IN ('deleted', 'cancelled'))
+            WHERE (m.Status IS NULL OR m.Status NOT IN ('deleted', 'cancelled'))
             """
             
-            # UNCHANGED: Original parameter building
-            params = []
-            if user_id:
-                params.append(user_id)
-            else:
-                params.append(None)
-                
-            email_pattern = f'%{user_email}%' if user_email else '%'
-            params.extend([email_pattern, email_pattern, user_email or ''])
+            # Host/guest/attendee/organizer matches come from the invitee index
+            invitee_subquery, params = user_meetings_subquery('CalendarMeeting', user_id, user_email)
+            base_query = base_query.replace('{invitee_subquery}', invitee_subquery)
             
             if start_date and end_date:
                 base_query += " AND cm.startTime BETWEEN %s AND %s"
@@ -5513,6 +5541,7 @@ def join_livekit_meeting(request):
                     ])
 
                     participant_id = cursor.lastrowid
+                    open_participant_session(cursor, participant_id, meeting_id, user_id, occurrence_number, join_time_str)
                     action = 'first_join'
                     
                     # If host is joining, update meeting status
@@ -5562,15 +5591,19 @@ def join_livekit_meeting(request):
                         
                         cursor.execute("""
                             UPDATE tbl_Participants 
-                            SET Join_Times = %s,
+                            SET Join_Times = JSON_ARRAY_APPEND(Join_Times, '$', %s),
                                 Is_Currently_Active = TRUE,
                                 Full_Name = %s,
                                 Meeting_Type = %s
                             WHERE ID = %s AND occurrence_number = %s
-                        """, [json.dumps(join_times), actual_user_name, meeting_type, participant_id, occurrence_number])
+                        """, [join_time_str, actual_user_name, meeting_type, participant_id, occurrence_number])
+                        open_participant_session(cursor, participant_id, meeting_id, user_id, occurrence_number, join_time_str)
 
                         action = 'rejoin'
                         logging.info(f"[JOIN] User {user_id} rejoined (session #{len(join_times)}) with Meeting_Type={meeting_type}")
+                
+                # A host join may start the meeting, which moves everyone's history row
+                refresh_user_meeting_history(cursor, meeting_id, None if participant_role == 'host' else [user_id])
                     
         except Exception as participant_error:
             logging.warning(f"Failed to record participant join (non-critical): {participant_error}")
@@ -5641,6 +5674,19 @@ def join_livekit_meeting(request):
             'traceback': traceback.format_exc() if logging.getLogger().isEnabledFor(logging.DEBUG) else None
         }, status=500)
            
+@require_http_methods(["GET"])
+@csrf_exempt
+def Get_Mail_Delivery_Metrics(request):
+    """Daily mail queue counters (queued/sent/failed/retried/dropped, overall and per tag)"""
+    try:
+        days = max(1, min(int(request.GET.get('days', 7)), 30))
+        return JsonResponse({"metrics": get_mail_metrics(days)}, status=SUCCESS_STATUS)
+    except ValueError:
+        return JsonResponse({"Error": "days must be an integer"}, status=BAD_REQUEST_STATUS)
+    except Exception as e:
+        logging.error(f"Failed to read mail delivery metrics: {e}")
+        return JsonResponse({"Error": str(e)}, status=SERVER_ERROR_STATUS)
+
 @require_http_methods(["POST"])
 @csrf_exempt
 def bulk_send_invitations(request):
@@ -6170,5 +6216,6 @@ urlpatterns = [
     path('api/meetings/check-queue/<str:meeting_id>/', check_connection_queue, name='check_connection_queue'),
     path('api/meetings/join-with-queue/', join_meeting_with_queue, name='join_meeting_with_queue'),
     path('api/invitations/bulk-send', bulk_send_invitations, name='bulk_send_invitations'),
+    path('api/invitations/delivery-metrics', Get_Mail_Delivery_Metrics, name='Get_Mail_Delivery_Metrics'),
     path("api/health", health_check, name="health_check"),
 ]
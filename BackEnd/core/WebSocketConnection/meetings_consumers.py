@@ -0,0 +1,93 @@
+# core/WebSocketConnection/meetings_consumers.py - Per-meeting WebSocket fan-out consumer
+import logging
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.db import connection
+from .meeting_events import meeting_group_name, meeting_user_group_name, meeting_hosts_group_name
+
+logger = logging.getLogger('meeting_events')
+
+# Close codes for rejected sockets (4000-4999 are application defined)
+CLOSE_UNAUTHENTICATED = 4401
+CLOSE_FORBIDDEN = 4403
+
+
+def get_meeting_access(session, meeting_id):
+    """
+    (user_id, is_host) of the session's user in a meeting, or (user_id, None)
+    if the user is neither its host nor one of its participants.
+    """
+    user_id = session.get('User_Id') if session is not None else None
+    if not user_id:
+        return None, None
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT m.Host_ID = %s,
+                   EXISTS(SELECT 1 FROM tbl_Participants p WHERE p.Meeting_ID = m.ID AND p.User_ID = %s)
+            FROM tbl_Meetings m
+            WHERE m.ID = %s
+        """, [user_id, user_id, meeting_id])
+        row = cursor.fetchone()
+
+    if not row or not (row[0] or row[1]):
+        return str(user_id), None
+    return str(user_id), bool(row[0])
+
+
+class MeetingConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Receive-only socket for chat, reaction and hand-raise events of one meeting.
+
+    The user comes from the login session (SessionMiddlewareStack in asgi.py);
+    host status and membership are checked against tbl_Meetings.Host_ID and
+    tbl_Participants. All mutations still go through the REST endpoints, which
+    publish to these groups after writing to Redis.
+    """
+
+    async def connect(self):
+        self.meeting_id = self.scope['url_route']['kwargs']['meeting_id']
+        self.user_id, self.is_host = await database_sync_to_async(get_meeting_access)(
+            self.scope.get('session'), self.meeting_id
+        )
+
+        if not self.user_id:
+            logger.warning(f"🔌 Rejected unauthenticated socket for meeting {self.meeting_id}")
+            await self.close(code=CLOSE_UNAUTHENTICATED)
+            return
+        if self.is_host is None:
+            logger.warning(f"🔌 Rejected socket of user {self.user_id}: not in meeting {self.meeting_id}")
+            await self.close(code=CLOSE_FORBIDDEN)
+            return
+
+        self.groups_joined = [
+            meeting_group_name(self.meeting_id),
+            meeting_user_group_name(self.meeting_id, self.user_id),
+        ]
+        if self.is_host:
+            self.groups_joined.append(meeting_hosts_group_name(self.meeting_id))
+
+        for group in self.groups_joined:
+            await self.channel_layer.group_add(group, self.channel_name)
+
+        await self.accept()
+        await self.send_json({
+            'type': 'connected',
+            'meeting_id': self.meeting_id,
+            'user_id': self.user_id,
+            'is_host': self.is_host
+        })
+        logger.info(f"🔌 Socket joined meeting {self.meeting_id} (user: {self.user_id}, host: {self.is_host})")
+
+    async def disconnect(self, close_code):
+        for group in getattr(self, 'groups_joined', []):
+            await self.channel_layer.group_discard(group, self.channel_name)
+        logger.info(f"🔌 Socket left meeting {getattr(self, 'meeting_id', None)} (code: {close_code})")
+
+    async def receive_json(self, content, **kwargs):
+        # Clients only send keepalives; everything else goes through the REST API
+        if content.get('type') == 'ping':
+            await self.send_json({'type': 'pong'})
+
+    async def meeting_event(self, event):
+        await self.send_json(event['event'])
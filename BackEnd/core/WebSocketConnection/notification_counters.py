@@ -0,0 +1,198 @@
+# notification_counters.py - Per-recipient unread notification counters in Redis
+# MySQL stays the source of truth: a missing counter is loaded with one COUNT, writers
+# adjust existing counters after commit, and a periodic task reconciles tracked counters.
+import os
+import logging
+import redis
+from redis import ConnectionPool
+from django.db import connection, transaction
+
+NOTIFICATION_COUNTER_CONFIG = {
+    'ENABLED': os.getenv("NOTIFICATION_COUNTER_ENABLED", "True") == "True",
+    # Bounds the lifetime of any drift that reconciliation has not caught yet
+    'TTL': int(os.getenv("NOTIFICATION_COUNTER_TTL", 60 * 60)),
+    'RECONCILE_BATCH_SIZE': int(os.getenv("NOTIFICATION_COUNTER_RECONCILE_BATCH_SIZE", 500)),
+}
+
+REDIS_POOL = ConnectionPool(
+    host=os.getenv("NOTIFICATION_COUNTER_HOST", os.getenv("REDIS_HOST", "localhost")),
+    port=int(os.getenv("NOTIFICATION_COUNTER_PORT", 6379)),
+    db=int(os.getenv("NOTIFICATION_COUNTER_DB", 6)),
+    decode_responses=True,
+    socket_timeout=2,
+    socket_connect_timeout=2,
+    max_connections=50
+)
+
+# Emails with a live counter, walked by reconcile_unread_counts()
+TRACKED_EMAILS_KEY = 'notification_unread:tracked'
+
+# Adjust only counters that are loaded; a counter that would go negative has drifted
+# and is dropped so the next read reloads it from MySQL.
+_ADJUST_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if value < 0 then
+    redis.call('DEL', KEYS[1])
+    return nil
+end
+return value
+"""
+
+
+def get_redis_client():
+    return redis.Redis(connection_pool=REDIS_POOL)
+
+
+def _normalize_email(email):
+    return (email or '').strip().lower()
+
+
+def _counter_key(email):
+    return f"notification_unread:{_normalize_email(email)}"
+
+
+def count_unread_in_db(emails):
+    """Unread counts straight from tbl_Notifications -> {email: count} (lowercase emails)"""
+    emails = list(dict.fromkeys(_normalize_email(email) for email in emails if email))
+    if not emails:
+        return {}
+    placeholders = ','.join(['%s'] * len(emails))
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT LOWER(recipient_email), COUNT(*)
+            FROM tbl_Notifications
+            WHERE recipient_email IN ({placeholders}) AND is_read = FALSE
+            GROUP BY LOWER(recipient_email)
+        """, emails)
+        counts = {row[0]: int(row[1]) for row in cursor.fetchall()}
+    return {email: counts.get(email, 0) for email in emails}
+
+
+def get_unread_count(email):
+    """Unread count for one recipient: a Redis hit, or one COUNT that seeds the counter"""
+    email = _normalize_email(email)
+    if not NOTIFICATION_COUNTER_CONFIG['ENABLED']:
+        return count_unread_in_db([email])[email]
+
+    try:
+        client = get_redis_client()
+        cached = client.get(_counter_key(email))
+        if cached is not None:
+            return int(cached)
+    except redis.RedisError as e:
+        logging.warning(f"⚠️ Unread counter unavailable, counting in MySQL: {e}")
+        return count_unread_in_db([email])[email]
+
+    count = count_unread_in_db([email])[email]
+    try:
+        pipe = client.pipeline(transaction=False)
+        # NX: a concurrent writer's adjustment of a just-seeded counter is not overwritten
+        pipe.set(_counter_key(email), count, nx=True, ex=NOTIFICATION_COUNTER_CONFIG['TTL'])
+        pipe.sadd(TRACKED_EMAILS_KEY, email)
+        pipe.execute()
+    except redis.RedisError as e:
+        logging.warning(f"⚠️ Failed to seed unread counter for {email}: {e}")
+    return count
+
+
+def _apply_adjustments(deltas):
+    try:
+        client = get_redis_client()
+        for email, delta in deltas.items():
+            client.eval(_ADJUST_SCRIPT, 1, _counter_key(email), delta)
+    except redis.RedisError as e:
+        logging.warning(f"⚠️ Unread counter update failed, invalidating: {e}")
+        _apply_invalidation(list(deltas))
+
+
+def adjust_unread_counts(deltas):
+    """
+    Apply {email: delta} to loaded counters once the current transaction commits
+    (immediately in autocommit mode). Unloaded counters are left for the next read.
+    """
+    if not NOTIFICATION_COUNTER_CONFIG['ENABLED']:
+        return
+    combined = {}
+    for email, delta in deltas.items():
+        email = _normalize_email(email)
+        if email and delta:
+            combined[email] = combined.get(email, 0) + int(delta)
+    combined = {email: delta for email, delta in combined.items() if delta}
+    if combined:
+        transaction.on_commit(lambda: _apply_adjustments(combined))
+
+
+def increment_unread_count(email, delta=1):
+    adjust_unread_counts({email: delta})
+
+
+def decrement_unread_count(email, delta=1):
+    adjust_unread_counts({email: -delta})
+
+
+def _apply_invalidation(emails):
+    try:
+        get_redis_client().delete(*[_counter_key(email) for email in emails])
+    except redis.RedisError as e:
+        logging.warning(f"⚠️ Unread counter invalidation failed: {e}")
+
+
+def invalidate_unread_counts(emails):
+    """Drop counters after commit, for bulk writes whose per-recipient deltas are unknown"""
+    if not NOTIFICATION_COUNTER_CONFIG['ENABLED']:
+        return
+    emails = list(dict.fromkeys(_normalize_email(email) for email in emails if email))
+    if emails:
+        transaction.on_commit(lambda: _apply_invalidation(emails))
+
+
+def reconcile_unread_counts(batch_size=None):
+    """
+    Re-count every tracked counter against MySQL in batches; counters that expired
+    are untracked. Returns {'checked', 'corrected', 'untracked'}.
+    """
+    batch_size = batch_size or NOTIFICATION_COUNTER_CONFIG['RECONCILE_BATCH_SIZE']
+    client = get_redis_client()
+    checked, corrected, untracked = 0, 0, 0
+
+    batch = []
+    for email in client.sscan_iter(TRACKED_EMAILS_KEY, count=batch_size):
+        batch.append(email)
+        if len(batch) >= batch_size:
+            result = _reconcile_batch(client, batch)
+            checked += len(batch)
+            corrected += result[0]
+            untracked += result[1]
+            batch = []
+    if batch:
+        result = _reconcile_batch(client, batch)
+        checked += len(batch)
+        corrected += result[0]
+        untracked += result[1]
+
+    if corrected or untracked:
+        logging.info(f"🔢 Unread counters reconciled: {checked} checked, {corrected} corrected, {untracked} untracked")
+    return {'checked': checked, 'corrected': corrected, 'untracked': untracked}
+
+
+def _reconcile_batch(client, emails):
+    cached = client.mget([_counter_key(email) for email in emails])
+    live = [email for email, value in zip(emails, cached) if value is not None]
+    expired = [email for email, value in zip(emails, cached) if value is None]
+
+    corrected = 0
+    if live:
+        actual = count_unread_in_db(live)
+        pipe = client.pipeline(transaction=False)
+        for email, value in zip(emails, cached):
+            if value is not None and int(value) != actual[email]:
+                # XX: never resurrect a counter that was invalidated meanwhile
+                pipe.set(_counter_key(email), actual[email], xx=True, keepttl=True)
+                corrected += 1
+        pipe.execute()
+    if expired:
+        client.srem(TRACKED_EMAILS_KEY, *expired)
+    return corrected, len(expired)
@@ -1,5 +1,6 @@
 # Complete Fixed Backend Notification System
 # Replace your existing notification methods with these
+import os
 import json
 import logging
 import uuid
@@ -10,17 +11,65 @@ from django.views.decorators.http import require_http_methods
 from django.db import connection, transaction
 from django.utils import timezone
 import pytz
+import redis
+from core.scheduler.reminder_queue import (
+    REMINDER_QUEUE_CONFIG, NOTIFICATION_REMINDER_QUEUE, add_reminders, pop_due_reminders, to_epoch
+)
+from .notification_counters import (
+    get_unread_count, increment_unread_count, decrement_unread_count, invalidate_unread_counts
+)
 # from .meetings import Create_Calendar_Meeting as _create_calendar_meeting
 # from .meetings import Create_Schedule_Meeting as _create_schedule_meeting
 
+NOTIFICATION_SWEEP_CONFIG = {
+    'BATCH_SIZE': int(os.getenv("NOTIFICATION_SWEEP_BATCH_SIZE", 1000)),
+    # Upper bound on batches per sweep so one run never holds a worker for long
+    'MAX_BATCHES': int(os.getenv("NOTIFICATION_SWEEP_MAX_BATCHES", 50)),
+}
+
+# Notification types that outlive their meeting and are never expired
+PROTECTED_NOTIFICATION_TYPES = (
+    'recording_completed',
+    'recording_completed_host',
+    'recording_processed',
+    'recording_available'
+)
+
+# Set once this process has created/verified the tables
+_notification_tables_ready = False
+
 def short_id():
     return uuid.uuid4().hex[:20]
 
+def _upgrade_notifications_table(cursor):
+    """Add expires_at and the keyset pagination index to tables created before they existed"""
+    cursor.execute("""
+        SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'tbl_Notifications' AND COLUMN_NAME = 'expires_at'
+    """)
+    if cursor.fetchone()[0]:
+        return
+    try:
+        cursor.execute("""
+            ALTER TABLE tbl_Notifications
+                ADD COLUMN expires_at DATETIME NULL,
+                ADD INDEX idx_expires_at (expires_at),
+                ADD INDEX idx_recipient_created (recipient_email, created_at, id)
+        """)
+        logging.info("✅ tbl_Notifications upgraded with expires_at")
+    except Exception as e:
+        # Another process may have run the same ALTER concurrently
+        logging.warning(f"⚠️ tbl_Notifications upgrade skipped: {e}")
+
 def ensure_notification_tables():
     """
     Create notification tables WITHOUT foreign key constraints.
     Recording notifications need to work even when meeting_id doesn't exist in tbl_Meetings.
+    Runs the DDL once per process; later calls return immediately.
     """
+    global _notification_tables_ready
+    if _notification_tables_ready:
+        return
     try:
         with connection.cursor() as cursor:
 
@@ -41,15 +90,19 @@ def ensure_notification_tables():
                     is_read BOOLEAN DEFAULT FALSE,
                     priority VARCHAR(20) DEFAULT 'normal',
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    expires_at DATETIME NULL,
 
                     PRIMARY KEY (id),
                     INDEX idx_recipient_email (recipient_email),
                     INDEX idx_meeting_id (meeting_id),
                     INDEX idx_created_at (created_at),
                     INDEX idx_is_read (is_read),
-                    INDEX idx_notification_type (notification_type)
+                    INDEX idx_notification_type (notification_type),
+                    INDEX idx_expires_at (expires_at),
+                    INDEX idx_recipient_created (recipient_email, created_at, id)
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
             """)
+            _upgrade_notifications_table(cursor)
 
             # ⚠️ REMOVED FK CONSTRAINT - Recording notifications have meeting_ids 
             # that may not exist in tbl_Meetings (instant meetings, MongoDB stored, etc.)
@@ -74,6 +127,7 @@ def ensure_notification_tables():
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
             """)
 
+            _notification_tables_ready = True
             logging.info("✅ Notification tables created or verified successfully")
 
     except Exception as e:
@@ -160,6 +214,7 @@ def create_meeting_notifications(meeting_id, meeting_title, participant_emails,
 
                 if cursor.rowcount > 0:
                     sent += 1
+                    increment_unread_count(email)
                 else:
                     failed += 1
 
@@ -236,6 +291,7 @@ def create_host_notification(meeting_id, meeting_title, host_email, start_time,
             ])
 
             if cursor.rowcount > 0:
+                increment_unread_count(host_email)
                 logging.info(f"✅ Created host notification ({notification_type}) for {host_email}")
             else:
                 logging.error(f"⚠️ Failed to create host notification for {host_email}")
@@ -271,6 +327,7 @@ def schedule_meeting_reminders(meeting_id, meeting_title, participant_emails, st
         return 0
     
     scheduled_count = 0
+    queued_reminders = []
     
     for reminder_min in reminder_minutes:
         reminder_dt = start_dt - timedelta(minutes=reminder_min)
@@ -307,10 +364,17 @@ def schedule_meeting_reminders(meeting_id, meeting_title, participant_emails, st
                     
                     if cursor.rowcount > 0:
                         scheduled_count += 1
+                        queued_reminders.append((reminder_id, to_epoch(reminder_dt)))
                 
             except Exception as e:
                 logging.error(f"Failed to schedule reminder for {email}: {e}")
     
+    if REMINDER_QUEUE_CONFIG['ENABLED']:
+        try:
+            add_reminders(NOTIFICATION_REMINDER_QUEUE, meeting_id, queued_reminders)
+        except redis.RedisError as e:
+            logging.warning(f"⚠️ Failed to queue reminders for meeting {meeting_id}, the SQL fallback will pick them up: {e}")
+    
     logging.info(f"Scheduled {scheduled_count} reminders for meeting {meeting_id}")
     return scheduled_count
 
@@ -336,6 +400,118 @@ def cleanup_old_notifications(days_old=30):
         logging.error(f"Failed to cleanup old notifications: {e}")
         return 0
 
+# (table, id column, end time column) of every meeting source a notification can point at
+_NOTIFICATION_MEETING_SOURCES = (
+    ('tbl_CalendarMeetings', 'ID', 'endTime'),
+    ('tbl_ScheduledMeetings', 'id', 'end_time'),
+    ('tbl_Meetings', 'ID', 'Ended_At'),
+)
+
+def stamp_expired_notifications(cursor, now):
+    """
+    Set expires_at on unstamped notifications whose meeting has ended.
+    Only rows with expires_at IS NULL are joined, so each row is stamped once.
+    """
+    placeholders = ','.join(['%s'] * len(PROTECTED_NOTIFICATION_TYPES))
+    stamped = 0
+    for table, id_column, end_column in _NOTIFICATION_MEETING_SOURCES:
+        cursor.execute(f"""
+            UPDATE tbl_Notifications n
+            INNER JOIN {table} src ON n.meeting_id = src.{id_column}
+            SET n.expires_at = src.{end_column}
+            WHERE n.expires_at IS NULL
+              AND src.{end_column} IS NOT NULL
+              AND src.{end_column} < %s
+              AND n.notification_type NOT IN ({placeholders})
+        """, [now, *PROTECTED_NOTIFICATION_TYPES])
+        stamped += cursor.rowcount or 0
+    return stamped
+
+def sweep_expired_notifications(batch_size=None, max_batches=None):
+    """
+    Background expiry for meeting notifications (recording types are never expired).
+    Stamps expires_at from the meeting end times, then deletes expired rows in
+    small batches through idx_expires_at so readers never wait on the cleanup.
+    """
+    batch_size = batch_size or NOTIFICATION_SWEEP_CONFIG['BATCH_SIZE']
+    max_batches = max_batches or NOTIFICATION_SWEEP_CONFIG['MAX_BATCHES']
+    now = datetime.now(pytz.timezone("Asia/Kolkata")).strftime('%Y-%m-%d %H:%M:%S')
+
+    ensure_notification_tables()
+    stamped, deleted = 0, 0
+    with connection.cursor() as cursor:
+        stamped = stamp_expired_notifications(cursor, now)
+        # Unread rows about to go: their recipients' counters are reloaded on next read
+        cursor.execute("""
+            SELECT DISTINCT recipient_email FROM tbl_Notifications
+            WHERE expires_at IS NOT NULL AND expires_at < %s AND is_read = FALSE
+        """, [now])
+        affected_emails = [row[0] for row in cursor.fetchall()]
+        for _ in range(max_batches):
+            cursor.execute("""
+                DELETE FROM tbl_Notifications
+                WHERE expires_at IS NOT NULL AND expires_at < %s
+                ORDER BY expires_at
+                LIMIT %s
+            """, [now, batch_size])
+            batch_deleted = cursor.rowcount or 0
+            deleted += batch_deleted
+            if batch_deleted < batch_size:
+                break
+    invalidate_unread_counts(affected_emails)
+
+    if stamped or deleted:
+        logging.info(f"🧹 Notification sweep: {stamped} expired, {deleted} deleted (excluded recording types)")
+    return {'stamped': stamped, 'deleted': deleted}
+
+def fetch_due_reminders(cursor, current_time, limit=None):
+    """
+    Due unsent rows of tbl_ScheduledReminders as (id, meeting_id, recipient_email, notification_data).
+    IDs are popped from the reminder queue; the table is only scanned when the queue is off or down.
+    """
+    if REMINDER_QUEUE_CONFIG['ENABLED']:
+        try:
+            due_ids = [member for member, _ in pop_due_reminders(NOTIFICATION_REMINDER_QUEUE, limit=limit)]
+            if not due_ids:
+                return []
+            placeholders = ','.join(['%s'] * len(due_ids))
+            cursor.execute(f"""
+                SELECT id, meeting_id, recipient_email, notification_data
+                FROM tbl_ScheduledReminders
+                WHERE id IN ({placeholders}) AND is_sent = FALSE
+                ORDER BY reminder_time
+            """, due_ids)
+            return cursor.fetchall()
+        except redis.RedisError as e:
+            logging.warning(f"⚠️ Reminder queue unavailable, scanning tbl_ScheduledReminders: {e}")
+
+    query = """
+        SELECT id, meeting_id, recipient_email, notification_data
+        FROM tbl_ScheduledReminders
+        WHERE reminder_time <= %s AND is_sent = FALSE
+        ORDER BY reminder_time
+    """
+    if limit:
+        query += f" LIMIT {int(limit)}"
+    cursor.execute(query, [current_time.strftime('%Y-%m-%d %H:%M:%S')])
+    return cursor.fetchall()
+
+def claim_scheduled_reminder(cursor, reminder_id):
+    """Mark a reminder sent before delivering it; False when another worker already did"""
+    cursor.execute("""
+        UPDATE tbl_ScheduledReminders 
+        SET is_sent = TRUE 
+        WHERE id = %s AND is_sent = FALSE
+    """, [reminder_id])
+    return cursor.rowcount > 0
+
+def release_scheduled_reminder(cursor, reminder_id):
+    """Undo a claim after a failed delivery so the SQL fallback can retry it"""
+    try:
+        cursor.execute("UPDATE tbl_ScheduledReminders SET is_sent = FALSE WHERE id = %s", [reminder_id])
+    except Exception as e:
+        logging.error(f"Failed to release reminder {reminder_id}: {e}")
+
 def process_scheduled_reminders():
     """Process scheduled reminders that are due"""
     try:
@@ -345,22 +521,16 @@ def process_scheduled_reminders():
         current_time = datetime.now(ist_timezone)
         
         with connection.cursor() as cursor:
-            # Get due reminders
-            cursor.execute("""
-                SELECT id, meeting_id, recipient_email, notification_data
-                FROM tbl_ScheduledReminders
-                WHERE reminder_time <= %s AND is_sent = FALSE
-                ORDER BY reminder_time
-                LIMIT 100
-            """, [current_time])
-            
-            reminders = cursor.fetchall()
+            reminders = fetch_due_reminders(cursor, current_time, limit=100)
             processed = 0
             
             for reminder in reminders:
                 reminder_id, meeting_id, recipient_email, notification_data_str = reminder
                 
                 try:
+                    if not claim_scheduled_reminder(cursor, reminder_id):
+                        continue
+                    
                     notification_data = json.loads(notification_data_str)
                     # notification_id = str(uuid.uuid4())
                     notification_id = short_id()
@@ -379,17 +549,12 @@ def process_scheduled_reminders():
                         notification_data["meeting_url"],
                         False, 'high', current_time
                     ])
-                    
-                    # Mark reminder as sent
-                    cursor.execute("""
-                        UPDATE tbl_ScheduledReminders 
-                        SET is_sent = TRUE 
-                        WHERE id = %s
-                    """, [reminder_id])
+                    increment_unread_count(recipient_email)
                     
                     processed += 1
                     
                 except Exception as e:
+                    release_scheduled_reminder(cursor, reminder_id)
                     logging.error(f"Failed to process reminder {reminder_id}: {e}")
             
             logging.info(f"Processed {processed} scheduled reminders")
@@ -642,13 +807,29 @@ def _get_recording_participants(meeting_id):
     logging.info(f"📋 Found {len(participants)} participants for meeting {meeting_id}")
     return list(participants)
 
+def _format_notification_cursor(created_at, notification_id):
+    """Opaque keyset cursor for the row a page ended on"""
+    return f"{created_at.strftime('%Y-%m-%d %H:%M:%S')}|{notification_id}"
+
+def _parse_notification_cursor(value):
+    """(created_at, id) from a cursor, or None when malformed"""
+    created_at, _, notification_id = value.partition('|')
+    try:
+        created_at = datetime.strptime(created_at, '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return None
+    if not notification_id:
+        return None
+    return created_at.strftime('%Y-%m-%d %H:%M:%S'), notification_id
+
 @require_http_methods(["GET"])
 @csrf_exempt
 def get_user_notifications(request):
     """
     Get notifications for a user with optional page-based filtering.
-    Automatically deletes expired meeting notifications (Calendar + Schedule) whose end_time has passed.
-    EXCLUDES recording notifications from cleanup - they should persist after meeting ends.
+    Expired meeting notifications are removed by sweep_expired_notifications() in the
+    background; this is a read-only, index-backed query.
+    Paginate with `cursor` (the previous response's next_cursor) or, for older clients, `offset`.
     """
     try:
         email = request.GET.get('email', '').strip()
@@ -660,6 +841,15 @@ def get_user_notifications(request):
         except (ValueError, TypeError):
             limit = 20
             offset = 0
+
+        cursor_value = request.GET.get('cursor', '').strip()
+        keyset = _parse_notification_cursor(cursor_value) if cursor_value else None
+        if cursor_value and keyset is None:
+            return JsonResponse({
+                "Error": "Invalid cursor",
+                "notifications": [],
+                "unread_count": 0
+            }, status=400)
         
         logging.info(f"📧 Getting notifications for email: {email}, page: {page}, limit: {limit}, offset: {offset}")
         
@@ -672,193 +862,73 @@ def get_user_notifications(request):
         
         ensure_notification_tables()
 
-        # 🧹 Auto-clean expired meeting notifications before fetching
-        # ⚠️ IMPORTANT: EXCLUDE recording notifications - they should persist after meeting ends!
-        try:
-            ist = pytz.timezone("Asia/Kolkata")
-            now = datetime.now(ist)
-            
-            # List of notification types that should NOT be auto-deleted
-            protected_types = (
-                'recording_completed',
-                'recording_completed_host', 
-                'recording_processed',
-                'recording_available'
-            )
-            
-            with connection.cursor() as cleanup_cursor:
-                # Delete notifications for ended Calendar meetings (EXCLUDE recording types)
-                cleanup_cursor.execute("""
-                    DELETE n FROM tbl_Notifications n
-                    INNER JOIN tbl_CalendarMeetings c ON n.meeting_id = c.ID
-                    WHERE c.endTime IS NOT NULL 
-                      AND c.endTime < %s
-                      AND n.notification_type NOT IN (%s, %s, %s, %s)
-                """, [now, *protected_types])
-                deleted_calendar = cleanup_cursor.rowcount or 0
-
-                # Delete notifications for ended Scheduled meetings (EXCLUDE recording types)
-                cleanup_cursor.execute("""
-                    DELETE n FROM tbl_Notifications n
-                    INNER JOIN tbl_ScheduledMeetings s ON n.meeting_id = s.id
-                    WHERE s.end_time IS NOT NULL 
-                      AND s.end_time < %s
-                      AND n.notification_type NOT IN (%s, %s, %s, %s)
-                """, [now, *protected_types])
-                deleted_schedule = cleanup_cursor.rowcount or 0
-
-                # Delete notifications for ended meetings in tbl_Meetings (EXCLUDE recording types)
-                cleanup_cursor.execute("""
-                    DELETE n FROM tbl_Notifications n
-                    INNER JOIN tbl_Meetings m ON n.meeting_id = m.ID
-                    WHERE m.Ended_At IS NOT NULL 
-                      AND m.Ended_At < %s
-                      AND n.notification_type NOT IN (%s, %s, %s, %s)
-                """, [now, *protected_types])
-                deleted_main = cleanup_cursor.rowcount or 0
-
-                total_deleted = deleted_calendar + deleted_schedule + deleted_main
-                if total_deleted > 0:
-                    logging.info(f"🧹 Cleaned up {total_deleted} expired notifications (excluded recording types).")
-        except Exception as cleanup_err:
-            logging.warning(f"⚠️ Failed to auto-clean expired meeting notifications: {cleanup_err}")
+        now = datetime.now(pytz.timezone("Asia/Kolkata")).strftime('%Y-%m-%d %H:%M:%S')
+        type_placeholders = ','.join(['%s'] * len(PROTECTED_NOTIFICATION_TYPES))
+
+        # Build filter based on page
+        joins = ""
+        page_filter = ""
+        page_params = []
+        if page == 'schedule':
+            joins = "LEFT JOIN tbl_Meetings m ON n.meeting_id = m.ID"
+            page_filter = "AND (m.Meeting_Type = 'ScheduleMeeting' OR n.notification_type LIKE '%%schedule%%')"
+        elif page == 'calendar':
+            joins = "LEFT JOIN tbl_Meetings m ON n.meeting_id = m.ID"
+            page_filter = "AND (m.Meeting_Type = 'CalendarMeeting' OR n.notification_type LIKE '%%calendar%%')"
+        elif page == 'recording':
+            page_filter = f"AND n.notification_type IN ({type_placeholders})"
+            page_params = list(PROTECTED_NOTIFICATION_TYPES)
+
+        # Stamped-but-not-yet-swept rows are already gone for the reader
+        where = f"""
+            WHERE n.recipient_email = %s
+              AND (n.expires_at IS NULL OR n.expires_at > %s)
+              {page_filter}
+        """
+        where_params = [email, now, *page_params]
+
+        query = f"""
+            SELECT 
+                n.id, n.notification_type, n.title, n.message, n.meeting_id,
+                n.meeting_title, n.meeting_url, n.start_time, n.is_read,
+                n.priority, n.created_at,
+                CASE 
+                    WHEN TIMESTAMPDIFF(DAY, n.created_at, NOW()) > 0 
+                    THEN CONCAT(TIMESTAMPDIFF(DAY, n.created_at, NOW()), 
+                        CASE WHEN TIMESTAMPDIFF(DAY, n.created_at, NOW()) = 1 THEN ' day ago' ELSE ' days ago' END)
+                    WHEN TIMESTAMPDIFF(HOUR, n.created_at, NOW()) > 0 
+                    THEN CONCAT(TIMESTAMPDIFF(HOUR, n.created_at, NOW()), 
+                        CASE WHEN TIMESTAMPDIFF(HOUR, n.created_at, NOW()) = 1 THEN ' hour ago' ELSE ' hours ago' END)
+                    WHEN TIMESTAMPDIFF(MINUTE, n.created_at, NOW()) > 0 
+                    THEN CONCAT(TIMESTAMPDIFF(MINUTE, n.created_at, NOW()), ' min ago')
+                    ELSE 'Just now'
+                END as time_ago
+            FROM tbl_Notifications n
+            {joins}
+            {where}
+        """
+        query_params = list(where_params)
+        if keyset:
+            # Seek past the last row of the previous page on idx_recipient_created
+            query += " AND (n.created_at, n.id) < (%s, %s)"
+            query_params.extend(keyset)
+        query += " ORDER BY n.created_at DESC, n.id DESC LIMIT %s"
+        query_params.append(limit)
+        if not keyset and offset:
+            query += " OFFSET %s"
+            query_params.append(offset)
+
+        count_query = f"""
+            SELECT COUNT(*)
+            FROM tbl_Notifications n
+            {joins}
+            {where}
+              AND n.is_read = FALSE
+        """
 
         with connection.cursor() as cursor:
-            # Build query based on page filter
-            if page == 'schedule':
-                query = """
-                    SELECT 
-                        n.id, n.notification_type, n.title, n.message, n.meeting_id,
-                        n.meeting_title, n.meeting_url, n.start_time, n.is_read,
-                        n.priority, n.created_at,
-                        CASE 
-                            WHEN TIMESTAMPDIFF(DAY, n.created_at, NOW()) > 0 
-                            THEN CONCAT(TIMESTAMPDIFF(DAY, n.created_at, NOW()), 
-                                CASE WHEN TIMESTAMPDIFF(DAY, n.created_at, NOW()) = 1 THEN ' day ago' ELSE ' days ago' END)
-                            WHEN TIMESTAMPDIFF(HOUR, n.created_at, NOW()) > 0 
-                            THEN CONCAT(TIMESTAMPDIFF(HOUR, n.created_at, NOW()), 
-                                CASE WHEN TIMESTAMPDIFF(HOUR, n.created_at, NOW()) = 1 THEN ' hour ago' ELSE ' hours ago' END)
-                            WHEN TIMESTAMPDIFF(MINUTE, n.created_at, NOW()) > 0 
-                            THEN CONCAT(TIMESTAMPDIFF(MINUTE, n.created_at, NOW()), ' min ago')
-                            ELSE 'Just now'
-                        END as time_ago
-                    FROM tbl_Notifications n
-                    LEFT JOIN tbl_Meetings m ON n.meeting_id = m.ID
-                    WHERE n.recipient_email = %s 
-                      AND (m.Meeting_Type = 'ScheduleMeeting' OR n.notification_type LIKE '%%schedule%%')
-                    ORDER BY n.created_at DESC 
-                    LIMIT %s OFFSET %s
-                """
-                count_query = """
-                    SELECT COUNT(*) 
-                    FROM tbl_Notifications n
-                    LEFT JOIN tbl_Meetings m ON n.meeting_id = m.ID
-                    WHERE n.recipient_email = %s 
-                      AND n.is_read = FALSE
-                      AND (m.Meeting_Type = 'ScheduleMeeting' OR n.notification_type LIKE '%%schedule%%')
-                """
-                
-            elif page == 'calendar':
-                query = """
-                    SELECT 
-                        n.id, n.notification_type, n.title, n.message, n.meeting_id,
-                        n.meeting_title, n.meeting_url, n.start_time, n.is_read,
-                        n.priority, n.created_at,
-                        CASE 
-                            WHEN TIMESTAMPDIFF(DAY, n.created_at, NOW()) > 0 
-                            THEN CONCAT(TIMESTAMPDIFF(DAY, n.created_at, NOW()), 
-                                CASE WHEN TIMESTAMPDIFF(DAY, n.created_at, NOW()) = 1 THEN ' day ago' ELSE ' days ago' END)
-                            WHEN TIMESTAMPDIFF(HOUR, n.created_at, NOW()) > 0 
-                            THEN CONCAT(TIMESTAMPDIFF(HOUR, n.created_at, NOW()), 
-                                CASE WHEN TIMESTAMPDIFF(HOUR, n.created_at, NOW()) = 1 THEN ' hour ago' ELSE ' hours ago' END)
-                            WHEN TIMESTAMPDIFF(MINUTE, n.created_at, NOW()) > 0 
-                            THEN CONCAT(TIMESTAMPDIFF(MINUTE, n.created_at, NOW()), ' min ago')
-                            ELSE 'Just now'
-                        END as time_ago
-                    FROM tbl_Notifications n
-                    LEFT JOIN tbl_Meetings m ON n.meeting_id = m.ID
-                    WHERE n.recipient_email = %s 
-                      AND (m.Meeting_Type = 'CalendarMeeting' OR n.notification_type LIKE '%%calendar%%')
-                    ORDER BY n.created_at DESC 
-                    LIMIT %s OFFSET %s
-                """
-                count_query = """
-                    SELECT COUNT(*) 
-                    FROM tbl_Notifications n
-                    LEFT JOIN tbl_Meetings m ON n.meeting_id = m.ID
-                    WHERE n.recipient_email = %s 
-                      AND n.is_read = FALSE
-                      AND (m.Meeting_Type = 'CalendarMeeting' OR n.notification_type LIKE '%%calendar%%')
-                """
-                
-            elif page == 'recording':
-                query = """
-                    SELECT 
-                        id, notification_type, title, message, meeting_id,
-                        meeting_title, meeting_url, start_time, is_read,
-                        priority, created_at,
-                        CASE 
-                            WHEN TIMESTAMPDIFF(DAY, created_at, NOW()) > 0 
-                            THEN CONCAT(TIMESTAMPDIFF(DAY, created_at, NOW()), 
-                                CASE WHEN TIMESTAMPDIFF(DAY, created_at, NOW()) = 1 THEN ' day ago' ELSE ' days ago' END)
-                            WHEN TIMESTAMPDIFF(HOUR, created_at, NOW()) > 0 
-                            THEN CONCAT(TIMESTAMPDIFF(HOUR, created_at, NOW()), 
-                                CASE WHEN TIMESTAMPDIFF(HOUR, created_at, NOW()) = 1 THEN ' hour ago' ELSE ' hours ago' END)
-                            WHEN TIMESTAMPDIFF(MINUTE, created_at, NOW()) > 0 
-                            THEN CONCAT(TIMESTAMPDIFF(MINUTE, created_at, NOW()), ' min ago')
-                            ELSE 'Just now'
-                        END as time_ago
-                    FROM tbl_Notifications 
-                    WHERE recipient_email = %s 
-                    AND notification_type IN (
-                        'recording_completed', 
-                        'recording_completed_host',
-                        'recording_processed', 
-                        'recording_available'
-                    )
-                    ORDER BY created_at DESC 
-                    LIMIT %s OFFSET %s
-                """
-                count_query = """
-                    SELECT COUNT(*) FROM tbl_Notifications 
-                    WHERE recipient_email = %s 
-                    AND is_read = FALSE
-                    AND notification_type IN (
-                        'recording_completed', 
-                        'recording_completed_host',
-                        'recording_processed', 
-                        'recording_available'
-                    )
-                """  
-            else:
-                query = """
-                    SELECT 
-                        id, notification_type, title, message, meeting_id,
-                        meeting_title, meeting_url, start_time, is_read,
-                        priority, created_at,
-                        CASE 
-                            WHEN TIMESTAMPDIFF(DAY, created_at, NOW()) > 0 
-                            THEN CONCAT(TIMESTAMPDIFF(DAY, created_at, NOW()), 
-                                CASE WHEN TIMESTAMPDIFF(DAY, created_at, NOW()) = 1 THEN ' day ago' ELSE ' days ago' END)
-                            WHEN TIMESTAMPDIFF(HOUR, created_at, NOW()) > 0 
-                            THEN CONCAT(TIMESTAMPDIFF(HOUR, created_at, NOW()), 
-                                CASE WHEN TIMESTAMPDIFF(HOUR, created_at, NOW()) = 1 THEN ' hour ago' ELSE ' hours ago' END)
-                            WHEN TIMESTAMPDIFF(MINUTE, created_at, NOW()) > 0 
-                            THEN CONCAT(TIMESTAMPDIFF(MINUTE, created_at, NOW()), ' min ago')
-                            ELSE 'Just now'
-                        END as time_ago
-                    FROM tbl_Notifications 
-                    WHERE recipient_email = %s 
-                    ORDER BY created_at DESC 
-                    LIMIT %s OFFSET %s
-                """
-                count_query = """
-                    SELECT COUNT(*) FROM tbl_Notifications 
-                    WHERE recipient_email = %s AND is_read = FALSE
-                """
-            
             # Execute main query
-            cursor.execute(query, [email, limit, offset])
+            cursor.execute(query, query_params)
             rows = cursor.fetchall()
             
             notifications = []
@@ -884,10 +954,14 @@ def get_user_notifications(request):
                     logging.warning(f"Error processing notification row: {e}")
                     continue
             
-            cursor.execute(count_query, [email])
+            cursor.execute(count_query, where_params)
             unread_count = cursor.fetchone()[0] or 0
             
             logging.info(f"✅ Retrieved {len(notifications)} notifications, {unread_count} unread for {email} (page: {page})")
+
+            next_cursor = None
+            if len(rows) == limit and rows[-1][10]:
+                next_cursor = _format_notification_cursor(rows[-1][10], rows[-1][0])
             
             response_data = {
                 "notifications": notifications,
@@ -895,6 +969,7 @@ def get_user_notifications(request):
                 "total_count": len(notifications),
                 "limit": limit,
                 "offset": offset,
+                "next_cursor": next_cursor,
                 "page": page,
                 "success": True
             }
@@ -928,21 +1003,15 @@ def get_notification_count(request):
         # Ensure notification tables exist
         ensure_notification_tables()
         
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT COUNT(*) FROM tbl_Notifications 
-                WHERE recipient_email = %s AND is_read = FALSE
-            """, [email])
-            
-            result = cursor.fetchone()
-            unread_count = result[0] if result else 0
-            
-            logging.info(f"✅ Unread count for {email}: {unread_count}")
-            
-            return JsonResponse({
-                "unread_count": int(unread_count),
-                "success": True
-            }, status=200)
+        # Redis counter; only a cold counter costs a COUNT in MySQL
+        unread_count = get_unread_count(email)
+        
+        logging.info(f"✅ Unread count for {email}: {unread_count}")
+        
+        return JsonResponse({
+            "unread_count": int(unread_count),
+            "success": True
+        }, status=200)
             
     except Exception as e:
         logging.error(f"❌ Error in get_notification_count: {str(e)}")
@@ -1002,20 +1071,18 @@ def mark_notification_as_read(request):
                 cursor.execute("""
                     UPDATE tbl_Notifications
                     SET is_read = TRUE
-                    WHERE id = %s AND recipient_email = %s
+                    WHERE id = %s AND recipient_email = %s AND is_read = FALSE
                     LIMIT 1
                 """, [notification_id, email])
+                affected = cursor.rowcount
                 connection.commit()  # ✅ Explicit commit
 
-                affected = cursor.rowcount
+                if affected:
+                    decrement_unread_count(email)
                 logging.info(f"✅ Updated {affected} row(s) for notification {notification_id}")
 
-            # ✅ Fetch updated unread count
-            cursor.execute("""
-                SELECT COUNT(*) FROM tbl_Notifications
-                WHERE recipient_email = %s AND is_read = FALSE
-            """, [email])
-            unread_count = cursor.fetchone()[0] or 0
+        # ✅ Fetch updated unread count
+        unread_count = get_unread_count(email)
 
         logging.info(f"✅ Notification {notification_id} marked as read for {email}. Unread count: {unread_count}")
 
@@ -1079,6 +1146,7 @@ def mark_all_notifications_as_read(request):
                     WHERE recipient_email = %s AND is_read = FALSE
                 """, [email])
                 marked_count = cursor.rowcount or 0
+                decrement_unread_count(email, marked_count)
 
         logging.info(f"✅ Marked {marked_count} notifications as read for {email}")
 
@@ -1140,13 +1208,10 @@ def delete_notification(request):
                     DELETE FROM tbl_Notifications
                     WHERE id = %s AND recipient_email = %s
                 """, [notification_id, email])
+                if cursor.rowcount and not row[1]:
+                    decrement_unread_count(email)
 
-                # Recount unread
-                cursor.execute("""
-                    SELECT COUNT(*) FROM tbl_Notifications
-                    WHERE recipient_email = %s AND is_read = FALSE
-                """, [email])
-                unread_count = cursor.fetchone()[0] or 0
+        unread_count = get_unread_count(email)
 
         logging.info(f"✅ Notification {notification_id} deleted for {email}")
 
@@ -1175,15 +1240,12 @@ def process_reminder_notifications(request):
         
         with connection.cursor() as cursor:
             # Get reminders that should be sent now
-            cursor.execute("""
-                SELECT id, notification_data FROM tbl_ScheduledReminders
-                WHERE reminder_time <= %s AND is_sent = FALSE
-            """, [current_time.strftime('%Y-%m-%d %H:%M:%S')])
-            
-            reminders = cursor.fetchall()
+            reminders = fetch_due_reminders(cursor, current_time)
             
-            for reminder_id, notification_data_json in reminders:
+            for reminder_id, _, _, notification_data_json in reminders:
                 try:
+                    if not claim_scheduled_reminder(cursor, reminder_id):
+                        continue
                     data = json.loads(notification_data_json)
 
                     notification_id = short_id()
@@ -1207,17 +1269,13 @@ def process_reminder_notifications(request):
                         'high',
                         current_time
                     ])
-
-                    
-                    # Mark reminder as sent
-                    cursor.execute("""
-                        UPDATE tbl_ScheduledReminders SET is_sent = TRUE WHERE id = %s
-                    """, [reminder_id])
+                    increment_unread_count(data['recipient_email'])
                     
                     processed_count += 1
                     logging.info(f"Processed reminder for meeting {data['meeting_id']}")
                     
                 except Exception as e:
+                    release_scheduled_reminder(cursor, reminder_id)
                     logging.error(f"Failed to process reminder {reminder_id}: {e}")
                     failed_count += 1
         
@@ -1275,6 +1333,7 @@ def debug_create_test_notification(request):
                     "Error": "Failed to create test notification",
                     "success": False
                 }, status=500)
+            increment_unread_count(email)
             
         logging.info(f"✅ Created test notification {notification_id} for {email}")
         
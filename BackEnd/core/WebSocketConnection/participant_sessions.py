@@ -0,0 +1,146 @@
+# participant_sessions.py - Normalized join/leave sessions for tbl_Participants
+# One row per join; the matching leave fills Left_At. Durations are aggregated
+# in SQL and host overlaps are computed from the rows instead of re-parsing
+# Join_Times/Leave_Times.
+from django.db import connection, models
+import logging
+
+
+class ParticipantSessions(models.Model):
+    id = models.AutoField(primary_key=True, db_column='ID')
+    participant_id = models.IntegerField(db_column='Participant_ID')
+    meeting_id = models.CharField(max_length=20, db_column='Meeting_ID')
+    user_id = models.IntegerField(db_column='User_ID')
+    occurrence_number = models.IntegerField(default=1, db_column='occurrence_number')
+    joined_at = models.DateTimeField(db_column='Joined_At')
+    left_at = models.DateTimeField(blank=True, null=True, db_column='Left_At')
+
+    class Meta:
+        db_table = 'tbl_ParticipantSessions'
+        indexes = [
+            models.Index(fields=['meeting_id', 'occurrence_number', 'user_id'], name='idx_sess_meeting_occ_user'),
+            models.Index(fields=['participant_id', 'left_at'], name='idx_sess_participant_open'),
+            models.Index(fields=['user_id', 'joined_at'], name='idx_sess_user_joined'),
+        ]
+
+
+def create_participant_sessions_table():
+    """Create tbl_ParticipantSessions table if it doesn't exist - MYSQL VERSION"""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tbl_ParticipantSessions (
+                ID INT AUTO_INCREMENT PRIMARY KEY,
+                Participant_ID INT NOT NULL,
+                Meeting_ID VARCHAR(20) NOT NULL,
+                User_ID INT NOT NULL,
+                occurrence_number INT NOT NULL DEFAULT 1,
+                Joined_At DATETIME NOT NULL,
+                Left_At DATETIME DEFAULT NULL,
+                KEY idx_sess_meeting_occ_user (Meeting_ID, occurrence_number, User_ID),
+                KEY idx_sess_participant_open (Participant_ID, Left_At),
+                KEY idx_sess_user_joined (User_ID, Joined_At)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+            """)
+    except Exception as e:
+        logging.error(f"Failed to create tbl_ParticipantSessions table: {e}")
+
+
+def open_participant_session(cursor, participant_id, meeting_id, user_id, occurrence_number, joined_at):
+    """Insert a new open session row for a join/rejoin"""
+    cursor.execute("""
+        INSERT INTO tbl_ParticipantSessions
+        (Participant_ID, Meeting_ID, User_ID, occurrence_number, Joined_At, Left_At)
+        VALUES (%s, %s, %s, %s, %s, NULL)
+    """, [participant_id, meeting_id, user_id, occurrence_number, joined_at])
+    return cursor.lastrowid
+
+
+def close_participant_session(cursor, participant_id, left_at):
+    """Close the participant's open session(s); a leave before the join is clamped to zero length"""
+    cursor.execute("""
+        UPDATE tbl_ParticipantSessions
+        SET Left_At = GREATEST(Joined_At, %s)
+        WHERE Participant_ID = %s AND Left_At IS NULL
+    """, [left_at, participant_id])
+    return cursor.rowcount
+
+
+def close_participant_sessions(cursor, participant_ids, left_at):
+    """Batched close_participant_session for many participants in one statement"""
+    participant_ids = list(participant_ids)
+    if not participant_ids:
+        return 0
+    placeholders = ','.join(['%s'] * len(participant_ids))
+    cursor.execute(f"""
+        UPDATE tbl_ParticipantSessions
+        SET Left_At = GREATEST(Joined_At, %s)
+        WHERE Participant_ID IN ({placeholders}) AND Left_At IS NULL
+    """, [left_at] + participant_ids)
+    return cursor.rowcount
+
+
+def close_meeting_sessions(cursor, meeting_id, left_at, occurrence_number=None):
+    """Close every open session in a meeting (optionally one occurrence) at meeting end"""
+    sql = """
+        UPDATE tbl_ParticipantSessions
+        SET Left_At = GREATEST(Joined_At, %s)
+        WHERE Meeting_ID = %s AND Left_At IS NULL
+    """
+    params = [left_at, meeting_id]
+    if occurrence_number is not None:
+        sql += " AND occurrence_number = %s"
+        params.append(occurrence_number)
+    cursor.execute(sql, params)
+    return cursor.rowcount
+
+
+def get_participant_session_minutes(cursor, participant_id, now):
+    """
+    Total minutes across a participant's sessions; open sessions run until `now`.
+    Returns None when the participant has no session rows (not backfilled yet).
+    """
+    cursor.execute("""
+        SELECT COUNT(*),
+               COALESCE(SUM(GREATEST(0, TIMESTAMPDIFF(SECOND, Joined_At, COALESCE(Left_At, %s)))), 0)
+        FROM tbl_ParticipantSessions
+        WHERE Participant_ID = %s
+    """, [now, participant_id])
+    row = cursor.fetchone()
+    if not row or not row[0]:
+        return None
+    return round(float(row[1]) / 60.0, 2)
+
+
+def get_meeting_session_minutes(cursor, meeting_id, now):
+    """Total minutes per participant row in a meeting -> {participant_id: minutes}"""
+    cursor.execute("""
+        SELECT Participant_ID,
+               SUM(GREATEST(0, TIMESTAMPDIFF(SECOND, Joined_At, COALESCE(Left_At, %s))))
+        FROM tbl_ParticipantSessions
+        WHERE Meeting_ID = %s
+        GROUP BY Participant_ID
+    """, [now, meeting_id])
+    return {row[0]: round(float(row[1] or 0) / 60.0, 2) for row in cursor.fetchall()}
+
+
+def get_meeting_session_times(cursor, meeting_id, occurrence_number):
+    """
+    All session rows of one occurrence in a single query ->
+    {participant_id: (joined_at_list, left_at_list)}, ordered by join time.
+    Open sessions contribute a join without a leave, like the JSON arrays.
+    """
+    cursor.execute("""
+        SELECT Participant_ID, Joined_At, Left_At
+        FROM tbl_ParticipantSessions
+        WHERE Meeting_ID = %s AND occurrence_number = %s
+        ORDER BY Participant_ID, Joined_At
+    """, [meeting_id, occurrence_number])
+
+    session_times = {}
+    for participant_id, joined_at, left_at in cursor.fetchall():
+        joins, leaves = session_times.setdefault(participant_id, ([], []))
+        joins.append(joined_at)
+        if left_at is not None:
+            leaves.append(left_at)
+    return session_times
@@ -4,6 +4,14 @@ from django.db import connection, transaction
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from core.AI_Attendance.Attendance import start_attendance_tracking, stop_attendance_tracking
+from core.WebSocketConnection.participant_sessions import (
+    open_participant_session, close_participant_session,
+    close_meeting_sessions, get_participant_session_minutes, get_meeting_session_minutes,
+    get_meeting_session_times
+)
+from core.utils.interval_overlap import calculate_meeting_overlaps
+from core.WebSocketConnection.schedule_cache import cache_user_schedule
+from core.WebSocketConnection.user_meeting_history import refresh_user_meeting_history
 from django.views.decorators.csrf import csrf_exempt
 from django.urls import path
 from django.utils import timezone
@@ -218,104 +226,6 @@ def calculate_duration_from_arrays(join_times, leave_times):
         return 0.0
 
 
-def get_host_duration_for_meeting(meeting_id):
-    """Get HOST's duration (total meeting duration)"""
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    Total_Duration_Minutes,
-                    Join_Times,
-                    Leave_Times
-                FROM tbl_Participants
-                WHERE Meeting_ID = %s 
-                AND Role = 'host'
-                ORDER BY ID ASC
-                LIMIT 1
-            """, [meeting_id])
-            
-            host_data = cursor.fetchone()
-            
-            if not host_data:
-                return 0.0
-            
-            total_duration, join_times_json, leave_times_json = host_data
-            
-            if total_duration and total_duration > 0:
-                return float(total_duration)
-            
-            try:
-                if isinstance(join_times_json, str):
-                    join_times = json.loads(join_times_json)
-                else:
-                    join_times = join_times_json or []
-                
-                if isinstance(leave_times_json, str):
-                    leave_times = json.loads(leave_times_json)
-                else:
-                    leave_times = leave_times_json or []
-                
-                duration = calculate_duration_from_arrays(join_times, leave_times)
-                return duration
-                
-            except Exception as e:
-                logging.error(f"Error parsing host times: {e}")
-                return 0.0
-                
-    except Exception as e:
-        logging.error(f"Error getting host duration: {e}")
-        return 0.0
-
-
-def get_user_duration_for_meeting(meeting_id, user_id):
-    """Get specific USER's duration in meeting"""
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    Total_Duration_Minutes,
-                    Join_Times,
-                    Leave_Times
-                FROM tbl_Participants
-                WHERE Meeting_ID = %s 
-                AND User_ID = %s
-                ORDER BY ID DESC
-                LIMIT 1
-            """, [meeting_id, user_id])
-            
-            user_data = cursor.fetchone()
-            
-            if not user_data:
-                return 0.0
-            
-            total_duration, join_times_json, leave_times_json = user_data
-            
-            if total_duration and total_duration > 0:
-                return float(total_duration)
-            
-            try:
-                if isinstance(join_times_json, str):
-                    join_times = json.loads(join_times_json)
-                else:
-                    join_times = join_times_json or []
-                
-                if isinstance(leave_times_json, str):
-                    leave_times = json.loads(leave_times_json)
-                else:
-                    leave_times = leave_times_json or []
-                
-                duration = calculate_duration_from_arrays(join_times, leave_times)
-                return duration
-                
-            except Exception as e:
-                logging.error(f"Error parsing user times: {e}")
-                return 0.0
-                
-    except Exception as e:
-        logging.error(f"Error getting user duration: {e}")
-        return 0.0
-
-
 def format_duration_mmss(decimal_minutes):
     """Format decimal minutes to MM:SS"""
     if not decimal_minutes or decimal_minutes <= 0:
@@ -415,6 +325,8 @@ def create_participants_table():
                 KEY idx_part_overall (User_ID, Overall_Attendance),
                 KEY idx_user_part_attend (User_ID, Participant_Attendance),
                 KEY idx_user_overall (User_ID, Overall_Attendance),
+                KEY idx_part_date_meeting (session_start_time, Meeting_ID, ID),
+                KEY idx_part_user_date (User_ID, session_start_time, Meeting_ID, ID),
                 CONSTRAINT FK_Participants_Meeting FOREIGN KEY (Meeting_ID) REFERENCES tbl_Meetings (ID) ON DELETE CASCADE ON UPDATE CASCADE,
                 CONSTRAINT FK_Participants_User FOREIGN KEY (User_ID) REFERENCES tbl_Users (ID) ON DELETE CASCADE ON UPDATE CASCADE,
                 CONSTRAINT chk_meeting_type CHECK (Meeting_Type IN ('InstantMeeting', 'ScheduleMeeting', 'CalendarMeeting')),
@@ -810,6 +722,7 @@ def record_participant_join(request):
                     ])
                     
                     participant_id = cursor.lastrowid
+                    open_participant_session(cursor, participant_id, meeting_id, user_id, occurrence_number, join_time_str)
                     action = 'new_occurrence'
                     logging.info(f"✅ [JOIN] Created new occurrence #{occurrence_number} for user {user_id} (participant_id: {participant_id})")
                     
@@ -864,20 +777,24 @@ def record_participant_join(request):
                             'action': 'already_active'
                         }, status=200)
                     
-                    # Append new join time
+                    # Append new join time in place and open a new session row
                     join_times.append(join_time_str)
                     
                     cursor.execute("""
                         UPDATE tbl_Participants 
-                        SET Join_Times = %s,
+                        SET Join_Times = JSON_ARRAY_APPEND(Join_Times, '$', %s),
                             Is_Currently_Active = TRUE,
                             Full_Name = %s
                         WHERE ID = %s
-                    """, [json.dumps(join_times), actual_user_name, participant_id])
+                    """, [join_time_str, actual_user_name, participant_id])
+                    open_participant_session(cursor, participant_id, meeting_id, user_id, occurrence_number, join_time_str)
                     
                     action = 'rejoin'
                     logging.info(f"✅ [JOIN] User {user_id} rejoined occurrence #{occurrence_number} (session #{len(join_times)})")
                 
+                # ===== Refresh meeting history (a host join also changes the meeting's duration) =====
+                refresh_user_meeting_history(cursor, meeting_id, None if role == 'host' else [user_id])
+                
                 return JsonResponse({
                     'success': True,
                     'message': f'Participant join recorded - {action}',
@@ -1102,9 +1019,12 @@ def record_participant_leave(request):
                 
                 # Append EFFECTIVE leave time (either actual or capped at host's leave)
                 leave_times.append(effective_leave_time_str)
+                close_participant_session(cursor, participant_id, effective_leave_time_str)
                 
                 # ===== Calculate total duration from ALL sessions =====
-                total_duration_minutes = calculate_duration_from_arrays(join_times, leave_times)
+                total_duration_minutes = get_participant_session_minutes(cursor, participant_id, effective_leave_time_str)
+                if total_duration_minutes is None:
+                    total_duration_minutes = calculate_duration_from_arrays(join_times, leave_times)
                 
                 # ===== ENSURE NOT NULL - Fallback to 0 =====
                 if total_duration_minutes is None:
@@ -1118,12 +1038,12 @@ def record_participant_leave(request):
                 # Update participant record with their effective leave time
                 cursor.execute("""
                     UPDATE tbl_Participants
-                    SET Leave_Times = %s,
+                    SET Leave_Times = JSON_ARRAY_APPEND(Leave_Times, '$', %s),
                         Total_Duration_Minutes = %s,
                         Total_Sessions = %s,
                         Is_Currently_Active = FALSE
                     WHERE ID = %s
-                """, [json.dumps(leave_times), total_duration_minutes, completed_sessions, participant_id])
+                """, [effective_leave_time_str, total_duration_minutes, completed_sessions, participant_id])
 
                 if cursor.rowcount == 0:
                     return JsonResponse({
@@ -1154,6 +1074,9 @@ def record_participant_leave(request):
                         
                         all_participants = cursor.fetchall()
                         
+                        # Open sessions are measured up to the host's leave time (not stored)
+                        session_minutes = get_meeting_session_minutes(cursor, meeting_id, leave_time_str)
+                        
                         # ===== STEP 2: Calculate duration for each participant =====
                         participant_durations = {}
                         
@@ -1171,7 +1094,10 @@ def record_participant_leave(request):
                             # Case 1: Participant is INACTIVE (already left) - use actual leave_times from DB
                             # Case 2: Participant is ACTIVE (still in meeting) - use host's leave_time as TEMPORARY fallback
                             
-                            if p_is_active:
+                            if p_id in session_minutes:
+                                p_duration = session_minutes[p_id]
+                                p_sessions = len(p_join_times) if p_is_active else len(p_leave_times)
+                            elif p_is_active:
                                 # ACTIVE participant - use host's leave_time as temporary fallback (NOT stored in DB)
                                 temp_leave_times = p_leave_times.copy()
                                 if len(p_join_times) > len(temp_leave_times):
@@ -1415,6 +1341,12 @@ def record_participant_leave(request):
                         import traceback
                         logging.error(f"[LEAVE] Traceback: {traceback.format_exc()}")
                 
+                # ===== Refresh meeting history (everyone's durations changed if a host left) =====
+                refresh_user_meeting_history(
+                    cursor, meeting_id,
+                    None if current_role in ['host', 'co-host', 'cohost', 'co_host'] else [user_id]
+                )
+                
                 # Format duration for display
                 hours = int(total_duration_minutes // 60)
                 mins = int(total_duration_minutes % 60)
@@ -1666,19 +1598,24 @@ def Leave_Meeting(request, participant_id):
             
             # Append to leave times
             leave_times.append(leave_time_str)
+            close_participant_session(cursor, participant_id, leave_time_str)
             
             # Calculate total duration
-            total_duration = calculate_duration_from_arrays(join_times, leave_times)
+            total_duration = get_participant_session_minutes(cursor, participant_id, leave_time_str)
+            if total_duration is None:
+                total_duration = calculate_duration_from_arrays(join_times, leave_times)
             
             # Update participant
             cursor.execute("""
                 UPDATE tbl_Participants
-                SET Leave_Times = %s,
+                SET Leave_Times = JSON_ARRAY_APPEND(Leave_Times, '$', %s),
                     Is_Currently_Active = FALSE,
                     Total_Duration_Minutes = %s,
                     Total_Sessions = %s
                 WHERE ID = %s
-            """, [json.dumps(leave_times), total_duration, len(leave_times), participant_id])
+            """, [leave_time_str, total_duration, len(leave_times), participant_id])
+
+            refresh_user_meeting_history(cursor, meeting_id, [user_id])
 
             # Format duration
             hours = int(total_duration // 60)
@@ -1866,6 +1803,8 @@ def Get_User_Meeting_History(request):
     For PARTICIPANT:
       - duration: Meeting duration (host's time) 
       - participation_duration: Participant's own time
+
+    Served from tbl_UserMeetingHistory (one row per user and meeting).
     """
     try:
         user_id = request.GET.get('user_id', '').strip()
@@ -1876,155 +1815,46 @@ def Get_User_Meeting_History(request):
         
         logging.info(f"Getting meeting history for user_id: {user_id}")
         
-        meetings_dict = {}
-        
         with connection.cursor() as cursor:
-            # --- Meetings where user is host ---
-            try:
-                cursor.execute("""
-                    SELECT ID, Meeting_Name, Meeting_Type, Meeting_Link, Status, 
-                           Created_At, Started_At, Ended_At, Host_ID, 
-                           Is_Recording_Enabled, Waiting_Room_Enabled,
-                           livekit_room_name, LiveKit_Room_SID
-                    FROM tbl_Meetings 
-                    WHERE Host_ID = %s
-                    ORDER BY Created_At DESC
-                """, [user_id])
-                
-                for row in cursor.fetchall():
-                    meeting_id = str(row[0])
-                    meetings_dict[meeting_id] = {
-                        'id': meeting_id,
-                        'title': row[1] or "Untitled Meeting",
-                        'meeting_type': row[2] or "InstantMeeting",
-                        'meeting_link': row[3],
-                        'status': row[4] or "unknown",
-                        'created_at': row[5],
-                        'started_at': row[6],
-                        'ended_at': row[7],
-                        'host_id': row[8],
-                        'recording': bool(row[9]),
-                        'waiting_room': bool(row[10]),
-                        'livekit_room': row[11],
-                        'livekit_room_sid': row[12],
-                        'is_host': True,
-                        'user_participated': True,
-                        'user_role': 'host'
-                    }
-            except Exception as e:
-                logging.warning(f"Error getting host meetings: {e}")
-            
-            # --- Meetings where user participated ---
-            try:
-                cursor.execute("""
-                    SELECT DISTINCT p.Meeting_ID, m.Meeting_Name, m.Meeting_Type, 
-                           m.Meeting_Link, m.Status, m.Created_At, m.Started_At, 
-                           m.Ended_At, m.Host_ID, m.Is_Recording_Enabled, 
-                           m.Waiting_Room_Enabled, m.livekit_room_name, m.LiveKit_Room_SID
-                    FROM tbl_Participants p
-                    JOIN tbl_Meetings m ON p.Meeting_ID = m.ID
-                    WHERE p.User_ID = %s
-                    ORDER BY m.Created_At DESC
-                """, [user_id])
-                
-                for row in cursor.fetchall():
-                    meeting_id = str(row[0])
-                    if meeting_id not in meetings_dict:
-                        meetings_dict[meeting_id] = {
-                            'id': meeting_id,
-                            'title': row[1] or "Untitled Meeting",
-                            'meeting_type': row[2] or "InstantMeeting",
-                            'meeting_link': row[3],
-                            'status': row[4] or "unknown",
-                            'created_at': row[5],
-                            'started_at': row[6],
-                            'ended_at': row[7],
-                            'host_id': row[8],
-                            'recording': bool(row[9]),
-                            'waiting_room': bool(row[10]),
-                            'livekit_room': row[11],
-                            'livekit_room_sid': row[12],
-                            'is_host': False,
-                            'user_participated': True,
-                            'user_role': 'participant'
-                        }
-            except Exception as e:
-                logging.warning(f"Error getting participant meetings: {e}")
+            cursor.execute("""
+                SELECT Meeting_ID, Meeting_Name, Meeting_Type, Meeting_Link, Status,
+                       Created_At, Started_At, Ended_At, Is_Host, Participant_Role,
+                       Is_Recording_Enabled, Waiting_Room_Enabled,
+                       LiveKit_Room_Name, LiveKit_Room_SID, Host_Name,
+                       First_Join_At, Last_Leave_At,
+                       User_Duration_Minutes, Meeting_Duration_Minutes, Participant_Count
+                FROM tbl_UserMeetingHistory
+                WHERE User_ID = %s
+                AND LOWER(Status) IN ('ended', 'completed')
+                ORDER BY Created_At DESC
+            """, [user_id])
+            rows = cursor.fetchall()
         
         # --- Process meetings ---
         final_meetings = []
-        for meeting_id, meeting_data in meetings_dict.items():
+        today = datetime.now().date()
+        for row in rows:
+            meeting_id = str(row[0])
             try:
-                # Get host name
-                try:
-                    with connection.cursor() as cursor:
-                        cursor.execute("SELECT full_name FROM tbl_Users WHERE ID = %s", [meeting_data['host_id']])
-                        host_row = cursor.fetchone()
-                        meeting_data['host'] = host_row[0] if host_row else "Unknown Host"
-                except:
-                    meeting_data['host'] = "Unknown Host"
+                meeting_type = row[2] or "InstantMeeting"
+                created_at = row[5]
+                started_at = row[6]
+                
+                user_role = row[9] or ('host' if row[8] else 'participant')
+                is_host = (user_role == 'host')
                 
                 # ✅ Get BOTH durations
-                # 1. Meeting duration (from host)
-                meeting_duration_decimal = get_host_duration_for_meeting(meeting_id)
+                meeting_duration_decimal = float(row[18] or 0)
                 meeting_duration_display = format_duration_mmss(meeting_duration_decimal)
-                
-                # 2. User's participation duration
-                user_duration_decimal = get_user_duration_for_meeting(meeting_id, user_id)
+                user_duration_decimal = float(row[17] or 0)
                 user_duration_display = format_duration_mmss(user_duration_decimal)
                 
-                logging.info(f"Meeting {meeting_id}: Host time={meeting_duration_decimal}, User {user_id} time={user_duration_decimal}")
-                
-                # Get additional participation details
-                user_join_time = None
-                user_leave_time = None
-                participant_name = None
-                
-                try:
-                    with connection.cursor() as cursor:
-                        cursor.execute("""
-                            SELECT Join_Times, Leave_Times, Full_Name, Role
-                            FROM tbl_Participants 
-                            WHERE Meeting_ID = %s AND User_ID = %s
-                            ORDER BY ID DESC LIMIT 1
-                        """, [meeting_id, user_id])
-                        row = cursor.fetchone()
-                        if row:
-                            join_times = json.loads(row[0]) if isinstance(row[0], str) else row[0] or []
-                            leave_times = json.loads(row[1]) if isinstance(row[1], str) else row[1] or []
-                            participant_name = row[2]
-                            user_role = row[3]
-                            user_join_time = join_times[0] if join_times else None
-                            user_leave_time = leave_times[-1] if leave_times else None
-                            
-                            if user_role:
-                                meeting_data['user_role'] = user_role
-                                meeting_data['is_host'] = (user_role == 'host')
-                                
-                except Exception as e:
-                    logging.error(f"Error getting participation details: {e}")
-                
-                # Fallback if durations are 0
-                if meeting_duration_decimal == 0 and meeting_data['started_at'] and meeting_data['ended_at']:
-                    try:
-                        start_dt = meeting_data['started_at']
-                        end_dt = meeting_data['ended_at']
-                        if isinstance(start_dt, str):
-                            start_dt = datetime.fromisoformat(start_dt.replace('Z', '+00:00'))
-                        if isinstance(end_dt, str):
-                            end_dt = datetime.fromisoformat(end_dt.replace('Z', '+00:00'))
-                        meeting_duration_decimal = (end_dt - start_dt).total_seconds() / 60.0
-                        meeting_duration_display = format_duration_mmss(meeting_duration_decimal)
-                    except Exception as e:
-                        logging.error(f"Error calculating fallback duration: {e}")
+                user_join_time = row[15].strftime('%Y-%m-%d %H:%M:%S') if row[15] else None
+                user_leave_time = row[16].strftime('%Y-%m-%d %H:%M:%S') if row[16] else None
                 
                 # Time category
                 try:
-                    meeting_date = meeting_data['started_at'] or meeting_data['created_at']
-                    if isinstance(meeting_date, str):
-                        meeting_date = datetime.fromisoformat(meeting_date.replace('Z', '+00:00'))
-                    today = datetime.now().date()
-                    meeting_date_only = meeting_date.date()
+                    meeting_date_only = (started_at or created_at).date()
                     if meeting_date_only == today:
                         time_category = 'today'
                     elif meeting_date_only > today:
@@ -2035,7 +1865,7 @@ def Get_User_Meeting_History(request):
                     time_category = 'unknown'
                 
                 # Meeting type display
-                mt = meeting_data['meeting_type'].lower()
+                mt = meeting_type.lower()
                 if 'schedule' in mt:
                     type_display = 'schedule'
                 elif 'calendar' in mt:
@@ -2043,44 +1873,17 @@ def Get_User_Meeting_History(request):
                 else:
                     type_display = 'instant'
                 
-                # Status normalization
-                status_raw = (meeting_data['status'] or 'unknown').lower()
-                if status_raw in ['ended', 'completed']:
-                    frontend_status = 'ended'
-                elif time_category == 'upcoming':
-                    frontend_status = 'scheduled'
-                elif time_category == 'today' and status_raw == 'active':
-                    frontend_status = 'active'
-                else:
-                    frontend_status = status_raw
-                
-                # Only show ended meetings
-                if frontend_status != 'ended':
-                    continue
-                
-                # Get participant count
-                try:
-                    with connection.cursor() as cursor:
-                        cursor.execute("""
-                            SELECT COUNT(DISTINCT User_ID) 
-                            FROM tbl_Participants 
-                            WHERE Meeting_ID = %s
-                        """, [meeting_id])
-                        participant_count = cursor.fetchone()[0] or 1
-                except:
-                    participant_count = 1
-                
                 # ✅ Build meeting object with BOTH durations
                 meeting_obj = {
-                    "id": meeting_data['id'],
-                    "title": meeting_data['title'],
+                    "id": meeting_id,
+                    "title": row[1] or "Untitled Meeting",
                     "type": type_display,
-                    "status": frontend_status,
-                    "meeting_link": meeting_data['meeting_link'],
-                    "date": meeting_data['started_at'] or meeting_data['created_at'],
-                    "created_at": meeting_data['created_at'],
-                    "started_at": meeting_data['started_at'],
-                    "ended_at": meeting_data['ended_at'],
+                    "status": 'ended',
+                    "meeting_link": row[3],
+                    "date": started_at or created_at,
+                    "created_at": created_at,
+                    "started_at": started_at,
+                    "ended_at": row[7],
                     "time_category": time_category,
                     
                     # ✅ MEETING DURATION (host's time = total meeting length)
@@ -2094,27 +1897,27 @@ def Get_User_Meeting_History(request):
                     # ✅ MAIN DURATION FIELD (for backward compatibility)
                     # For HOST: Show their time (same as meeting duration)
                     # For PARTICIPANT: Can show either meeting or participation duration
-                    "duration": user_duration_display if meeting_data['is_host'] else meeting_duration_display,
-                    "duration_decimal_minutes": round(user_duration_decimal if meeting_data['is_host'] else meeting_duration_decimal, 2),
+                    "duration": user_duration_display if is_host else meeting_duration_display,
+                    "duration_decimal_minutes": round(user_duration_decimal if is_host else meeting_duration_decimal, 2),
                     
-                    "participants": participant_count,
-                    "host": meeting_data['host'],
+                    "participants": row[19] or 1,
+                    "host": row[14] or "Unknown Host",
                     "host_email": None,
-                    "is_host": meeting_data['is_host'],
-                    "user_role": meeting_data['user_role'],
-                    "user_participated": meeting_data['user_participated'],
+                    "is_host": is_host,
+                    "user_role": user_role,
+                    "user_participated": True,
                     "user_join_time": user_join_time,
                     "user_leave_time": user_leave_time,
-                    "recording": meeting_data['recording'],
-                    "waiting_room": meeting_data['waiting_room'],
+                    "recording": bool(row[10]),
+                    "waiting_room": bool(row[11]),
                     "starred": False,
-                    "livekit_room": meeting_data['livekit_room'],
-                    "livekit_room_sid": meeting_data['livekit_room_sid'],
-                    "livekit_enabled": bool(meeting_data['livekit_room']),
+                    "livekit_room": row[12],
+                    "livekit_room_sid": row[13],
+                    "livekit_enabled": bool(row[12]),
                     "description": None,
                     "location": None,
-                    "meeting_type": meeting_data['meeting_type'],
-                    "involvement_type": "host" if meeting_data['is_host'] else "participant"
+                    "meeting_type": meeting_type,
+                    "involvement_type": "host" if is_host else "participant"
                 }
                 
                 final_meetings.append(meeting_obj)
@@ -2125,12 +1928,6 @@ def Get_User_Meeting_History(request):
                 logging.error(traceback.format_exc())
                 continue
         
-        # Sort by created date
-        try:
-            final_meetings.sort(key=lambda x: x.get('created_at') or datetime.min, reverse=True)
-        except:
-            pass
-        
         # Summary stats
         total_meetings = len(final_meetings)
         hosted_meetings = sum(1 for m in final_meetings if m.get('is_host'))
@@ -2206,85 +2003,40 @@ def Get_User_Meetings_By_Date(request):
         logging.info(f"Getting meetings for user {user_id} from {start_date} to {end_date}")
         
         with connection.cursor() as cursor:
-            # CORRECTED: Query based on actual database schema
+            # Single range scan on tbl_UserMeetingHistory (User_ID, Meeting_Date)
             query = """
-            SELECT DISTINCT
-                m.ID,
-                m.Meeting_Name,
-                m.Meeting_Type,
-                m.Status,
-                m.Started_At,
-                m.Ended_At,
-                m.Host_ID,
-                m.Created_At,
-                m.Meeting_Link,
-                m.Is_Recording_Enabled,
-                m.Waiting_Room_Enabled,
-                m.livekit_room_name,
-                m.LiveKit_Room_SID,
-                
-                -- Host information
-                COALESCE(host_user.full_name, 'Unknown Host') as host_name,
-                host_user.email as host_email,
-                
-                -- Duration from appropriate table
-                CASE 
-                    WHEN m.Meeting_Type = 'ScheduleMeeting' THEN COALESCE(sm.duration_minutes, 60)
-                    WHEN m.Meeting_Type = 'CalendarMeeting' THEN COALESCE(cm.duration, 60)
-                    WHEN m.Started_At IS NOT NULL AND m.Ended_At IS NOT NULL THEN 
-                        TIMESTAMPDIFF(MINUTE, m.Started_At, m.Ended_At)
-                    ELSE 60
-                END as duration_minutes,
-                
-                -- User's participation info
-                p.Role as user_role,
-                p.Join_Time,
-                p.Leave_Time,
-                p.End_Meeting_Time,
-                p.Duration as user_participation_duration,
-                p.Full_Name as participant_name,
-                
-                -- Meeting details
-                CASE 
-                    WHEN m.Meeting_Type = 'ScheduleMeeting' THEN sm.description
-                    WHEN m.Meeting_Type = 'CalendarMeeting' THEN cm.location
-                    ELSE NULL
-                END as meeting_description,
-                
-                CASE 
-                    WHEN m.Meeting_Type = 'ScheduleMeeting' THEN sm.location
-                    WHEN m.Meeting_Type = 'CalendarMeeting' THEN cm.location
-                    ELSE NULL
-                END as meeting_location
-                
-            FROM tbl_Meetings m
-            
-            -- Join for host information
-            LEFT JOIN tbl_Users host_user ON m.Host_ID = host_user.ID
-            
-            -- Join for scheduled meeting details
-            LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
-            
-            -- Join for calendar meeting details
-            LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
-            
-            -- Join for user's participation details
-            LEFT JOIN tbl_Participants p ON m.ID = p.Meeting_ID AND p.User_ID = %s
-            
-            WHERE (
-                -- User is the host of the meeting
-                m.Host_ID = %s 
-                OR 
-                -- User actually participated in the meeting
-                p.User_ID IS NOT NULL
-            )
-            AND DATE(COALESCE(m.Started_At, m.Created_At)) BETWEEN %s AND %s
-            
-            ORDER BY COALESCE(m.Started_At, m.Created_At) ASC
+            SELECT
+                Meeting_ID,
+                Meeting_Name,
+                Meeting_Type,
+                Status,
+                Started_At,
+                Ended_At,
+                Host_ID,
+                Created_At,
+                Meeting_Link,
+                Is_Recording_Enabled,
+                Waiting_Room_Enabled,
+                LiveKit_Room_Name,
+                LiveKit_Room_SID,
+                COALESCE(Host_Name, 'Unknown Host') as host_name,
+                Host_Email,
+                Scheduled_Duration_Minutes,
+                Participant_Role,
+                First_Join_At,
+                Last_Leave_At,
+                End_Meeting_Time,
+                User_Duration_Minutes,
+                Participant_Name,
+                Description,
+                Location
+            FROM tbl_UserMeetingHistory
+            WHERE User_ID = %s
+            AND Meeting_Date BETWEEN %s AND %s
+            ORDER BY COALESCE(Started_At, Created_At) ASC
             """
             
-            # CORRECTED: 4 parameters to match the query
-            params = [user_id, user_id, start_date, end_date]
+            params = [user_id, start_date, end_date]
             
             try:
                 cursor.execute(query, params)
@@ -2318,10 +2070,10 @@ def Get_User_Meetings_By_Date(request):
                     user_join_time = row[17]
                     user_leave_time = row[18]
                     user_end_meeting_time = row[19]
-                    user_participation_duration = row[20]
-                    participant_name = row[23]
-                    meeting_description = row[24]
-                    meeting_location = row[25]
+                    user_participation_duration = float(row[20]) if row[20] is not None else None
+                    participant_name = row[21]
+                    meeting_description = row[22]
+                    meeting_location = row[23]
                     
                     is_host = str(host_id) == str(user_id)
                     user_participated = user_join_time is not None
@@ -2414,6 +2166,7 @@ def Get_User_Meetings_By_Date(request):
 
 @require_http_methods(["GET"])
 @csrf_exempt
+@cache_user_schedule('today')
 def Get_User_Today_Meetings(request):
     """
     Get user's meetings for today specifically
@@ -2431,67 +2184,40 @@ def Get_User_Today_Meetings(request):
         logging.info(f"Getting today's meetings for user {user_id} on {today}")
         
         with connection.cursor() as cursor:
-            # CORRECTED: Direct query for today's meetings
+            # Single range scan on tbl_UserMeetingHistory (User_ID, Meeting_Date)
             query = """
-            SELECT DISTINCT
-                m.ID,
-                m.Meeting_Name,
-                m.Meeting_Type,
-                m.Status,
-                m.Started_At,
-                m.Ended_At,
-                m.Host_ID,
-                m.Created_At,
-                m.Meeting_Link,
-                
-                -- Host information
-                COALESCE(host_user.full_name, 'Unknown Host') as host_name,
-                
-                -- Duration
-                CASE 
-                    WHEN m.Meeting_Type = 'ScheduleMeeting' THEN COALESCE(sm.duration_minutes, 60)
-                    WHEN m.Meeting_Type = 'CalendarMeeting' THEN COALESCE(cm.duration, 60)
-                    WHEN m.Started_At IS NOT NULL AND m.Ended_At IS NOT NULL THEN 
-                        TIMESTAMPDIFF(MINUTE, m.Started_At, m.Ended_At)
-                    ELSE 60
-                END as duration_minutes,
-                
-                -- User participation
-                p.Role as user_role,
-                p.Join_Time,
-                p.Leave_Time,
+            SELECT
+                Meeting_ID,
+                Meeting_Name,
+                Meeting_Type,
+                Status,
+                Started_At,
+                Ended_At,
+                Host_ID,
+                Created_At,
+                Meeting_Link,
+                COALESCE(Host_Name, 'Unknown Host') as host_name,
+                Scheduled_Duration_Minutes,
+                Participant_Role,
+                First_Join_At,
+                Last_Leave_At,
                 
                 -- Time category for today
                 CASE 
-                    WHEN m.Started_At IS NULL THEN 'scheduled'
-                    WHEN TIME(m.Started_At) <= CURTIME() AND (m.Ended_At IS NULL OR TIME(m.Ended_At) >= CURTIME()) THEN 'active'
-                    WHEN TIME(m.Started_At) > CURTIME() THEN 'upcoming'
+                    WHEN Started_At IS NULL THEN 'scheduled'
+                    WHEN TIME(Started_At) <= CURTIME() AND (Ended_At IS NULL OR TIME(Ended_At) >= CURTIME()) THEN 'active'
+                    WHEN TIME(Started_At) > CURTIME() THEN 'upcoming'
                     ELSE 'ended'
                 END as meeting_status_today
-                
-            FROM tbl_Meetings m
-            
-            -- Join for host information
-            LEFT JOIN tbl_Users host_user ON m.Host_ID = host_user.ID
-            
-            -- Join for meeting type details
-            LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
-            LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
-            
-            -- Join for user's participation
-            LEFT JOIN tbl_Participants p ON m.ID = p.Meeting_ID AND p.User_ID = %s
-            
-            WHERE (
-                m.Host_ID = %s OR p.User_ID IS NOT NULL
-            )
-            AND DATE(COALESCE(m.Started_At, m.Created_At)) = %s
-            
+            FROM tbl_UserMeetingHistory
+            WHERE User_ID = %s
+            AND Meeting_Date = %s
             ORDER BY 
-                COALESCE(m.Started_At, m.Created_At) ASC,
-                m.Created_At ASC
+                COALESCE(Started_At, Created_At) ASC,
+                Created_At ASC
             """
             
-            params = [user_id, user_id, today]
+            params = [user_id, today]
             
             try:
                 cursor.execute(query, params)
@@ -2518,7 +2244,7 @@ def Get_User_Today_Meetings(request):
                     user_role = row[11]
                     user_join_time = row[12]
                     user_leave_time = row[13]
-                    meeting_status_today = row[16]
+                    meeting_status_today = row[14]
                     
                     is_host = str(host_id) == str(user_id)
                     user_participated = user_join_time is not None
@@ -3275,9 +3001,12 @@ def Sync_LiveKit_Participants_Fixed(request, meeting_id):
                                         
                                         # Append current time to leave times
                                         leave_times.append(current_time_str)
+                                        close_participant_session(cursor, participant_info['id'], current_time_str)
                                         
                                         # Calculate total duration
-                                        total_duration = calculate_duration_from_arrays(join_times, leave_times)
+                                        total_duration = get_participant_session_minutes(cursor, participant_info['id'], current_time_str)
+                                        if total_duration is None:
+                                            total_duration = calculate_duration_from_arrays(join_times, leave_times)
                                         
                                         # Update participant
                                         cursor.execute("""
@@ -3385,9 +3114,13 @@ def Sync_LiveKit_Participants_Fixed(request, meeting_id):
                                     
                                     cursor.execute("""
                                         UPDATE tbl_Participants 
-                                        SET Join_Times = %s, Is_Currently_Active = TRUE
+                                        SET Join_Times = JSON_ARRAY_APPEND(Join_Times, '$', %s), Is_Currently_Active = TRUE
                                         WHERE ID = %s
-                                    """, [json.dumps(join_times), participant_id])
+                                    """, [current_time_str, participant_id])
+                                    open_participant_session(
+                                        cursor, participant_id, meeting_id, user_id,
+                                        inactive_db_users[user_id].get('occurrence_number', 1), current_time_str
+                                    )
                                     
                                     sync_results['rejoined'] += 1
                                     logging.info(f"[SYNC-FIXED] User {user_id} rejoined (session #{len(join_times)})")
@@ -3444,6 +3177,8 @@ def Sync_LiveKit_Participants_Fixed(request, meeting_id):
                                 occurrence_number                   # 13. occurrence_number ✅ NEW: From helper
                             ])
                             
+                            open_participant_session(cursor, cursor.lastrowid, meeting_id, user_id, occurrence_number, current_time_str)
+                            
                             sync_results['added'] += 1
                             logging.info(f"[SYNC-FIXED] Added new user {user_id} ({user_name}) - occurrence #{occurrence_number}")
 
@@ -3502,51 +3237,17 @@ def calculate_overlap_duration(host_join_times, host_leave_times, participant_jo
     - This 23 min is stored in Total_Duration_Minutes
     - Attendance = 23/25 × 100 = 92%
     
+    Single-participant wrapper around calculate_meeting_overlaps; use that
+    directly when computing a whole meeting.
+    
     Returns: overlap_duration_minutes (float)
     """
-    from datetime import datetime
-    
-    def parse_datetime(dt_str):
-        """Parse datetime string to datetime object"""
-        if isinstance(dt_str, datetime):
-            return dt_str
-        try:
-            return datetime.strptime(dt_str, '%Y-%m-%d %H:%M:%S')
-        except:
-            return None
-    
-    def get_time_ranges(join_times, leave_times):
-        """Convert join/leave arrays to list of (start, end) tuples"""
-        ranges = []
-        for i in range(min(len(join_times), len(leave_times))):
-            start = parse_datetime(join_times[i])
-            end = parse_datetime(leave_times[i])
-            if start and end and end > start:
-                ranges.append((start, end))
-        return ranges
-    
-    def calculate_overlap(range1_start, range1_end, range2_start, range2_end):
-        """Calculate overlap between two time ranges in minutes"""
-        overlap_start = max(range1_start, range2_start)
-        overlap_end = min(range1_end, range2_end)
-        
-        if overlap_end > overlap_start:
-            return (overlap_end - overlap_start).total_seconds() / 60.0
-        return 0.0
-    
-    # Get time ranges for host and participant
-    host_ranges = get_time_ranges(host_join_times, host_leave_times)
-    participant_ranges = get_time_ranges(participant_join_times, participant_leave_times)
-    
-    # Calculate total overlap
-    total_overlap_minutes = 0.0
-    
-    for host_start, host_end in host_ranges:
-        for part_start, part_end in participant_ranges:
-            overlap = calculate_overlap(host_start, host_end, part_start, part_end)
-            total_overlap_minutes += overlap
-    
-    return total_overlap_minutes
+    overlaps = calculate_meeting_overlaps(
+        host_join_times,
+        host_leave_times,
+        {'participant': (participant_join_times, participant_leave_times)}
+    )
+    return overlaps['participant']
 
 @require_http_methods(["POST"])
 @csrf_exempt
@@ -3764,6 +3465,13 @@ def end_meeting(request, meeting_id):
             logging.error(f"[end_meeting] Failed to mark meeting ended: {e}")
             return JsonResponse({"error": "Failed to update meeting status", "details": str(e)}, status=500)
 
+        # ===== Release the meeting's preloaded face embeddings =====
+        try:
+            from core.FaceAuth.unified_face_service import get_unified_face_service
+            get_unified_face_service().release_meeting_embeddings(meeting_id)
+        except Exception as e:
+            logging.warning(f"[end_meeting] Could not release face embeddings: {e}")
+
         # ===== Step 3: Get all participants and finalize leave times first =====
         try:
             with transaction.atomic():
@@ -3798,6 +3506,8 @@ def end_meeting(request, meeting_id):
                                     Is_Currently_Active = FALSE
                                 WHERE ID = %s
                             """, [json.dumps(leave_times), participant_id])
+
+                    close_meeting_sessions(cursor, meeting_id, end_time_str, occurrence_number)
                             
         except Exception as e:
             logging.error(f"[end_meeting] Finalize leave times error: {e}")
@@ -3806,12 +3516,13 @@ def end_meeting(request, meeting_id):
         # ===== Step 4: Get HOST join/leave times for overlap calculation =====
         host_join_times = []
         host_leave_times = []
+        host_participant_id = None
         host_duration = 0.0
         
         try:
             with connection.cursor() as cursor:
                 cursor.execute("""
-                    SELECT User_ID, Role, Join_Times, Leave_Times
+                    SELECT User_ID, Role, Join_Times, Leave_Times, ID
                     FROM tbl_Participants
                     WHERE Meeting_ID = %s AND LOWER(Role) = 'host' AND occurrence_number = %s
                 """, [meeting_id, occurrence_number])
@@ -3828,7 +3539,10 @@ def end_meeting(request, meeting_id):
                     host_join_times, host_leave_times = [], []
                 
                 # Calculate host's total duration
-                host_duration = calculate_duration_from_arrays(host_join_times, host_leave_times)
+                host_participant_id = host_row[4]
+                host_duration = get_participant_session_minutes(cursor, host_participant_id, end_time_str)
+                if host_duration is None:
+                    host_duration = calculate_duration_from_arrays(host_join_times, host_leave_times)
                 if host_duration is None:
                     host_duration = 0.0
                 
@@ -3856,40 +3570,40 @@ def end_meeting(request, meeting_id):
 
                     all_participants = cursor.fetchall()
 
+                    # Parse every participant's sessions once; session rows take
+                    # precedence over the JSON arrays when they exist
+                    session_times = get_meeting_session_times(cursor, meeting_id, occurrence_number)
+                    participant_times = {}
                     for row in all_participants:
-                        participant_id, user_id, full_name, role, meeting_type, join_times_json, leave_times_json = row
-
+                        participant_id, join_times_json, leave_times_json = row[0], row[5], row[6]
                         try:
                             join_times = json.loads(join_times_json) if isinstance(join_times_json, str) else join_times_json or []
                             leave_times = json.loads(leave_times_json) if isinstance(leave_times_json, str) else leave_times_json or []
                         except Exception:
                             join_times, leave_times = [], []
+                        participant_times[participant_id] = (join_times, leave_times)
+
+                    host_times = session_times.get(host_participant_id, (host_join_times, host_leave_times))
+                    overlap_minutes = calculate_meeting_overlaps(
+                        host_times[0],
+                        host_times[1],
+                        {p_id: session_times.get(p_id, times) for p_id, times in participant_times.items()},
+                        open_until=end_time_str
+                    )
 
-                        completed_sessions = len(leave_times)
+                    participant_updates = []
+                    for row in all_participants:
+                        participant_id, user_id, full_name, role, meeting_type = row[:5]
+                        completed_sessions = len(participant_times[participant_id][1])
                         
                         if role.lower() == "host":
                             total_duration_minutes = host_duration
                         else:
-                            total_duration_minutes = calculate_overlap_duration(
-                                host_join_times, 
-                                host_leave_times, 
-                                join_times, 
-                                leave_times
-                            )
+                            total_duration_minutes = overlap_minutes.get(participant_id, 0.0)
                             
                             logging.info(f"[end_meeting] User {user_id}: Overlap duration = {total_duration_minutes:.2f} min")
-                        
-                        if total_duration_minutes is None:
-                            total_duration_minutes = 0.0
 
-                        cursor.execute("""
-                            UPDATE tbl_Participants
-                            SET End_Meeting_Time = %s,
-                                Total_Duration_Minutes = %s,
-                                Total_Sessions = %s,
-                                Is_Currently_Active = FALSE
-                            WHERE ID = %s
-                        """, [
+                        participant_updates.append([
                             end_time,
                             total_duration_minutes,
                             completed_sessions,
@@ -3905,6 +3619,15 @@ def end_meeting(request, meeting_id):
                             "total_sessions": completed_sessions,
                             "total_duration_minutes": round(total_duration_minutes, 2),
                         })
+
+                    cursor.executemany("""
+                        UPDATE tbl_Participants
+                        SET End_Meeting_Time = %s,
+                            Total_Duration_Minutes = %s,
+                            Total_Sessions = %s,
+                            Is_Currently_Active = FALSE
+                        WHERE ID = %s
+                    """, participant_updates)
                         
         except Exception as e:
             logging.error(f"[end_meeting] Participant duration update error: {e}")
@@ -4061,6 +3784,17 @@ def end_meeting(request, meeting_id):
             attendance_calculation_results = []
             attendance_calculation_success = False
 
+        # ===== Refresh every user's meeting history row for this meeting =====
+        with connection.cursor() as cursor:
+            refresh_user_meeting_history(cursor, meeting_id)
+
+        # ===== Refresh the dashboard analytics rollups for this meeting =====
+        try:
+            from core.WebSocketConnection.analytics_rollups import schedule_meeting_rollup_refresh
+            schedule_meeting_rollup_refresh(meeting_id, immediate=True)
+        except Exception as e:
+            logging.warning(f"[end_meeting] Could not schedule analytics rollup refresh: {e}")
+
         # ===== Step 8: Meeting summary =====
         summary_average = round(total_participant_percentage / participant_count, 2) if participant_count > 0 else 0.0
         meeting_duration_display = "Unknown"
@@ -4923,7 +4657,10 @@ def remove_participant_from_meeting(request):
                 # Calculate total duration
                 total_duration = 0.0
                 try:
-                    total_duration = calculate_duration_from_arrays(join_times, leave_times)
+                    close_participant_session(cursor, participant_id, remove_time_str)
+                    total_duration = get_participant_session_minutes(cursor, participant_id, remove_time_str)
+                    if total_duration is None:
+                        total_duration = calculate_duration_from_arrays(join_times, leave_times)
                     logging.info(f"[REMOVE-PARTICIPANT] Calculated duration: {total_duration:.2f} minutes")
                 except Exception as e:
                     logging.error(f"[REMOVE-PARTICIPANT] Error calculating duration: {e}")
@@ -4948,6 +4685,8 @@ def remove_participant_from_meeting(request):
                     }, status=500)
                 
                 logging.info(f"✅ [REMOVE-PARTICIPANT] Updated participant record ({rows_affected} row(s))")
+                
+                refresh_user_meeting_history(cursor, meeting_id, [user_id_to_remove])
         
         except Exception as e:
             logging.error(f"[REMOVE-PARTICIPANT] Database update error: {e}")
@@ -12,6 +12,7 @@ from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.urls import path
 from django.db import connection
+from core.WebSocketConnection.meeting_events import publish_meeting_event
 
 # Configure logging
 logger = logging.getLogger('cache_reactions')
@@ -42,7 +43,8 @@ CACHE_SETTINGS = {
     'REACTION_DISPLAY_TTL': 5,          # Individual reactions disappear after 5 seconds
     'CLEANUP_IMMEDIATE': True,          # Delete immediately when meeting ends
     'MAX_USER_NAME_LENGTH': 100,        # Maximum user name length
-    'REACTION_BURST_LIMIT': 10,         # Max reactions per user per 10 seconds
+    'REACTION_BURST_LIMIT': 10,         # Max reactions per user per burst window
+    'REACTION_BURST_WINDOW': 10,        # Burst window in seconds
     'AUTO_START_ON_FIRST_REACTION': True # Auto-start reactions if not initialized
 }
 
@@ -57,29 +59,78 @@ ALLOWED_REACTIONS = {
     '🤔': 'thinking'
 }
 
+# Reverse lookup: reaction type -> emoji
+REACTION_EMOJIS = {reaction_type: emoji for emoji, reaction_type in ALLOWED_REACTIONS.items()}
+
+# Stores one reaction atomically: enforces the per-user burst limit, adds the
+# reaction to the expiry-scored ZSET, prunes expired/overflow entries and bumps
+# the per-type and total counters. Returns 1 when stored, 0 when burst limited.
+# KEYS: [reactions, user_reactions, counts, status]
+# ARGV: [now, expires_at, reaction_json, reaction_type, burst_window, burst_limit, max_reactions, created_at]
+ADD_REACTION_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[5])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now - window)
+if redis.call('ZCARD', KEYS[2]) >= tonumber(ARGV[6]) then
+    return 0
+end
+redis.call('ZADD', KEYS[2], now, ARGV[3])
+redis.call('EXPIRE', KEYS[2], math.ceil(window))
+
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+local overflow = redis.call('ZCARD', KEYS[1]) - tonumber(ARGV[7])
+if overflow > 0 then
+    redis.call('ZREMRANGEBYRANK', KEYS[1], 0, overflow - 1)
+end
+
+redis.call('HINCRBY', KEYS[3], ARGV[4], 1)
+redis.call('HINCRBY', KEYS[4], 'total_reactions', 1)
+redis.call('HSET', KEYS[4], 'last_reaction_at', ARGV[8])
+return 1
+"""
+
+# Initializes a meeting's status and counters atomically. Every field is set with
+# HSETNX, so a repeated start, or one racing with ADD_REACTION_SCRIPT, never resets
+# a live counter. Returns 1 when this call initialized the meeting.
+# KEYS: [status, counts]
+# ARGV: [meeting_id, started_at, reaction_type...]
+START_REACTIONS_SCRIPT = """
+local started = redis.call('HSETNX', KEYS[1], 'meeting_id', ARGV[1])
+redis.call('HSETNX', KEYS[1], 'started_at', ARGV[2])
+redis.call('HSETNX', KEYS[1], 'status', 'active')
+redis.call('HSETNX', KEYS[1], 'total_reactions', 0)
+for i = 3, #ARGV do
+    redis.call('HSETNX', KEYS[2], ARGV[i], 0)
+end
+return started
+"""
+
 class CacheOnlyReactionsManager:
     """Manages reactions ONLY in cache - NO database storage"""
     
     def __init__(self):
         self.redis_client = cache_reactions_redis
         self.enabled = cache_reactions_redis is not None
+        self._add_reaction_script = cache_reactions_redis.register_script(ADD_REACTION_SCRIPT) if self.enabled else None
+        self._start_reactions_script = cache_reactions_redis.register_script(START_REACTIONS_SCRIPT) if self.enabled else None
         logger.info(f"😊 Cache-only reactions manager initialized: {'Enabled' if self.enabled else 'Disabled'}")
     
     def _get_reactions_key(self, meeting_id):
-        """Generate Redis key for active reactions"""
-        return f"cache_reactions:{meeting_id}"
+        """Generate Redis key for active reactions (ZSET scored by expiry time)"""
+        return f"cache_reactions_active:{meeting_id}"
     
     def _get_reaction_counts_key(self, meeting_id):
         """Generate Redis key for reaction counts by type"""
         return f"cache_reaction_counts:{meeting_id}"
     
-    def _get_user_reactions_key(self, meeting_id):
-        """Generate Redis key for user reaction history (for burst limiting)"""
-        return f"cache_user_reactions:{meeting_id}"
+    def _get_user_reactions_key(self, meeting_id, user_id):
+        """Generate Redis key for a user's recent reactions (for burst limiting)"""
+        return f"cache_user_reactions:{meeting_id}:{user_id}"
     
     def _get_meeting_status_key(self, meeting_id):
-        """Generate Redis key for meeting status"""
-        return f"cache_reaction_meeting:{meeting_id}"
+        """Generate Redis key for meeting status (hash)"""
+        return f"cache_reaction_status:{meeting_id}"
     
     def start_meeting_reactions(self, meeting_id):
         """Initialize reactions system for a meeting"""
@@ -90,27 +141,15 @@ class CacheOnlyReactionsManager:
         try:
             status_key = self._get_meeting_status_key(meeting_id)
             
-            # Check if already initialized
-            if self.redis_client.exists(status_key):
+            # One script with HSETNX per field: concurrent auto-starts are idempotent
+            started = self._start_reactions_script(
+                keys=[status_key, self._get_reaction_counts_key(meeting_id)],
+                args=[meeting_id, timezone.now().isoformat(), *ALLOWED_REACTIONS.values()]
+            )
+            if not started:
                 logger.info(f"😊 Reactions already initialized for meeting: {meeting_id}")
                 return True
             
-            meeting_data = {
-                'meeting_id': meeting_id,
-                'started_at': timezone.now().isoformat(),
-                'status': 'active',
-                'total_reactions': 0,
-                'reactions_by_type': {reaction_type: 0 for reaction_type in ALLOWED_REACTIONS.values()}
-            }
-            
-            # Set meeting as active (no expiration until meeting ends)
-            self.redis_client.set(status_key, json.dumps(meeting_data))
-            
-            # Initialize reaction counts
-            counts_key = self._get_reaction_counts_key(meeting_id)
-            for emoji, reaction_type in ALLOWED_REACTIONS.items():
-                self.redis_client.hset(counts_key, reaction_type, 0)
-            
             logger.info(f"😊 Started cache-only reactions for meeting: {meeting_id}")
             return True
             
@@ -118,6 +157,32 @@ class CacheOnlyReactionsManager:
             logger.error(f"❌ Failed to start meeting reactions: {e}")
             return False
     
+    def store_reaction(self, meeting_id, reaction_data):
+        """
+        Store a prepared reaction in one scripted round trip.
+        Returns True when stored and False when the user hit the burst limit;
+        Redis errors propagate to the caller.
+        """
+        stored = self._add_reaction_script(
+            keys=[
+                self._get_reactions_key(meeting_id),
+                self._get_user_reactions_key(meeting_id, reaction_data['user_id']),
+                self._get_reaction_counts_key(meeting_id),
+                self._get_meeting_status_key(meeting_id),
+            ],
+            args=[
+                reaction_data['timestamp'],
+                reaction_data['expires_at'],
+                json.dumps(reaction_data),
+                reaction_data['reaction_type'],
+                CACHE_SETTINGS['REACTION_BURST_WINDOW'],
+                CACHE_SETTINGS['REACTION_BURST_LIMIT'],
+                CACHE_SETTINGS['MAX_REACTIONS_PER_ROOM'],
+                reaction_data['created_at'],
+            ]
+        )
+        return bool(stored)
+    
     def add_reaction(self, meeting_id, user_id, user_name, emoji, participant_identity=None):
         """Add reaction (cache only) - Auto-start if not initialized"""
         if not self.enabled:
@@ -140,31 +205,7 @@ class CacheOnlyReactionsManager:
                     logger.warning(f"Meeting {meeting_id} not active, cannot add reaction")
                     return False
             
-            reactions_key = self._get_reactions_key(meeting_id)
-            counts_key = self._get_reaction_counts_key(meeting_id)
-            user_reactions_key = self._get_user_reactions_key(meeting_id)
-            status_key = self._get_meeting_status_key(meeting_id)
-            
-            # Check burst limit for user
             current_time = time.time()
-            recent_reactions = self.redis_client.lrange(user_reactions_key, 0, -1)
-            
-            # Count recent reactions from this user
-            recent_count = 0
-            for reaction_data_str in recent_reactions:
-                try:
-                    reaction_data = json.loads(reaction_data_str)
-                    if (reaction_data.get('user_id') == str(user_id) and 
-                        current_time - reaction_data.get('timestamp', 0) < 10):  # 10 seconds
-                        recent_count += 1
-                except json.JSONDecodeError:
-                    continue
-            
-            if recent_count >= CACHE_SETTINGS['REACTION_BURST_LIMIT']:
-                logger.warning(f"User {user_id} hit reaction burst limit")
-                return False
-            
-            # Prepare reaction data
             reaction_data = {
                 'id': f"reaction_{user_id}_{int(current_time * 1000)}",
                 'user_id': str(user_id),
@@ -177,28 +218,9 @@ class CacheOnlyReactionsManager:
                 'expires_at': current_time + CACHE_SETTINGS['REACTION_DISPLAY_TTL']
             }
             
-            # Add to active reactions list
-            self.redis_client.lpush(reactions_key, json.dumps(reaction_data))
-            
-            # Limit list size to prevent memory overflow
-            self.redis_client.ltrim(reactions_key, 0, CACHE_SETTINGS['MAX_REACTIONS_PER_ROOM'] - 1)
-            
-            # Add to user reactions for burst limiting
-            self.redis_client.lpush(user_reactions_key, json.dumps(reaction_data))
-            self.redis_client.ltrim(user_reactions_key, 0, 100)  # Keep recent history
-            
-            # Increment reaction count by type
-            reaction_type = ALLOWED_REACTIONS[emoji]
-            self.redis_client.hincrby(counts_key, reaction_type, 1)
-            
-            # Update meeting statistics
-            meeting_status = self.redis_client.get(status_key)
-            if meeting_status:
-                status_data = json.loads(meeting_status)
-                status_data['total_reactions'] = status_data.get('total_reactions', 0) + 1
-                status_data['reactions_by_type'][reaction_type] = status_data['reactions_by_type'].get(reaction_type, 0) + 1
-                status_data['last_reaction_at'] = timezone.now().isoformat()
-                self.redis_client.set(status_key, json.dumps(status_data))
+            if not self.store_reaction(meeting_id, reaction_data):
+                logger.warning(f"User {user_id} hit reaction burst limit")
+                return False
             
             logger.info(f"😊 User {user_id} ({user_name}) added reaction {emoji} in meeting {meeting_id}")
             return True
@@ -232,51 +254,33 @@ class CacheOnlyReactionsManager:
                     logger.warning(f"Could not verify meeting in database: {e}")
                     return []
             
-            # Get all reactions
-            raw_reactions = self.redis_client.lrange(reactions_key, 0, -1)
-            
-            active_reactions = []
+            # Only unexpired reactions, newest expiry first; expired ones are
+            # pruned by the write script
             current_time = time.time()
-            expired_reactions = []
+            raw_reactions = self.redis_client.zrevrangebyscore(reactions_key, '+inf', f"({current_time}")
             
+            active_reactions = []
             for raw_reaction in raw_reactions:
                 try:
                     reaction_data = json.loads(raw_reaction)
-                    
-                    # Check if reaction has expired
-                    if current_time > reaction_data.get('expires_at', 0):
-                        expired_reactions.append(raw_reaction)
-                        continue
-                    
-                    # Add to active list
-                    active_reactions.append({
-                        'id': reaction_data['id'],
-                        'user_id': reaction_data['user_id'],
-                        'user': {
-                            'user_id': reaction_data['user_id'],
-                            'full_name': reaction_data['user_name'],
-                            'profile_picture': None
-                        },
-                        'emoji': reaction_data['emoji'],
-                        'reaction_type': reaction_data['reaction_type'],
-                        'timestamp': reaction_data['created_at'],
-                        'participant_identity': reaction_data.get('participant_identity'),
-                        'expires_at': reaction_data['expires_at'],
-                        'time_remaining': max(0, reaction_data['expires_at'] - current_time)
-                    })
-                    
                 except json.JSONDecodeError:
-                    expired_reactions.append(raw_reaction)
                     continue
-            
-            # Clean up expired reactions
-            if expired_reactions:
-                for expired in expired_reactions:
-                    self.redis_client.lrem(reactions_key, 0, expired)
-                logger.info(f"🧹 Cleaned up {len(expired_reactions)} expired reactions")
-            
-            # Sort by timestamp (newest first)
-            active_reactions.sort(key=lambda x: x['timestamp'], reverse=True)
+                
+                active_reactions.append({
+                    'id': reaction_data['id'],
+                    'user_id': reaction_data['user_id'],
+                    'user': {
+                        'user_id': reaction_data['user_id'],
+                        'full_name': reaction_data['user_name'],
+                        'profile_picture': None
+                    },
+                    'emoji': reaction_data['emoji'],
+                    'reaction_type': reaction_data['reaction_type'],
+                    'timestamp': reaction_data['created_at'],
+                    'participant_identity': reaction_data.get('participant_identity'),
+                    'expires_at': reaction_data['expires_at'],
+                    'time_remaining': max(0, reaction_data['expires_at'] - current_time)
+                })
             
             return active_reactions
             
@@ -296,13 +300,7 @@ class CacheOnlyReactionsManager:
             # Convert to proper format with emojis
             reaction_counts = {}
             for reaction_type, count in raw_counts.items():
-                # Find emoji for this reaction type
-                emoji = None
-                for e, rt in ALLOWED_REACTIONS.items():
-                    if rt == reaction_type:
-                        emoji = e
-                        break
-                
+                emoji = REACTION_EMOJIS.get(reaction_type)
                 if emoji:
                     reaction_counts[emoji] = {
                         'emoji': emoji,
@@ -323,13 +321,8 @@ class CacheOnlyReactionsManager:
         
         try:
             status_key = self._get_meeting_status_key(meeting_id)
-            status_data = self.redis_client.get(status_key)
-            
-            if status_data:
-                data = json.loads(status_data)
-                return data.get('total_reactions', 0)
-            
-            return 0
+            total = self.redis_client.hget(status_key, 'total_reactions')
+            return int(total) if total else 0
             
         except Exception as e:
             logger.error(f"❌ Failed to get reactions count: {e}")
@@ -343,11 +336,11 @@ class CacheOnlyReactionsManager:
         try:
             reactions_key = self._get_reactions_key(meeting_id)
             
-            # Get count before clearing
-            reactions_count = self.redis_client.llen(reactions_key)
-            
-            # Clear all reactions
-            self.redis_client.delete(reactions_key)
+            # Count and clear in one round trip
+            pipe = self.redis_client.pipeline()
+            pipe.zcard(reactions_key)
+            pipe.delete(reactions_key)
+            reactions_count = pipe.execute()[0]
             
             logger.info(f"🧹 Host {host_user_id} cleared {reactions_count} reactions in meeting {meeting_id}")
             return reactions_count
@@ -364,17 +357,16 @@ class CacheOnlyReactionsManager:
         try:
             reactions_key = self._get_reactions_key(meeting_id)
             counts_key = self._get_reaction_counts_key(meeting_id)
-            user_reactions_key = self._get_user_reactions_key(meeting_id)
             status_key = self._get_meeting_status_key(meeting_id)
             
             # Get final stats before deletion
             final_stats = self.get_meeting_stats(meeting_id)
             
             # DELETE ALL reaction data for this meeting
+            # (per-user burst keys expire on their own after the burst window)
             deleted_keys = self.redis_client.delete(
                 reactions_key,
                 counts_key,
-                user_reactions_key,
                 status_key
             )
             
@@ -407,19 +399,31 @@ class CacheOnlyReactionsManager:
         
         try:
             status_key = self._get_meeting_status_key(meeting_id)
-            status_data = self.redis_client.get(status_key)
             
-            if status_data:
-                data = json.loads(status_data)
-                current_active_count = len(self.get_active_reactions(meeting_id))
-                reaction_counts = self.get_reaction_counts(meeting_id)
+            pipe = self.redis_client.pipeline()
+            pipe.hgetall(status_key)
+            pipe.zcount(self._get_reactions_key(meeting_id), f"({time.time()}", '+inf')
+            pipe.hgetall(self._get_reaction_counts_key(meeting_id))
+            data, current_active_count, raw_counts = pipe.execute()
+            
+            if data:
+                reactions_by_type = {reaction_type: int(count) for reaction_type, count in raw_counts.items()}
+                reaction_counts = {
+                    REACTION_EMOJIS[reaction_type]: {
+                        'emoji': REACTION_EMOJIS[reaction_type],
+                        'reaction_type': reaction_type,
+                        'count': count
+                    }
+                    for reaction_type, count in reactions_by_type.items()
+                    if reaction_type in REACTION_EMOJIS
+                }
                 
                 return {
                     'meeting_id': meeting_id,
                     'started_at': data.get('started_at'),
-                    'total_reactions': data.get('total_reactions', 0),
+                    'total_reactions': int(data.get('total_reactions', 0)),
                     'current_active_reactions': current_active_count,
-                    'reactions_by_type': data.get('reactions_by_type', {}),
+                    'reactions_by_type': reactions_by_type,
                     'reaction_counts': reaction_counts,
                     'last_reaction_at': data.get('last_reaction_at'),
                     'status': data.get('status', 'unknown'),
@@ -531,35 +535,7 @@ def add_reaction(request):
                     'detail': 'Please start meeting reactions first'
                 }, status=400)
         
-        # Step 6: Check burst limit (prevent spam)
-        try:
-            user_reactions_key = cache_reactions_manager._get_user_reactions_key(meeting_id)
-            recent_reactions = cache_reactions_manager.redis_client.lrange(user_reactions_key, 0, -1)
-            
-            # Count recent reactions from this user in last 10 seconds
-            recent_count = 0
-            burst_window = 10  # seconds
-            for reaction_data_str in recent_reactions:
-                try:
-                    reaction_data = json.loads(reaction_data_str)
-                    if (reaction_data.get('user_id') == user_id and 
-                        reaction_timestamp - reaction_data.get('timestamp', 0) < burst_window):
-                        recent_count += 1
-                except (json.JSONDecodeError, KeyError):
-                    continue
-            
-            if recent_count >= CACHE_SETTINGS['REACTION_BURST_LIMIT']:
-                logger.warning(f"⚠️ User {user_id} hit reaction burst limit")
-                return JsonResponse({
-                    'error': 'Reaction rate limit exceeded',
-                    'detail': f'Maximum {CACHE_SETTINGS["REACTION_BURST_LIMIT"]} reactions per {burst_window} seconds',
-                    'retry_after': burst_window
-                }, status=429)
-        except Exception as burst_check_error:
-            # Don't fail the request if burst check fails
-            logger.warning(f"⚠️ Burst check failed (non-critical): {burst_check_error}")
-        
-        # Step 7: INSTANT - Prepare LiveKit broadcast data (BEFORE storage)
+        # Step 6: INSTANT - Prepare LiveKit broadcast data (BEFORE storage)
         livekit_data = {
             'type': 'reaction_notification',  # CRITICAL: Must match frontend listener
             'action': 'add',
@@ -576,12 +552,11 @@ def add_reaction(request):
             'expires_at': reaction_timestamp + CACHE_SETTINGS['REACTION_DISPLAY_TTL']
         }
         
-        # Step 8: Store in Redis (non-blocking - after response prepared)
+        # Step 7: Burst check + storage in a single atomic Lua call
         redis_storage_success = False
         storage_warning = None
         
         try:
-            # Prepare complete reaction data for storage
             reaction_data = {
                 'id': reaction_id,
                 'user_id': user_id,
@@ -591,49 +566,18 @@ def add_reaction(request):
                 'reaction_type': reaction_type,
                 'timestamp': reaction_timestamp,
                 'timestamp_ms': reaction_timestamp_ms,
-                'created_at': timezone.now().isoformat(),
+                'created_at': livekit_data['created_at'],
                 'expires_at': reaction_timestamp + CACHE_SETTINGS['REACTION_DISPLAY_TTL'],
                 'meeting_id': meeting_id
             }
             
-            # Get Redis keys
-            reactions_key = cache_reactions_manager._get_reactions_key(meeting_id)
-            counts_key = cache_reactions_manager._get_reaction_counts_key(meeting_id)
-            user_reactions_key = cache_reactions_manager._get_user_reactions_key(meeting_id)
-            status_key = cache_reactions_manager._get_meeting_status_key(meeting_id)
-            
-            # Add to active reactions list
-            cache_reactions_manager.redis_client.lpush(reactions_key, json.dumps(reaction_data))
-            
-            # Limit list size to prevent memory overflow
-            cache_reactions_manager.redis_client.ltrim(
-                reactions_key, 
-                0, 
-                CACHE_SETTINGS['MAX_REACTIONS_PER_ROOM'] - 1
-            )
-            
-            # Add to user reactions for burst limiting
-            cache_reactions_manager.redis_client.lpush(user_reactions_key, json.dumps(reaction_data))
-            cache_reactions_manager.redis_client.ltrim(user_reactions_key, 0, 100)  # Keep recent history
-            
-            # Increment reaction count by type
-            cache_reactions_manager.redis_client.hincrby(counts_key, reaction_type, 1)
-            
-            # Update meeting statistics
-            meeting_status = cache_reactions_manager.redis_client.get(status_key)
-            if meeting_status:
-                try:
-                    status_data = json.loads(meeting_status)
-                    status_data['total_reactions'] = status_data.get('total_reactions', 0) + 1
-                    status_data['reactions_by_type'] = status_data.get('reactions_by_type', {})
-                    status_data['reactions_by_type'][reaction_type] = \
-                        status_data['reactions_by_type'].get(reaction_type, 0) + 1
-                    status_data['last_reaction_at'] = timezone.now().isoformat()
-                    status_data['last_reaction_user'] = user_name
-                    status_data['last_reaction_emoji'] = emoji
-                    cache_reactions_manager.redis_client.set(status_key, json.dumps(status_data))
-                except (json.JSONDecodeError, KeyError) as status_error:
-                    logger.warning(f"⚠️ Failed to update meeting status: {status_error}")
+            if not cache_reactions_manager.store_reaction(meeting_id, reaction_data):
+                logger.warning(f"⚠️ User {user_id} hit reaction burst limit")
+                return JsonResponse({
+                    'error': 'Reaction rate limit exceeded',
+                    'detail': f'Maximum {CACHE_SETTINGS["REACTION_BURST_LIMIT"]} reactions per {CACHE_SETTINGS["REACTION_BURST_WINDOW"]} seconds',
+                    'retry_after': CACHE_SETTINGS['REACTION_BURST_WINDOW']
+                }, status=429)
             
             redis_storage_success = True
             logger.info(f"✅ User {user_id} ({user_name}) added reaction {emoji} in meeting {meeting_id}")
@@ -648,6 +592,9 @@ def add_reaction(request):
             logger.error(f"❌ Unexpected storage error: {storage_error}")
             storage_warning = 'Reaction sent but storage encountered an error'
         
+        # Step 8: Push to meeting sockets (pollers pick it up from Redis otherwise)
+        publish_meeting_event(meeting_id, 'reaction', livekit_data)
+        
         # Step 9: INSTANT - Return response immediately for zero-latency
         response_data = {
             'success': True,
@@ -720,6 +667,7 @@ def clear_all_reactions(request):
             'timestamp': timezone.now().isoformat(),
             'meeting_id': data['meeting_id']
         }
+        publish_meeting_event(data['meeting_id'], 'clear_all_reactions', livekit_data)
         
         return JsonResponse({
             'success': True,
@@ -0,0 +1,140 @@
+# schedule_cache.py - Per-user Redis cache for dashboard meeting lists
+# Responses are cached under keys that embed per-user/per-email version counters.
+# Writers bump the counters instead of hunting down keys; stale entries simply age out.
+import os
+import json
+import hashlib
+import logging
+from functools import wraps
+import redis
+from redis import ConnectionPool
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from core.utils.date_utils import get_current_ist_date
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_CACHE_CONFIG = {
+    'ENABLED': os.getenv("SCHEDULE_CACHE_ENABLED", "True") == "True",
+    # Lists embed real-time status ('scheduled'/'inprogress'/'ended'), so keep entries short-lived
+    'TTL': int(os.getenv("SCHEDULE_CACHE_TTL", 60)),
+    'VERSION_TTL': int(os.getenv("SCHEDULE_CACHE_VERSION_TTL", 7 * 24 * 3600)),
+}
+
+REDIS_POOL = ConnectionPool(
+    host=os.getenv("SCHEDULE_CACHE_HOST", os.getenv("REDIS_HOST", "localhost")),
+    port=int(os.getenv("SCHEDULE_CACHE_PORT", 6379)),
+    db=int(os.getenv("SCHEDULE_CACHE_DB", 4)),
+    decode_responses=True,
+    socket_timeout=2,
+    socket_connect_timeout=2,
+    max_connections=50
+)
+
+GLOBAL_VERSION_KEY = 'schedule_cache_version:global'
+
+
+def get_redis_client():
+    return redis.Redis(connection_pool=REDIS_POOL)
+
+
+def _user_version_key(user_id):
+    return f"schedule_cache_version:user:{user_id}"
+
+
+def _email_version_key(email):
+    return f"schedule_cache_version:email:{email.strip().lower()}"
+
+
+def _bump_versions(keys):
+    if not keys:
+        return
+    try:
+        pipe = get_redis_client().pipeline(transaction=False)
+        for key in keys:
+            pipe.incr(key)
+            pipe.expire(key, SCHEDULE_CACHE_CONFIG['VERSION_TTL'])
+        pipe.execute()
+        logger.debug(f"🧹 Schedule cache invalidated for {len(keys)} version keys")
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Schedule cache invalidation failed: {e}")
+
+
+def invalidate_user_schedules(user_ids=(), emails=(), everyone=False):
+    """
+    Bump cache versions once the current transaction commits, so a concurrent
+    reader cannot re-cache the pre-commit state under the new version.
+    """
+    keys = {_user_version_key(user_id) for user_id in user_ids if user_id}
+    keys.update(_email_version_key(email) for email in emails if email)
+    if everyone:
+        keys.add(GLOBAL_VERSION_KEY)
+    if keys:
+        transaction.on_commit(lambda: _bump_versions(sorted(keys)))
+
+
+def _cached_response(request, body, etag):
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def cache_user_schedule(endpoint):
+    """
+    Cache a GET view's JSON per user_id/user_email (plus query params and IST date).
+    Serves ETag/If-None-Match revalidation with 304 responses.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not SCHEDULE_CACHE_CONFIG['ENABLED'] or request.method != 'GET':
+                return view(request, *args, **kwargs)
+
+            user_id = request.GET.get('user_id', '').strip()
+            user_email = request.GET.get('user_email', '').strip().lower()
+            if not user_id and not user_email:
+                return view(request, *args, **kwargs)
+
+            try:
+                client = get_redis_client()
+                version_keys = [GLOBAL_VERSION_KEY]
+                if user_id:
+                    version_keys.append(_user_version_key(user_id))
+                if user_email:
+                    version_keys.append(_email_version_key(user_email))
+                version_tag = '.'.join(v or '0' for v in client.mget(version_keys))
+
+                params = sorted(request.GET.items())
+                params_digest = hashlib.md5(
+                    json.dumps([params, str(get_current_ist_date()), list(args), sorted(kwargs.items())]).encode()
+                ).hexdigest()
+                cache_key = f"schedule_cache:{endpoint}:{user_id}:{user_email}:{version_tag}:{params_digest}"
+
+                cached = client.hgetall(cache_key)
+                if cached and 'body' in cached and 'etag' in cached:
+                    return _cached_response(request, cached['body'], cached['etag'])
+            except redis.RedisError as e:
+                logger.warning(f"⚠️ Schedule cache unavailable, serving from database: {e}")
+                return view(request, *args, **kwargs)
+
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200 or getattr(response, 'streaming', False):
+                return response
+
+            body = response.content.decode('utf-8')
+            etag = f'"{hashlib.md5(response.content).hexdigest()}"'
+            try:
+                pipe = client.pipeline(transaction=False)
+                pipe.hset(cache_key, mapping={'body': body, 'etag': etag})
+                pipe.expire(cache_key, SCHEDULE_CACHE_CONFIG['TTL'])
+                pipe.execute()
+            except redis.RedisError as e:
+                logger.warning(f"⚠️ Failed to store schedule cache entry {cache_key}: {e}")
+
+            return _cached_response(request, body, etag)
+        return wrapper
+    return decorator
@@ -0,0 +1,319 @@
+# user_meeting_history.py - Per-user meeting history index
+# One row per (user, meeting) for the host and everyone who joined, with the meeting,
+# host and the user's own participation denormalized and Meeting_Date as the leading
+# range column. History, date-range and today lists are a single range scan on
+# (User_ID, Meeting_Date) instead of host + participant queries merged in Python.
+# Rows are recomputed from tbl_Meetings / tbl_Participants / tbl_ParticipantSessions by
+# every writer of those tables (create, update, join, leave, end, recurring rollover);
+# reconcile_user_meeting_history() repairs rows a failed refresh left behind.
+from django.db import connection, models, transaction
+import os
+import logging
+from datetime import timedelta
+from core.utils.date_utils import get_current_ist_datetime
+
+USER_MEETING_HISTORY_CONFIG = {
+    # Meetings created, started or ended within this window are re-checked by the reconcile
+    'RECONCILE_HOURS': int(os.getenv("USER_MEETING_HISTORY_RECONCILE_HOURS", 48)),
+    'RECONCILE_BATCH_SIZE': int(os.getenv("USER_MEETING_HISTORY_RECONCILE_BATCH_SIZE", 200)),
+}
+
+
+class UserMeetingHistory(models.Model):
+    id = models.AutoField(primary_key=True, db_column='ID')
+    user_id = models.IntegerField(db_column='User_ID')
+    meeting_id = models.CharField(max_length=20, db_column='Meeting_ID')
+    meeting_date = models.DateField(db_column='Meeting_Date')
+    is_host = models.BooleanField(default=False, db_column='Is_Host')
+    participant_role = models.CharField(max_length=50, blank=True, null=True, db_column='Participant_Role')
+    participant_name = models.CharField(max_length=100, blank=True, null=True, db_column='Participant_Name')
+    meeting_name = models.CharField(max_length=200, blank=True, null=True, db_column='Meeting_Name')
+    meeting_type = models.CharField(max_length=50, blank=True, null=True, db_column='Meeting_Type')
+    meeting_link = models.CharField(max_length=500, blank=True, null=True, db_column='Meeting_Link')
+    status = models.CharField(max_length=50, blank=True, null=True, db_column='Status')
+    host_id = models.IntegerField(blank=True, null=True, db_column='Host_ID')
+    host_name = models.CharField(max_length=255, blank=True, null=True, db_column='Host_Name')
+    host_email = models.CharField(max_length=255, blank=True, null=True, db_column='Host_Email')
+    created_at = models.DateTimeField(blank=True, null=True, db_column='Created_At')
+    started_at = models.DateTimeField(blank=True, null=True, db_column='Started_At')
+    ended_at = models.DateTimeField(blank=True, null=True, db_column='Ended_At')
+    is_recording_enabled = models.BooleanField(default=False, db_column='Is_Recording_Enabled')
+    waiting_room_enabled = models.BooleanField(default=False, db_column='Waiting_Room_Enabled')
+    livekit_room_name = models.CharField(max_length=100, blank=True, null=True, db_column='LiveKit_Room_Name')
+    livekit_room_sid = models.CharField(max_length=100, blank=True, null=True, db_column='LiveKit_Room_SID')
+    scheduled_duration_minutes = models.IntegerField(blank=True, null=True, db_column='Scheduled_Duration_Minutes')
+    description = models.CharField(max_length=1000, blank=True, null=True, db_column='Description')
+    location = models.CharField(max_length=255, blank=True, null=True, db_column='Location')
+    first_join_at = models.DateTimeField(blank=True, null=True, db_column='First_Join_At')
+    last_leave_at = models.DateTimeField(blank=True, null=True, db_column='Last_Leave_At')
+    end_meeting_time = models.DateTimeField(blank=True, null=True, db_column='End_Meeting_Time')
+    user_duration_minutes = models.DecimalField(max_digits=10, decimal_places=2, default=0.00, db_column='User_Duration_Minutes')
+    meeting_duration_minutes = models.DecimalField(max_digits=10, decimal_places=2, default=0.00, db_column='Meeting_Duration_Minutes')
+    participant_count = models.IntegerField(default=0, db_column='Participant_Count')
+    updated_at = models.DateTimeField(db_column='Updated_At')
+
+    class Meta:
+        db_table = 'tbl_UserMeetingHistory'
+        unique_together = ('user_id', 'meeting_id')
+        indexes = [
+            models.Index(fields=['user_id', 'meeting_date'], name='idx_umh_user_date'),
+            models.Index(fields=['meeting_id'], name='idx_umh_meeting'),
+        ]
+
+
+def create_user_meeting_history_table():
+    """Create tbl_UserMeetingHistory table if it doesn't exist - MYSQL VERSION"""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tbl_UserMeetingHistory (
+                ID INT AUTO_INCREMENT PRIMARY KEY,
+                User_ID INT NOT NULL,
+                Meeting_ID VARCHAR(20) NOT NULL,
+                Meeting_Date DATE NOT NULL,
+                Is_Host TINYINT(1) NOT NULL DEFAULT 0,
+                Participant_Role VARCHAR(50) DEFAULT NULL,
+                Participant_Name VARCHAR(100) DEFAULT NULL,
+                Meeting_Name VARCHAR(200) DEFAULT NULL,
+                Meeting_Type VARCHAR(50) DEFAULT NULL,
+                Meeting_Link VARCHAR(500) DEFAULT NULL,
+                Status VARCHAR(50) DEFAULT NULL,
+                Host_ID INT DEFAULT NULL,
+                Host_Name VARCHAR(255) DEFAULT NULL,
+                Host_Email VARCHAR(255) DEFAULT NULL,
+                Created_At DATETIME DEFAULT NULL,
+                Started_At DATETIME DEFAULT NULL,
+                Ended_At DATETIME DEFAULT NULL,
+                Is_Recording_Enabled TINYINT(1) NOT NULL DEFAULT 0,
+                Waiting_Room_Enabled TINYINT(1) NOT NULL DEFAULT 0,
+                LiveKit_Room_Name VARCHAR(100) DEFAULT NULL,
+                LiveKit_Room_SID VARCHAR(100) DEFAULT NULL,
+                Scheduled_Duration_Minutes INT DEFAULT NULL,
+                Description VARCHAR(1000) DEFAULT NULL,
+                Location VARCHAR(255) DEFAULT NULL,
+                First_Join_At DATETIME DEFAULT NULL,
+                Last_Leave_At DATETIME DEFAULT NULL,
+                End_Meeting_Time DATETIME DEFAULT NULL,
+                User_Duration_Minutes DECIMAL(10,2) NOT NULL DEFAULT 0.00,
+                Meeting_Duration_Minutes DECIMAL(10,2) NOT NULL DEFAULT 0.00,
+                Participant_Count INT NOT NULL DEFAULT 0,
+                Updated_At DATETIME NOT NULL,
+                UNIQUE KEY tbl_UserMeetingHistory_user_id_meeting_id_uniq (User_ID, Meeting_ID),
+                KEY idx_umh_user_date (User_ID, Meeting_Date),
+                KEY idx_umh_meeting (Meeting_ID)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+            """)
+    except Exception as e:
+        logging.error(f"Failed to create tbl_UserMeetingHistory table: {e}")
+
+
+# The host and every user with a participant row, one history row each. A user's
+# participation comes from their latest participant row (latest occurrence), the
+# meeting duration from the host's first participant row; each is the row's
+# Total_Duration_Minutes, else tbl_ParticipantSessions with open sessions running
+# until `now`.
+# Params: now, meeting_id x5, then the optional user filter.
+_USER_MEETING_HISTORY_SQL = """
+INSERT INTO tbl_UserMeetingHistory
+    (User_ID, Meeting_ID, Meeting_Date, Is_Host, Participant_Role, Participant_Name,
+     Meeting_Name, Meeting_Type, Meeting_Link, Status, Host_ID, Host_Name, Host_Email,
+     Created_At, Started_At, Ended_At, Is_Recording_Enabled, Waiting_Room_Enabled,
+     LiveKit_Room_Name, LiveKit_Room_SID, Scheduled_Duration_Minutes, Description, Location,
+     First_Join_At, Last_Leave_At, End_Meeting_Time, User_Duration_Minutes, Meeting_Duration_Minutes,
+     Participant_Count, Updated_At)
+SELECT u.User_ID,
+       m.ID,
+       DATE(COALESCE(m.Started_At, m.Created_At)),
+       COALESCE(m.Host_ID = u.User_ID, 0),
+       pl.Role,
+       pl.Full_Name,
+       m.Meeting_Name,
+       m.Meeting_Type,
+       m.Meeting_Link,
+       m.Status,
+       m.Host_ID,
+       hu.full_name,
+       hu.email,
+       m.Created_At,
+       m.Started_At,
+       m.Ended_At,
+       COALESCE(m.Is_Recording_Enabled, 0),
+       COALESCE(m.Waiting_Room_Enabled, 0),
+       m.LiveKit_Room_Name,
+       m.LiveKit_Room_SID,
+       CASE
+           WHEN m.Meeting_Type = 'ScheduleMeeting' THEN COALESCE(sm.duration_minutes, 60)
+           WHEN m.Meeting_Type = 'CalendarMeeting' THEN COALESCE(cm.duration, 60)
+           WHEN m.Started_At IS NOT NULL AND m.Ended_At IS NOT NULL THEN
+               TIMESTAMPDIFF(MINUTE, m.Started_At, m.Ended_At)
+           ELSE 60
+       END,
+       CASE
+           WHEN m.Meeting_Type = 'ScheduleMeeting' THEN sm.description
+           WHEN m.Meeting_Type = 'CalendarMeeting' THEN cm.location
+           ELSE NULL
+       END,
+       CASE
+           WHEN m.Meeting_Type = 'ScheduleMeeting' THEN sm.location
+           WHEN m.Meeting_Type = 'CalendarMeeting' THEN cm.location
+           ELSE NULL
+       END,
+       us.first_join_at,
+       us.last_leave_at,
+       pl.End_Meeting_Time,
+       COALESCE(NULLIF(pl.Total_Duration_Minutes, 0), us.minutes, 0),
+       COALESCE(
+           NULLIF(hp.Total_Duration_Minutes, 0),
+           NULLIF(hs.minutes, 0),
+           TIMESTAMPDIFF(SECOND, m.Started_At, m.Ended_At) / 60,
+           0
+       ),
+       pc.participant_count,
+       %s
+FROM (
+    SELECT Host_ID AS User_ID FROM tbl_Meetings WHERE ID = %s AND Host_ID IS NOT NULL
+    UNION
+    SELECT User_ID FROM tbl_Participants WHERE Meeting_ID = %s
+) u
+JOIN tbl_Meetings m ON m.ID = %s
+LEFT JOIN tbl_Users hu ON hu.ID = m.Host_ID
+LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
+LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
+LEFT JOIN (
+    SELECT User_ID, MAX(ID) AS participant_id
+    FROM tbl_Participants
+    WHERE Meeting_ID = %s
+    GROUP BY User_ID
+) pk ON pk.User_ID = u.User_ID
+LEFT JOIN tbl_Participants pl ON pl.ID = pk.participant_id
+LEFT JOIN (
+    SELECT Participant_ID,
+           MIN(Joined_At) AS first_join_at,
+           MAX(Left_At) AS last_leave_at,
+           ROUND(SUM(GREATEST(0, TIMESTAMPDIFF(SECOND, Joined_At, COALESCE(Left_At, %s)))) / 60, 2) AS minutes
+    FROM tbl_ParticipantSessions
+    WHERE Meeting_ID = %s
+    GROUP BY Participant_ID
+) us ON us.Participant_ID = pl.ID
+LEFT JOIN tbl_Participants hp ON hp.ID = (
+    SELECT MIN(ID) FROM tbl_Participants WHERE Meeting_ID = m.ID AND Role = 'host'
+)
+LEFT JOIN (
+    SELECT Participant_ID,
+           ROUND(SUM(GREATEST(0, TIMESTAMPDIFF(SECOND, Joined_At, COALESCE(Left_At, %s)))) / 60, 2) AS minutes
+    FROM tbl_ParticipantSessions
+    WHERE Meeting_ID = %s
+    GROUP BY Participant_ID
+) hs ON hs.Participant_ID = hp.ID
+CROSS JOIN (
+    SELECT COUNT(DISTINCT User_ID) AS participant_count FROM tbl_Participants WHERE Meeting_ID = %s
+) pc
+{user_filter}
+ON DUPLICATE KEY UPDATE
+    Meeting_Date = VALUES(Meeting_Date),
+    Is_Host = VALUES(Is_Host),
+    Participant_Role = VALUES(Participant_Role),
+    Participant_Name = VALUES(Participant_Name),
+    Meeting_Name = VALUES(Meeting_Name),
+    Meeting_Type = VALUES(Meeting_Type),
+    Meeting_Link = VALUES(Meeting_Link),
+    Status = VALUES(Status),
+    Host_ID = VALUES(Host_ID),
+    Host_Name = VALUES(Host_Name),
+    Host_Email = VALUES(Host_Email),
+    Created_At = VALUES(Created_At),
+    Started_At = VALUES(Started_At),
+    Ended_At = VALUES(Ended_At),
+    Is_Recording_Enabled = VALUES(Is_Recording_Enabled),
+    Waiting_Room_Enabled = VALUES(Waiting_Room_Enabled),
+    LiveKit_Room_Name = VALUES(LiveKit_Room_Name),
+    LiveKit_Room_SID = VALUES(LiveKit_Room_SID),
+    Scheduled_Duration_Minutes = VALUES(Scheduled_Duration_Minutes),
+    Description = VALUES(Description),
+    Location = VALUES(Location),
+    First_Join_At = VALUES(First_Join_At),
+    Last_Leave_At = VALUES(Last_Leave_At),
+    End_Meeting_Time = VALUES(End_Meeting_Time),
+    User_Duration_Minutes = VALUES(User_Duration_Minutes),
+    Meeting_Duration_Minutes = VALUES(Meeting_Duration_Minutes),
+    Participant_Count = VALUES(Participant_Count),
+    Updated_At = VALUES(Updated_At)
+"""
+
+
+def _now_for_db():
+    return get_current_ist_datetime().replace(tzinfo=None).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def refresh_user_meeting_history(cursor, meeting_id, user_ids=None):
+    """
+    Recompute the history rows of a meeting (only user_ids' rows if given); a full
+    refresh also drops rows of users no longer host or participant.
+    Never raises: a failed refresh is logged and repaired by the next refresh of the
+    meeting or by reconcile_user_meeting_history().
+    """
+    now = _now_for_db()
+    params = [now, meeting_id, meeting_id, meeting_id, meeting_id, now, meeting_id, now, meeting_id, meeting_id]
+    user_filter = ""
+    try:
+        if user_ids:
+            user_ids = [int(user_id) for user_id in user_ids]
+            user_filter = f"WHERE u.User_ID IN ({','.join(['%s'] * len(user_ids))})"
+            params.extend(user_ids)
+
+        # Savepoint, so a failure here cannot break the caller's transaction
+        with transaction.atomic():
+            cursor.execute(_USER_MEETING_HISTORY_SQL.format(user_filter=user_filter), params)
+            refreshed = cursor.rowcount
+            if not user_ids:
+                # The host may have changed
+                cursor.execute("""
+                    DELETE h FROM tbl_UserMeetingHistory h
+                    WHERE h.Meeting_ID = %s
+                      AND NOT EXISTS (SELECT 1 FROM tbl_Meetings m WHERE m.ID = h.Meeting_ID AND m.Host_ID = h.User_ID)
+                      AND NOT EXISTS (SELECT 1 FROM tbl_Participants p WHERE p.Meeting_ID = h.Meeting_ID AND p.User_ID = h.User_ID)
+                """, [meeting_id])
+        return refreshed
+    except Exception as e:
+        logging.error(f"❌ [HISTORY] Refresh failed for meeting {meeting_id} (users {user_ids or 'all'}): {e}")
+        return 0
+
+
+
+def delete_user_meeting_history(cursor, meeting_id):
+    cursor.execute("DELETE FROM tbl_UserMeetingHistory WHERE Meeting_ID = %s", [meeting_id])
+
+
+def reconcile_user_meeting_history(hours=None, batch_size=None):
+    """
+    Refresh meetings created, started or ended recently (and every active one) whose
+    host history row is missing or disagrees with tbl_Meetings.
+    """
+    hours = hours or USER_MEETING_HISTORY_CONFIG['RECONCILE_HOURS']
+    batch_size = batch_size or USER_MEETING_HISTORY_CONFIG['RECONCILE_BATCH_SIZE']
+    since = get_current_ist_datetime().replace(tzinfo=None) - timedelta(hours=hours)
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT m.ID FROM tbl_Meetings m
+            LEFT JOIN tbl_UserMeetingHistory h ON h.Meeting_ID = m.ID AND h.User_ID = m.Host_ID
+            WHERE m.Host_ID IS NOT NULL
+              AND (m.Created_At >= %s OR m.Started_At >= %s OR m.Ended_At >= %s OR m.Status = 'active')
+              AND (h.ID IS NULL
+                   OR NOT (h.Status <=> m.Status
+                           AND h.Meeting_Name <=> m.Meeting_Name
+                           AND h.Started_At <=> m.Started_At
+                           AND h.Ended_At <=> m.Ended_At
+                           AND h.LiveKit_Room_SID <=> m.LiveKit_Room_SID))
+            LIMIT %s
+        """, [since, since, since, batch_size])
+        meeting_ids = [row[0] for row in cursor.fetchall()]
+
+        refreshed = 0
+        for meeting_id in meeting_ids:
+            if refresh_user_meeting_history(cursor, meeting_id):
+                refreshed += 1
+
+    if meeting_ids:
+        logging.info(f"📚 [HISTORY] Reconciled {refreshed}/{len(meeting_ids)} meetings")
+    return {'checked': len(meeting_ids), 'refreshed': refreshed}
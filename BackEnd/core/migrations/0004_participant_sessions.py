@@ -0,0 +1,65 @@
+from django.db import migrations, models
+
+
+# Expand each tbl_Participants row's parallel Join_Times/Leave_Times arrays into
+# one session row per join. A join without a matching leave stays open only if
+# the participant is still active; otherwise it is closed at its join time.
+BACKFILL_SESSIONS_SQL = """
+INSERT INTO tbl_ParticipantSessions
+    (Participant_ID, Meeting_ID, User_ID, occurrence_number, Joined_At, Left_At)
+SELECT p.ID,
+       p.Meeting_ID,
+       p.User_ID,
+       p.occurrence_number,
+       STR_TO_DATE(j.join_time, '%Y-%m-%d %H:%i:%s'),
+       COALESCE(
+           GREATEST(
+               STR_TO_DATE(JSON_UNQUOTE(JSON_EXTRACT(p.Leave_Times, CONCAT('$[', j.idx - 1, ']'))), '%Y-%m-%d %H:%i:%s'),
+               STR_TO_DATE(j.join_time, '%Y-%m-%d %H:%i:%s')
+           ),
+           CASE WHEN p.Is_Currently_Active = 1 THEN NULL
+                ELSE STR_TO_DATE(j.join_time, '%Y-%m-%d %H:%i:%s') END
+       )
+FROM tbl_Participants p
+JOIN JSON_TABLE(
+    p.Join_Times, '$[*]' COLUMNS (
+        idx FOR ORDINALITY,
+        join_time VARCHAR(32) PATH '$'
+    )
+) j
+WHERE STR_TO_DATE(j.join_time, '%Y-%m-%d %H:%i:%s') IS NOT NULL
+  AND NOT EXISTS (
+      SELECT 1 FROM tbl_ParticipantSessions s WHERE s.Participant_ID = p.ID
+  )
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_attendancesession_break_count_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParticipantSessions',
+            fields=[
+                ('id', models.AutoField(db_column='ID', primary_key=True, serialize=False)),
+                ('participant_id', models.IntegerField(db_column='Participant_ID')),
+                ('meeting_id', models.CharField(db_column='Meeting_ID', max_length=20)),
+                ('user_id', models.IntegerField(db_column='User_ID')),
+                ('occurrence_number', models.IntegerField(db_column='occurrence_number', default=1)),
+                ('joined_at', models.DateTimeField(db_column='Joined_At')),
+                ('left_at', models.DateTimeField(blank=True, db_column='Left_At', null=True)),
+            ],
+            options={
+                'db_table': 'tbl_ParticipantSessions',
+                'indexes': [
+                    models.Index(fields=['meeting_id', 'occurrence_number', 'user_id'], name='idx_sess_meeting_occ_user'),
+                    models.Index(fields=['participant_id', 'left_at'], name='idx_sess_participant_open'),
+                    models.Index(fields=['user_id', 'joined_at'], name='idx_sess_user_joined'),
+                ],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SESSIONS_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,88 @@
+from django.db import migrations, models
+
+
+def _guest_backfill_sql(meeting_type, table, id_column, email_list_expr, start_column, end_column):
+    """
+    Split a comma separated email list into one normalized guest row per address.
+    JSON_ARRAY escapes quotes/backslashes in the list; its escapes never contain a comma,
+    so turning each ',' into '","' splits the single string element into one per address.
+    """
+    return f"""
+INSERT INTO tbl_MeetingInvitees
+    (Meeting_ID, Meeting_Type, Role, Email, User_ID, Next_Start_Time, Next_End_Time)
+SELECT guests.Meeting_ID, '{meeting_type}', 'guest', guests.Email, u.ID,
+       guests.Next_Start_Time, guests.Next_End_Time
+FROM (
+    SELECT DISTINCT src.{id_column} AS Meeting_ID,
+           LOWER(TRIM(raw.email)) AS Email,
+           src.{start_column} AS Next_Start_Time,
+           src.{end_column} AS Next_End_Time
+    FROM {table} src
+    JOIN JSON_TABLE(
+        REPLACE(JSON_ARRAY({email_list_expr}), ',', '","'),
+        '$[*]' COLUMNS (email VARCHAR(255) PATH '$')
+    ) raw
+    WHERE {email_list_expr} IS NOT NULL
+      AND INSTR(raw.email, '@') > 0
+) guests
+LEFT JOIN tbl_Users u ON u.email = guests.Email
+"""
+
+
+BACKFILL_INVITEES_SQL = [
+    """
+INSERT INTO tbl_MeetingInvitees
+    (Meeting_ID, Meeting_Type, Role, Email, User_ID, Next_Start_Time, Next_End_Time)
+SELECT sm.id, 'ScheduleMeeting', 'host', NULL, sm.host_id, sm.start_time, sm.end_time
+FROM tbl_ScheduledMeetings sm
+WHERE sm.host_id IS NOT NULL
+""",
+    """
+INSERT INTO tbl_MeetingInvitees
+    (Meeting_ID, Meeting_Type, Role, Email, User_ID, Next_Start_Time, Next_End_Time)
+SELECT cm.ID, 'CalendarMeeting', 'host', NULL, cm.Host_ID, cm.startTime, cm.endTime
+FROM tbl_CalendarMeetings cm
+WHERE cm.Host_ID IS NOT NULL
+""",
+    _guest_backfill_sql(
+        'ScheduleMeeting', 'tbl_ScheduledMeetings', 'id',
+        'src.email', 'start_time', 'end_time'
+    ),
+    _guest_backfill_sql(
+        'CalendarMeeting', 'tbl_CalendarMeetings', 'ID',
+        "CONCAT_WS(',', src.guestEmails, REPLACE(src.attendees, ';', ','), src.email)",
+        'startTime', 'endTime'
+    ),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_participant_sessions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeetingInvitees',
+            fields=[
+                ('id', models.AutoField(db_column='ID', primary_key=True, serialize=False)),
+                ('meeting_id', models.CharField(db_column='Meeting_ID', max_length=20)),
+                ('meeting_type', models.CharField(db_column='Meeting_Type', max_length=50)),
+                ('role', models.CharField(choices=[('host', 'Host'), ('guest', 'Guest')], db_column='Role', default='guest', max_length=10)),
+                ('email', models.CharField(blank=True, db_column='Email', max_length=255, null=True)),
+                ('user_id', models.IntegerField(blank=True, db_column='User_ID', null=True)),
+                ('next_start_time', models.DateTimeField(blank=True, db_column='Next_Start_Time', null=True)),
+                ('next_end_time', models.DateTimeField(blank=True, db_column='Next_End_Time', null=True)),
+            ],
+            options={
+                'db_table': 'tbl_MeetingInvitees',
+                'indexes': [
+                    models.Index(fields=['meeting_id'], name='idx_inv_meeting'),
+                    models.Index(fields=['email', 'meeting_type', 'next_end_time'], name='idx_inv_email_next'),
+                    models.Index(fields=['user_id', 'meeting_type', 'next_end_time'], name='idx_inv_user_next'),
+                ],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_INVITEES_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,232 @@
+from django.db import migrations, models
+
+
+# One rollup row per meeting occurrence. Participant figures count Role='participant'
+# rows only; start/end come from tbl_ParticipantSessions (host's first join if any).
+BACKFILL_MEETING_ROLLUPS_SQL = """
+INSERT INTO tbl_MeetingRollups
+    (Meeting_ID, occurrence_number, Host_ID, Meeting_Type, Meeting_Name, Status, Meeting_Date,
+     Created_At, Started_At, Ended_At, Participant_Count, Active_Participant_Count,
+     Duration_Sum, Duration_Samples, Duration_Max, Duration_Min, Attendance_Sum, Attendance_Samples,
+     Overall_Sum, Overall_Samples, Sessions_Sum, Monitored_Count, Popup_Sum, Detection_Sum,
+     Penalty_Sum, Engagement_Sum, Focus_Sum, Break_Time_Sum, Breaks_Used, Identity_Warnings,
+     Removals, Updated_At)
+SELECT p.Meeting_ID,
+       p.occurrence_number,
+       MAX(m.Host_ID),
+       COALESCE(MAX(m.Meeting_Type), MAX(p.Meeting_Type), ''),
+       MAX(CASE
+           WHEN m.Meeting_Type = 'ScheduleMeeting' THEN COALESCE(sm.title, m.Meeting_Name)
+           WHEN m.Meeting_Type = 'CalendarMeeting' THEN COALESCE(cm.title, m.Meeting_Name)
+           ELSE m.Meeting_Name
+       END),
+       MAX(m.Status),
+       COALESCE(MIN(CASE WHEN p.Role = 'host' THEN p.session_start_time END), MIN(p.session_start_time)),
+       MAX(m.Created_At),
+       COALESCE(MAX(s.host_started_at), MAX(s.first_joined_at)),
+       COALESCE(MAX(CASE WHEN p.Role = 'host' THEN p.End_Meeting_Time END), MAX(s.last_left_at)),
+       COUNT(DISTINCT CASE WHEN p.Role = 'participant' THEN p.User_ID END),
+       COUNT(DISTINCT CASE WHEN p.Role = 'participant' AND p.Is_Currently_Active = 1 THEN p.User_ID END),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN p.Total_Duration_Minutes END), 0),
+       COUNT(CASE WHEN p.Role = 'participant' THEN p.Total_Duration_Minutes END),
+       MAX(CASE WHEN p.Role = 'participant' THEN p.Total_Duration_Minutes END),
+       MIN(CASE WHEN p.Role = 'participant' THEN p.Total_Duration_Minutes END),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN p.Participant_Attendance END), 0),
+       COUNT(CASE WHEN p.Role = 'participant' THEN p.Participant_Attendance END),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN p.Overall_Attendance END), 0),
+       COUNT(CASE WHEN p.Role = 'participant' THEN p.Overall_Attendance END),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN p.Total_Sessions END), 0),
+       COUNT(CASE WHEN p.Role = 'participant' THEN ats.engagement_score END),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN ats.popup_count END), 0),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN ats.total_detections END), 0),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN ats.attendance_penalty END), 0),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN ats.engagement_score END), 0),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN ats.focus_score END), 0),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN ats.total_break_time_used END), 0),
+       COUNT(CASE WHEN p.Role = 'participant' AND ats.break_used = 1 THEN 1 END),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant' THEN ats.identity_total_warnings_issued END), 0),
+       COALESCE(SUM(CASE WHEN p.Role = 'participant'
+                         THEN COALESCE(ats.identity_removal_count, 0) + COALESCE(ats.behavior_removal_count, 0) END), 0),
+       NOW()
+FROM tbl_Participants p
+JOIN tbl_Meetings m ON m.ID = p.Meeting_ID
+LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
+LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
+LEFT JOIN tbl_Attendance_Sessions ats ON p.Meeting_ID = ats.Meeting_ID AND p.User_ID = ats.User_ID
+LEFT JOIN (
+    SELECT ps.Meeting_ID,
+           ps.occurrence_number,
+           MIN(CASE WHEN ps.User_ID = pm.Host_ID THEN ps.Joined_At END) AS host_started_at,
+           MIN(ps.Joined_At) AS first_joined_at,
+           MAX(ps.Left_At) AS last_left_at
+    FROM tbl_ParticipantSessions ps
+    JOIN tbl_Meetings pm ON pm.ID = ps.Meeting_ID
+    GROUP BY ps.Meeting_ID, ps.occurrence_number
+) s ON s.Meeting_ID = p.Meeting_ID AND s.occurrence_number = p.occurrence_number
+GROUP BY p.Meeting_ID, p.occurrence_number
+"""
+
+BACKFILL_HOST_DAILY_ROLLUPS_SQL = """
+INSERT INTO tbl_UserDailyRollups
+    (User_ID, Rollup_Date, Role, Meeting_Type, Meeting_Count, Active_Count, Ended_Count,
+     Scheduled_Count, Participant_Count, Duration_Sum, Duration_Samples, Attendance_Sum,
+     Attendance_Samples, Overall_Sum, Overall_Samples, Sessions_Sum, Monitored_Count, Popup_Sum,
+     Detection_Sum, Penalty_Sum, Engagement_Sum, Focus_Sum, Break_Time_Sum, Breaks_Used,
+     Identity_Warnings, Removals, First_Meeting_At, Last_Meeting_At, Updated_At)
+SELECT r.Host_ID, r.Meeting_Date, 'host', r.Meeting_Type,
+       COUNT(DISTINCT r.Meeting_ID),
+       COUNT(DISTINCT CASE WHEN r.Status = 'active' THEN r.Meeting_ID END),
+       COUNT(DISTINCT CASE WHEN r.Status = 'ended' THEN r.Meeting_ID END),
+       COUNT(DISTINCT CASE WHEN r.Status = 'scheduled' THEN r.Meeting_ID END),
+       SUM(r.Participant_Count),
+       SUM(r.Duration_Sum), SUM(r.Duration_Samples),
+       SUM(r.Attendance_Sum), SUM(r.Attendance_Samples),
+       SUM(r.Overall_Sum), SUM(r.Overall_Samples),
+       SUM(r.Sessions_Sum), SUM(r.Monitored_Count),
+       SUM(r.Popup_Sum), SUM(r.Detection_Sum), SUM(r.Penalty_Sum),
+       SUM(r.Engagement_Sum), SUM(r.Focus_Sum), SUM(r.Break_Time_Sum),
+       SUM(r.Breaks_Used), SUM(r.Identity_Warnings), SUM(r.Removals),
+       MIN(r.Created_At), MAX(r.Created_At),
+       NOW()
+FROM tbl_MeetingRollups r
+WHERE r.Host_ID IS NOT NULL
+GROUP BY r.Host_ID, r.Meeting_Date, r.Meeting_Type
+"""
+
+BACKFILL_PARTICIPANT_DAILY_ROLLUPS_SQL = """
+INSERT INTO tbl_UserDailyRollups
+    (User_ID, Rollup_Date, Role, Meeting_Type, Meeting_Count, Active_Count, Ended_Count,
+     Scheduled_Count, Participant_Count, Duration_Sum, Duration_Samples, Attendance_Sum,
+     Attendance_Samples, Overall_Sum, Overall_Samples, Sessions_Sum, Monitored_Count, Popup_Sum,
+     Detection_Sum, Penalty_Sum, Engagement_Sum, Focus_Sum, Break_Time_Sum, Breaks_Used,
+     Identity_Warnings, Removals, First_Meeting_At, Last_Meeting_At, Updated_At)
+SELECT p.User_ID, p.session_start_time, 'participant', COALESCE(p.Meeting_Type, ''),
+       COUNT(DISTINCT p.Meeting_ID),
+       COUNT(DISTINCT CASE WHEN p.Is_Currently_Active = 1 THEN p.Meeting_ID END),
+       COUNT(DISTINCT CASE WHEN m.Status = 'ended' THEN p.Meeting_ID END),
+       COUNT(DISTINCT CASE WHEN m.Status = 'scheduled' THEN p.Meeting_ID END),
+       0,
+       COALESCE(SUM(p.Total_Duration_Minutes), 0), COUNT(p.Total_Duration_Minutes),
+       COALESCE(SUM(p.Participant_Attendance), 0), COUNT(p.Participant_Attendance),
+       COALESCE(SUM(p.Overall_Attendance), 0), COUNT(p.Overall_Attendance),
+       COALESCE(SUM(p.Total_Sessions), 0), COUNT(ats.engagement_score),
+       COALESCE(SUM(ats.popup_count), 0), COALESCE(SUM(ats.total_detections), 0),
+       COALESCE(SUM(ats.attendance_penalty), 0), COALESCE(SUM(ats.engagement_score), 0),
+       COALESCE(SUM(ats.focus_score), 0), COALESCE(SUM(ats.total_break_time_used), 0),
+       COUNT(CASE WHEN ats.break_used = 1 THEN 1 END),
+       COALESCE(SUM(ats.identity_total_warnings_issued), 0),
+       COALESCE(SUM(COALESCE(ats.identity_removal_count, 0) + COALESCE(ats.behavior_removal_count, 0)), 0),
+       MIN(m.Created_At), MAX(m.Created_At),
+       NOW()
+FROM tbl_Participants p
+LEFT JOIN tbl_Meetings m ON p.Meeting_ID = m.ID
+LEFT JOIN tbl_Attendance_Sessions ats ON p.Meeting_ID = ats.Meeting_ID AND p.User_ID = ats.User_ID
+WHERE p.Role = 'participant' AND p.session_start_time IS NOT NULL
+GROUP BY p.User_ID, p.session_start_time, COALESCE(p.Meeting_Type, '')
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_meeting_invitees'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeetingRollups',
+            fields=[
+                ('id', models.AutoField(db_column='ID', primary_key=True, serialize=False)),
+                ('meeting_id', models.CharField(db_column='Meeting_ID', max_length=20)),
+                ('occurrence_number', models.IntegerField(db_column='occurrence_number', default=1)),
+                ('host_id', models.IntegerField(blank=True, db_column='Host_ID', null=True)),
+                ('meeting_type', models.CharField(db_column='Meeting_Type', default='', max_length=50)),
+                ('meeting_name', models.CharField(blank=True, db_column='Meeting_Name', max_length=200, null=True)),
+                ('status', models.CharField(blank=True, db_column='Status', max_length=50, null=True)),
+                ('meeting_date', models.DateField(db_column='Meeting_Date')),
+                ('created_at', models.DateTimeField(blank=True, db_column='Created_At', null=True)),
+                ('started_at', models.DateTimeField(blank=True, db_column='Started_At', null=True)),
+                ('ended_at', models.DateTimeField(blank=True, db_column='Ended_At', null=True)),
+                ('participant_count', models.IntegerField(db_column='Participant_Count', default=0)),
+                ('active_participant_count', models.IntegerField(db_column='Active_Participant_Count', default=0)),
+                ('duration_sum', models.FloatField(db_column='Duration_Sum', default=0)),
+                ('duration_samples', models.IntegerField(db_column='Duration_Samples', default=0)),
+                ('duration_max', models.FloatField(blank=True, db_column='Duration_Max', null=True)),
+                ('duration_min', models.FloatField(blank=True, db_column='Duration_Min', null=True)),
+                ('attendance_sum', models.FloatField(db_column='Attendance_Sum', default=0)),
+                ('attendance_samples', models.IntegerField(db_column='Attendance_Samples', default=0)),
+                ('overall_sum', models.FloatField(db_column='Overall_Sum', default=0)),
+                ('overall_samples', models.IntegerField(db_column='Overall_Samples', default=0)),
+                ('sessions_sum', models.IntegerField(db_column='Sessions_Sum', default=0)),
+                ('monitored_count', models.IntegerField(db_column='Monitored_Count', default=0)),
+                ('popup_sum', models.IntegerField(db_column='Popup_Sum', default=0)),
+                ('detection_sum', models.IntegerField(db_column='Detection_Sum', default=0)),
+                ('penalty_sum', models.FloatField(db_column='Penalty_Sum', default=0)),
+                ('engagement_sum', models.FloatField(db_column='Engagement_Sum', default=0)),
+                ('focus_sum', models.FloatField(db_column='Focus_Sum', default=0)),
+                ('break_time_sum', models.IntegerField(db_column='Break_Time_Sum', default=0)),
+                ('breaks_used', models.IntegerField(db_column='Breaks_Used', default=0)),
+                ('identity_warnings', models.IntegerField(db_column='Identity_Warnings', default=0)),
+                ('removals', models.IntegerField(db_column='Removals', default=0)),
+                ('updated_at', models.DateTimeField(db_column='Updated_At')),
+            ],
+            options={
+                'db_table': 'tbl_MeetingRollups',
+                'unique_together': {('meeting_id', 'occurrence_number')},
+                'indexes': [
+                    models.Index(fields=['host_id', 'meeting_date'], name='idx_mroll_host_date'),
+                    models.Index(fields=['meeting_date'], name='idx_mroll_date'),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name='UserDailyRollups',
+            fields=[
+                ('id', models.AutoField(db_column='ID', primary_key=True, serialize=False)),
+                ('user_id', models.IntegerField(db_column='User_ID')),
+                ('rollup_date', models.DateField(db_column='Rollup_Date')),
+                ('role', models.CharField(choices=[('host', 'Host'), ('participant', 'Participant')], db_column='Role', max_length=20)),
+                ('meeting_type', models.CharField(db_column='Meeting_Type', default='', max_length=50)),
+                ('meeting_count', models.IntegerField(db_column='Meeting_Count', default=0)),
+                ('active_count', models.IntegerField(db_column='Active_Count', default=0)),
+                ('ended_count', models.IntegerField(db_column='Ended_Count', default=0)),
+                ('scheduled_count', models.IntegerField(db_column='Scheduled_Count', default=0)),
+                ('participant_count', models.IntegerField(db_column='Participant_Count', default=0)),
+                ('duration_sum', models.FloatField(db_column='Duration_Sum', default=0)),
+                ('duration_samples', models.IntegerField(db_column='Duration_Samples', default=0)),
+                ('attendance_sum', models.FloatField(db_column='Attendance_Sum', default=0)),
+                ('attendance_samples', models.IntegerField(db_column='Attendance_Samples', default=0)),
+                ('overall_sum', models.FloatField(db_column='Overall_Sum', default=0)),
+                ('overall_samples', models.IntegerField(db_column='Overall_Samples', default=0)),
+                ('sessions_sum', models.IntegerField(db_column='Sessions_Sum', default=0)),
+                ('monitored_count', models.IntegerField(db_column='Monitored_Count', default=0)),
+                ('popup_sum', models.IntegerField(db_column='Popup_Sum', default=0)),
+                ('detection_sum', models.IntegerField(db_column='Detection_Sum', default=0)),
+                ('penalty_sum', models.FloatField(db_column='Penalty_Sum', default=0)),
+                ('engagement_sum', models.FloatField(db_column='Engagement_Sum', default=0)),
+                ('focus_sum', models.FloatField(db_column='Focus_Sum', default=0)),
+                ('break_time_sum', models.IntegerField(db_column='Break_Time_Sum', default=0)),
+                ('breaks_used', models.IntegerField(db_column='Breaks_Used', default=0)),
+                ('identity_warnings', models.IntegerField(db_column='Identity_Warnings', default=0)),
+                ('removals', models.IntegerField(db_column='Removals', default=0)),
+                ('first_meeting_at', models.DateTimeField(blank=True, db_column='First_Meeting_At', null=True)),
+                ('last_meeting_at', models.DateTimeField(blank=True, db_column='Last_Meeting_At', null=True)),
+                ('updated_at', models.DateTimeField(db_column='Updated_At')),
+            ],
+            options={
+                'db_table': 'tbl_UserDailyRollups',
+                'unique_together': {('user_id', 'rollup_date', 'role', 'meeting_type')},
+                'indexes': [
+                    models.Index(fields=['rollup_date', 'role'], name='idx_droll_date_role'),
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            [
+                BACKFILL_MEETING_ROLLUPS_SQL,
+                BACKFILL_HOST_DAILY_ROLLUPS_SQL,
+                BACKFILL_PARTICIPANT_DAILY_ROLLUPS_SQL,
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+# Keyset order of comprehensive analytics participant_details:
+# (session date, meeting, participant row) DESC, optionally narrowed to one user.
+# tbl_Participants is created by create_participants_table(), so the indexes are raw SQL.
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_analytics_rollups'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            [
+                "CREATE INDEX idx_part_date_meeting ON tbl_Participants (session_start_time, Meeting_ID, ID)",
+                "CREATE INDEX idx_part_user_date ON tbl_Participants (User_ID, session_start_time, Meeting_ID, ID)",
+            ],
+            reverse_sql=[
+                "DROP INDEX idx_part_date_meeting ON tbl_Participants",
+                "DROP INDEX idx_part_user_date ON tbl_Participants",
+            ],
+        ),
+    ]
@@ -0,0 +1,161 @@
+from django.db import migrations, models
+
+
+# One history row per (user, meeting) for the host and everyone with a participant row.
+# A user's participation comes from their latest participant row, the meeting duration
+# from the host's first one; each is Total_Duration_Minutes, else the row's
+# tbl_ParticipantSessions with open sessions running until NOW().
+BACKFILL_USER_MEETING_HISTORY_SQL = """
+INSERT INTO tbl_UserMeetingHistory
+    (User_ID, Meeting_ID, Meeting_Date, Is_Host, Participant_Role, Participant_Name,
+     Meeting_Name, Meeting_Type, Meeting_Link, Status, Host_ID, Host_Name, Host_Email,
+     Created_At, Started_At, Ended_At, Is_Recording_Enabled, Waiting_Room_Enabled,
+     LiveKit_Room_Name, LiveKit_Room_SID, Scheduled_Duration_Minutes, Description, Location,
+     First_Join_At, Last_Leave_At, End_Meeting_Time, User_Duration_Minutes, Meeting_Duration_Minutes,
+     Participant_Count, Updated_At)
+SELECT u.User_ID,
+       m.ID,
+       DATE(COALESCE(m.Started_At, m.Created_At)),
+       COALESCE(m.Host_ID = u.User_ID, 0),
+       pl.Role,
+       pl.Full_Name,
+       m.Meeting_Name,
+       m.Meeting_Type,
+       m.Meeting_Link,
+       m.Status,
+       m.Host_ID,
+       hu.full_name,
+       hu.email,
+       m.Created_At,
+       m.Started_At,
+       m.Ended_At,
+       COALESCE(m.Is_Recording_Enabled, 0),
+       COALESCE(m.Waiting_Room_Enabled, 0),
+       m.LiveKit_Room_Name,
+       m.LiveKit_Room_SID,
+       CASE
+           WHEN m.Meeting_Type = 'ScheduleMeeting' THEN COALESCE(sm.duration_minutes, 60)
+           WHEN m.Meeting_Type = 'CalendarMeeting' THEN COALESCE(cm.duration, 60)
+           WHEN m.Started_At IS NOT NULL AND m.Ended_At IS NOT NULL THEN
+               TIMESTAMPDIFF(MINUTE, m.Started_At, m.Ended_At)
+           ELSE 60
+       END,
+       CASE
+           WHEN m.Meeting_Type = 'ScheduleMeeting' THEN sm.description
+           WHEN m.Meeting_Type = 'CalendarMeeting' THEN cm.location
+           ELSE NULL
+       END,
+       CASE
+           WHEN m.Meeting_Type = 'ScheduleMeeting' THEN sm.location
+           WHEN m.Meeting_Type = 'CalendarMeeting' THEN cm.location
+           ELSE NULL
+       END,
+       us.first_join_at,
+       us.last_leave_at,
+       pl.End_Meeting_Time,
+       COALESCE(NULLIF(pl.Total_Duration_Minutes, 0), us.minutes, 0),
+       COALESCE(
+           NULLIF(hp.Total_Duration_Minutes, 0),
+           NULLIF(hs.minutes, 0),
+           TIMESTAMPDIFF(SECOND, m.Started_At, m.Ended_At) / 60,
+           0
+       ),
+       COALESCE(pc.participant_count, 0),
+       NOW()
+FROM (
+    SELECT ID AS Meeting_ID, Host_ID AS User_ID FROM tbl_Meetings WHERE Host_ID IS NOT NULL
+    UNION
+    SELECT Meeting_ID, User_ID FROM tbl_Participants
+) u
+JOIN tbl_Meetings m ON m.ID = u.Meeting_ID
+LEFT JOIN tbl_Users hu ON hu.ID = m.Host_ID
+LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
+LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
+LEFT JOIN (
+    SELECT Meeting_ID, User_ID, MAX(ID) AS participant_id
+    FROM tbl_Participants
+    GROUP BY Meeting_ID, User_ID
+) pk ON pk.Meeting_ID = u.Meeting_ID AND pk.User_ID = u.User_ID
+LEFT JOIN tbl_Participants pl ON pl.ID = pk.participant_id
+LEFT JOIN (
+    SELECT Participant_ID,
+           MIN(Joined_At) AS first_join_at,
+           MAX(Left_At) AS last_leave_at,
+           ROUND(SUM(GREATEST(0, TIMESTAMPDIFF(SECOND, Joined_At, COALESCE(Left_At, NOW())))) / 60, 2) AS minutes
+    FROM tbl_ParticipantSessions
+    GROUP BY Participant_ID
+) us ON us.Participant_ID = pl.ID
+LEFT JOIN (
+    SELECT Meeting_ID, MIN(ID) AS host_participant_id
+    FROM tbl_Participants
+    WHERE Role = 'host'
+    GROUP BY Meeting_ID
+) hk ON hk.Meeting_ID = m.ID
+LEFT JOIN tbl_Participants hp ON hp.ID = hk.host_participant_id
+LEFT JOIN (
+    SELECT Participant_ID,
+           ROUND(SUM(GREATEST(0, TIMESTAMPDIFF(SECOND, Joined_At, COALESCE(Left_At, NOW())))) / 60, 2) AS minutes
+    FROM tbl_ParticipantSessions
+    GROUP BY Participant_ID
+) hs ON hs.Participant_ID = hp.ID
+LEFT JOIN (
+    SELECT Meeting_ID, COUNT(DISTINCT User_ID) AS participant_count
+    FROM tbl_Participants
+    GROUP BY Meeting_ID
+) pc ON pc.Meeting_ID = m.ID
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_participants_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserMeetingHistory',
+            fields=[
+                ('id', models.AutoField(db_column='ID', primary_key=True, serialize=False)),
+                ('user_id', models.IntegerField(db_column='User_ID')),
+                ('meeting_id', models.CharField(db_column='Meeting_ID', max_length=20)),
+                ('meeting_date', models.DateField(db_column='Meeting_Date')),
+                ('is_host', models.BooleanField(db_column='Is_Host', default=False)),
+                ('participant_role', models.CharField(blank=True, db_column='Participant_Role', max_length=50, null=True)),
+                ('participant_name', models.CharField(blank=True, db_column='Participant_Name', max_length=100, null=True)),
+                ('meeting_name', models.CharField(blank=True, db_column='Meeting_Name', max_length=200, null=True)),
+                ('meeting_type', models.CharField(blank=True, db_column='Meeting_Type', max_length=50, null=True)),
+                ('meeting_link', models.CharField(blank=True, db_column='Meeting_Link', max_length=500, null=True)),
+                ('status', models.CharField(blank=True, db_column='Status', max_length=50, null=True)),
+                ('host_id', models.IntegerField(blank=True, db_column='Host_ID', null=True)),
+                ('host_name', models.CharField(blank=True, db_column='Host_Name', max_length=255, null=True)),
+                ('host_email', models.CharField(blank=True, db_column='Host_Email', max_length=255, null=True)),
+                ('created_at', models.DateTimeField(blank=True, db_column='Created_At', null=True)),
+                ('started_at', models.DateTimeField(blank=True, db_column='Started_At', null=True)),
+                ('ended_at', models.DateTimeField(blank=True, db_column='Ended_At', null=True)),
+                ('is_recording_enabled', models.BooleanField(db_column='Is_Recording_Enabled', default=False)),
+                ('waiting_room_enabled', models.BooleanField(db_column='Waiting_Room_Enabled', default=False)),
+                ('livekit_room_name', models.CharField(blank=True, db_column='LiveKit_Room_Name', max_length=100, null=True)),
+                ('livekit_room_sid', models.CharField(blank=True, db_column='LiveKit_Room_SID', max_length=100, null=True)),
+                ('scheduled_duration_minutes', models.IntegerField(blank=True, db_column='Scheduled_Duration_Minutes', null=True)),
+                ('description', models.CharField(blank=True, db_column='Description', max_length=1000, null=True)),
+                ('location', models.CharField(blank=True, db_column='Location', max_length=255, null=True)),
+                ('first_join_at', models.DateTimeField(blank=True, db_column='First_Join_At', null=True)),
+                ('last_leave_at', models.DateTimeField(blank=True, db_column='Last_Leave_At', null=True)),
+                ('end_meeting_time', models.DateTimeField(blank=True, db_column='End_Meeting_Time', null=True)),
+                ('user_duration_minutes', models.DecimalField(db_column='User_Duration_Minutes', decimal_places=2, default=0.0, max_digits=10)),
+                ('meeting_duration_minutes', models.DecimalField(db_column='Meeting_Duration_Minutes', decimal_places=2, default=0.0, max_digits=10)),
+                ('participant_count', models.IntegerField(db_column='Participant_Count', default=0)),
+                ('updated_at', models.DateTimeField(db_column='Updated_At')),
+            ],
+            options={
+                'db_table': 'tbl_UserMeetingHistory',
+                'unique_together': {('user_id', 'meeting_id')},
+                'indexes': [
+                    models.Index(fields=['user_id', 'meeting_date'], name='idx_umh_user_date'),
+                    models.Index(fields=['meeting_id'], name='idx_umh_meeting'),
+                ],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_USER_MEETING_HISTORY_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
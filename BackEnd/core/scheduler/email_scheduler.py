@@ -2,15 +2,100 @@
 import logging
 import json
 import threading
-from concurrent.futures import ThreadPoolExecutor
+import time
 from datetime import datetime, timedelta
-from django.core.mail import EmailMessage
-from django.conf import settings
+import redis
 from core.utils.date_utils import get_current_ist_datetime, parse_datetime_safely
 from core.utils.recurring_calculator import calculate_next_occurrence, should_send_reminder
+from .reminder_queue import (
+    REMINDER_QUEUE_CONFIG, MEETING_REMINDER_QUEUE, pop_due_reminders, claim_reminder,
+    retry_reminder, is_too_late, to_epoch, parse_meeting_reminder_member, enqueue_meeting_reminders
+)
+from .mail_queue import deliver_email_batch
 
 def send_daily_meeting_reminders():
-    """Send daily reminders for all applicable meetings"""
+    """Send the meeting reminders that are due (reminder queue, or a full scan when disabled)"""
+    if REMINDER_QUEUE_CONFIG['ENABLED']:
+        return send_due_meeting_reminders()
+    return scan_todays_meeting_reminders()
+
+def send_due_meeting_reminders():
+    """
+    Pop only the reminders whose due time has passed and send them.
+    Meetings are re-read so edits/cancellations made after enqueueing are respected.
+    """
+    try:
+        from core.scheduler.recurring_scheduler import get_scheduled_meetings_by_ids
+        
+        now = time.time()
+        due_items = pop_due_reminders(MEETING_REMINDER_QUEUE, now)
+        if not due_items:
+            return 0
+        
+        parsed = []
+        for member, due in due_items:
+            try:
+                parsed.append((member, due) + parse_meeting_reminder_member(member))
+            except ValueError:
+                logging.warning(f"Dropping malformed reminder queue member: {member}")
+        
+        meetings = {
+            str(meeting['id']): meeting
+            for meeting in get_scheduled_meetings_by_ids({item[2] for item in parsed})
+        }
+        
+        reminders_sent = 0
+        for member, due, meeting_id, start_epoch, reminder_minutes in parsed:
+            meeting = meetings.get(meeting_id)
+            if not meeting or meeting.get('Status') not in ('scheduled', 'active') or not meeting.get('reminders_email', True):
+                continue
+            # The meeting was moved after this reminder was queued
+            if to_epoch(meeting.get('start_time')) != start_epoch:
+                continue
+            if is_too_late(due, now):
+                logging.warning(f"Skipping {reminder_minutes}-minute reminder for meeting {meeting_id}: {int(now - due)}s late")
+                continue
+            if not claim_reminder(MEETING_REMINDER_QUEUE, member):
+                continue
+            
+            if send_meeting_reminder(meeting, reminder_minutes):
+                reminders_sent += 1
+                logging.info(f"Sent {reminder_minutes}-minute reminder for meeting {meeting_id}")
+            else:
+                retry_reminder(MEETING_REMINDER_QUEUE, member, due, now)
+        
+        logging.info(f"Reminder queue: {len(due_items)} due, {reminders_sent} reminders sent")
+        return reminders_sent
+        
+    except redis.RedisError as e:
+        logging.error(f"Reminder queue unavailable: {e}")
+        return 0
+    except Exception as e:
+        logging.error(f"Error in send_due_meeting_reminders: {e}")
+        return 0
+
+def rebuild_meeting_reminder_queue(hours=24):
+    """
+    Re-enqueue reminders for meetings starting soon (e.g. after a Redis flush).
+    Safe to repeat: already-sent reminders are skipped by their idempotency keys.
+    """
+    try:
+        from core.scheduler.recurring_scheduler import get_upcoming_scheduled_meetings
+        
+        meetings = get_upcoming_scheduled_meetings(hours)
+        for meeting in meetings:
+            enqueue_meeting_reminders(
+                meeting['id'], meeting.get('start_time'), meeting.get('reminders_times'),
+                enabled=bool(meeting.get('reminders_email', True))
+            )
+        logging.info(f"Reminder queue rebuilt for {len(meetings)} upcoming meetings")
+        return len(meetings)
+    except Exception as e:
+        logging.error(f"Error rebuilding reminder queue: {e}")
+        return 0
+
+def scan_todays_meeting_reminders():
+    """Send daily reminders for all applicable meetings (full scan of today's meetings)"""
     try:
         from core.scheduler.recurring_scheduler import get_active_recurring_meetings, get_todays_scheduled_meetings
         
@@ -138,46 +223,14 @@ Meet Pro Team"""
         return False
 
 def send_emails_to_participants(email_data, participant_emails):
-    """Send emails to participants using threading"""
+    """Send emails to participants over one pooled SMTP connection"""
     try:
-        successful_sends = 0
-        
-        def send_single_reminder_email(email_address):
-            try:
-                email_message = EmailMessage(
-                    subject=email_data['subject'],
-                    body=email_data['message'],
-                    from_email=settings.DEFAULT_FROM_EMAIL or 'noreply@meetpro.com',
-                    to=[email_address],
-                )
-                
-                email_message.content_subtype = "plain"
-                email_message.send(fail_silently=False)
-                
-                logging.info(f"Successfully sent reminder to: {email_address}")
-                return True
-                
-            except Exception as e:
-                logging.error(f"Failed to send reminder email to {email_address}: {e}")
-                return False
-        
-        # Use ThreadPoolExecutor for concurrent sending
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            future_to_email = {
-                executor.submit(send_single_reminder_email, email): email 
-                for email in participant_emails
-            }
-            
-            for future in future_to_email:
-                try:
-                    success = future.result(timeout=30)
-                    if success:
-                        successful_sends += 1
-                except Exception as e:
-                    email = future_to_email[future]
-                    logging.error(f"Reminder email sending failed for {email}: {e}")
-        
-        return successful_sends
+        result = deliver_email_batch(
+            email_data['subject'], email_data['message'], participant_emails, tag='reminder'
+        )
+        for email_address in result['failed']:
+            logging.error(f"Failed to send reminder email to {email_address}")
+        return result['sent']
         
     except Exception as e:
         logging.error(f"Error in send_emails_to_participants: {e}")
@@ -0,0 +1,190 @@
+# core/scheduler/mail_queue.py
+# Celery-backed mail queue: recipients are split into batches, each batch is one
+# task that sends every message over a single pooled SMTP connection and retries
+# only the recipients that failed, with exponential backoff.
+# For local testing point EMAIL_HOST/EMAIL_PORT at a debugging SMTP server
+# (e.g. `python -m aiosmtpd -n -l localhost:1025`) with EMAIL_USE_TLS=False.
+import os
+import random
+import logging
+import smtplib
+import threading
+from datetime import timedelta
+import redis
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from core.utils.date_utils import get_current_ist_date
+from .reminder_queue import get_redis_client
+
+MAIL_QUEUE_CONFIG = {
+    'ENABLED': os.getenv("MAIL_QUEUE_ENABLED", "True") == "True",
+    'BATCH_SIZE': int(os.getenv("MAIL_QUEUE_BATCH_SIZE", 50)),
+    'MAX_RETRIES': int(os.getenv("MAIL_QUEUE_MAX_RETRIES", 5)),
+    'RETRY_BACKOFF': int(os.getenv("MAIL_QUEUE_RETRY_BACKOFF", 30)),
+    'RETRY_BACKOFF_MAX': int(os.getenv("MAIL_QUEUE_RETRY_BACKOFF_MAX", 15 * 60)),
+    # Pooled connections are recycled after this many messages
+    'MAX_MESSAGES_PER_CONNECTION': int(os.getenv("MAIL_QUEUE_MAX_MESSAGES_PER_CONNECTION", 500)),
+    'METRICS_TTL': 30 * 24 * 3600,
+}
+
+MAIL_METRIC_FIELDS = ('queued', 'sent', 'failed', 'retried', 'dropped')
+
+_SMTP_ERRORS = (smtplib.SMTPException, OSError)
+
+# One open SMTP connection per (thread, connection settings); Celery prefork
+# workers therefore keep a single logged-in session across batches.
+_pool = threading.local()
+
+
+def default_from_email():
+    return getattr(settings, 'DEFAULT_FROM_EMAIL', None) or 'noreply@meetpro.com'
+
+
+def _pooled_connection(connection_kwargs):
+    key = tuple(sorted(connection_kwargs.items()))
+    connections = getattr(_pool, 'connections', None)
+    if connections is None:
+        connections = _pool.connections = {}
+
+    entry = connections.get(key)
+    if entry and entry['sent'] >= MAIL_QUEUE_CONFIG['MAX_MESSAGES_PER_CONNECTION']:
+        _close_pooled_connection(key)
+        entry = None
+    if entry is None:
+        backend = get_connection(fail_silently=False, **connection_kwargs)
+        backend.open()
+        entry = connections[key] = {'backend': backend, 'sent': 0}
+    return key, entry
+
+
+def _close_pooled_connection(key):
+    entry = getattr(_pool, 'connections', {}).pop(key, None)
+    if entry:
+        try:
+            entry['backend'].close()
+        except Exception:
+            pass
+
+
+def send_messages_pooled(messages, **connection_kwargs):
+    """
+    Send EmailMessages over this thread's pooled SMTP connection.
+    Each message is sent individually so one bad address doesn't fail the batch;
+    a dropped connection is reopened once. If no connection can be opened, the
+    current and remaining messages fail. Returns the list of failed messages.
+    """
+    failed = []
+    for index, message in enumerate(messages):
+        for attempt in range(2):
+            try:
+                key, entry = _pooled_connection(connection_kwargs)
+            except _SMTP_ERRORS as e:
+                logging.error(f"📧 SMTP connection failed, {len(messages) - index} messages not sent: {e}")
+                failed.extend(messages[index:])
+                return failed
+            try:
+                message.connection = entry['backend']
+                message.send(fail_silently=False)
+                entry['sent'] += 1
+                break
+            except smtplib.SMTPServerDisconnected:
+                _close_pooled_connection(key)
+                if attempt == 1:
+                    failed.append(message)
+            except _SMTP_ERRORS as e:
+                logging.error(f"📧 Failed to send email to {message.to}: {e}")
+                # Server state is unknown after an error, start the next message fresh
+                _close_pooled_connection(key)
+                failed.append(message)
+                break
+    return failed
+
+
+def record_mail_metric(field, count=1, tag=None):
+    """Increment today's delivery counters (overall and per tag)"""
+    if not count:
+        return
+    try:
+        key = f"mail_queue:metrics:{get_current_ist_date()}"
+        pipe = get_redis_client().pipeline(transaction=False)
+        pipe.hincrby(key, field, count)
+        if tag:
+            pipe.hincrby(key, f"{tag}:{field}", count)
+        pipe.expire(key, MAIL_QUEUE_CONFIG['METRICS_TTL'])
+        pipe.execute()
+    except redis.RedisError as e:
+        logging.debug(f"Mail metrics unavailable: {e}")
+
+
+def get_mail_metrics(days=7):
+    """Delivery counters for the last `days` days -> {date: {field: count}}"""
+    today = get_current_ist_date()
+    dates = [str(today - timedelta(days=offset)) for offset in range(days)]
+    pipe = get_redis_client().pipeline(transaction=False)
+    for day in dates:
+        pipe.hgetall(f"mail_queue:metrics:{day}")
+    return {
+        day: {field: int(value) for field, value in counters.items()}
+        for day, counters in zip(dates, pipe.execute())
+    }
+
+
+def deliver_email_batch(subject, body, recipients, from_email=None, tag=None):
+    """Send one message per recipient over a pooled connection -> {'sent': n, 'failed': [emails]}"""
+    from_email = from_email or default_from_email()
+    messages = [
+        EmailMessage(subject=subject, body=body, from_email=from_email, to=[recipient])
+        for recipient in recipients
+    ]
+    failed = [message.to[0] for message in send_messages_pooled(messages)]
+
+    sent = len(recipients) - len(failed)
+    record_mail_metric('sent', sent, tag)
+    record_mail_metric('failed', len(failed), tag)
+    logging.info(f"📧 Email batch [{tag or 'mail'}]: {sent}/{len(recipients)} sent")
+    return {'sent': sent, 'failed': failed}
+
+
+def retry_countdown(retries):
+    """Exponential backoff with jitter for the given retry number"""
+    delay = MAIL_QUEUE_CONFIG['RETRY_BACKOFF'] * (2 ** retries)
+    delay = min(delay, MAIL_QUEUE_CONFIG['RETRY_BACKOFF_MAX'])
+    return int(delay * random.uniform(0.8, 1.2))
+
+
+def _deliver_in_background(batches, subject, body, from_email, tag):
+    def run():
+        for batch in batches:
+            deliver_email_batch(subject, body, batch, from_email, tag)
+    threading.Thread(target=run, daemon=True).start()
+
+
+def enqueue_bulk_email(subject, body, recipients, from_email=None, tag=None):
+    """
+    Queue the same message to many recipients, one Celery task per batch.
+    Returns the number of recipients queued; never blocks on SMTP.
+    """
+    recipients = list(dict.fromkeys(r.strip() for r in recipients if r and '@' in r))
+    if not recipients:
+        return 0
+
+    batch_size = MAIL_QUEUE_CONFIG['BATCH_SIZE']
+    batches = [recipients[i:i + batch_size] for i in range(0, len(recipients), batch_size)]
+    record_mail_metric('queued', len(recipients), tag)
+
+    if not MAIL_QUEUE_CONFIG['ENABLED']:
+        _deliver_in_background(batches, subject, body, from_email, tag)
+        return len(recipients)
+
+    from core.scheduler.tasks import send_email_batch_task
+    for index, batch in enumerate(batches):
+        try:
+            send_email_batch_task.delay(subject, body, batch, from_email=from_email, tag=tag)
+        except Exception as e:
+            # Broker unavailable: keep the request fast and deliver from a thread
+            logging.error(f"📧 Mail queue unavailable, sending in background: {e}")
+            _deliver_in_background(batches[index:], subject, body, from_email, tag)
+            break
+
+    logging.info(f"📧 Queued {len(recipients)} emails in {len(batches)} batches [{tag or 'mail'}]")
+    return len(recipients)
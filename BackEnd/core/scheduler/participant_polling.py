@@ -3,7 +3,8 @@ core/scheduler/participant_polling.py - SIMPLIFIED VERSION (CORRECTED IMPORT)
 
 This polling task:
 1. Detects disconnected participants (compares LiveKit vs Database)
-2. Stores leave time in Leave_Times JSON array
+2. Stores leave time in Leave_Times JSON array and closes the open tbl_ParticipantSessions rows
+   (one set-based diff per cycle, applied with batched statements)
 3. Marks Is_Currently_Active = FALSE
 4. That's it - duration calculation handled by your API functions
 
@@ -11,26 +12,41 @@ CRITICAL FIX: Import livekit_service from the correct location
 """
 
 import logging
-import json
 import pytz
 from datetime import datetime
-from django.db import connection
+from django.db import connection, transaction
 from django.utils import timezone
 
 # ✅ FIXED: Import from correct location - core.WebSocketConnection.meetings
 from core.WebSocketConnection.meetings import livekit_service
+from core.WebSocketConnection.participant_sessions import close_participant_sessions
 
 logger = logging.getLogger(__name__)
 
 
+# Upper bound on IDs per IN (...) list in one batched statement
+BATCH_SIZE = 500
+
+
+def _livekit_user_ids(livekit_participants):
+    """User IDs present in a LiveKit room, from identities like "user_456_1234567890_1234" """
+    user_ids = set()
+    for participant in livekit_participants:
+        parts = str(participant.get('identity', '')).split('_')
+        if len(parts) > 1 and parts[0] == 'user':
+            user_ids.add(parts[1])
+    return user_ids
+
+
 def sync_participants_polling():
     """
     ✅ POLLING TASK: Runs every 10 seconds
     
     What it does:
     1. Gets all active meetings
-    2. For each meeting: compares LiveKit participants with database
-    3. Marks missing participants as left (stores leave time only)
+    2. Fetches LiveKit participants per room, then ALL active DB participants in one query
+    3. Diffs the two sets and marks every missing participant as left in one
+       transaction with batched statements (stores leave time only)
     4. Your API functions will handle duration calculation
     """
     try:
@@ -57,72 +73,44 @@ def sync_participants_polling():
             active_meetings = cursor.fetchall()
             sync_results['meetings_checked'] = len(active_meetings)
             
-            # logger.info(f"[POLLING] Found {len(active_meetings)} active meetings to check")
-            
-            # ===== STEP 2: FOR EACH MEETING, CHECK PARTICIPANTS =====
+            # ===== STEP 2: LIVEKIT PARTICIPANTS PER ROOM =====
+            # Meetings whose room could not be listed are left untouched this cycle
+            livekit_users = {}
             for meeting_id, room_name, meeting_status in active_meetings:
                 try:
-                    # ===== A: Get actual participants from LiveKit =====
-                    try:
-                        livekit_participants = livekit_service.list_participants(room_name)
-                        livekit_identities = {p['identity'] for p in livekit_participants}
-                        
-                        # logger.info(f"[POLLING] Meeting {meeting_id}: LiveKit has {len(livekit_identities)} participants")
-                    except Exception as lk_error:
-                        logger.warning(f"[POLLING] Could not fetch from LiveKit for meeting {meeting_id}: {lk_error}")
-                        continue
-                    
-                    # ===== B: GET DATABASE ACTIVE PARTICIPANTS =====
-                    cursor.execute("""
-                        SELECT ID, User_ID, occurrence_number, Role, Leave_Times, Is_Currently_Active
-                        FROM tbl_Participants 
-                        WHERE Meeting_ID = %s AND Is_Currently_Active = TRUE
-                    """, [meeting_id])
-                    
-                    db_participants = cursor.fetchall()
-                    sync_results['participants_checked'] += len(db_participants)
-                    
-                    # logger.info(f"[POLLING] Meeting {meeting_id}: DB has {len(db_participants)} active participants")
-                    
-                    # ===== C: FIND WHO IS MISSING FROM LIVEKIT =====
-                    for participant_row in db_participants:
-                        (participant_id, user_id, occurrence_number, role, 
-                         leave_times_json, is_active) = participant_row
-                        
-                        # Check if this user is still in LiveKit
-                        is_still_in_livekit = False
-                        
-                        for livekit_identity in livekit_identities:
-                            # Extract user_id from identity: "user_456_1234567890_1234"
-                            try:
-                                parts = livekit_identity.split('_')
-                                if parts[0] == 'user' and parts[1] == str(user_id):
-                                    is_still_in_livekit = True
-                                    break
-                            except:
-                                continue
-                        
-                        if not is_still_in_livekit:
-                            # ===== THIS USER DISCONNECTED =====
-                            # logger.info(f"[POLLING] ❌ User {user_id} in DB but NOT in LiveKit - marking as left")
-                            
-                            try:
-                                _mark_participant_as_left(
-                                    cursor=cursor,
-                                    participant_id=participant_id,
-                                    user_id=user_id,
-                                    leave_times_json=leave_times_json
-                                )
-                                sync_results['participants_marked_left'] += 1
-                                
-                            except Exception as process_error:
-                                logger.error(f"[POLLING] Error marking user {user_id} as left: {process_error}")
-                                sync_results['errors'].append(f"User {user_id}: {str(process_error)}")
-                
-                except Exception as meeting_error:
-                    logger.error(f"[POLLING] Error processing meeting {meeting_id}: {meeting_error}")
-                    sync_results['errors'].append(f"Meeting {meeting_id}: {str(meeting_error)}")
-                    continue
+                    livekit_users[meeting_id] = _livekit_user_ids(livekit_service.list_participants(room_name))
+                except Exception as lk_error:
+                    logger.warning(f"[POLLING] Could not fetch from LiveKit for meeting {meeting_id}: {lk_error}")
+            
+            if not livekit_users:
+                return sync_results
+            
+            # ===== STEP 3: ALL ACTIVE DB PARTICIPANTS IN ONE QUERY =====
+            meeting_ids = list(livekit_users)
+            placeholders = ','.join(['%s'] * len(meeting_ids))
+            cursor.execute(f"""
+                SELECT ID, Meeting_ID, User_ID
+                FROM tbl_Participants 
+                WHERE Meeting_ID IN ({placeholders}) AND Is_Currently_Active = TRUE
+            """, meeting_ids)
+            
+            db_participants = cursor.fetchall()
+            sync_results['participants_checked'] = len(db_participants)
+            
+            # ===== STEP 4: SET DIFFERENCE - IN DB BUT NOT IN LIVEKIT =====
+            missing_participant_ids = [
+                participant_id
+                for participant_id, meeting_id, user_id in db_participants
+                if str(user_id) not in livekit_users.get(meeting_id, ())
+            ]
+        
+        # ===== STEP 5: APPLY AS BATCHED UPDATES IN ONE TRANSACTION =====
+        if missing_participant_ids:
+            try:
+                sync_results['participants_marked_left'] = _mark_participants_as_left(missing_participant_ids)
+            except Exception as update_error:
+                logger.error(f"[POLLING] Error marking {len(missing_participant_ids)} participants as left: {update_error}")
+                sync_results['errors'].append(str(update_error))
         
 #         logger.info(f"""
 # ✅ [POLLING] Sync cycle completed:
@@ -146,45 +134,46 @@ def sync_participants_polling():
 
 # ==================== HELPER FUNCTION ====================
 
-def _mark_participant_as_left(cursor, participant_id, user_id, leave_times_json):
+def _mark_participants_as_left(participant_ids):
     """
-    Mark a participant as left
+    Mark participants as left, BATCH_SIZE rows per statement, in one transaction
     
     ONLY STORES:
-    - Leave_Times (adds current timestamp)
+    - Leave_Times (appends the cycle's timestamp)
     - Is_Currently_Active = FALSE
+    - Left_At on the open tbl_ParticipantSessions rows
     
     Duration calculation will be handled by your API functions
     """
-    
-    leave_time = timezone.now()
     ist_timezone = pytz.timezone("Asia/Kolkata")
-    leave_time_ist = leave_time.astimezone(ist_timezone)
-    leave_time_str = leave_time_ist.strftime('%Y-%m-%d %H:%M:%S')
+    leave_time_str = timezone.now().astimezone(ist_timezone).strftime('%Y-%m-%d %H:%M:%S')
     
-    # Parse existing leave times
-    try:
-        leave_times = json.loads(leave_times_json) if isinstance(leave_times_json, str) else (leave_times_json or [])
-    except:
-        leave_times = []
-    
-    # ===== DO NOT ADD DUPLICATE LEAVE TIMES =====
-    if leave_time_str not in leave_times:
-        leave_times.append(leave_time_str)
-        
-        # ===== UPDATE DATABASE: ONLY STORE LEAVE TIME =====
-        cursor.execute("""
-            UPDATE tbl_Participants
-            SET Is_Currently_Active = FALSE,
-                Leave_Times = %s
-            WHERE ID = %s
-        """, [
-            json.dumps(leave_times),
-            participant_id
-        ])
-        
-        # logger.info(f"✅ [POLLING] User {user_id} marked as left - Leave_Times stored in database")
-        # logger.info(f"   Leave time: {leave_time_str}")
+    marked = 0
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            for i in range(0, len(participant_ids), BATCH_SIZE):
+                batch = participant_ids[i:i + BATCH_SIZE]
+                placeholders = ','.join(['%s'] * len(batch))
+                
+                # Re-checking Is_Currently_Active skips rows another writer already closed
+                cursor.execute(f"""
+                    SELECT ID FROM tbl_Participants
+                    WHERE ID IN ({placeholders}) AND Is_Currently_Active = TRUE
+                    FOR UPDATE
+                """, batch)
+                still_active = [row[0] for row in cursor.fetchall()]
+                if not still_active:
+                    continue
+                
+                placeholders = ','.join(['%s'] * len(still_active))
+                cursor.execute(f"""
+                    UPDATE tbl_Participants
+                    SET Is_Currently_Active = FALSE,
+                        Leave_Times = JSON_ARRAY_APPEND(COALESCE(Leave_Times, JSON_ARRAY()), '$', %s)
+                    WHERE ID IN ({placeholders})
+                """, [leave_time_str] + still_active)
+                close_participant_sessions(cursor, still_active, leave_time_str)
+                marked += len(still_active)
     
-    else:
-        logger.info(f"[POLLING] Leave time already recorded for user {user_id}")
+    logger.info(f"[POLLING] Marked {marked} participants as left at {leave_time_str}")
+    return marked
@@ -9,6 +9,9 @@ from core.utils.recurring_calculator import (
     is_recurrence_ended,
     should_send_reminder
 )
+from core.WebSocketConnection.meeting_invitees import refresh_next_occurrence, invalidate_meeting_schedule_caches
+from core.WebSocketConnection.user_meeting_history import refresh_user_meeting_history
+from .reminder_queue import enqueue_meeting_reminders, remove_meeting_reminders
 from .email_scheduler import send_daily_meeting_reminders
 
 def update_recurring_meetings():
@@ -148,6 +151,14 @@ def update_meeting_to_next_occurrence(meeting, next_occurrence):
                     format_datetime_for_db(end_datetime),
                     meeting_id
                 ])
+
+                # Keep the invitee index's precomputed next occurrence in step
+                refresh_next_occurrence(cursor, meeting_id, start_datetime, end_datetime)
+                refresh_user_meeting_history(cursor, meeting_id)
+                enqueue_meeting_reminders(
+                    meeting_id, start_datetime, meeting.get('reminders_times'),
+                    enabled=bool(meeting.get('reminders_email', True))
+                )
                 
                 logging.info(f"Updated meeting {meeting_id} to next occurrence: {start_datetime}")
                 return True
@@ -249,6 +260,10 @@ def mark_meeting_recurrence_ended(meeting_id):
                 SET Status = 'recurrence_ended'
                 WHERE ID = %s
             """, [meeting_id])
+
+            invalidate_meeting_schedule_caches(cursor, meeting_id)
+            refresh_user_meeting_history(cursor, meeting_id)
+            remove_meeting_reminders(meeting_id)
             
             logging.info(f"Marked meeting {meeting_id} recurrence as ended")
             return True
@@ -257,15 +272,7 @@ def mark_meeting_recurrence_ended(meeting_id):
         logging.error(f"Error marking meeting {meeting_id} recurrence as ended: {e}")
         return False
 
-def get_todays_scheduled_meetings():
-    """
-    UPDATED: Get all meetings scheduled for today, including updated recurring ones
-    """
-    try:
-        current_date = get_current_ist_datetime().date()
-        
-        with connection.cursor() as cursor:
-            query = """
+SCHEDULED_MEETING_SELECT = """
             SELECT 
                 sm.id, sm.host_id, sm.title, sm.description, sm.location,
                 sm.start_time, sm.end_time, sm.duration_minutes,
@@ -275,19 +282,62 @@ def get_todays_scheduled_meetings():
             FROM tbl_ScheduledMeetings sm
             INNER JOIN tbl_Meetings m ON sm.id = m.ID
             LEFT JOIN tbl_Users u ON sm.host_id = u.ID
+"""
+
+def _fetch_meeting_dicts(cursor):
+    columns = [desc[0] for desc in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+def get_scheduled_meetings_by_ids(meeting_ids):
+    """Scheduled meetings (same shape as get_todays_scheduled_meetings) for the given IDs"""
+    meeting_ids = list(meeting_ids)
+    if not meeting_ids:
+        return []
+    try:
+        with connection.cursor() as cursor:
+            placeholders = ','.join(['%s'] * len(meeting_ids))
+            cursor.execute(SCHEDULED_MEETING_SELECT + f"""
+            WHERE sm.id IN ({placeholders})
+            """, meeting_ids)
+            return _fetch_meeting_dicts(cursor)
+    except Exception as e:
+        logging.error(f"Error getting scheduled meetings {meeting_ids}: {e}")
+        return []
+
+def get_upcoming_scheduled_meetings(hours=24):
+    """Scheduled/active meetings starting within the next `hours`"""
+    try:
+        current_time = get_current_ist_datetime()
+        with connection.cursor() as cursor:
+            cursor.execute(SCHEDULED_MEETING_SELECT + """
+            WHERE sm.start_time >= %s AND sm.start_time < %s
+              AND m.Status IN ('scheduled', 'active')
+            ORDER BY sm.start_time ASC
+            """, [
+                format_datetime_for_db(current_time),
+                format_datetime_for_db(current_time + timedelta(hours=hours))
+            ])
+            return _fetch_meeting_dicts(cursor)
+    except Exception as e:
+        logging.error(f"Error getting upcoming meetings: {e}")
+        return []
+
+def get_todays_scheduled_meetings():
+    """
+    UPDATED: Get all meetings scheduled for today, including updated recurring ones
+    """
+    try:
+        current_date = get_current_ist_datetime().date()
+        
+        with connection.cursor() as cursor:
+            query = SCHEDULED_MEETING_SELECT + """
             WHERE DATE(sm.start_time) = %s
               AND m.Status IN ('scheduled', 'active')
             ORDER BY sm.start_time ASC
             """
             
             cursor.execute(query, [current_date])
-            
-            columns = [desc[0] for desc in cursor.description]
-            meetings = []
-            
-            for row in cursor.fetchall():
-                meeting_dict = dict(zip(columns, row))
-                meetings.append(meeting_dict)
+            meetings = _fetch_meeting_dicts(cursor)
             
             logging.info(f"Retrieved {len(meetings)} meetings scheduled for today")
             return meetings
@@ -362,15 +412,25 @@ def cleanup_old_meetings():
         with connection.cursor() as cursor:
             # Mark old non-recurring meetings as archived
             cursor.execute("""
-                UPDATE tbl_Meetings m
+                SELECT m.ID FROM tbl_Meetings m
                 INNER JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id
-                SET m.Status = 'archived'
                 WHERE sm.is_recurring = 0
                   AND sm.end_time < %s
                   AND m.Status NOT IN ('archived', 'deleted')
             """, [format_datetime_for_db(cutoff_date)])
+            meeting_ids = [row[0] for row in cursor.fetchall()]
+            if not meeting_ids:
+                return 0
+
+            cursor.execute(f"""
+                UPDATE tbl_Meetings
+                SET Status = 'archived'
+                WHERE ID IN ({','.join(['%s'] * len(meeting_ids))})
+            """, meeting_ids)
             
             archived_count = cursor.rowcount
+            for meeting_id in meeting_ids:
+                refresh_user_meeting_history(cursor, meeting_id)
             logging.info(f"Archived {archived_count} old meetings")
             
             return archived_count
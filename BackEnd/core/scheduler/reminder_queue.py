@@ -0,0 +1,196 @@
+# core/scheduler/reminder_queue.py
+# Due-time reminder queue backed by Redis sorted sets.
+# Every pending reminder is one member scored by the epoch second it becomes due,
+# so a scheduler tick pops only what is due instead of re-checking every meeting.
+import os
+import json
+import time
+import logging
+from datetime import datetime
+import redis
+from redis import ConnectionPool
+from django.db import transaction
+from core.utils.date_utils import convert_to_ist, parse_datetime_safely
+
+REMINDER_QUEUE_CONFIG = {
+    'ENABLED': os.getenv("REMINDER_QUEUE_ENABLED", "True") == "True",
+    'DEFAULT_TIMES': [15, 5],
+    # Reminders popped later than this (seconds) after their due time are dropped, not sent
+    'MAX_LATENESS': int(os.getenv("REMINDER_QUEUE_MAX_LATENESS", 600)),
+    'BATCH_SIZE': int(os.getenv("REMINDER_QUEUE_BATCH_SIZE", 200)),
+    'RETRY_DELAY': int(os.getenv("REMINDER_QUEUE_RETRY_DELAY", 60)),
+    # Idempotency keys outlive any re-enqueue of the same occurrence
+    'SENT_TTL': int(os.getenv("REMINDER_QUEUE_SENT_TTL", 2 * 24 * 3600)),
+}
+
+REDIS_POOL = ConnectionPool(
+    host=os.getenv("REMINDER_QUEUE_HOST", os.getenv("REDIS_HOST", "localhost")),
+    port=int(os.getenv("REMINDER_QUEUE_PORT", 6379)),
+    db=int(os.getenv("REMINDER_QUEUE_DB", 5)),
+    decode_responses=True,
+    socket_timeout=2,
+    socket_connect_timeout=2,
+    max_connections=20
+)
+
+MEETING_REMINDER_QUEUE = 'reminder_queue:meeting_emails'
+NOTIFICATION_REMINDER_QUEUE = 'reminder_queue:notifications'
+
+# Atomic "pop everything due": concurrent workers never receive the same member
+_POP_DUE_SCRIPT = """
+local items = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'WITHSCORES', 'LIMIT', 0, ARGV[2])
+for i = 1, #items, 2 do
+    redis.call('ZREM', KEYS[1], items[i])
+end
+return items
+"""
+
+
+def get_redis_client():
+    return redis.Redis(connection_pool=REDIS_POOL)
+
+
+def _owner_key(queue, owner_id):
+    return f"{queue}:owner:{owner_id}"
+
+
+def _sent_key(queue, member):
+    return f"{queue}:sent:{member}"
+
+
+def to_epoch(value):
+    """Epoch seconds for a datetime/string; naive values are IST wall-clock time"""
+    if isinstance(value, str):
+        value = parse_datetime_safely(value)
+    if not isinstance(value, datetime):
+        return None
+    return int(convert_to_ist(value).timestamp())
+
+
+def parse_reminder_times(value):
+    """Reminder offsets in minutes from a JSON string/list, defaulting to [15, 5]"""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except (ValueError, TypeError):
+            value = None
+    if not isinstance(value, (list, tuple)):
+        return list(REMINDER_QUEUE_CONFIG['DEFAULT_TIMES'])
+    minutes = []
+    for item in value:
+        try:
+            if int(item) > 0:
+                minutes.append(int(item))
+        except (ValueError, TypeError):
+            continue
+    return sorted(set(minutes), reverse=True)
+
+
+def _store_reminders(queue, owner_id, items, replace):
+    client = get_redis_client()
+    owner_key = _owner_key(queue, owner_id)
+    previous = client.smembers(owner_key) if replace else set()
+
+    pipe = client.pipeline(transaction=True)
+    if previous:
+        pipe.zrem(queue, *previous)
+        pipe.delete(owner_key)
+    if items:
+        pipe.zadd(queue, {member: due for member, due in items})
+        pipe.sadd(owner_key, *[member for member, _ in items])
+        # The owner index only needs to live until its last reminder is due
+        expire_at = max(due for _, due in items) + REMINDER_QUEUE_CONFIG['SENT_TTL']
+        pipe.expireat(owner_key, int(expire_at))
+    pipe.execute()
+
+
+def replace_reminders(queue, owner_id, items):
+    """Replace every pending reminder of an owner with items [(member, due_epoch)]"""
+    _store_reminders(queue, owner_id, items, replace=True)
+
+
+def add_reminders(queue, owner_id, items):
+    """Add reminders [(member, due_epoch)] next to the owner's pending ones"""
+    if items:
+        _store_reminders(queue, owner_id, items, replace=False)
+
+
+def pop_due_reminders(queue, now=None, limit=None):
+    """Atomically remove and return due reminders -> [(member, due_epoch)] oldest first"""
+    now = int(now if now is not None else time.time())
+    limit = limit or REMINDER_QUEUE_CONFIG['BATCH_SIZE']
+    flat = get_redis_client().eval(_POP_DUE_SCRIPT, 1, queue, now, limit)
+    return [(flat[i], int(float(flat[i + 1]))) for i in range(0, len(flat), 2)]
+
+
+def claim_reminder(queue, member):
+    """Idempotency guard: True only for the first claim of a member"""
+    return bool(get_redis_client().set(
+        _sent_key(queue, member), 1, nx=True, ex=REMINDER_QUEUE_CONFIG['SENT_TTL']
+    ))
+
+
+def retry_reminder(queue, member, due, now=None):
+    """Release a failed claim and retry shortly, unless the reminder would be too late by then"""
+    now = int(now if now is not None else time.time())
+    retry_at = now + REMINDER_QUEUE_CONFIG['RETRY_DELAY']
+    client = get_redis_client()
+    client.delete(_sent_key(queue, member))
+    if retry_at - due <= REMINDER_QUEUE_CONFIG['MAX_LATENESS']:
+        client.zadd(queue, {member: retry_at})
+        return True
+    return False
+
+
+def is_too_late(due, now=None):
+    now = now if now is not None else time.time()
+    return now - due > REMINDER_QUEUE_CONFIG['MAX_LATENESS']
+
+
+# ---------------------------------------------------------------------------
+# Meeting reminder emails: member = "<meeting_id>|<occurrence start epoch>|<minutes>"
+# ---------------------------------------------------------------------------
+
+def meeting_reminder_member(meeting_id, start_epoch, minutes):
+    return f"{meeting_id}|{start_epoch}|{minutes}"
+
+
+def parse_meeting_reminder_member(member):
+    meeting_id, start_epoch, minutes = member.rsplit('|', 2)
+    return meeting_id, int(start_epoch), int(minutes)
+
+
+def build_meeting_reminders(meeting_id, start_time, reminder_times=None, now=None):
+    """[(member, due_epoch)] for every reminder offset of one occurrence that isn't already past"""
+    start_epoch = to_epoch(start_time)
+    if start_epoch is None:
+        return []
+    items = []
+    for minutes in parse_reminder_times(reminder_times):
+        due = start_epoch - minutes * 60
+        if not is_too_late(due, now):
+            items.append((meeting_reminder_member(meeting_id, start_epoch, minutes), due))
+    return items
+
+
+def enqueue_meeting_reminders(meeting_id, start_time, reminder_times=None, enabled=True):
+    """
+    Queue reminder emails for a meeting's next occurrence, replacing any pending ones.
+    Applied on commit so a rolled-back create/update never leaves reminders behind.
+    """
+    if not REMINDER_QUEUE_CONFIG['ENABLED'] or not meeting_id:
+        return
+
+    def apply():
+        try:
+            items = build_meeting_reminders(meeting_id, start_time, reminder_times) if enabled else []
+            replace_reminders(MEETING_REMINDER_QUEUE, meeting_id, items)
+            logging.debug(f"⏰ Queued {len(items)} reminders for meeting {meeting_id}")
+        except redis.RedisError as e:
+            logging.warning(f"⚠️ Failed to queue reminders for meeting {meeting_id}: {e}")
+
+    transaction.on_commit(apply)
+
+
+def remove_meeting_reminders(meeting_id):
+    enqueue_meeting_reminders(meeting_id, None, enabled=False)
@@ -2,7 +2,8 @@
 from celery import shared_task
 import logging
 from .recurring_scheduler import update_recurring_meetings, cleanup_old_meetings
-from .email_scheduler import send_daily_invitation_emails, send_daily_meeting_reminders
+from .email_scheduler import send_daily_invitation_emails, send_daily_meeting_reminders, rebuild_meeting_reminder_queue
+from .mail_queue import MAIL_QUEUE_CONFIG, deliver_email_batch, record_mail_metric, retry_countdown
 
 @shared_task
 def update_recurring_meetings_task():
@@ -40,6 +41,35 @@ def send_meeting_reminders_task():
         logging.error(f"Meeting reminders task failed: {e}")
         return {'reminders_sent': 0, 'error': str(e)}
 
+@shared_task
+def rebuild_reminder_queue_task():
+    """Celery task to re-enqueue reminders for upcoming meetings"""
+    try:
+        logging.info("Starting Celery task: rebuild_reminder_queue")
+        result = rebuild_meeting_reminder_queue()
+        logging.info(f"Reminder queue rebuilt for {result} meetings")
+        return {'meetings_enqueued': result}
+    except Exception as e:
+        logging.error(f"Reminder queue rebuild task failed: {e}")
+        return {'meetings_enqueued': 0, 'error': str(e)}
+
+@shared_task(bind=True, max_retries=MAIL_QUEUE_CONFIG['MAX_RETRIES'])
+def send_email_batch_task(self, subject, body, recipients, from_email=None, tag=None):
+    """Celery task to send one email batch; only failed recipients are retried, with backoff"""
+    result = deliver_email_batch(subject, body, recipients, from_email, tag)
+    failed = result['failed']
+    if failed:
+        if self.request.retries < self.max_retries:
+            record_mail_metric('retried', len(failed), tag)
+            raise self.retry(
+                args=[subject, body, failed],
+                kwargs={'from_email': from_email, 'tag': tag},
+                countdown=retry_countdown(self.request.retries)
+            )
+        record_mail_metric('dropped', len(failed), tag)
+        logging.error(f"📧 Giving up on {len(failed)} emails after {self.request.retries} retries: {failed}")
+    return {'sent': result['sent'], 'failed': len(failed)}
+
 @shared_task
 def cleanup_old_meetings_task():
     """Celery task to cleanup old meetings"""
@@ -52,6 +82,87 @@ def cleanup_old_meetings_task():
         logging.error(f"Cleanup task failed: {e}")
         return {'archived_count': 0, 'error': str(e)}
 
+@shared_task
+def sweep_expired_notifications_task():
+    """Celery task to delete notifications of ended meetings in batches"""
+    try:
+        from core.WebSocketConnection.notifications import sweep_expired_notifications
+        result = sweep_expired_notifications()
+        return result
+    except Exception as e:
+        logging.error(f"Notification sweep task failed: {e}")
+        return {'stamped': 0, 'deleted': 0, 'error': str(e)}
+
+@shared_task
+def sweep_chat_files_task():
+    """Celery task to delete chat attachment blobs that outlived their metadata"""
+    try:
+        from core.WebSocketConnection.chat_messages import sweep_expired_chat_files
+        return sweep_expired_chat_files()
+    except Exception as e:
+        logging.error(f"Chat file sweep task failed: {e}")
+        return {'deleted': 0, 'error': str(e)}
+
+@shared_task
+def reconcile_notification_counters_task():
+    """Celery task to re-check Redis unread counters against MySQL"""
+    try:
+        from core.WebSocketConnection.notification_counters import reconcile_unread_counts
+        return reconcile_unread_counts()
+    except Exception as e:
+        logging.error(f"Notification counter reconciliation failed: {e}")
+        return {'checked': 0, 'corrected': 0, 'error': str(e)}
+
+@shared_task
+def refresh_meeting_rollups_task(meeting_id):
+    """Celery task to recompute one meeting's analytics rollups"""
+    try:
+        from core.WebSocketConnection.analytics_rollups import refresh_meeting_rollups
+        return refresh_meeting_rollups(meeting_id)
+    except Exception as e:
+        logging.error(f"Analytics rollup refresh failed for {meeting_id}: {e}")
+        return {'host_days': 0, 'participant_days': 0, 'error': str(e)}
+
+@shared_task
+def reconcile_user_meeting_history_task():
+    """Celery task to repair per-user meeting history rows that drifted from tbl_Meetings"""
+    try:
+        from core.WebSocketConnection.user_meeting_history import reconcile_user_meeting_history
+        return reconcile_user_meeting_history()
+    except Exception as e:
+        logging.error(f"Meeting history reconcile task failed: {e}")
+        return {'checked': 0, 'refreshed': 0, 'error': str(e)}
+
+@shared_task
+def reconcile_analytics_rollups_task():
+    """Celery task to refresh recently ended meetings missing from the analytics rollups"""
+    try:
+        from core.WebSocketConnection.analytics_rollups import reconcile_analytics_rollups
+        return reconcile_analytics_rollups()
+    except Exception as e:
+        logging.error(f"Analytics rollup reconciliation failed: {e}")
+        return {'checked': 0, 'refreshed': 0, 'error': str(e)}
+
+@shared_task
+def generate_participant_report_task(meeting_id, user_id, occurrence_number=None):
+    """Celery task to render and cache one participant's PDF report"""
+    try:
+        from core.UserDashBoard.participant_reports import generate_participant_report
+        return generate_participant_report(meeting_id, user_id, occurrence_number)
+    except Exception as e:
+        logging.error(f"Participant report generation failed for {meeting_id}/{user_id}: {e}")
+        return {'key': None, 'generated': False, 'error': str(e)}
+
+@shared_task
+def generate_meeting_reports_task(meeting_id, occurrence_number=None):
+    """Celery task to render and cache every participant's PDF report of a meeting"""
+    try:
+        from core.UserDashBoard.participant_reports import generate_meeting_participant_reports
+        return generate_meeting_participant_reports(meeting_id, occurrence_number)
+    except Exception as e:
+        logging.error(f"Bulk report generation failed for {meeting_id}: {e}")
+        return {'participants': 0, 'generated': 0, 'cached': 0, 'error': str(e)}
+
 @shared_task
 def process_all_recurring_meetings():
     """Combined task to process all recurring meeting operations"""
@@ -1,3 +1,194 @@
-from django.test import TestCase
+import random
+from datetime import datetime, date, timedelta
+from django.test import SimpleTestCase
+from core.utils.date_utils import convert_to_ist
+from core.utils.occurrence_engine import DAY_MAPPING, rule_from_meeting, expand_occurrences, next_occurrence
+from core.utils.recurring_calculator import (
+    calculate_daily_occurrence, calculate_weekly_occurrence, calculate_monthly_occurrence
+)
 
-# Create your tests here.
+WEEKDAY_NAMES = sorted(DAY_MAPPING, key=DAY_MAPPING.get)
+
+# The engine is checked against the single-step calculators it replaced, inside the
+# domain where both mean the same thing. Outside it they diverge on purpose:
+# - every legacy result lasts 1 hour and ignores recurrence_end_date/recurrence_occurrences
+# - daily skips an occurrence later today when asked on a cycle day before it starts
+# - weekly and monthly ignore recurrence_interval, and none of them know the series start
+# - monthly only looks at this month and the next, so it returns None across a short month
+# test_documented_divergences pins each of these down.
+
+
+def make_meeting(recurrence_type, start, duration_minutes=45, **fields):
+    meeting = {
+        'id': 'test',
+        'is_recurring': True,
+        'recurrence_type': recurrence_type,
+        'start_time': start.isoformat(),
+        'end_time': (start + timedelta(minutes=duration_minutes)).isoformat(),
+    }
+    if fields.get('selected_month_dates'):
+        meeting['monthly_pattern'] = 'selected-dates'
+    meeting.update(fields)
+    return meeting
+
+
+def legacy_occurrence(meeting, after):
+    """(start, end) from the recurring_calculator function for the meeting's type, naive IST"""
+    start = convert_to_ist(datetime.fromisoformat(meeting['start_time']))
+    after = convert_to_ist(after)
+    interval = meeting.get('recurrence_interval') or 1
+    if meeting['recurrence_type'] == 'daily':
+        result = calculate_daily_occurrence(start, after, interval)
+    elif meeting['recurrence_type'] == 'weekly':
+        result = calculate_weekly_occurrence(start, after, interval, meeting)
+    else:
+        result = calculate_monthly_occurrence(start, after, interval, meeting)
+    if not result:
+        return None
+    return tuple(datetime.fromisoformat(result[key]).replace(tzinfo=None) for key in ('next_start_time', 'next_end_time'))
+
+
+def engine_occurrence(meeting, after):
+    occurrence = next_occurrence(rule_from_meeting(meeting), after)
+    return tuple(value.replace(tzinfo=None) for value in occurrence) if occurrence else None
+
+
+def engine_occurrences(meeting, window_start, window_end):
+    starts, ends = expand_occurrences(rule_from_meeting(meeting), window_start, window_end)
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def random_legacy_case(rng):
+    """(meeting, after) inside the domain shared with the legacy calculators"""
+    recurrence_type = rng.choice(['daily', 'weekly', 'monthly'])
+    day = datetime(2023, 1, 1) + timedelta(days=rng.randrange(3 * 365))
+    fields = {}
+
+    if recurrence_type == 'daily':
+        # Morning starts, afternoon lookups: today's occurrence has always passed
+        start = day + timedelta(hours=rng.randrange(12), minutes=rng.choice([0, 15, 30, 45]))
+        fields['recurrence_interval'] = rng.choice([1, 1, 2, 3, 4, 7])
+        after_day = day + timedelta(days=rng.randrange(-30, 400))
+        after = after_day + timedelta(hours=12, minutes=rng.randrange(12 * 60))
+    else:
+        start = day + timedelta(hours=rng.randrange(24), minutes=rng.choice([0, 15, 30, 45]))
+        after = start + timedelta(days=rng.randrange(400), minutes=rng.randrange(1, 24 * 60))
+        if recurrence_type == 'weekly' and rng.random() < 0.8:
+            fields['selected_days'] = rng.sample(WEEKDAY_NAMES, rng.randint(1, 7))
+        if recurrence_type == 'monthly' and rng.random() < 0.6:
+            # Weighted towards 28-31 to cross short months and leap days
+            fields['selected_month_dates'] = sorted(set(rng.sample(range(1, 32), rng.randint(1, 4)) + rng.sample([28, 29, 30, 31], rng.randint(0, 2))))
+
+    return make_meeting(recurrence_type, start, 60, **fields), after
+
+
+def months_between(earlier, later):
+    return (later.year - earlier.year) * 12 + later.month - earlier.month
+
+
+class OccurrenceEnginePropertyTests(SimpleTestCase):
+    """occurrence_engine must agree with the recurring_calculator functions it replaced"""
+
+    def test_next_occurrence_matches_legacy_calculators(self):
+        rng = random.Random(35)
+        for _ in range(500):
+            meeting, after = random_legacy_case(rng)
+            expected = legacy_occurrence(meeting, after)
+            actual = engine_occurrence(meeting, after)
+            if expected is None:
+                # Legacy monthly gives up when next month lacks the day; the engine keeps going
+                self.assertEqual(meeting['recurrence_type'], 'monthly', (meeting, after))
+                self.assertGreaterEqual(months_between(after, actual[0]), 2, (meeting, after))
+            else:
+                self.assertEqual(actual, expected, (meeting, after))
+
+    def test_expansion_matches_chained_next_occurrence(self):
+        rng = random.Random(3535)
+        for _ in range(200):
+            meeting, after = random_legacy_case(rng)
+            if rng.random() < 0.5:
+                meeting['recurrence_interval'] = rng.choice([2, 3, 4])
+            if rng.random() < 0.3:
+                meeting['recurrence_occurrences'] = rng.randint(1, 40)
+            window_end = after + timedelta(days=rng.randrange(1, 400))
+
+            chained = []
+            occurrence = engine_occurrence(meeting, after - timedelta(seconds=1))
+            while occurrence and occurrence[0] < window_end:
+                chained.append(occurrence)
+                occurrence = engine_occurrence(meeting, occurrence[0])
+            self.assertEqual(engine_occurrences(meeting, after, window_end), chained, meeting)
+
+    def test_documented_divergences(self):
+        # Daily: asked at 08:00 on a cycle day for a 09:00 meeting, legacy skips to tomorrow
+        daily = make_meeting('daily', datetime(2024, 6, 1, 9, 0), 60)
+        self.assertEqual(legacy_occurrence(daily, datetime(2024, 6, 3, 8, 0))[0], datetime(2024, 6, 4, 9, 0))
+        self.assertEqual(engine_occurrence(daily, datetime(2024, 6, 3, 8, 0))[0], datetime(2024, 6, 3, 9, 0))
+
+        # Weekly: legacy ignores the interval
+        fortnightly = make_meeting('weekly', datetime(2024, 6, 3, 9, 0), 60, recurrence_interval=2)
+        self.assertEqual(legacy_occurrence(fortnightly, datetime(2024, 6, 3, 10, 0))[0], datetime(2024, 6, 10, 9, 0))
+        self.assertEqual(engine_occurrence(fortnightly, datetime(2024, 6, 3, 10, 0))[0], datetime(2024, 6, 17, 9, 0))
+
+        # Monthly: nothing in February, so legacy returns None on Jan 31
+        month_end = make_meeting('monthly', datetime(2024, 1, 31, 10, 0), 60)
+        self.assertIsNone(legacy_occurrence(month_end, datetime(2024, 1, 31, 11, 0)))
+        self.assertEqual(engine_occurrence(month_end, datetime(2024, 1, 31, 11, 0))[0], datetime(2024, 3, 31, 10, 0))
+
+        # End date and duration: legacy ignores the first and always assumes 1 hour
+        ended = make_meeting('daily', datetime(2024, 6, 1, 9, 0), 30, recurrence_end_date='2024-06-02')
+        self.assertEqual(legacy_occurrence(ended, datetime(2024, 6, 2, 12, 0)), (datetime(2024, 6, 3, 9, 0), datetime(2024, 6, 3, 10, 0)))
+        self.assertIsNone(engine_occurrence(ended, datetime(2024, 6, 2, 12, 0)))
+
+    def test_month_end_dates_skip_short_months(self):
+        meeting = make_meeting('monthly', datetime(2024, 1, 31, 10, 0))
+        occurrences = engine_occurrences(meeting, datetime(2024, 1, 1), datetime(2025, 1, 1))
+        self.assertEqual(
+            [start.date() for start, _ in occurrences],
+            [date(2024, month, 31) for month in (1, 3, 5, 7, 8, 10, 12)]
+        )
+
+    def test_selected_month_dates_across_february(self):
+        meeting = make_meeting('monthly', datetime(2024, 1, 15, 9, 0), selected_month_dates=[29, 30, 31])
+        february = engine_occurrences(meeting, datetime(2024, 2, 1), datetime(2024, 3, 1))
+        self.assertEqual([start.date() for start, _ in february], [date(2024, 2, 29)])
+        self.assertEqual(engine_occurrences(meeting, datetime(2025, 2, 1), datetime(2025, 3, 1)), [])
+
+    def test_leap_day_series(self):
+        yearly = make_meeting('monthly', datetime(2024, 2, 29, 18, 30), recurrence_interval=12)
+        occurrences = engine_occurrences(yearly, datetime(2024, 1, 1), datetime(2033, 1, 1))
+        self.assertEqual([start.date() for start, _ in occurrences], [date(2024, 2, 29), date(2028, 2, 29), date(2032, 2, 29)])
+
+        every_52_weeks = make_meeting('weekly', datetime(2024, 2, 29, 18, 30), recurrence_interval=52)
+        occurrences = engine_occurrences(every_52_weeks, datetime(2024, 1, 1), datetime(2027, 1, 1))
+        self.assertEqual([start.date() for start, _ in occurrences], [date(2024, 2, 29), date(2025, 2, 27), date(2026, 2, 26)])
+
+    def test_end_date_and_occurrence_count(self):
+        start = datetime(2024, 3, 4, 8, 0)
+        by_count = make_meeting('daily', start, recurrence_occurrences=5, recurrence_end_date='2024-12-31')
+        by_date = make_meeting('daily', start, recurrence_occurrences=50, recurrence_end_date='2024-03-06')
+        self.assertEqual(len(engine_occurrences(by_count, datetime(2024, 1, 1), datetime(2025, 1, 1))), 5)
+        self.assertEqual(len(engine_occurrences(by_date, datetime(2024, 1, 1), datetime(2025, 1, 1))), 3)
+
+        # The count is spent from the series start, not from the window
+        late_window = engine_occurrences(by_count, datetime(2024, 3, 7), datetime(2025, 1, 1))
+        self.assertEqual([start.date() for start, _ in late_window], [date(2024, 3, 7), date(2024, 3, 8)])
+        self.assertIsNone(next_occurrence(rule_from_meeting(by_count), datetime(2024, 3, 8, 9, 0)))
+
+    def test_weekday_sets_with_interval(self):
+        # Starts on a Wednesday: Monday of the first week is before the series and skipped
+        meeting = make_meeting(
+            'weekly', datetime(2024, 5, 1, 14, 0),
+            selected_days=['monday', 'friday'], recurrence_interval=2, recurrence_occurrences=6
+        )
+        occurrences = engine_occurrences(meeting, datetime(2024, 1, 1), datetime(2025, 1, 1))
+        self.assertEqual(
+            [start.date() for start, _ in occurrences],
+            [date(2024, 5, 3), date(2024, 5, 13), date(2024, 5, 17),
+             date(2024, 5, 27), date(2024, 5, 31), date(2024, 6, 10)]
+        )
+
+    def test_window_bounds_are_half_open(self):
+        meeting = make_meeting('daily', datetime(2024, 6, 1, 9, 0))
+        occurrences = engine_occurrences(meeting, datetime(2024, 6, 2, 9, 0), datetime(2024, 6, 4, 9, 0))
+        self.assertEqual([start for start, _ in occurrences], [datetime(2024, 6, 2, 9, 0), datetime(2024, 6, 3, 9, 0)])
@@ -0,0 +1,141 @@
+import numpy as np
+import logging
+from datetime import datetime
+
+# Session timestamps are stored as naive IST strings ('%Y-%m-%d %H:%M:%S') or
+# naive DATETIME values; both map directly onto datetime64[s].
+NAT = np.datetime64('NaT', 's')
+
+
+def to_datetime64(values):
+    """Convert a list of datetime strings/objects to a datetime64[s] array (NaT for unparseable)"""
+    values = list(values or [])
+    if not values:
+        return np.array([], dtype='datetime64[s]')
+
+    normalized = []
+    for value in values:
+        if isinstance(value, datetime):
+            normalized.append(value.replace(tzinfo=None))
+        elif value is None:
+            normalized.append('NaT')
+        else:
+            normalized.append(str(value).strip())
+
+    try:
+        return np.array(normalized, dtype='datetime64[s]')
+    except (ValueError, TypeError):
+        parsed = np.full(len(normalized), NAT)
+        for i, value in enumerate(normalized):
+            try:
+                parsed[i] = np.datetime64(value, 's')
+            except (ValueError, TypeError):
+                logging.warning(f"[OVERLAP] Skipping unparseable session time: {value!r}")
+        return parsed
+
+
+def build_intervals(join_times, leave_times, open_until=None):
+    """
+    Pair join_times[i] with leave_times[i] into (starts, ends) arrays.
+    Joins without a leave are closed at `open_until`, or dropped when it is None.
+    Invalid and non-positive intervals are removed.
+    """
+    starts = to_datetime64(join_times)
+    ends = np.full(len(starts), NAT)
+
+    leaves = to_datetime64(leave_times)[:len(starts)]
+    ends[:len(leaves)] = leaves
+    if open_until is not None and len(leaves) < len(starts):
+        ends[len(leaves):] = to_datetime64([open_until])[0]
+
+    valid = ~np.isnat(starts) & ~np.isnat(ends) & (ends > starts)
+    return starts[valid], ends[valid]
+
+
+def merge_intervals(starts, ends):
+    """Merge intervals into a sorted, disjoint set"""
+    if len(starts) == 0:
+        return starts, ends
+
+    order = np.argsort(starts, kind='mergesort')
+    starts = starts[order]
+    ends = ends[order]
+
+    # An interval opens a new block when it starts after everything before it has ended
+    running_end = np.maximum.accumulate(ends.astype('int64'))
+    new_block = np.empty(len(starts), dtype=bool)
+    new_block[0] = True
+    new_block[1:] = starts[1:].astype('int64') > running_end[:-1]
+
+    block_ids = np.cumsum(new_block) - 1
+    merged_starts = starts[new_block]
+    merged_ends = np.full(len(merged_starts), np.iinfo('int64').min, dtype='int64')
+    np.maximum.at(merged_ends, block_ids, ends.astype('int64'))
+    return merged_starts, merged_ends.astype('datetime64[s]')
+
+
+def overlap_seconds_by_owner(host_starts, host_ends, owners, starts, ends):
+    """
+    Seconds each owner's intervals overlap the host's intervals -> {owner: seconds}.
+
+    Host intervals are merged once; for each participant interval [a, b) the
+    overlap is C(b) - C(a), where C(t) is the host time elapsed up to t. C is
+    evaluated with a binary search over the merged host starts, so the whole
+    meeting is one O((n + m) log m) pass instead of an n*m pairwise comparison.
+    """
+    owners = np.asarray(owners)
+    unique_owners, owner_index = np.unique(owners, return_inverse=True)
+    result = {owner: 0.0 for owner in unique_owners.tolist()}
+
+    host_starts, host_ends = merge_intervals(host_starts, host_ends)
+    if len(host_starts) == 0 or len(starts) == 0:
+        return result
+
+    hs = host_starts.astype('int64')
+    he = host_ends.astype('int64')
+    lengths = he - hs
+    covered_before = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    def covered_until(t):
+        k = np.searchsorted(hs, t, side='right') - 1
+        inside = np.clip(t - hs[np.maximum(k, 0)], 0, lengths[np.maximum(k, 0)])
+        return np.where(k >= 0, covered_before[np.maximum(k, 0)] + inside, 0)
+
+    per_interval = covered_until(ends.astype('int64')) - covered_until(starts.astype('int64'))
+    totals = np.bincount(owner_index, weights=per_interval, minlength=len(unique_owners))
+
+    for owner, seconds in zip(unique_owners.tolist(), totals.tolist()):
+        result[owner] = seconds
+    return result
+
+
+def calculate_meeting_overlaps(host_join_times, host_leave_times, participant_sessions, open_until=None):
+    """
+    Overlap minutes with the host for every participant of a meeting.
+
+    participant_sessions: {key: (join_times, leave_times)}
+    open_until: closing time for sessions without a leave (e.g. meeting end)
+    Returns {key: overlap_minutes}
+    """
+    host_starts, host_ends = build_intervals(host_join_times, host_leave_times, open_until)
+
+    owners, all_starts, all_ends = [], [], []
+    for key, (join_times, leave_times) in participant_sessions.items():
+        starts, ends = build_intervals(join_times, leave_times, open_until)
+        owners.extend([key] * len(starts))
+        all_starts.append(starts)
+        all_ends.append(ends)
+
+    result = {key: 0.0 for key in participant_sessions}
+    if not owners:
+        return result
+
+    seconds = overlap_seconds_by_owner(
+        host_starts, host_ends,
+        owners,
+        np.concatenate(all_starts),
+        np.concatenate(all_ends)
+    )
+    for key, value in seconds.items():
+        result[key] = round(value / 60.0, 2)
+    return result
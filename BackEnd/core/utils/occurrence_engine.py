@@ -0,0 +1,306 @@
+import json
+import logging
+from collections import namedtuple
+from datetime import datetime, date
+from functools import lru_cache
+import numpy as np
+from .date_utils import convert_to_ist, parse_datetime_safely
+
+# Occurrences are expanded on naive IST wall-clock time: day numbers are days
+# since 1970-01-01 (datetime64[D]) and starts are seconds since the epoch.
+SECONDS_PER_DAY = 86400
+DEFAULT_DURATION_MINUTES = 60
+# 1970-01-01 was a Thursday (Monday == 0)
+EPOCH_WEEKDAY = 3
+# next_occurrence() gives up on rules with nothing left in this horizon
+MAX_SEARCH_DAYS = 366 * 5
+
+DAY_MAPPING = {
+    'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
+    'friday': 4, 'saturday': 5, 'sunday': 6
+}
+
+_EMPTY_DAYS = np.array([], dtype=np.int64)
+
+# Hashable so expansions can be memoized per rule
+RecurrenceRule = namedtuple('RecurrenceRule', [
+    'recurrence_type',  # 'daily' | 'weekly' | 'monthly'
+    'anchor_day',       # first day of the series (day number)
+    'time_of_day',      # start offset within the day, seconds
+    'duration',         # occurrence length, seconds
+    'interval',         # every N days/weeks/months
+    'weekdays',         # weekly: sorted weekday numbers
+    'month_days',       # monthly: sorted days of month (missing dates are skipped)
+    'until_day',        # last allowed day number (recurrence_end_date) or None
+    'count',            # max number of occurrences (recurrence_occurrences) or None
+])
+
+
+def _to_naive_ist(value):
+    """Naive IST datetime from a string/date/datetime, or None"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = parse_datetime_safely(value)
+        if value is None:
+            return None
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = convert_to_ist(value).replace(tzinfo=None)
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    return None
+
+
+def _day_number(value):
+    return (value.date() - date(1970, 1, 1)).days
+
+
+def _epoch_seconds(value):
+    return int((value - datetime(1970, 1, 1)).total_seconds())
+
+
+def _load_list(value):
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except (ValueError, TypeError):
+            return []
+    return value if isinstance(value, (list, tuple)) else []
+
+
+def rule_from_meeting(meeting_data):
+    """
+    Build a RecurrenceRule from a scheduled meeting row/dict, or None for
+    non-recurring meetings and unknown recurrence types.
+    The series is anchored on start_date (falling back to start_time) so
+    intervals and occurrence counts stay stable while start_time is rolled forward.
+    """
+    if not meeting_data.get('is_recurring'):
+        return None
+
+    recurrence_type = (meeting_data.get('recurrence_type') or '').lower()
+    if recurrence_type not in ('daily', 'weekly', 'monthly'):
+        return None
+
+    start_time = _to_naive_ist(meeting_data.get('start_time'))
+    if start_time is None:
+        return None
+    end_time = _to_naive_ist(meeting_data.get('end_time'))
+
+    if end_time and end_time > start_time:
+        duration = int((end_time - start_time).total_seconds())
+    else:
+        try:
+            duration = int(meeting_data.get('duration_minutes') or DEFAULT_DURATION_MINUTES) * 60
+        except (ValueError, TypeError):
+            duration = DEFAULT_DURATION_MINUTES * 60
+
+    anchor = start_time
+    series_start = _to_naive_ist(meeting_data.get('start_date'))
+    if series_start and series_start.date() < start_time.date():
+        anchor = series_start
+
+    try:
+        interval = max(1, int(meeting_data.get('recurrence_interval') or 1))
+    except (ValueError, TypeError):
+        interval = 1
+
+    weekdays = ()
+    month_days = ()
+    if recurrence_type == 'weekly':
+        numeric_days = set()
+        for day in _load_list(meeting_data.get('selected_days')):
+            if isinstance(day, str) and not day.strip().isdigit():
+                numeric_days.add(DAY_MAPPING.get(day.strip().lower(), 0))
+            else:
+                numeric_days.add(int(day) % 7)
+        weekdays = tuple(sorted(numeric_days)) or (start_time.weekday(),)
+    elif recurrence_type == 'monthly':
+        if meeting_data.get('monthly_pattern') == 'selected-dates':
+            month_days = tuple(sorted({
+                int(day) for day in _load_list(meeting_data.get('selected_month_dates'))
+                if str(day).strip().isdigit() and 1 <= int(day) <= 31
+            }))
+        month_days = month_days or (start_time.day,)
+
+    until = _to_naive_ist(meeting_data.get('recurrence_end_date'))
+
+    count = None
+    try:
+        if meeting_data.get('recurrence_occurrences'):
+            count = int(meeting_data.get('recurrence_occurrences')) or None
+    except (ValueError, TypeError):
+        count = None
+
+    return RecurrenceRule(
+        recurrence_type=recurrence_type,
+        anchor_day=_day_number(anchor),
+        time_of_day=start_time.hour * 3600 + start_time.minute * 60 + start_time.second,
+        duration=duration,
+        interval=interval,
+        weekdays=weekdays,
+        month_days=month_days,
+        until_day=_day_number(until) if until else None,
+        count=count,
+    )
+
+
+def _pattern_days(rule, day_lo, day_hi):
+    """
+    Sorted day numbers in [day_lo, day_hi] matching the rule's pattern, ignoring
+    end date and count. Every period in range is enumerated in closed form.
+    """
+    day_lo = max(day_lo, rule.anchor_day)
+    if day_hi < day_lo:
+        return _EMPTY_DAYS
+
+    if rule.recurrence_type == 'daily':
+        k_lo = -(-(day_lo - rule.anchor_day) // rule.interval)
+        k_hi = (day_hi - rule.anchor_day) // rule.interval
+        return rule.anchor_day + np.arange(k_lo, k_hi + 1, dtype=np.int64) * rule.interval
+
+    if rule.recurrence_type == 'weekly':
+        # Week 0 is the Monday-based week containing the anchor
+        week_zero = rule.anchor_day - (rule.anchor_day + EPOCH_WEEKDAY) % 7
+        w_lo = (day_lo - week_zero) // 7
+        w_lo = -(-w_lo // rule.interval) * rule.interval
+        w_hi = (day_hi - week_zero) // 7
+        weeks = np.arange(w_lo, w_hi + 1, rule.interval, dtype=np.int64)
+        days = (week_zero + weeks[:, None] * 7 + np.array(rule.weekdays, dtype=np.int64)[None, :]).ravel()
+    else:
+        month_zero = np.datetime64(rule.anchor_day, 'D').astype('datetime64[M]').astype(np.int64)
+        m_lo = np.datetime64(day_lo, 'D').astype('datetime64[M]').astype(np.int64) - month_zero
+        m_lo = -(-m_lo // rule.interval) * rule.interval
+        m_hi = np.datetime64(day_hi, 'D').astype('datetime64[M]').astype(np.int64) - month_zero
+        months = month_zero + np.arange(m_lo, m_hi + 1, rule.interval, dtype=np.int64)
+        first_days = months.astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+        candidates = first_days[:, None] + (np.array(rule.month_days, dtype=np.int64) - 1)[None, :]
+        # Day 31 in a 30-day month rolls into the next month: such dates don't exist
+        in_month = candidates.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64) == months[:, None]
+        days = candidates[in_month]
+
+    return days[(days >= day_lo) & (days <= day_hi)]
+
+
+def _search_span_days(rule):
+    """A window length that always contains at least one full period"""
+    if rule.recurrence_type == 'daily':
+        return rule.interval + 1
+    if rule.recurrence_type == 'weekly':
+        return 7 * rule.interval + 7
+    return 62 * rule.interval + 31
+
+
+@lru_cache(maxsize=1024)
+def _series_last_day(rule):
+    """Day number of the last occurrence allowed by the rule's count, or None"""
+    if not rule.count:
+        return None
+
+    span = _search_span_days(rule) * (rule.count + 1)
+    while span <= MAX_SEARCH_DAYS * 20:
+        day_hi = rule.anchor_day + span
+        if rule.until_day is not None:
+            day_hi = min(day_hi, rule.until_day)
+        days = _pattern_days(rule, rule.anchor_day, day_hi)
+        if len(days) >= rule.count:
+            return int(days[rule.count - 1])
+        if rule.until_day is not None and day_hi == rule.until_day:
+            return None
+        span *= 2
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _expand_window(rule, lo, hi):
+    """Occurrence starts/ends (datetime64[s]) with lo <= start < hi, in epoch seconds"""
+    # start = day * 86400 + time_of_day, so the day range follows exactly from [lo, hi)
+    day_lo = -(-(lo - rule.time_of_day) // SECONDS_PER_DAY)
+    day_hi = (hi - 1 - rule.time_of_day) // SECONDS_PER_DAY
+    if rule.until_day is not None:
+        day_hi = min(day_hi, rule.until_day)
+    last_day = _series_last_day(rule)
+    if last_day is not None:
+        day_hi = min(day_hi, last_day)
+
+    days = _pattern_days(rule, day_lo, day_hi)
+    starts = (days * SECONDS_PER_DAY + rule.time_of_day).astype('datetime64[s]')
+    ends = starts + np.timedelta64(rule.duration, 's')
+    # Shared between callers through the cache
+    starts.flags.writeable = False
+    ends.flags.writeable = False
+    return starts, ends
+
+
+def expand_occurrences(rule, window_start, window_end):
+    """
+    Occurrences of a rule starting in [window_start, window_end) as
+    (starts, ends) datetime64[s] arrays of naive IST times.
+    """
+    window_start = _to_naive_ist(window_start)
+    window_end = _to_naive_ist(window_end)
+    if rule is None or window_start is None or window_end is None or window_end <= window_start:
+        empty = np.array([], dtype='datetime64[s]')
+        return empty, empty
+    return _expand_window(rule, _epoch_seconds(window_start), _epoch_seconds(window_end))
+
+
+def _as_ist_datetimes(values):
+    return [convert_to_ist(value) for value in values.tolist()]
+
+
+def next_occurrence(rule, after):
+    """First occurrence starting strictly after `after` -> (start, end) in IST, or None"""
+    after = _to_naive_ist(after)
+    if rule is None or after is None:
+        return None
+
+    after_seconds = _epoch_seconds(after)
+    span = _search_span_days(rule) * SECONDS_PER_DAY
+    # Day-aligned windows so repeated lookups on the same day hit the cache
+    lo = (after_seconds // SECONDS_PER_DAY) * SECONDS_PER_DAY
+    limit = lo + MAX_SEARCH_DAYS * SECONDS_PER_DAY
+
+    last_days = [day for day in (rule.until_day, _series_last_day(rule)) if day is not None]
+    if last_days:
+        limit = min(limit, (min(last_days) + 1) * SECONDS_PER_DAY)
+
+    while lo < limit:
+        starts, ends = _expand_window(rule, lo, lo + span)
+        index = np.searchsorted(starts, np.datetime64(after_seconds, 's'), side='right')
+        if index < len(starts):
+            return convert_to_ist(starts[index].tolist()), convert_to_ist(ends[index].tolist())
+        lo += span
+    return None
+
+
+def occurrences_between(meetings, window_start, window_end):
+    """
+    Occurrences starting in [window_start, window_end) for many meetings at once ->
+    {meeting_id: [(start, end), ...]} with IST datetimes. Meetings sharing a rule
+    share one expansion.
+    """
+    results = {}
+    for meeting in meetings:
+        try:
+            rule = rule_from_meeting(meeting)
+            starts, ends = expand_occurrences(rule, window_start, window_end)
+            results[meeting.get('id')] = list(zip(_as_ist_datetimes(starts), _as_ist_datetimes(ends)))
+        except Exception as e:
+            logging.error(f"[OCCURRENCES] Failed to expand meeting {meeting.get('id')}: {e}")
+            results[meeting.get('id')] = []
+    return results
+
+
+def next_occurrences(meetings, after):
+    """Next occurrence after `after` for many meetings -> {meeting_id: (start, end) or None}"""
+    results = {}
+    for meeting in meetings:
+        try:
+            results[meeting.get('id')] = next_occurrence(rule_from_meeting(meeting), after)
+        except Exception as e:
+            logging.error(f"[OCCURRENCES] Failed to find next occurrence for meeting {meeting.get('id')}: {e}")
+            results[meeting.get('id')] = None
+    return results
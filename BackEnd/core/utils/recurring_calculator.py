@@ -3,6 +3,7 @@ from dateutil.relativedelta import relativedelta
 import json
 import logging
 from .date_utils import get_current_ist_datetime, convert_to_ist, parse_datetime_safely
+from .occurrence_engine import rule_from_meeting, next_occurrence, occurrences_between
 
 def calculate_next_occurrence(meeting_data, from_date=None):
     """
@@ -57,19 +58,22 @@ def calculate_next_occurrence(meeting_data, from_date=None):
             'is_currently_active': start_time <= current_time <= end_time
         }
     
-    # Calculate actual next occurrence for recurring meetings
-    recurrence_type = meeting_data.get('recurrence_type')
-    interval = meeting_data.get('recurrence_interval', 1)
-    
-    if recurrence_type == 'daily':
-        return calculate_daily_occurrence(start_time, current_time, interval)
-    elif recurrence_type == 'weekly':
-        return calculate_weekly_occurrence(start_time, current_time, interval, meeting_data)
-    elif recurrence_type == 'monthly':
-        return calculate_monthly_occurrence(start_time, current_time, interval, meeting_data)
+    # Calculate actual next occurrence for recurring meetings (closed-form expansion,
+    # honours intervals, selected days/dates, end date and occurrence count)
+    occurrence = next_occurrence(rule_from_meeting(meeting_data), current_time)
+    if not occurrence:
+        return None
     
-    return None
+    next_datetime, next_end_datetime = occurrence
+    return {
+        'next_start_time': next_datetime.isoformat(),
+        'next_end_time': next_end_datetime.isoformat(),
+        'is_today': next_datetime.date() == current_time.date(),
+        'is_completed_today': False
+    }
 
+# Single-step calculators that occurrence_engine replaced. core/tests.py checks the engine
+# against them and lists where they differ (interval, end date/count, short months).
 def calculate_daily_occurrence(start_time, current_time, interval):
     """Calculate next daily occurrence"""
     days_diff = (current_time.date() - start_time.date()).days
@@ -274,17 +278,22 @@ def get_todays_meetings(meetings_data):
     today = get_current_ist_datetime().date()
     todays_meetings = []
     
+    # Expand every recurring meeting over today's window in one pass
+    day_start = convert_to_ist(datetime.combine(today, datetime.min.time()))
+    todays_occurrences = occurrences_between(
+        [meeting for meeting in meetings_data if meeting.get('is_recurring')],
+        day_start, day_start + timedelta(days=1)
+    )
+    
     for meeting in meetings_data:
         if not meeting.get('is_recurring'):
             # Non-recurring meeting
             start_time = parse_datetime_safely(meeting.get('start_time'))
             if start_time and start_time.date() == today:
                 todays_meetings.append(meeting)
-        else:
-            # Recurring meeting - check if it should occur today
-            next_occurrence = calculate_next_occurrence(meeting)
-            if next_occurrence and next_occurrence.get('is_today'):
-                todays_meetings.append(meeting)
+        elif todays_occurrences.get(meeting.get('id')):
+            # Recurring meeting with an occurrence today
+            todays_meetings.append(meeting)
     
     return todays_meetings
 
@@ -327,11 +336,12 @@ def is_recurrence_ended(meeting_data, check_date=None):
         if end_date and check_date.date() > end_date.date():
             return True
     
-    # Check occurrences (this would need tracking in database)
+    # Check occurrences: counted from the series start, ended once no occurrence
+    # is still running or upcoming
     recurrence_occurrences = meeting_data.get('recurrence_occurrences')
     if recurrence_occurrences:
-        # This would need to be implemented with occurrence tracking
-        # For now, just use end date logic
-        pass
+        rule = rule_from_meeting(meeting_data)
+        if rule and not next_occurrence(rule, check_date - timedelta(seconds=rule.duration)):
+            return True
     
     return False
\ No newline at end of file
@@ -61,7 +61,7 @@ export const useAnalytics = () => {
         analytics_type: filters.analytics_type || 'all',
         timeframe: filters.period || filters.timeframe || '30days',
         meetingType: filters.meetingType || filters.meeting_type || 'all',
-        page: filters.page || 1,
+        cursor: filters.cursor,
         limit: filters.limit || 100,
         start_date: filters.start_date || filters.dateRange?.start,
         end_date: filters.end_date || filters.dateRange?.end
@@ -139,7 +139,7 @@ export const useAnalytics = () => {
         analytics_type: 'meeting',
         timeframe: filters.period || filters.timeframe || '30days',
         meetingType: filters.meetingType || filters.meeting_type || 'all',
-        page: filters.page || 1,
+        cursor: filters.cursor,
         limit: filters.limit || 50,
         start_date: filters.dateRange?.start || filters.start_date,
         end_date: filters.dateRange?.end || filters.end_date